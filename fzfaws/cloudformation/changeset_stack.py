@@ -41,6 +41,7 @@ def changeset_stack(
     extra: bool = False,
     bucket: str = None,
     version: Union[str, bool] = False,
+    stage: bool = False,
 ) -> None:
     """Handle changeset actions.
 
@@ -75,6 +76,8 @@ def changeset_stack(
     :type bucket: str, optional
     :param version: use previous version of template in s3 bucket
     :type version: Union[bool, str], optional
+    :param stage: upload the local template and its artifacts to s3 and create the changeset with the s3 url
+    :type stage: bool, optional
     :raises NoNameEntered: If no changset name is entered
     """
     cloudformation = Cloudformation(profile, region)
@@ -104,12 +107,13 @@ def changeset_stack(
         elif execute:
             selected_changeset = fzf.execute_fzf()
             if get_confirmation("Execute changeset %s?" % selected_changeset):
+                last_event_id = cloudformation.get_last_event_id()
                 response = cloudformation.client.execute_change_set(
                     ChangeSetName=selected_changeset,
                     StackName=cloudformation.stack_name,
                 )
-                cloudformation.wait(
-                    "stack_update_complete", "Wating for stack to be updated ..."
+                cloudformation.wait_stack(
+                    "Wating for stack to be updated ...", last_event_id
                 )
                 print("Stack updated")
 
@@ -142,6 +146,7 @@ def changeset_stack(
             version,
             dryrun=True,
             cloudformation=cloudformation,
+            stage=stage,
         )
         cloudformation_args[
             "cloudformation_action"
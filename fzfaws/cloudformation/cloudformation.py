@@ -3,10 +3,80 @@ import json
 import os
 import re
 import sys
-from typing import Any, Callable, Dict, Generator, List, Tuple, Union
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
 
 from fzfaws.utils import BaseSession, Pyfzf, Spinner, get_confirmation
-from fzfaws.utils.util import search_dict_in_list
+from fzfaws.utils.exceptions import CloudformationError
+from fzfaws.utils.throttle import run_bounded
+
+# every stack status except DELETE_COMPLETE, filtered by list_stacks server side
+STACK_STATUS_FILTER = [
+    "CREATE_IN_PROGRESS",
+    "CREATE_FAILED",
+    "CREATE_COMPLETE",
+    "ROLLBACK_IN_PROGRESS",
+    "ROLLBACK_FAILED",
+    "ROLLBACK_COMPLETE",
+    "DELETE_IN_PROGRESS",
+    "DELETE_FAILED",
+    "UPDATE_IN_PROGRESS",
+    "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS",
+    "UPDATE_COMPLETE",
+    "UPDATE_ROLLBACK_IN_PROGRESS",
+    "UPDATE_ROLLBACK_FAILED",
+    "UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS",
+    "UPDATE_ROLLBACK_COMPLETE",
+    "REVIEW_IN_PROGRESS",
+    "IMPORT_IN_PROGRESS",
+    "IMPORT_COMPLETE",
+    "IMPORT_ROLLBACK_IN_PROGRESS",
+    "IMPORT_ROLLBACK_FAILED",
+    "IMPORT_ROLLBACK_COMPLETE",
+]
+
+# stack status starting an operation
+STACK_START_STATUS = {
+    "CREATE_IN_PROGRESS",
+    "UPDATE_IN_PROGRESS",
+    "DELETE_IN_PROGRESS",
+    "IMPORT_IN_PROGRESS",
+}
+
+# stack status ending an operation, mapped to whether the operation succeeded
+STACK_TERMINAL_STATUS = {
+    "CREATE_COMPLETE": True,
+    "UPDATE_COMPLETE": True,
+    "DELETE_COMPLETE": True,
+    "IMPORT_COMPLETE": True,
+    "CREATE_FAILED": False,
+    "UPDATE_FAILED": False,
+    "DELETE_FAILED": False,
+    "ROLLBACK_COMPLETE": False,
+    "ROLLBACK_FAILED": False,
+    "UPDATE_ROLLBACK_COMPLETE": False,
+    "UPDATE_ROLLBACK_FAILED": False,
+    "IMPORT_ROLLBACK_COMPLETE": False,
+    "IMPORT_ROLLBACK_FAILED": False,
+}
+
+# seconds between each stack event poll, doubled while no new event shows up
+EVENT_POLL_MIN = 2
+
+# tolerated difference between the local clock and the event timestamps
+EVENT_CLOCK_SKEW = timedelta(minutes=1)
+
+# number of nested stacks listed or polled concurrently
+NESTED_WORKERS = 5
+
+# maximum number of stack operations in flight during multi stack operations
+STACK_OPERATION_LIMIT = 5
+
+# status of a stack operation completed without any change, e.g. nothing to update
+STACK_NO_CHANGES = "NO_CHANGES"
 
 
 class Cloudformation(BaseSession):
@@ -29,63 +99,245 @@ class Cloudformation(BaseSession):
         super().__init__(profile=profile, region=region, service_name="cloudformation")
         self.stack_name: str = ""
         self.stack_details: dict = {}
+        self.stack_summaries: Dict[str, Dict[str, Any]] = {}
+        self.stack_resources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.stack_tree: Dict[str, Dict[str, Any]] = {}
 
     def set_stack(self, no_progress=False) -> None:
         """Store the selected stack into the instance attribute.
 
+        Stacks are listed once through the list_stacks summaries and indexed
+        by name, only the selected stack is described.
+
+        :param no_progress: don't display progress bar, useful for ls command
+        :type no_progress: bool, optional
+        """
+        self.stack_name = self.select_stacks(no_progress=no_progress)[0]
+        response = self.client.describe_stacks(
+            StackName=self.stack_summaries.get(self.stack_name, {}).get(
+                "StackId", self.stack_name
+            )
+        )
+        self.stack_details = response["Stacks"][0]
+
+    def select_stacks(
+        self, multi_select: bool = False, header: str = None, no_progress: bool = False
+    ) -> List[str]:
+        """List all stacks and return the selected stack names.
+
+        :param multi_select: allow multiple stacks to be selected
+        :type multi_select: bool, optional
+        :param header: information to be displayed in fzf header
+        :type header: str, optional
         :param no_progress: don't display progress bar, useful for ls command
         :type no_progress: bool, optional
+        :return: selected list of stack names
+        :rtype: List[str]
         """
         fzf = Pyfzf()
+        fzf.process_list(
+            list(self.load_stack_summaries(no_progress=no_progress).values()),
+            "StackName",
+            "StackStatus",
+            "TemplateDescription",
+        )
+        if not multi_select:
+            return [str(fzf.execute_fzf(empty_allow=False))]
+        return list(
+            fzf.execute_fzf(empty_allow=False, multi_select=True, header=header)
+        )
+
+    def load_stack_summaries(
+        self, no_progress: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """List the summaries of all stacks once and index them by stack name.
+
+        Deleted stacks are filtered out by list_stacks server side.
+
+        :param no_progress: don't display progress bar
+        :type no_progress: bool, optional
+        :return: dict of stack name and its list_stacks summary
+        :rtype: Dict[str, Dict[str, Any]]
+        """
         with Spinner.spin(
             message="Fetching cloudformation stacks ...", no_progress=no_progress
         ):
-            paginator = self.client.get_paginator("describe_stacks")
-            response = paginator.paginate()
-            stack_generator = self._get_stack_generator(response)
-            for result in response:
-                fzf.process_list(
-                    result["Stacks"], "StackName", "StackStatus", "Description"
-                )
-        self.stack_name = str(fzf.execute_fzf(empty_allow=False))
-        self.stack_details = search_dict_in_list(
-            self.stack_name, stack_generator, "StackName"
-        )
+            paginator = self.client.get_paginator("list_stacks")
+            self.stack_summaries = {
+                summary["StackName"]: summary
+                for result in paginator.paginate(StackStatusFilter=STACK_STATUS_FILTER)
+                for summary in result.get("StackSummaries", [])
+            }
+        return self.stack_summaries
 
     def get_stack_resources(
-        self, empty_allow: bool = False, header: str = None, no_progress: bool = False
+        self,
+        empty_allow: bool = False,
+        header: str = None,
+        no_progress: bool = False,
+        nested: bool = False,
     ) -> List[str]:
         """List all stack logical resources and return the selected resources.
 
+        With nested, resources of the entire nested stack tree are listed in
+        one flattened view, identified by the stack path and the logical id,
+        e.g. root/Network/VPC, use get_resource_stack to split the selection.
+
         :param empty_allow: allow empty selection
         :type empty_allow: bool, optional
         :param header: information to be displayed in fzf header
         :type header: str, optional
         :param no_progress: don't display progress bar, useful for ls command
         :type no_progress: bool, optional
+        :param nested: list resources of all nested stacks
+        :type nested: bool, optional
         :return: selected list of logical resources LogicalResourceId
         :rtype: List[str]
         """
         fzf = Pyfzf()
-        with Spinner.spin(
-            message="Fetching stack resources ...", no_progress=no_progress
-        ):
-            paginator = self.client.get_paginator("list_stack_resources")
-            for result in paginator.paginate(StackName=self.stack_name):
-                for resource in result.get("StackResourceSummaries"):
-                    resource["Drift"] = resource.get("DriftInformation").get(
-                        "StackResourceDriftStatus"
+        if not nested:
+            resources = list(
+                self.list_stack_resources(no_progress=no_progress).values()
+            )
+        else:
+            resources = []
+            for path, node in self.load_stack_tree(no_progress=no_progress).items():
+                for resource in self.stack_resources[node["ResourceKey"]].values():
+                    resources.append(
+                        dict(
+                            resource,
+                            LogicalResourceId="%s/%s"
+                            % (path, resource["LogicalResourceId"]),
+                        )
                     )
-                fzf.process_list(
-                    result.get("StackResourceSummaries"),
-                    "LogicalResourceId",
-                    "ResourceType",
-                    "Drift",
-                )
+        for resource in resources:
+            resource["Drift"] = resource.get("DriftInformation", {}).get(
+                "StackResourceDriftStatus"
+            )
+        fzf.process_list(resources, "LogicalResourceId", "ResourceType", "Drift")
         return list(
             fzf.execute_fzf(multi_select=True, header=header, empty_allow=empty_allow)
         )
 
+    def get_resource_stack(self, resource: str) -> Tuple[str, str]:
+        """Split the resource selected from the nested view.
+
+        :param resource: the stack path and the logical id, e.g. root/Network/VPC
+        :type resource: str
+        :return: the StackId of the stack containing the resource and the logical id
+        :rtype: Tuple[str, str]
+        """
+        path, _, logical_id = resource.rpartition("/")
+        return self.stack_tree[path]["StackId"], logical_id
+
+    def load_stack_tree(self, no_progress: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Build the nested stack tree of the current stack.
+
+        Nested stacks are followed through the AWS::CloudFormation::Stack
+        resources recursively, stacks of the same level are listed concurrently
+        and their resources are cached for later lookups.
+
+        :param no_progress: don't display progress bar
+        :type no_progress: bool, optional
+        :return: dict of stack path and the stack node, parents before children,
+            each node contains Path, StackName, StackId, Depth, StackStatus, Drift
+            and ResourceKey, the key of its resources in stack_resources
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        root = {
+            "Path": self.stack_name,
+            "StackName": self.stack_name,
+            "StackId": self.stack_details.get("StackId", self.stack_name),
+            "Depth": 0,
+            "StackStatus": self.stack_details.get("StackStatus"),
+            "Drift": self.stack_details.get("DriftInformation", {}).get(
+                "StackDriftStatus"
+            ),
+            "ResourceKey": self.stack_name,
+        }
+        nodes: List[Dict[str, Any]] = []
+        level = [root]
+
+        def _list(node: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+            if node["ResourceKey"] not in self.stack_resources:
+                self.stack_resources[node["ResourceKey"]] = self._fetch_resources(
+                    node["StackId"]
+                )
+            return self.stack_resources[node["ResourceKey"]]
+
+        with Spinner.spin(
+            message="Fetching nested stacks ...", no_progress=no_progress
+        ):
+            while level:
+                nodes.extend(level)
+                next_level: List[Dict[str, Any]] = []
+                for node, future in run_bounded(_list, level, NESTED_WORKERS):
+                    for resource in future.result().values():
+                        stack_id = resource.get("PhysicalResourceId")
+                        if (
+                            resource.get("ResourceType") != "AWS::CloudFormation::Stack"
+                            or not stack_id
+                        ):
+                            continue
+                        next_level.append(
+                            {
+                                "Path": "%s/%s"
+                                % (node["Path"], resource["LogicalResourceId"]),
+                                "StackName": stack_id.split("/")[1],
+                                "StackId": stack_id,
+                                "Depth": node["Depth"] + 1,
+                                "StackStatus": resource.get("ResourceStatus"),
+                                "Drift": resource.get("DriftInformation", {}).get(
+                                    "StackResourceDriftStatus"
+                                ),
+                                "ResourceKey": stack_id,
+                            }
+                        )
+                level = next_level
+        self.stack_tree = {
+            node["Path"]: node
+            for node in sorted(nodes, key=lambda node: node["Path"].split("/"))
+        }
+        return self.stack_tree
+
+    def list_stack_resources(
+        self, stack_name: str = None, no_progress: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return the resource summaries of the stack indexed by logical id.
+
+        Resources are listed in one paginated pass and cached per stack,
+        later calls for the same stack don't call the api again.
+
+        :param stack_name: name of the stack, default to the current stack
+        :type stack_name: str, optional
+        :param no_progress: don't display progress bar
+        :type no_progress: bool, optional
+        :return: dict of LogicalResourceId and its list_stack_resources summary
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        stack_name = stack_name or self.stack_name
+        if stack_name not in self.stack_resources:
+            with Spinner.spin(
+                message="Fetching stack resources ...", no_progress=no_progress
+            ):
+                self.stack_resources[stack_name] = self._fetch_resources(stack_name)
+        return self.stack_resources[stack_name]
+
+    def _fetch_resources(self, stack_name: str) -> Dict[str, Dict[str, Any]]:
+        """List the resource summaries of the stack in one paginated pass.
+
+        :param stack_name: name or StackId of the stack
+        :type stack_name: str
+        :return: dict of LogicalResourceId and its list_stack_resources summary
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        paginator = self.client.get_paginator("list_stack_resources")
+        return {
+            resource["LogicalResourceId"]: resource
+            for result in paginator.paginate(StackName=stack_name)
+            for resource in result.get("StackResourceSummaries", [])
+        }
+
     def wait(self, waiter_name: str, message: str = None, **kwargs) -> None:
         """Wait for the operation to be completed.
 
@@ -105,6 +357,271 @@ class Cloudformation(BaseSession):
                 **kwargs
             )
 
+    def wait_stack(self, message: str = None, last_event_id: str = None) -> None:
+        """Tail the stack events until the stack operation completes.
+
+        Pass the return value of get_last_event_id taken before starting the
+        operation as last_event_id, so that events of a previous operation are
+        never picked up. Without it, events are tailed from the latest stack
+        event starting an operation, used when creating a new stack.
+
+        Events are polled incrementally from the last seen event and printed
+        as they show up, polling is fast while resources are changing and backs
+        off up to the delay of the waiter config when quiet. Return as soon as
+        the stack reaches a terminal status.
+
+        Nested stacks showing up in the events are tailed as well, their events
+        are printed with the nested stack name prefixed to the logical id.
+
+        :param message: message to display before the events
+        :type message: str, optional
+        :param last_event_id: EventId of the latest event before the operation started
+        :type last_event_id: str, optional
+        :raises CloudformationError: when the stack operation failed or timed out
+        """
+        if message:
+            print(message)
+        since = datetime.now(timezone.utc) - EVENT_CLOCK_SKEW
+        stack_id = self._get_stack_id()
+        delay, max_attempts = self._get_waiter_config()
+        deadline = time.monotonic() + delay * max_attempts
+        interval = EVENT_POLL_MIN
+        last_event_ids: Dict[str, Optional[str]] = {stack_id: last_event_id}
+        failures: List[str] = []
+
+        def _poll(tailed_id: str) -> List[Dict[str, Any]]:
+            return self._get_new_events(tailed_id, last_event_ids[tailed_id], since)
+
+        while True:
+            events: List[Dict[str, Any]] = []
+            for tailed_id, future in run_bounded(
+                _poll, list(last_event_ids), NESTED_WORKERS
+            ):
+                new_events = future.result()
+                if new_events:
+                    last_event_ids[tailed_id] = new_events[-1]["EventId"]
+                    events.extend(new_events)
+            if events:
+                events.sort(key=lambda event: event["Timestamp"])
+                interval = EVENT_POLL_MIN
+            else:
+                interval = min(interval * 2, max(delay, EVENT_POLL_MIN))
+            for event in events:
+                status = event.get("ResourceStatus", "")
+                logical_id = event.get("LogicalResourceId")
+                if event.get("StackId") != stack_id:
+                    logical_id = "%s/%s" % (event.get("StackName"), logical_id)
+                failure = self._handle_event(event, logical_id=logical_id)
+                nested_id = event.get("PhysicalResourceId")
+                if (
+                    event.get("ResourceType") == "AWS::CloudFormation::Stack"
+                    and nested_id
+                    and nested_id.startswith("arn:")
+                    and nested_id not in last_event_ids
+                ):
+                    last_event_ids[nested_id] = None
+                if not self._is_stack_event(event) or event.get("StackId") != stack_id:
+                    if failure:
+                        failures.append(failure)
+                    continue
+                if status in STACK_TERMINAL_STATUS:
+                    if not STACK_TERMINAL_STATUS[status]:
+                        raise CloudformationError(
+                            "Stack %s %s\n%s"
+                            % (self.stack_name, status, "\n".join(failures))
+                        )
+                    return
+            if time.monotonic() >= deadline:
+                raise CloudformationError(
+                    "Timed out waiting for stack %s" % self.stack_name
+                )
+            time.sleep(interval)
+
+    def execute_stacks(
+        self,
+        stack_actions: Dict[str, Callable[[], Optional[str]]],
+        dependencies: Dict[str, Set[str]] = None,
+        max_in_flight: int = STACK_OPERATION_LIMIT,
+    ) -> Dict[str, Dict[str, str]]:
+        """Start the stack operations in dependency order and tail their events.
+
+        A stack operation starts once all of its dependencies succeeded, at most
+        max_in_flight operations run at the same time and the events of all of them
+        are polled in one loop. Stacks depending on a failed stack are skipped.
+        Each operation times out after the waiter config from its own start and
+        its events are tailed from the latest stack event before it started.
+
+        :param stack_actions: dict of stack name and the function starting its operation,
+            the function return None to wait for the operation, or a status string
+            to complete the stack without waiting
+        :type stack_actions: Dict[str, Callable[[], Optional[str]]]
+        :param dependencies: dict of stack name and the stacks to complete before it
+        :type dependencies: Dict[str, Set[str]], optional
+        :param max_in_flight: maximum number of operations in flight
+        :type max_in_flight: int, optional
+        :raises TypeError: when a stack action returns neither None nor a status string
+        :return: dict of stack name and its outcome, contains Status and Reason
+        :rtype: Dict[str, Dict[str, str]]
+        """
+        if dependencies is None:
+            dependencies = {}
+        delay, max_attempts = self._get_waiter_config()
+        interval = EVENT_POLL_MIN
+        pending: Set[str] = set(stack_actions)
+        in_flight: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Dict[str, str]] = {}
+
+        def _get_stack_id(stack_name: str) -> str:
+            return self.stack_summaries.get(stack_name, {}).get("StackId", stack_name)
+
+        def _start(stack_name: str) -> Tuple[Optional[str], Optional[str]]:
+            last_event_id = self.get_last_event_id(_get_stack_id(stack_name))
+            return last_event_id, stack_actions[stack_name]()
+
+        def _poll(stack_name: str) -> List[Dict[str, Any]]:
+            tailed = in_flight[stack_name]
+            return self._get_new_events(
+                tailed["StackId"], tailed["LastEventId"], tailed["Since"]
+            )
+
+        while pending or in_flight:
+            ready: List[str] = []
+            skipped = True
+            while skipped:
+                # skipping a stack could skip the stacks depending on it
+                ready, skipped = [], False
+                for stack_name in sorted(pending):
+                    stack_dependencies = dependencies.get(stack_name, set()) & set(
+                        stack_actions
+                    )
+                    failed = [
+                        dependency
+                        for dependency in stack_dependencies
+                        if dependency in results
+                        and not self._is_success(results[dependency]["Status"])
+                    ]
+                    if failed:
+                        results[stack_name] = {
+                            "Status": "SKIPPED",
+                            "Reason": "%s failed" % ", ".join(sorted(failed)),
+                        }
+                        pending.discard(stack_name)
+                        skipped = True
+                    elif all(
+                        dependency in results for dependency in stack_dependencies
+                    ):
+                        ready.append(stack_name)
+            if not ready and not in_flight:
+                for stack_name in pending:
+                    results[stack_name] = {
+                        "Status": "SKIPPED",
+                        "Reason": "circular dependencies",
+                    }
+                break
+            ready = ready[: max(max_in_flight - len(in_flight), 0)]
+            since = datetime.now(timezone.utc) - EVENT_CLOCK_SKEW
+            for stack_name, future in run_bounded(_start, ready, max_in_flight):
+                pending.discard(stack_name)
+                try:
+                    last_event_id, status = future.result()
+                except (ClientError, BotoCoreError) as e:
+                    results[stack_name] = {"Status": "FAILED", "Reason": str(e)}
+                    continue
+                if status is not None:
+                    if not isinstance(status, str):
+                        raise TypeError(
+                            "Action of stack %s returned %s, expect None or a status"
+                            % (stack_name, type(status).__name__)
+                        )
+                    results[stack_name] = {"Status": status, "Reason": ""}
+                    continue
+                in_flight[stack_name] = {
+                    "StackId": _get_stack_id(stack_name),
+                    "LastEventId": last_event_id,
+                    "Since": since,
+                    "Deadline": time.monotonic() + delay * max_attempts,
+                    "Reason": "",
+                }
+            if not in_flight:
+                continue
+
+            events: List[Tuple[str, Dict[str, Any]]] = []
+            for stack_name, future in run_bounded(
+                _poll, list(in_flight), max_in_flight
+            ):
+                new_events = future.result()
+                if new_events:
+                    in_flight[stack_name]["LastEventId"] = new_events[-1]["EventId"]
+                    events.extend((stack_name, event) for event in new_events)
+            if events:
+                events.sort(key=lambda stack_event: stack_event[1]["Timestamp"])
+                interval = EVENT_POLL_MIN
+            else:
+                interval = min(interval * 2, max(delay, EVENT_POLL_MIN))
+            for stack_name, event in events:
+                status = event.get("ResourceStatus", "")
+                failure = self._handle_event(event, label=stack_name)
+                if stack_name not in in_flight:
+                    continue
+                if not self._is_stack_event(event):
+                    if failure and not in_flight[stack_name]["Reason"]:
+                        in_flight[stack_name]["Reason"] = failure
+                    continue
+                if status in STACK_TERMINAL_STATUS:
+                    reason = in_flight.pop(stack_name)["Reason"]
+                    results[stack_name] = {
+                        "Status": status,
+                        "Reason": "" if STACK_TERMINAL_STATUS[status] else reason,
+                    }
+            now = time.monotonic()
+            for stack_name in [
+                stack_name
+                for stack_name, tailed in in_flight.items()
+                if now >= tailed["Deadline"]
+            ]:
+                in_flight.pop(stack_name)
+                results[stack_name] = {"Status": "TIMED_OUT", "Reason": ""}
+            if in_flight:
+                time.sleep(interval)
+        return results
+
+    def print_stack_results(self, results: Dict[str, Dict[str, str]]) -> None:
+        """Print the outcome of the stack operations as a table.
+
+        :param results: return value of execute_stacks
+        :type results: Dict[str, Dict[str, str]]
+        :raises CloudformationError: when any of the stack operations failed
+        """
+        width = max([len("StackName")] + [len(stack_name) for stack_name in results])
+        status_width = max(
+            [len("Status")] + [len(result["Status"]) for result in results.values()]
+        )
+        print(80 * "-")
+        print("%-*s  %-*s  %s" % (width, "StackName", status_width, "Status", "Reason"))
+        for stack_name in sorted(results):
+            print(
+                (
+                    "%-*s  %-*s  %s"
+                    % (
+                        width,
+                        stack_name,
+                        status_width,
+                        results[stack_name]["Status"],
+                        results[stack_name]["Reason"],
+                    )
+                ).rstrip()
+            )
+        failed = [
+            stack_name
+            for stack_name, result in results.items()
+            if not self._is_success(result["Status"])
+        ]
+        if failed:
+            raise CloudformationError(
+                "%s stack operations failed: %s"
+                % (len(failed), ", ".join(sorted(failed)))
+            )
+
     def execute_with_capabilities(
         self, cloudformation_action: Callable[..., Dict[str, Any]] = None, **kwargs
     ) -> Dict[str, Any]:
@@ -135,6 +652,138 @@ class Cloudformation(BaseSession):
             )
         return response
 
+    def get_last_event_id(self, stack_name: str = None) -> Optional[str]:
+        """Return the EventId of the latest event of the stack.
+
+        Take it before starting a stack operation and pass it to wait_stack,
+        only the events after it belong to the new operation.
+
+        :param stack_name: name or id of the stack, default to the current stack
+        :type stack_name: str, optional
+        :return: EventId of the latest event, None if the stack has no event
+        :rtype: Optional[str]
+        """
+        response = self.client.describe_stack_events(
+            StackName=stack_name or self.stack_name
+        )
+        events = response.get("StackEvents", [])
+        return events[0]["EventId"] if events else None
+
+    def _get_stack_id(self) -> str:
+        """Return the id of the current stack.
+
+        Events of a deleted stack are only available through the stack id.
+
+        :return: the StackId of the stack
+        :rtype: str
+        """
+        if self.stack_details.get("StackName") == self.stack_name and (
+            self.stack_details.get("StackId")
+        ):
+            return self.stack_details["StackId"]
+        response = self.client.describe_stacks(StackName=self.stack_name)
+        return response["Stacks"][0]["StackId"]
+
+    def _get_new_events(
+        self,
+        stack_id: str,
+        last_event_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the stack events after the last seen event, oldest first.
+
+        Without a last seen event, return the events of the current operation,
+        starting from the latest stack event starting an operation. Nothing is
+        returned when the latest stack event is a terminal status before since,
+        the terminal status belongs to a previous operation and the current
+        operation hasn't started yet.
+
+        :param stack_id: the StackId of the stack
+        :type stack_id: str
+        :param last_event_id: EventId of the last seen event
+        :type last_event_id: str, optional
+        :param since: time the current operation started
+        :type since: datetime, optional
+        :return: list of new stack events
+        :rtype: List[Dict[str, Any]]
+        """
+        events: List[Dict[str, Any]] = []
+        paginator = self.client.get_paginator("describe_stack_events")
+        for result in paginator.paginate(StackName=stack_id):
+            for event in result.get("StackEvents", []):
+                if event["EventId"] == last_event_id:
+                    return events[::-1]
+                if last_event_id is None and self._is_stack_event(event):
+                    status = event.get("ResourceStatus")
+                    if (
+                        status in STACK_TERMINAL_STATUS
+                        and not events
+                        and (since is None or event["Timestamp"] < since)
+                    ):
+                        return []
+                    if status in STACK_START_STATUS:
+                        events.append(event)
+                        return events[::-1]
+                events.append(event)
+        return events[::-1]
+
+    @staticmethod
+    def _handle_event(
+        event: Dict[str, Any], label: str = "", logical_id: str = None
+    ) -> str:
+        """Print the stack event and return the failure it reports.
+
+        :param event: stack event from describe_stack_events
+        :type event: Dict[str, Any]
+        :param label: printed before the status, e.g. the stack name
+        :type label: str, optional
+        :param logical_id: logical id to print, default to the LogicalResourceId
+        :type logical_id: str, optional
+        :return: logical id and reason of a failed status, empty string otherwise
+        :rtype: str
+        """
+        status = event.get("ResourceStatus", "")
+        reason = event.get("ResourceStatusReason", "")
+        logical_id = logical_id or event.get("LogicalResourceId")
+        print(
+            "%s %s%s %s %s%s"
+            % (
+                event["Timestamp"].strftime("%H:%M:%S"),
+                "%s " % label if label else "",
+                status,
+                event.get("ResourceType"),
+                logical_id,
+                " (%s)" % reason if reason else "",
+            )
+        )
+        if status.endswith("_FAILED") and reason:
+            return "%s: %s" % (logical_id, reason)
+        return ""
+
+    @staticmethod
+    def _is_success(status: str) -> bool:
+        """Check if the stack operation outcome is a success.
+
+        :param status: outcome status of the stack operation
+        :type status: str
+        :return: True if the operation completed successfully or without changes
+        :rtype: bool
+        """
+        return status == STACK_NO_CHANGES or STACK_TERMINAL_STATUS.get(status, False)
+
+    @staticmethod
+    def _is_stack_event(event: Dict[str, Any]) -> bool:
+        """Check if the event is the status change of the stack itself.
+
+        :param event: stack event from describe_stack_events
+        :type event: Dict[str, Any]
+        :return: True if the event is about the stack rather than a resource
+        :rtype: bool
+        """
+        return event.get("ResourceType") == "AWS::CloudFormation::Stack" and event.get(
+            "PhysicalResourceId"
+        ) == event.get("StackId")
+
     def _get_waiter_config(self) -> Tuple[int, int]:
         """Process env and return the waiter config.
 
@@ -171,17 +820,3 @@ class Cloudformation(BaseSession):
                 empty_allow=True, print_col=1, multi_select=True, header=message
             )
         )
-
-    def _get_stack_generator(
-        self, response: List[Dict[str, Any]]
-    ) -> Generator[Dict[str, Any], None, None]:
-        """Create generator for boto3 paginator.
-
-        Attempt to reduce unnecessary memory usage.
-
-        :param response: response from paginator.paginate()
-        :type response: List[Dict[str, Any]]
-        """
-        for result in response:
-            for stack in result.get("Stacks", []):
-                yield stack
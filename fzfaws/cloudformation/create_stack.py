@@ -10,6 +10,10 @@ from fzfaws.cloudformation.helper.file_validation import (
     is_yaml,
 )
 from fzfaws.cloudformation.helper.paramprocessor import ParamProcessor
+from fzfaws.cloudformation.helper.templatestage import (
+    check_template_size,
+    get_template_stage,
+)
 from fzfaws.cloudformation.validate_stack import validate_stack
 from fzfaws.s3 import S3
 from fzfaws.utils import FileLoader, Pyfzf
@@ -25,6 +29,7 @@ def create_stack(
     extra: bool = False,
     bucket: str = None,
     version: Union[str, bool] = False,
+    stage: bool = False,
 ) -> None:
     """Handle the creation of the cloudformation stack.
 
@@ -44,6 +49,8 @@ def create_stack(
     :type bucket: str, optional
     :param version: use a previous version of the template
     :type version: Union[bool, str], optional
+    :param stage: upload the local template and its artifacts to s3 and create with the s3 url
+    :type stage: bool, optional
     :raises NoNameEntered: when the new stack receive empty string as stack_name
     """
     cloudformation = Cloudformation(profile, region)
@@ -55,7 +62,7 @@ def create_stack(
                 fzf.get_local_file(search_from_root=root, cloudformation=True)
             )
         cloudformation_args = construct_local_creation_args(
-            cloudformation, str(local_path)
+            cloudformation, str(local_path), stage
         )
     else:
         cloudformation_args = construct_s3_creation_args(
@@ -75,36 +82,54 @@ def create_stack(
 
     if wait:
         cloudformation.stack_name = cloudformation_args["StackName"]
-        cloudformation.wait(
-            "stack_create_complete", "Waiting for stack to be ready ..."
-        )
+        cloudformation.wait_stack("Waiting for stack to be ready ...")
         print("Stack created")
 
 
 def construct_local_creation_args(
-    cloudformation: Cloudformation, local_path: str
+    cloudformation: Cloudformation, local_path: str, stage: bool = False
 ) -> Dict[str, Any]:
     """Construct cloudformation create argument for local file.
 
     Perform fzf search on local files json/yaml and then use validate_stack to
     validate stack through boto3 API before constructing the argument.
 
+    With stage, the template and its local artifacts are uploaded to s3
+    and the stack is created with TemplateURL instead of TemplateBody.
+
     :param cloudformation: Cloudformation instance
     :type cloudformation: Cloudformation
     :param local_path: local file path
     :type local_path: str
+    :param stage: stage the template to s3
+    :type stage: bool, optional
     :return: return the constructed args thats ready for use with boto3
     :rtype: Dict[str, Any]
     """
     # validate file type, has to be either yaml or json
     check_is_valid(local_path)
 
-    validate_stack(
-        cloudformation.profile,
-        cloudformation.region,
-        local_path=local_path,
-        no_print=True,
-    )
+    template_args: Dict[str, str] = {}
+    if stage:
+        template_stage = get_template_stage(
+            cloudformation.profile, cloudformation.region
+        )
+        template_key = template_stage.stage(local_path)
+        validate_stack(
+            cloudformation.profile,
+            cloudformation.region,
+            bucket="%s/%s" % (template_stage.s3.bucket_name, template_key),
+            no_print=True,
+        )
+        template_args["TemplateURL"] = template_stage.get_template_url(template_key)
+    else:
+        check_template_size(local_path)
+        validate_stack(
+            cloudformation.profile,
+            cloudformation.region,
+            local_path=local_path,
+            no_print=True,
+        )
 
     stack_name: str = input("StackName: ")
     if not stack_name:
@@ -135,6 +160,9 @@ def construct_local_creation_args(
         "TemplateBody": file_data["body"],
         "Parameters": create_parameters,
     }
+    if template_args:
+        cloudformation_args.pop("TemplateBody")
+        cloudformation_args.update(template_args)
 
     return cloudformation_args
 
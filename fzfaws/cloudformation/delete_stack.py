@@ -1,8 +1,12 @@
 """Module contains the cloudformation function to delete stack."""
 import sys
-from typing import Any, Dict, List, Union
+from functools import partial
+from typing import Any, Dict, List, Set, Union
+
+from botocore.exceptions import ClientError
 
 from fzfaws.cloudformation import Cloudformation
+from fzfaws.cloudformation.helper.exportindex import get_export_index
 from fzfaws.iam import IAM
 from fzfaws.utils import get_confirmation
 
@@ -12,6 +16,7 @@ def delete_stack(
     region: Union[str, bool] = False,
     wait: bool = False,
     iam: Union[str, bool] = False,
+    multi: bool = False,
 ) -> None:
     """Handle deletion of the stack.
 
@@ -20,6 +25,12 @@ def delete_stack(
     fzf operation would be triggered for user to select logical id to retain
     in order for deletion to be success.
 
+    Exports of the stack imported by other stacks are printed before
+    confirmation since the deletion would fail until the imports are removed.
+
+    With multi, multiple stacks are deleted concurrently, stacks importing
+    exports of other selected stacks are deleted first.
+
     :param profile: use a different profile for this operation
     :type profile: Union[str, bool], optional
     :param region: use a different region for this operation
@@ -28,8 +39,14 @@ def delete_stack(
     :type wait: bool, optional
     :param iam: specify a iam arn to delete this stack
     :type iam: Union[str, bool]
+    :param multi: select multiple stacks to delete, always wait for the deletion
+    :type multi: bool, optional
+    :raises CloudformationError: when any of the stacks failed to delete in multi mode
     """
     cloudformation = Cloudformation(profile, region)
+    if multi:
+        delete_stacks(cloudformation, iam)
+        return
     cloudformation.set_stack()
 
     logical_id_list: List[str] = []
@@ -44,28 +61,118 @@ def delete_stack(
     cloudformation_args: Dict[str, Any] = {"StackName": cloudformation.stack_name}
     if logical_id_list:
         cloudformation_args["RetainResources"] = logical_id_list
+    cloudformation_args.update(get_role_args(cloudformation, iam))
 
-    if iam and type(iam) == str:
-        cloudformation_args["RoleARN"] = iam
-    elif iam and type(iam) == bool:
-        iam_instance = IAM(profile=cloudformation.profile)
-        iam_instance.set_arns(
-            header="select a iam role with permissions to delete the current stack",
-            service="cloudformation.amazonaws.com",
+    try:
+        stack_imports = get_export_index(cloudformation).load_stack_imports(
+            cloudformation.stack_details["StackId"]
+        )
+    except ClientError as e:
+        print("Unable to check stack imports: %s" % e)
+        stack_imports = {}
+    for export_name, stack_names in stack_imports.items():
+        print(
+            "Warning: export '%s' is imported by %s"
+            % (export_name, ", ".join(stack_names))
         )
-        if iam_instance.arns[0]:
-            cloudformation_args["RoleARN"] = iam_instance.arns[0]
 
     if not get_confirmation(
         "Are you sure you want to delete the stack '%s'?" % cloudformation.stack_name
     ):
         sys.exit(1)
 
+    last_event_id = cloudformation.get_last_event_id() if wait else None
     cloudformation.client.delete_stack(**cloudformation_args)
     print("Stack deletion initiated")
 
     if wait:
-        cloudformation.wait(
-            "stack_delete_complete", "Wating for stack to be deleted ..."
-        )
+        cloudformation.wait_stack("Wating for stack to be deleted ...", last_event_id)
         print("Stack deleted")
+
+
+def delete_stacks(
+    cloudformation: Cloudformation, iam: Union[str, bool] = False
+) -> None:
+    """Delete the selected stacks concurrently in dependency order.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param iam: specify a iam arn to delete the stacks
+    :type iam: Union[str, bool]
+    :raises CloudformationError: when any of the stacks failed to delete
+    """
+    stack_names = cloudformation.select_stacks(
+        multi_select=True, header="select stacks to delete"
+    )
+    export_index = get_export_index(cloudformation)
+    export_index.load()
+    delete_order = export_index.get_delete_order(stack_names)
+    role_args = get_role_args(cloudformation, iam)
+
+    dependencies: Dict[str, Set[str]] = {}
+    for stack_name in stack_names:
+        # stacks importing the exports are deleted first
+        dependencies[stack_name] = export_index.dependents.get(stack_name, set())
+        for export_name, importers in export_index.get_stack_imports(
+            stack_name
+        ).items():
+            unselected = [name for name in importers if name not in stack_names]
+            if unselected:
+                print(
+                    "Warning: export '%s' is imported by %s"
+                    % (export_name, ", ".join(unselected))
+                )
+    for level in delete_order:
+        for stack_name in level:
+            print("(dryrun) delete: %s" % stack_name)
+    if not get_confirmation("Are you sure you want to delete the stacks?"):
+        sys.exit(1)
+
+    results = cloudformation.execute_stacks(
+        {
+            stack_name: partial(start_delete, cloudformation, stack_name, role_args)
+            for stack_name in stack_names
+        },
+        dependencies,
+    )
+    cloudformation.print_stack_results(results)
+
+
+def start_delete(
+    cloudformation: Cloudformation, stack_name: str, role_args: Dict[str, str]
+) -> None:
+    """Start the deletion of a stack.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param stack_name: name of the stack to delete
+    :type stack_name: str
+    :param role_args: RoleARN argument of delete_stack
+    :type role_args: Dict[str, str]
+    """
+    cloudformation.client.delete_stack(StackName=stack_name, **role_args)
+
+
+def get_role_args(
+    cloudformation: Cloudformation, iam: Union[str, bool] = False
+) -> Dict[str, str]:
+    """Return the RoleARN argument to delete the stack.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param iam: iam arn, or True to select the iam role through fzf
+    :type iam: Union[str, bool]
+    :return: dict contains RoleARN if specified
+    :rtype: Dict[str, str]
+    """
+    if iam and type(iam) == str:
+        return {"RoleARN": iam}
+    elif iam and type(iam) == bool:
+        iam_instance = IAM(profile=cloudformation.profile)
+        iam_instance.set_arns(
+            header="select a iam role with permissions to delete the current stack",
+            service="cloudformation.amazonaws.com",
+        )
+        if iam_instance.arns[0]:
+            return {"RoleARN": iam_instance.arns[0]}
+    return {}
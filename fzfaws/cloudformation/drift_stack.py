@@ -1,10 +1,30 @@
 """Contains function to handle drift detection."""
 import json
 import time
-from typing import List, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
 
 from fzfaws.cloudformation import Cloudformation
 from fzfaws.utils import Spinner
+from fzfaws.utils.exceptions import CloudformationError
+from fzfaws.utils.throttle import RateLimiter, call_with_retry, run_bounded
+
+# number of concurrent drift api calls and the maximum calls per second
+DRIFT_WORKERS = 5
+DRIFT_REQUEST_RATE = 5
+
+# stack status allowing drift detection, other stacks are skipped on --all
+DRIFT_STACK_STATUS = {
+    "CREATE_COMPLETE",
+    "UPDATE_COMPLETE",
+    "UPDATE_ROLLBACK_COMPLETE",
+    "IMPORT_COMPLETE",
+    "IMPORT_ROLLBACK_COMPLETE",
+}
+
+# seconds between each detection status poll, doubled while nothing completes
+DRIFT_POLL_MIN = 2
 
 
 def drift_stack(
@@ -13,6 +33,9 @@ def drift_stack(
     info: bool = False,
     select: bool = False,
     wait: bool = False,
+    multi: bool = False,
+    all_stacks: bool = False,
+    nested: bool = False,
 ) -> None:
     """Perform actions on stack drift.
 
@@ -20,6 +43,8 @@ def drift_stack(
 
     Select: select resource and detect its drift.
 
+    Multi/All/Nested: detect drift on multiple stacks concurrently and report the drifted resources.
+
     Default: init and wait for the drift result of the entire stack.
 
     :param profile: use a different profile for the operation
@@ -32,9 +57,35 @@ def drift_stack(
     :type select: bool, optional
     :param wait: wait for the drfit detection
     :type wait: bool, optional
+    :param multi: select multiple stacks to detect drift
+    :type multi: bool, optional
+    :param all_stacks: detect drift on every stack
+    :type all_stacks: bool, optional
+    :param nested: detect drift on the selected stack and all of its nested stacks
+    :type nested: bool, optional
+    :raises CloudformationError: when drift detection failed on any of the stacks
     """
     cloudformation = Cloudformation(profile, region)
+    if multi or all_stacks:
+        if all_stacks:
+            stack_names = []
+            for stack_name, summary in cloudformation.load_stack_summaries().items():
+                if summary.get("StackStatus") in DRIFT_STACK_STATUS:
+                    stack_names.append(stack_name)
+                else:
+                    print("skip: %s (%s)" % (stack_name, summary.get("StackStatus")))
+        else:
+            stack_names = cloudformation.select_stacks(
+                multi_select=True, header="select stacks to detect drift"
+            )
+        scan_drift(cloudformation, stack_names)
+        return
+
     cloudformation.set_stack()
+    if nested:
+        stack_tree = cloudformation.load_stack_tree()
+        scan_drift(cloudformation, [node["StackName"] for node in stack_tree.values()])
+        return
 
     print(
         json.dumps(
@@ -101,23 +152,16 @@ def wait_drift_result(cloudformation: Cloudformation, drift_id: str) -> None:
     :param drift_id: the id of the drift detection
     :type drift_id: str
     """
-    delay, max_attempts = cloudformation._get_waiter_config()
-    attempts: int = 0
     response = None
     with Spinner.spin(message="Wating for drift detection to complete ..."):
-        while attempts <= max_attempts:
-            time.sleep(delay)
-            response = cloudformation.client.describe_stack_drift_detection_status(
-                StackDriftDetectionId=drift_id
-            )
-            if response.get("DetectionStatus") != "DETECTION_IN_PROGRESS":
-                break
+        for _, response in poll_drift_detections(cloudformation, [drift_id]):
+            pass
     if response is not None:
         response.pop("ResponseMetadata", None)
         print(json.dumps(response, indent=4, default=str))
         print(80 * "-")
         if response["DetectionStatus"] == "DETECTION_COMPLETE":
-            print("StackDriftStatus: %s" % response.get("StackResourceDriftStatus"))
+            print("StackDriftStatus: %s" % response.get("StackDriftStatus"))
             print(
                 "DriftedStackResourceCount: %s"
                 % response.get("DriftedStackResourceCount")
@@ -126,3 +170,196 @@ def wait_drift_result(cloudformation: Cloudformation, drift_id: str) -> None:
             print("Drift detection failed")
     else:
         print("Waiter failed: Max attempts exceeded")
+
+
+def poll_drift_detections(
+    cloudformation: Cloudformation,
+    drift_ids: List[str],
+    limiter: Optional[RateLimiter] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Poll the status of the drift detections until they complete.
+
+    All detections are polled by one scheduler, the first poll is immediate,
+    the interval resets when any detection completes and doubles up to the
+    delay of the waiter config otherwise. Detections still in progress after
+    max attempts of the waiter config are not yielded.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param drift_ids: ids of the drift detections
+    :type drift_ids: List[str]
+    :param limiter: rate limiter of the drift api calls
+    :type limiter: RateLimiter, optional
+    :return: generator of drift id and the detection status, as each detection completes
+    :rtype: Iterator[Tuple[str, Dict[str, Any]]]
+    """
+    if limiter is None:
+        limiter = RateLimiter(DRIFT_REQUEST_RATE)
+    delay, max_attempts = cloudformation._get_waiter_config()
+    pending = list(drift_ids)
+    interval = DRIFT_POLL_MIN
+    attempts = 0
+
+    def _status(drift_id: str) -> Dict[str, Any]:
+        return call_with_retry(
+            cloudformation.client.describe_stack_drift_detection_status,
+            limiter,
+            StackDriftDetectionId=drift_id,
+        )
+
+    while pending:
+        attempts += 1
+        in_progress: List[str] = []
+        for drift_id, future in run_bounded(_status, pending, DRIFT_WORKERS):
+            try:
+                response = future.result()
+            except (ClientError, BotoCoreError) as e:
+                response = {
+                    "DetectionStatus": "DETECTION_FAILED",
+                    "DetectionStatusReason": str(e),
+                }
+            if response.get("DetectionStatus") == "DETECTION_IN_PROGRESS":
+                in_progress.append(drift_id)
+                continue
+            yield drift_id, response
+        if in_progress and len(in_progress) == len(pending):
+            interval = min(interval * 2, max(delay, DRIFT_POLL_MIN))
+        else:
+            interval = DRIFT_POLL_MIN
+        pending = in_progress
+        if pending and attempts < max_attempts:
+            time.sleep(interval)
+        else:
+            break
+
+
+def scan_drift(cloudformation: Cloudformation, stack_names: List[str]) -> None:
+    """Detect drift on the stacks concurrently and report the drifted resources.
+
+    Detections are started at once and polled together, the result of each
+    stack is printed as its detection completes, followed by the drifted
+    resources of all drifted stacks.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param stack_names: name of the stacks to detect drift
+    :type stack_names: List[str]
+    :raises CloudformationError: when drift detection failed on any of the stacks
+    """
+    limiter = RateLimiter(DRIFT_REQUEST_RATE)
+    detections: Dict[str, str] = {}
+    failed: List[Tuple[str, str]] = []
+
+    def _detect(stack_name: str) -> str:
+        response = call_with_retry(
+            cloudformation.client.detect_stack_drift, limiter, StackName=stack_name
+        )
+        return response["StackDriftDetectionId"]
+
+    for stack_name, future in run_bounded(_detect, stack_names, DRIFT_WORKERS):
+        try:
+            detections[future.result()] = stack_name
+        except (ClientError, BotoCoreError) as e:
+            failed.append((stack_name, str(e)))
+    print("Drift detection initiated on %s stacks" % len(detections))
+
+    drifted: List[str] = []
+    for drift_id, response in poll_drift_detections(
+        cloudformation, list(detections), limiter
+    ):
+        stack_name = detections.pop(drift_id)
+        drift_status = response.get("StackDriftStatus")
+        if drift_status == "DRIFTED":
+            drifted.append(stack_name)
+        if response.get("DetectionStatus") != "DETECTION_COMPLETE":
+            failed.append(
+                (
+                    stack_name,
+                    response.get(
+                        "DetectionStatusReason", response.get("DetectionStatus")
+                    ),
+                )
+            )
+            continue
+        print(
+            "%s: %s (%s drifted resources)"
+            % (stack_name, drift_status, response.get("DriftedStackResourceCount", 0))
+        )
+    failed.extend(
+        (stack_name, "Max attempts exceeded") for stack_name in detections.values()
+    )
+
+    if drifted:
+        print(80 * "-")
+        reports: Dict[str, List[Dict[str, Any]]] = {}
+        for stack_name, future in run_bounded(
+            get_resource_drifts,
+            drifted,
+            DRIFT_WORKERS,
+            cloudformation=cloudformation,
+            limiter=limiter,
+        ):
+            try:
+                reports[stack_name] = future.result()
+            except (ClientError, BotoCoreError) as e:
+                failed.append((stack_name, str(e)))
+        for stack_name in sorted(reports):
+            for drift in reports[stack_name]:
+                print(
+                    "%s %s %s %s"
+                    % (
+                        stack_name,
+                        drift.get("LogicalResourceId"),
+                        drift.get("ResourceType"),
+                        drift.get("StackResourceDriftStatus"),
+                    )
+                )
+                for difference in drift.get("PropertyDifferences", []):
+                    print(
+                        "    %s %s: %s -> %s"
+                        % (
+                            difference.get("DifferenceType"),
+                            difference.get("PropertyPath"),
+                            difference.get("ExpectedValue"),
+                            difference.get("ActualValue"),
+                        )
+                    )
+
+    if failed:
+        for stack_name, reason in failed:
+            print("failed: %s (%s)" % (stack_name, reason))
+        raise CloudformationError("Drift detection failed on %s stacks" % len(failed))
+
+
+def get_resource_drifts(
+    stack_name: str,
+    cloudformation: Cloudformation,
+    limiter: Optional[RateLimiter] = None,
+) -> List[Dict[str, Any]]:
+    """Return the drifted resources of the stack from the last drift detection.
+
+    :param stack_name: name of the stack
+    :type stack_name: str
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param limiter: rate limiter of the drift api calls
+    :type limiter: RateLimiter, optional
+    :return: list of modified or deleted resource drifts
+    :rtype: List[Dict[str, Any]]
+    """
+    drifts: List[Dict[str, Any]] = []
+    next_token: Optional[str] = None
+    while True:
+        kwargs: Dict[str, Any] = {
+            "StackName": stack_name,
+            "StackResourceDriftStatusFilters": ["MODIFIED", "DELETED"],
+        }
+        if next_token:
+            kwargs["NextToken"] = next_token
+        response = call_with_retry(
+            cloudformation.client.describe_stack_resource_drifts, limiter, **kwargs
+        )
+        drifts.extend(response.get("StackResourceDrifts", []))
+        next_token = response.get("NextToken")
+        if not next_token:
+            return drifts
@@ -0,0 +1,221 @@
+"""Contains ExportIndex helper class.
+
+Used to find the cross stack dependencies created by stack exports and imports.
+"""
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from botocore.exceptions import ClientError
+
+from fzfaws.cloudformation import Cloudformation
+from fzfaws.utils import Spinner
+from fzfaws.utils.exceptions import CloudformationError
+from fzfaws.utils.throttle import RateLimiter, call_with_retry, run_bounded
+
+# number of concurrent list_imports calls and the maximum calls per second
+EXPORT_WORKERS = 5
+EXPORT_REQUEST_RATE = 5
+
+_export_indexes: Dict[Tuple[Optional[str], Optional[str]], "ExportIndex"] = {}
+_export_indexes_lock = threading.Lock()
+
+
+def get_export_index(cloudformation: Cloudformation) -> "ExportIndex":
+    """Return the export index shared by the profile and region.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :return: export index of the profile and region, call load before use
+    :rtype: ExportIndex
+    """
+    with _export_indexes_lock:
+        key = (cloudformation.profile, cloudformation.region)
+        if key not in _export_indexes:
+            _export_indexes[key] = ExportIndex(cloudformation)
+        return _export_indexes[key]
+
+
+class ExportIndex:
+    """Index of the stack exports and the stacks importing them.
+
+    Exports are listed with list_exports and the imports of each
+    export are listed concurrently, building a stack to stack dependency graph.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    """
+
+    def __init__(self, cloudformation: Cloudformation) -> None:
+        """Construct the instance."""
+        self.cloudformation = cloudformation
+        self.exports: Dict[str, Dict[str, str]] = {}
+        self.imports: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.loaded: bool = False
+
+    def load(self, no_progress: bool = False, refresh: bool = False) -> None:
+        """List the exports and their imports, skipped if already loaded.
+
+        :param no_progress: don't display progress bar
+        :type no_progress: bool, optional
+        :param refresh: list again even if already loaded
+        :type refresh: bool, optional
+        """
+        if self.loaded and not refresh:
+            return
+        with Spinner.spin(
+            message="Fetching stack exports ...", no_progress=no_progress
+        ):
+            exports = self._list_exports()
+            imports = self._list_all_imports(list(exports))
+
+        self.exports, self.imports = exports, imports
+        self.dependents, self.dependencies = {}, {}
+        for export_name, stack_names in imports.items():
+            exporting_stack = exports[export_name]["ExportingStackName"]
+            for stack_name in stack_names:
+                self.dependents.setdefault(exporting_stack, set()).add(stack_name)
+                self.dependencies.setdefault(stack_name, set()).add(exporting_stack)
+        self.loaded = True
+
+    def load_stack_imports(
+        self, stack_id: str, no_progress: bool = False
+    ) -> Dict[str, List[str]]:
+        """Return the exports of the stack imported by other stacks.
+
+        Only the imports of the exports of the stack are listed, the rest
+        of the index is not loaded. Use the loaded index if available.
+
+        :param stack_id: StackId of the stack
+        :type stack_id: str
+        :param no_progress: don't display progress bar
+        :type no_progress: bool, optional
+        :return: dict of export name and names of the importing stacks
+        :rtype: Dict[str, List[str]]
+        """
+        with Spinner.spin(
+            message="Fetching stack exports ...", no_progress=no_progress
+        ):
+            exports = self.exports if self.loaded else self._list_exports()
+            export_names = [
+                export_name
+                for export_name, export in exports.items()
+                if export["ExportingStackId"] == stack_id
+            ]
+            if self.loaded:
+                imports = {name: self.imports.get(name, []) for name in export_names}
+            else:
+                imports = self._list_all_imports(export_names)
+        return {
+            export_name: sorted(imports[export_name])
+            for export_name in sorted(export_names)
+            if imports[export_name]
+        }
+
+    def _list_exports(self) -> Dict[str, Dict[str, str]]:
+        """List all exports in one paginated pass.
+
+        :return: dict of export name and the export
+        :rtype: Dict[str, Dict[str, str]]
+        """
+        exports: Dict[str, Dict[str, str]] = {}
+        paginator = self.cloudformation.client.get_paginator("list_exports")
+        for page in paginator.paginate():
+            for export in page.get("Exports", []):
+                exports[export["Name"]] = {
+                    "Name": export["Name"],
+                    "Value": export.get("Value", ""),
+                    "ExportingStackId": export["ExportingStackId"],
+                    "ExportingStackName": export["ExportingStackId"].split("/")[1],
+                }
+        return exports
+
+    def _list_all_imports(self, export_names: List[str]) -> Dict[str, List[str]]:
+        """List the importing stacks of the exports concurrently.
+
+        :param export_names: names of the exports
+        :type export_names: List[str]
+        :return: dict of export name and names of the importing stacks
+        :rtype: Dict[str, List[str]]
+        """
+        imports: Dict[str, List[str]] = {}
+        limiter = RateLimiter(EXPORT_REQUEST_RATE)
+        for export_name, future in run_bounded(
+            self._list_imports, export_names, EXPORT_WORKERS, limiter=limiter
+        ):
+            imports[export_name] = future.result()
+        return imports
+
+    def _list_imports(
+        self, export_name: str, limiter: Optional[RateLimiter] = None
+    ) -> List[str]:
+        """List names of the stacks importing the export.
+
+        :param export_name: name of the export
+        :type export_name: str
+        :param limiter: rate limiter of the list_imports calls
+        :type limiter: RateLimiter, optional
+        :return: names of the importing stacks
+        :rtype: List[str]
+        """
+        stack_names: List[str] = []
+        kwargs: Dict[str, str] = {"ExportName": export_name}
+        while True:
+            try:
+                response = call_with_retry(
+                    self.cloudformation.client.list_imports, limiter, **kwargs
+                )
+            except ClientError as e:
+                # list_imports raise ValidationError for exports not imported
+                if "is not imported" in e.response.get("Error", {}).get("Message", ""):
+                    return stack_names
+                raise
+            stack_names.extend(response.get("Imports", []))
+            if not response.get("NextToken"):
+                return stack_names
+            kwargs["NextToken"] = response["NextToken"]
+
+    def get_stack_imports(self, stack_name: str) -> Dict[str, List[str]]:
+        """Return the exports of the stack imported by other stacks.
+
+        :param stack_name: name of the stack
+        :type stack_name: str
+        :return: dict of export name and names of the importing stacks
+        :rtype: Dict[str, List[str]]
+        """
+        return {
+            export_name: sorted(self.imports[export_name])
+            for export_name, export in sorted(self.exports.items())
+            if export["ExportingStackName"] == stack_name
+            and self.imports.get(export_name)
+        }
+
+    def get_delete_order(self, stack_names: List[str]) -> List[List[str]]:
+        """Group the stacks into levels to delete in order.
+
+        Stacks in a level don't depend on each other and can be deleted
+        concurrently, a stack is only in a level after all of its selected
+        dependents, dependents outside of the stacks are ignored.
+
+        :param stack_names: names of the stacks to delete
+        :type stack_names: List[str]
+        :raises CloudformationError: when the stacks import each other
+        :return: list of levels, each level is a sorted list of stack names
+        :rtype: List[List[str]]
+        """
+        remaining = set(stack_names)
+        levels: List[List[str]] = []
+        while remaining:
+            level = sorted(
+                stack_name
+                for stack_name in remaining
+                if not self.dependents.get(stack_name, set()) & remaining
+            )
+            if not level:
+                raise CloudformationError(
+                    "Circular imports between stacks %s" % ", ".join(sorted(remaining))
+                )
+            levels.append(level)
+            remaining.difference_update(level)
+        return levels
@@ -2,11 +2,60 @@
 
 Used to process parameter in template for cloudformation update/changeset/create stack.
 """
-from typing import Any, Dict, List, Optional, Union
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from fzfaws.cloudformation import Cloudformation
+from fzfaws.cloudformation.helper.exportindex import ExportIndex, get_export_index
 from fzfaws.ec2 import EC2
 from fzfaws.route53 import Route53
-from fzfaws.utils import Pyfzf, Spinner, check_dict_value_in_list, search_dict_in_list
+from fzfaws.utils import (
+    Pyfzf,
+    Spinner,
+    check_dict_value_in_list,
+    get_name_tag,
+    search_dict_in_list,
+)
+
+# input of a normal parameter to select the value from the stack exports
+IMPORT_VALUE_INPUT = "!ImportValue"
+
+# key and columns displayed in fzf for each aws specific parameter type
+PARAM_CHOICE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "AWS::EC2::AvailabilityZone::Name": ("ZoneName",),
+    "AWS::EC2::Instance::Id": ("InstanceId", "Name"),
+    "AWS::EC2::KeyPair::KeyName": ("KeyName",),
+    "AWS::EC2::SecurityGroup::GroupName": ("GroupName", "Name"),
+    "AWS::EC2::SecurityGroup::Id": ("GroupId", "GroupName", "Name"),
+    "AWS::EC2::Subnet::Id": ("SubnetId", "AvailabilityZone", "CidrBlock", "Name"),
+    "AWS::EC2::Volume::Id": ("VolumeId", "Name"),
+    "AWS::EC2::VPC::Id": ("VpcId", "IsDefault", "CidrBlock", "Name"),
+    "AWS::Route53::HostedZone::Id": ("Id", "Name"),
+}
+
+# paginated ec2 operation and its result key for each parameter type
+EC2_CHOICE_OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "AWS::EC2::SecurityGroup::GroupName": (
+        "describe_security_groups",
+        "SecurityGroups",
+    ),
+    "AWS::EC2::SecurityGroup::Id": ("describe_security_groups", "SecurityGroups"),
+    "AWS::EC2::Subnet::Id": ("describe_subnets", "Subnets"),
+    "AWS::EC2::Volume::Id": ("describe_volumes", "Volumes"),
+    "AWS::EC2::VPC::Id": ("describe_vpcs", "Vpcs"),
+}
+
+# parameter types not bound to a region, their choices are shared by all regions
+GLOBAL_PARAM_TYPES = {"AWS::Route53::HostedZone::Id"}
+
+# number of parameter choices fetched concurrently in the background
+PREFETCH_WORKERS = 5
+
+# fetched choices of each profile, region and parameter type, kept for the session
+_param_choices: Dict[Tuple[Optional[str], Optional[str], str], Future] = {}
+_param_choices_lock = threading.Lock()
+_prefetch_slots = threading.BoundedSemaphore(PREFETCH_WORKERS)
 
 
 class ParamProcessor:
@@ -42,6 +91,7 @@ class ParamProcessor:
         self.params: Dict[str, Any] = params
         self.original_params: List[Dict[str, Any]] = original_params
         self.processed_params: List[Dict[str, Any]] = []
+        self._export_index: Optional[ExportIndex] = None
         self._aws_specific_param: List[str] = [
             "AWS::EC2::AvailabilityZone::Name",
             "AWS::EC2::Instance::Id",
@@ -70,7 +120,9 @@ class ParamProcessor:
         Loop through the keys in the loaded dict object of params and leverage
         self._get_user_input to get user input through fzf or cmd input
         """
+        self.prefetch()
         print("Enter parameters specified in your template below")
+        print("Enter %s to select a value from the stack exports" % IMPORT_VALUE_INPUT)
 
         for parameter_key in self.params:
             print(80 * "-")
@@ -210,6 +262,11 @@ class ParamProcessor:
                     user_input = input("%s(Default: %s): " % (parameter_key, default))
                 elif value_type == "Original":
                     user_input = input("%s(Original: %s): " % (parameter_key, default))
+                if user_input == IMPORT_VALUE_INPUT:
+                    user_input = self._get_export_value(
+                        param_header
+                        + self._print_parameter_key(parameter_key, value_type, default)
+                    )
         if not user_input and default:
             return default
         elif user_input == "''":
@@ -232,6 +289,31 @@ class ParamProcessor:
         else:
             return "choose a value for %s" % parameter_key
 
+    def _get_export_value(self, param_header: str) -> str:
+        """Use fzf to select a value from the exports of the stacks.
+
+        :param param_header: information about current parameter
+        :type param_header: str
+        :return: value of the selected export
+        :rtype: str
+        """
+        if not self._export_index:
+            self._export_index = get_export_index(
+                Cloudformation(self.ec2.profile, self.ec2.region)
+            )
+        self._export_index.load()
+        exports = self._export_index.exports
+        fzf = Pyfzf()
+        fzf.process_list(
+            [exports[name] for name in sorted(exports)],
+            "Name",
+            "Value",
+            "ExportingStackName",
+            empty_allow=True,
+        )
+        export_name = fzf.execute_fzf(empty_allow=True, header=param_header)
+        return exports[export_name]["Value"] if export_name else ""
+
     def _get_selected_param_value(self, type_name: str, param_header: str) -> str:
         """Use fzf to display aws specific parameters.
 
@@ -243,34 +325,12 @@ class ParamProcessor:
         :rtype: str
         """
         fzf = Pyfzf()
-
-        if type_name == "AWS::EC2::KeyPair::KeyName":
-            with Spinner.spin(message="Fetching KeyPair ..."):
-                response = self.ec2.client.describe_key_pairs()
-                response_list = response["KeyPairs"]
-            fzf.process_list(response_list, "KeyName", empty_allow=True)
-        elif type_name == "AWS::EC2::SecurityGroup::Id":
-            return str(self.ec2.get_security_groups(header=param_header))
-        elif type_name == "AWS::EC2::AvailabilityZone::Name":
-            with Spinner.spin(message="Fetching AvailabilityZones ..."):
-                response = self.ec2.client.describe_availability_zones()
-                response_list = response.get("AvailabilityZones", [])
-            fzf.process_list(response_list, "ZoneName", empty_allow=True)
-        elif type_name == "AWS::EC2::Instance::Id":
-            return str(self.ec2.get_instance_id(header=param_header))
-        elif type_name == "AWS::EC2::SecurityGroup::GroupName":
-            return str(
-                self.ec2.get_security_groups(return_attr="name", header=param_header)
+        if type_name in PARAM_CHOICE_COLUMNS:
+            fzf.process_list(
+                self._get_choices(type_name),
+                *PARAM_CHOICE_COLUMNS[type_name],
+                empty_allow=True
             )
-        elif type_name == "AWS::EC2::Subnet::Id":
-            return str(self.ec2.get_subnet_id(header=param_header))
-        elif type_name == "AWS::EC2::Volume::Id":
-            return str(self.ec2.get_volume_id(header=param_header))
-        elif type_name == "AWS::EC2::VPC::Id":
-            return str(self.ec2.get_vpc_id(header=param_header))
-        elif type_name == "AWS::Route53::HostedZone::Id":
-            self.route53.set_zone_id()
-            return self.route53.zone_ids[0]
         return str(fzf.execute_fzf(empty_allow=True, header=param_header))
 
     def _get_list_param_value(self, type_name: str, param_header: str) -> List[str]:
@@ -287,35 +347,140 @@ class ParamProcessor:
         :rtype: List[str]
         """
         fzf = Pyfzf()
-
-        if type_name == "List<AWS::EC2::AvailabilityZone::Name>":
-            with Spinner.spin(message="Fetching AvailabilityZones ..."):
-                response = self.ec2.client.describe_availability_zones()
-                response_list = response["AvailabilityZones"]
-            fzf.process_list(response_list, "ZoneName", empty_allow=True)
-        elif type_name == "List<AWS::EC2::Instance::Id>":
-            return list(
-                self.ec2.get_instance_id(multi_select=True, header=param_header)
-            )
-        elif type_name == "List<AWS::EC2::SecurityGroup::GroupName>":
-            return list(
-                self.ec2.get_security_groups(
-                    multi_select=True, return_attr="name", header=param_header
-                )
-            )
-        elif type_name == "List<AWS::EC2::SecurityGroup::Id>":
-            return list(
-                self.ec2.get_security_groups(multi_select=True, header=param_header)
+        type_name = get_base_type(type_name)
+        if type_name in PARAM_CHOICE_COLUMNS:
+            fzf.process_list(
+                self._get_choices(type_name),
+                *PARAM_CHOICE_COLUMNS[type_name],
+                empty_allow=True
             )
-        elif type_name == "List<AWS::EC2::Subnet::Id>":
-            return list(self.ec2.get_subnet_id(multi_select=True, header=param_header))
-        elif type_name == "List<AWS::EC2::Volume::Id>":
-            return list(self.ec2.get_volume_id(multi_select=True, header=param_header))
-        elif type_name == "List<AWS::EC2::VPC::Id>":
-            return list(self.ec2.get_vpc_id(multi_select=True, header=param_header))
-        elif type_name == "List<AWS::Route53::HostedZone::Id>":
-            self.route53.set_zone_id(multi_select=True)
-            return self.route53.zone_ids
         return list(
             fzf.execute_fzf(multi_select=True, empty_allow=True, header=param_header)
         )
+
+    def prefetch(self) -> None:
+        """Fetch the choices of all aws specific parameters in the background.
+
+        Choices of each parameter type are fetched once concurrently while the
+        user enters the earlier parameters.
+        """
+        for parameter in self.params.values():
+            type_name = get_base_type(parameter.get("Type", ""))
+            if type_name in PARAM_CHOICE_COLUMNS and "AllowedValues" not in parameter:
+                self._get_choice_future(type_name)
+
+    def _get_choices(self, type_name: str) -> List[Dict[str, Any]]:
+        """Return the choices of the parameter type, wait for the fetch if needed.
+
+        :param type_name: aws specific parameter type, without List<>
+        :type type_name: str
+        :return: list of choices to display in fzf
+        :rtype: List[Dict[str, Any]]
+        """
+        future = self._get_choice_future(type_name)
+        try:
+            if future.done():
+                return future.result()
+            with Spinner.spin(message="Fetching %s ..." % type_name):
+                return future.result()
+        except Exception:
+            # fetch again next time instead of memoising the failure
+            with _param_choices_lock:
+                _param_choices.pop(self._get_choice_key(type_name), None)
+            raise
+
+    def _get_choice_key(
+        self, type_name: str
+    ) -> Tuple[Optional[str], Optional[str], str]:
+        """Return the key of the parameter type in the fetched choices.
+
+        :param type_name: aws specific parameter type, without List<>
+        :type type_name: str
+        :return: profile, region and the parameter type, region is None for global types
+        :rtype: Tuple[Optional[str], Optional[str], str]
+        """
+        if type_name in GLOBAL_PARAM_TYPES:
+            return self.route53.profile, None, type_name
+        return self.ec2.profile, self.ec2.region, type_name
+
+    def _get_choice_future(self, type_name: str) -> Future:
+        """Return the memoised fetch of the parameter type, start it if needed.
+
+        Fetches run on daemon threads, a fetch still running never blocks
+        the exit once the stack operation is done.
+
+        :param type_name: aws specific parameter type, without List<>
+        :type type_name: str
+        :return: future of the list of choices
+        :rtype: Future
+        """
+        key = self._get_choice_key(type_name)
+        with _param_choices_lock:
+            if key in _param_choices:
+                return _param_choices[key]
+            future: Future = Future()
+            _param_choices[key] = future
+
+        def _fetch() -> None:
+            with _prefetch_slots:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    future.set_result(self._fetch_choices(type_name))
+                except Exception as e:
+                    future.set_exception(e)
+
+        threading.Thread(target=_fetch, daemon=True).start()
+        return future
+
+    def _fetch_choices(self, type_name: str) -> List[Dict[str, Any]]:
+        """Fetch the choices of the parameter type.
+
+        :param type_name: aws specific parameter type, without List<>
+        :type type_name: str
+        :return: list of choices to display in fzf
+        :rtype: List[Dict[str, Any]]
+        """
+        if type_name == "AWS::EC2::KeyPair::KeyName":
+            return self.ec2.client.describe_key_pairs().get("KeyPairs", [])
+        elif type_name == "AWS::EC2::AvailabilityZone::Name":
+            return self.ec2.client.describe_availability_zones().get(
+                "AvailabilityZones", []
+            )
+        elif type_name == "AWS::Route53::HostedZone::Id":
+            paginator = self.route53.client.get_paginator("list_hosted_zones")
+            return [
+                hosted_zone
+                for result in paginator.paginate()
+                for hosted_zone in self.route53._process_hosted_zone(
+                    result.get("HostedZones", [])
+                )
+            ]
+        elif type_name == "AWS::EC2::Instance::Id":
+            paginator = self.ec2.client.get_paginator("describe_instances")
+            return [
+                {"InstanceId": instance["InstanceId"], "Name": get_name_tag(instance)}
+                for result in paginator.paginate()
+                for reservation in result.get("Reservations", [])
+                for instance in reservation.get("Instances", [])
+            ]
+        operation_name, result_key = EC2_CHOICE_OPERATIONS[type_name]
+        paginator = self.ec2.client.get_paginator(operation_name)
+        return [
+            {**item, "Name": get_name_tag(item)}
+            for result in paginator.paginate()
+            for item in result.get(result_key, [])
+        ]
+
+
+def get_base_type(type_name: str) -> str:
+    """Return the item type of the list parameter type.
+
+    :param type_name: parameter type, e.g. List<AWS::EC2::Subnet::Id>
+    :type type_name: str
+    :return: type without List<>, e.g. AWS::EC2::Subnet::Id
+    :rtype: str
+    """
+    if type_name.startswith("List<") and type_name.endswith(">"):
+        return type_name[5:-1]
+    return type_name
@@ -0,0 +1,405 @@
+"""Contains TemplateStage helper class.
+
+Used to upload local templates and their local artifacts to s3
+under content addressed keys, similar to aws cloudformation package.
+"""
+import copy
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from typing import Any, Dict, List, Set, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.cloudformation.helper.file_validation import is_json
+from fzfaws.s3 import S3
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import get_bucket_limiter
+from fzfaws.utils import FileLoader
+from fzfaws.utils.exceptions import CloudformationError
+from fzfaws.utils.throttle import call_with_retry, raise_failures, run_bounded
+
+TEMPLATE_BUCKET_ENV = "FZFAWS_CLOUDFORMATION_TEMPLATE_BUCKET"
+
+# maximum size of the template body passed inline
+TEMPLATE_BODY_LIMIT = 51200
+
+# how the s3 location of the artifact is written back to the template
+ARTIFACT_TEMPLATE = "template"
+ARTIFACT_S3_URI = "s3uri"
+ARTIFACT_CODE = "code"
+ARTIFACT_LOCATION = "location"
+
+# resource properties which could reference a local artifact
+ARTIFACT_PROPERTIES: Dict[str, Dict[str, str]] = {
+    "AWS::CloudFormation::Stack": {"TemplateURL": ARTIFACT_TEMPLATE},
+    "AWS::Serverless::Application": {"Location": ARTIFACT_TEMPLATE},
+    "AWS::Serverless::Function": {"CodeUri": ARTIFACT_S3_URI},
+    "AWS::Serverless::LayerVersion": {"ContentUri": ARTIFACT_S3_URI},
+    "AWS::Serverless::Api": {"DefinitionUri": ARTIFACT_S3_URI},
+    "AWS::Serverless::HttpApi": {"DefinitionUri": ARTIFACT_S3_URI},
+    "AWS::Serverless::StateMachine": {"DefinitionUri": ARTIFACT_S3_URI},
+    "AWS::Lambda::Function": {"Code": ARTIFACT_CODE},
+    "AWS::Lambda::LayerVersion": {"Content": ARTIFACT_CODE},
+    "AWS::ApiGateway::RestApi": {"BodyS3Location": ARTIFACT_LOCATION},
+}
+
+# fixed timestamp of the zip entries, same content always produce the same zip
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_template_stages: Dict[Tuple[Any, Any], "TemplateStage"] = {}
+_template_stages_lock = threading.Lock()
+
+
+def get_template_stage(
+    profile: Union[str, bool] = None, region: Union[str, bool] = None
+) -> "TemplateStage":
+    """Return the template stage shared by the profile and region.
+
+    Sharing the instance avoid selecting the bucket and checking
+    the same keys again when staging the template for multiple stacks.
+
+    :param profile: profile to use for this operation
+    :type profile: Union[bool, str], optional
+    :param region: region to use for this operation
+    :type region: Union[bool, str], optional
+    :return: template stage of the profile and region
+    :rtype: TemplateStage
+    """
+    with _template_stages_lock:
+        key = (profile, region)
+        if key not in _template_stages:
+            _template_stages[key] = TemplateStage(profile, region)
+        return _template_stages[key]
+
+
+class TemplateStage:
+    """Upload local templates and their artifacts to s3.
+
+    Each object is uploaded under the sha256 digest of its content and
+    skipped if the key already exists, so unchanged templates and artifacts
+    are only uploaded once. Local paths of the artifact properties are
+    resolved relative to the template and replaced with the s3 location.
+
+    :param profile: profile to use for this operation
+    :type profile: Union[bool, str], optional
+    :param region: region to use for this operation
+    :type region: Union[bool, str], optional
+    :param bucket: bucket/path to stage the templates, default to template_bucket in config
+    :type bucket: str, optional
+    """
+
+    def __init__(
+        self,
+        profile: Union[str, bool] = None,
+        region: Union[str, bool] = None,
+        bucket: str = None,
+    ) -> None:
+        """Construct the instance and select the bucket if not configured."""
+        self.s3 = S3(profile, region)
+        bucket = bucket or os.getenv(TEMPLATE_BUCKET_ENV, "")
+        if bucket and "/" not in bucket:
+            bucket = "%s/" % bucket
+        self.s3.set_bucket_and_path(bucket)
+        if not self.s3.bucket_name:
+            self.s3.set_s3_bucket(header="select a bucket to stage the templates")
+        self.prefix: str = self.s3.path_list[0]
+        if self.prefix and not self.prefix.endswith("/"):
+            self.prefix = "%s/" % self.prefix
+        self.uploads: Dict[str, bytes] = {}
+        self.uploaded: Set[str] = set()
+        self.templates: Dict[str, str] = {}
+        self._packaging: Set[str] = set()
+
+    def stage(self, local_path: str) -> str:
+        """Package the template and upload it with its artifacts.
+
+        :param local_path: local template path
+        :type local_path: str
+        :raises CloudformationError: when any of the objects failed to upload
+        :return: s3 key of the packaged template
+        :rtype: str
+        """
+        key = self.add_template(local_path)
+        self.upload()
+        return key
+
+    def get_template_url(self, key: str) -> str:
+        """Return the url of the staged template to use as TemplateURL.
+
+        :param key: s3 key of the template
+        :type key: str
+        :return: url of the template
+        :rtype: str
+        """
+        return self.s3.get_object_url(object_key=key)
+
+    def add_template(self, local_path: str) -> str:
+        """Package the template and add it to the pending uploads.
+
+        Local artifacts referenced by the template are added as well,
+        nested templates are packaged recursively.
+
+        :param local_path: local template path
+        :type local_path: str
+        :raises CloudformationError: when the nested templates reference each other
+        :return: s3 key of the packaged template
+        :rtype: str
+        """
+        local_path = os.path.abspath(local_path)
+        if local_path in self.templates:
+            return self.templates[local_path]
+        if local_path in self._packaging:
+            raise CloudformationError(
+                "Template %s is nested in itself" % os.path.basename(local_path)
+            )
+        self._packaging.add(local_path)
+        try:
+            with open(local_path, "r") as file:
+                body = self.package(local_path, file.read())
+        finally:
+            self._packaging.discard(local_path)
+        key = self.add_upload(body.encode("utf-8"), os.path.splitext(local_path)[1])
+        self.templates[local_path] = key
+        return key
+
+    def package(self, local_path: str, body: str) -> str:
+        """Replace the local artifact references of the template.
+
+        Json templates are dumped again, yaml templates are replaced line by
+        line to preserve the formatting and comments.
+
+        :param local_path: local template path, used to resolve relative paths
+        :type local_path: str
+        :param body: template body
+        :type body: str
+        :raises CloudformationError: when the local artifact doesn't exist
+        :return: template body referencing the s3 locations
+        :rtype: str
+        """
+        fileloader = FileLoader(body=body)
+        if is_json(local_path):
+            template = fileloader.process_json_body()
+        else:
+            template = fileloader.process_yaml_body()
+        if not isinstance(template, dict):
+            return body
+        # parsed templates are cached and shared, don't modify in place
+        template = copy.deepcopy(template)
+
+        base_dir = os.path.dirname(os.path.abspath(local_path))
+        replacements: List[Tuple[str, str, Any]] = []
+        for resource in (template.get("Resources") or {}).values():
+            if not isinstance(resource, dict):
+                continue
+            properties = resource.get("Properties") or {}
+            for property_name, artifact_type in ARTIFACT_PROPERTIES.get(
+                resource.get("Type"), {}
+            ).items():
+                value = properties.get(property_name)
+                if not is_local_artifact(value):
+                    continue
+                artifact_path = os.path.join(base_dir, value)
+                if not os.path.exists(artifact_path):
+                    raise CloudformationError(
+                        "Artifact %s of %s not found" % (value, property_name)
+                    )
+                location = self.add_artifact(artifact_path, artifact_type)
+                properties[property_name] = location
+                replacements.append((property_name, value, location))
+
+        if not replacements:
+            return body
+        if is_json(local_path):
+            return json.dumps(template, indent=4)
+        replaced: Set[Tuple[str, str]] = set()
+        for property_name, value, location in replacements:
+            # same artifact referenced by multiple resources is replaced at once
+            if (property_name, value) in replaced:
+                continue
+            body = replace_yaml_property(body, property_name, value, location)
+            replaced.add((property_name, value))
+        return body
+
+    def add_artifact(self, artifact_path: str, artifact_type: str) -> Any:
+        """Add the local artifact to the pending uploads.
+
+        Directories are zipped, files are uploaded as is.
+
+        :param artifact_path: local path of the artifact
+        :type artifact_path: str
+        :param artifact_type: how the location is referenced, one of the ARTIFACT types
+        :type artifact_type: str
+        :return: s3 location of the artifact in the format of the artifact type
+        :rtype: Any
+        """
+        if artifact_type == ARTIFACT_TEMPLATE:
+            return self.get_template_url(self.add_template(artifact_path))
+        if os.path.isdir(artifact_path):
+            key = self.add_upload(zip_directory(artifact_path), ".zip")
+        else:
+            with open(artifact_path, "rb") as file:
+                key = self.add_upload(file.read(), os.path.splitext(artifact_path)[1])
+        if artifact_type == ARTIFACT_CODE:
+            return {"S3Bucket": self.s3.bucket_name, "S3Key": key}
+        if artifact_type == ARTIFACT_LOCATION:
+            return {"Bucket": self.s3.bucket_name, "Key": key}
+        return "s3://%s/%s" % (self.s3.bucket_name, key)
+
+    def add_upload(self, data: bytes, extension: str = "") -> str:
+        """Add the data to the pending uploads under its content addressed key.
+
+        :param data: content to upload
+        :type data: bytes
+        :param extension: file extension appended to the key, e.g. .yaml
+        :type extension: str, optional
+        :return: s3 key of the data
+        :rtype: str
+        """
+        key = "%s%s%s" % (self.prefix, hashlib.sha256(data).hexdigest(), extension)
+        self.uploads[key] = data
+        return key
+
+    def upload(self) -> None:
+        """Upload the pending objects concurrently, skip keys already exist.
+
+        Requests to the bucket are rate limited and throttled calls are retried.
+
+        :raises CloudformationError: when any of the objects failed to upload
+        """
+        client = self.s3.get_client()
+        limiter = get_bucket_limiter(self.s3.bucket_name)
+        pending = sorted(key for key in self.uploads if key not in self.uploaded)
+
+        def _upload(key: str) -> bool:
+            try:
+                call_with_retry(
+                    client.head_object, limiter, Bucket=self.s3.bucket_name, Key=key
+                )
+                return False
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in {
+                    "404",
+                    "NoSuchKey",
+                    "NotFound",
+                }:
+                    raise
+            call_with_retry(
+                client.put_object,
+                limiter,
+                Bucket=self.s3.bucket_name,
+                Key=key,
+                Body=self.uploads[key],
+            )
+            return True
+
+        failed: List[Tuple[str, str]] = []
+        for key, future in run_bounded(
+            _upload, pending, S3TransferWrapper().max_workers
+        ):
+            try:
+                uploaded = future.result()
+            except (ClientError, BotoCoreError) as e:
+                failed.append(("s3://%s/%s" % (self.s3.bucket_name, key), str(e)))
+                continue
+            print(
+                "%s: s3://%s/%s"
+                % ("upload" if uploaded else "exists", self.s3.bucket_name, key)
+            )
+            self.uploaded.add(key)
+
+        raise_failures(failed, CloudformationError, "%s artifacts failed to upload")
+
+
+def is_local_artifact(value: Any) -> bool:
+    """Check if the property value is a local path.
+
+    :param value: value of the artifact property
+    :type value: Any
+    :return: True if the value is a path rather than a s3 location
+    :rtype: bool
+    """
+    if not isinstance(value, str) or not value:
+        return False
+    return not re.match(r"^(s3|https?)://", value)
+
+
+def zip_directory(path: str) -> bytes:
+    """Zip the directory with fixed timestamps and sorted entries.
+
+    :param path: local directory
+    :type path: str
+    :return: content of the zip file
+    :rtype: bytes
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                entry = zipfile.ZipInfo(
+                    os.path.relpath(file_path, path).replace(os.sep, "/"),
+                    date_time=ZIP_DATE_TIME,
+                )
+                entry.compress_type = zipfile.ZIP_DEFLATED
+                entry.external_attr = (os.stat(file_path).st_mode & 0o777) << 16
+                with open(file_path, "rb") as file:
+                    archive.writestr(entry, file.read())
+    return buffer.getvalue()
+
+
+def replace_yaml_property(
+    body: str, property_name: str, value: str, location: Any
+) -> str:
+    """Replace the value of the property in the yaml template body.
+
+    :param body: yaml template body
+    :type body: str
+    :param property_name: name of the property, e.g. CodeUri
+    :type property_name: str
+    :param value: current value of the property
+    :type value: str
+    :param location: new value, dict is written in flow style
+    :type location: Any
+    :raises CloudformationError: when the property is not found in the body
+    :return: updated template body
+    :rtype: str
+    """
+    if isinstance(location, dict):
+        location = "{%s}" % ", ".join(
+            "%s: %s" % (name, item) for name, item in location.items()
+        )
+    pattern = re.compile(
+        r"^([ \t]*%s[ \t]*:[ \t]*)(['\"]?)%s\2([ \t]*(?:#.*)?)$"
+        % (re.escape(property_name), re.escape(value)),
+        re.MULTILINE,
+    )
+    body, count = pattern.subn(
+        lambda match: match.group(1) + location + match.group(3), body
+    )
+    if not count:
+        raise CloudformationError(
+            "Unable to replace %s: %s in the template, "
+            "only plain scalar values on the same line are supported"
+            % (property_name, value)
+        )
+    return body
+
+
+def check_template_size(local_path: str) -> None:
+    """Check if the template is small enough to pass as TemplateBody.
+
+    :param local_path: local template path
+    :type local_path: str
+    :raises CloudformationError: when the template exceeds TEMPLATE_BODY_LIMIT
+    """
+    if os.path.getsize(local_path) > TEMPLATE_BODY_LIMIT:
+        raise CloudformationError(
+            "Template is larger than %s bytes, use --stage to upload it to s3"
+            % TEMPLATE_BODY_LIMIT
+        )
@@ -1,8 +1,16 @@
 """Contains the ls function to display information about the stack."""
 import json
-from typing import Union
+from typing import Any, Dict, List, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
 
 from fzfaws.cloudformation.cloudformation import Cloudformation
+from fzfaws.utils.exceptions import CloudformationError
+from fzfaws.utils.throttle import RateLimiter, call_with_retry, run_bounded
+
+# number of concurrent resource lookups and the maximum calls per second
+DESCRIBE_WORKERS = 5
+DESCRIBE_REQUEST_RATE = 5
 
 
 def ls_stack(
@@ -13,9 +21,17 @@ def ls_stack(
     arn: bool = False,
     tag: bool = False,
     resource_type: bool = False,
+    nested: bool = False,
+    metadata: bool = False,
 ) -> None:
     """Display stack/resource information.
 
+    With nested, display the nested stack tree, or select resources
+    across all nested stacks when displaying resource information.
+
+    Resource information is displayed from the cached resource summaries,
+    each resource is only described when its Metadata is requested.
+
     :param profile: use a different profile for this operation
     :type profile: Union[str, bool], optional
     :param region: use a different region for this operation
@@ -30,11 +46,27 @@ def ls_stack(
     :type tag: bool, optional
     :param resource_type: display type of the resource instead of the entire resource information
     :type resource_type: bool, optional
+    :param nested: include all nested stacks
+    :type nested: bool, optional
+    :param metadata: describe each selected resource to include its Metadata
+    :type metadata: bool, optional
+    :raises CloudformationError: when any of the resources failed to describe
     """
     cloudformation = Cloudformation(profile, region)
     cloudformation.set_stack(no_progress=True)
 
-    if not resource:
+    if not resource and nested:
+        for node in cloudformation.load_stack_tree(no_progress=True).values():
+            print(
+                "%s%s %s %s"
+                % (
+                    "  " * node["Depth"],
+                    node["StackName"],
+                    node["StackStatus"],
+                    node["Drift"],
+                )
+            )
+    elif not resource:
         if not name and not arn and not tag:
             print(json.dumps(cloudformation.stack_details, indent=4, default=str))
         else:
@@ -45,16 +77,74 @@ def ls_stack(
             if tag:
                 print(cloudformation.stack_details.get("Tags", []))
     else:
-        logical_id_list = cloudformation.get_stack_resources(no_progress=True)
-        for logical_id in logical_id_list:
-            response = cloudformation.client.describe_stack_resource(
-                StackName=cloudformation.stack_name, LogicalResourceId=logical_id
-            )
-            response.pop("ResponseMetadata", None)
-            if not name and not resource_type:
-                print(json.dumps(response, indent=4, default=str))
-            else:
+        selected = cloudformation.get_stack_resources(no_progress=True, nested=nested)
+        resources: Dict[str, Tuple[str, str]] = {
+            key: cloudformation.get_resource_stack(key)
+            if nested
+            else (cloudformation.stack_name, key)
+            for key in selected
+        }
+        if metadata and not name and not resource_type:
+            details = describe_resources(cloudformation, resources)
+            for key in selected:
+                print(json.dumps(details[key], indent=4, default=str))
+        else:
+            # summaries of each stack are listed once and cached
+            for key, (stack_name, logical_id) in resources.items():
+                summary = cloudformation.list_stack_resources(
+                    stack_name, no_progress=True
+                )[logical_id]
+                if not name and not resource_type:
+                    print(
+                        json.dumps(
+                            {"StackName": stack_name, **summary},
+                            indent=4,
+                            default=str,
+                        )
+                    )
                 if name:
-                    print(response["StackResourceDetail"].get("LogicalResourceId"))
+                    print(key)
                 if resource_type:
-                    print(response["StackResourceDetail"].get("ResourceType"))
+                    print(summary.get("ResourceType"))
+
+
+def describe_resources(
+    cloudformation: Cloudformation, resources: Dict[str, Tuple[str, str]]
+) -> Dict[str, Dict[str, Any]]:
+    """Describe the stack resources concurrently.
+
+    Only used when the Metadata missing from the resource summaries is
+    requested, calls are rate limited and throttled calls are retried.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param resources: dict of the selected resource and its stack name and logical id
+    :type resources: Dict[str, Tuple[str, str]]
+    :raises CloudformationError: when any of the resources failed to describe
+    :return: dict of the selected resource and the describe_stack_resource response
+    :rtype: Dict[str, Dict[str, Any]]
+    """
+    limiter = RateLimiter(DESCRIBE_REQUEST_RATE)
+
+    def _describe(key: str) -> Dict[str, Any]:
+        stack_name, logical_id = resources[key]
+        response = call_with_retry(
+            cloudformation.client.describe_stack_resource,
+            limiter,
+            StackName=stack_name,
+            LogicalResourceId=logical_id,
+        )
+        response.pop("ResponseMetadata", None)
+        return response
+
+    details: Dict[str, Dict[str, Any]] = {}
+    failed: List[str] = []
+    for key, future in run_bounded(_describe, resources, DESCRIBE_WORKERS):
+        try:
+            details[key] = future.result()
+        except (ClientError, BotoCoreError) as e:
+            print("failed: %s (%s)" % (key, e))
+            failed.append(key)
+    if failed:
+        raise CloudformationError("%s resources failed to describe" % len(failed))
+    return details
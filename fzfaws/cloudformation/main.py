@@ -70,6 +70,13 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="perform replacing update, replace the stack with a new template",
     )
+    update_cmd.add_argument(
+        "-s",
+        "--stage",
+        action="store_true",
+        default=False,
+        help="upload the local template and its local artifacts to the template_bucket in config under content addressed keys, skip existing keys",
+    )
     update_cmd.add_argument(
         "-w",
         "--wait",
@@ -84,6 +91,13 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="configure extra settings during update stack (E.g.Tags, iam role, notification, policy etc)",
     )
+    update_cmd.add_argument(
+        "-m",
+        "--multi",
+        action="store_true",
+        default=False,
+        help="select multiple stacks to update concurrently, stacks are updated in the order of their exports and imports",
+    )
     update_cmd.add_argument(
         "-P",
         "--profile",
@@ -147,6 +161,13 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="configure extra settings during create stack (E.g.Tags, iam role, notification, policy etc)",
     )
+    create_cmd.add_argument(
+        "-s",
+        "--stage",
+        action="store_true",
+        default=False,
+        help="upload the local template and its local artifacts to the template_bucket in config under content addressed keys, skip existing keys",
+    )
     create_cmd.add_argument(
         "-P",
         "--profile",
@@ -182,6 +203,13 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="wait for the stack to be deleted",
     )
+    delete_cmd.add_argument(
+        "-m",
+        "--multi",
+        action="store_true",
+        default=False,
+        help="select multiple stacks to delete concurrently, stacks are deleted in the order of their exports and imports",
+    )
     delete_cmd.add_argument(
         "-P",
         "--profile",
@@ -249,6 +277,18 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="display the type of the selected stack resource",
     )
+    ls_cmd.add_argument(
+        "--nested",
+        action="store_true",
+        default=False,
+        help="display the nested stack tree, or resources of all nested stacks with -r",
+    )
+    ls_cmd.add_argument(
+        "--metadata",
+        action="store_true",
+        default=False,
+        help="include the metadata of the selected stack resources with -r",
+    )
 
     drift_cmd = subparsers.add_parser(
         "drift", description="Detect drift on stack/resources."
@@ -274,6 +314,27 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="wait for the drift detection result",
     )
+    drift_cmd.add_argument(
+        "-m",
+        "--multi",
+        action="store_true",
+        default=False,
+        help="select multiple stacks to detect drift concurrently and report the drifted resources",
+    )
+    drift_cmd.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        default=False,
+        help="detect drift on every stack in the account and region",
+    )
+    drift_cmd.add_argument(
+        "-n",
+        "--nested",
+        action="store_true",
+        default=False,
+        help="detect drift on the selected stack and all of its nested stacks",
+    )
     drift_cmd.add_argument(
         "-P",
         "--profile",
@@ -338,6 +399,13 @@ def cloudformation(raw_args: List[Any]) -> None:
         default=False,
         help="perform replacing changeset, replace the current template with a new template and create the changeset",
     )
+    changeset_cmd.add_argument(
+        "-s",
+        "--stage",
+        action="store_true",
+        default=False,
+        help="upload the local template and its local artifacts to the template_bucket in config under content addressed keys, skip existing keys",
+    )
     changeset_cmd.add_argument(
         "-i", "--info", action="store_true", help="view the result of the changeset"
     )
@@ -483,6 +551,7 @@ def cloudformation(raw_args: List[Any]) -> None:
             args.extra,
             args.bucket,
             args.version,
+            args.stage,
         )
     elif args.subparser_name == "update":
         update_stack(
@@ -495,11 +564,13 @@ def cloudformation(raw_args: List[Any]) -> None:
             args.extra,
             args.bucket,
             args.version,
+            multi=args.multi,
+            stage=args.stage,
         )
     elif args.subparser_name == "delete":
         if args.iam == None:
             args.iam = True
-        delete_stack(args.profile, args.region, args.wait, args.iam)
+        delete_stack(args.profile, args.region, args.wait, args.iam, args.multi)
     elif args.subparser_name == "ls":
         ls_stack(
             args.profile,
@@ -509,9 +580,20 @@ def cloudformation(raw_args: List[Any]) -> None:
             args.arn,
             args.tag,
             args.type,
+            args.nested,
+            args.metadata,
         )
     elif args.subparser_name == "drift":
-        drift_stack(args.profile, args.region, args.info, args.select, args.wait)
+        drift_stack(
+            args.profile,
+            args.region,
+            args.info,
+            args.select,
+            args.wait,
+            args.multi,
+            args.all,
+            args.nested,
+        )
     elif args.subparser_name == "changeset":
         changeset_stack(
             args.profile,
@@ -526,6 +608,7 @@ def cloudformation(raw_args: List[Any]) -> None:
             args.extra,
             args.bucket,
             args.version,
+            args.stage,
         )
     elif args.subparser_name == "validate":
         validate_stack(
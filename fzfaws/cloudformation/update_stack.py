@@ -1,18 +1,28 @@
 """Contains cloudformation update stack operation handler."""
 import json
-from typing import Any, Dict, List, Optional, Union
+import sys
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from botocore.exceptions import ClientError
 
 from fzfaws.cloudformation import Cloudformation
+from fzfaws.cloudformation.cloudformation import STACK_NO_CHANGES
 from fzfaws.cloudformation.helper.cloudformationargs import CloudformationArgs
+from fzfaws.cloudformation.helper.exportindex import get_export_index
 from fzfaws.cloudformation.helper.file_validation import (
     check_is_valid,
     is_json,
     is_yaml,
 )
 from fzfaws.cloudformation.helper.paramprocessor import ParamProcessor
+from fzfaws.cloudformation.helper.templatestage import (
+    check_template_size,
+    get_template_stage,
+)
 from fzfaws.cloudformation.validate_stack import validate_stack
 from fzfaws.s3 import S3
-from fzfaws.utils import Pyfzf, FileLoader
+from fzfaws.utils import Pyfzf, FileLoader, get_confirmation
 
 
 def update_stack(
@@ -27,6 +37,8 @@ def update_stack(
     version: Union[str, bool] = False,
     dryrun: bool = False,
     cloudformation: Optional[Cloudformation] = None,
+    multi: bool = False,
+    stage: bool = False,
 ) -> Union[None, dict]:
     """Handle the update of cloudformation stacks.
 
@@ -34,6 +46,10 @@ def update_stack(
     The dryrun and cloudformation argument in the function is only
     used by changeset_stack.
 
+    With multi, parameters of each selected stack are processed first, then
+    the stacks are updated concurrently, stacks exporting values imported by
+    other selected stacks are updated first.
+
     :param profile: use a different profile for this operation
     :type profile: Union[bool, str], optional
     :param region: use a different region for this operation
@@ -56,13 +72,222 @@ def update_stack(
     :type dryrun: bool, optional
     :param cloudformation: a cloudformation instance, when calling from changeset_stack(), pass cloudformation in
     :type cloudformation: Cloudformation, optional
+    :param multi: select multiple stacks to update, always wait for the update
+    :type multi: bool, optional
+    :param stage: upload the local template and its artifacts to s3 and update with the s3 url
+    :type stage: bool, optional
+    :raises CloudformationError: when any of the stacks failed to update in multi mode
     :return: If dryrun is set, return all the update details as dict {'Parameters': value, 'Tags': value...}
     :rtype: Union[None, dict]
     """
     if not cloudformation:
         cloudformation = Cloudformation(profile, region)
+        if multi:
+            update_stacks(
+                cloudformation,
+                replace,
+                local_path,
+                root,
+                extra,
+                bucket,
+                version,
+                stage,
+            )
+            return None
         cloudformation.set_stack()
 
+    if replace and local_path and type(local_path) != str:
+        fzf = Pyfzf()
+        local_path = str(fzf.get_local_file(search_from_root=root, cloudformation=True))
+    cloudformation_args = get_update_args(
+        cloudformation,
+        replace,
+        local_path,
+        root,
+        extra,
+        bucket,
+        version,
+        dryrun,
+        stage,
+    )
+
+    if dryrun:
+        return cloudformation_args
+
+    last_event_id = cloudformation.get_last_event_id() if wait else None
+    response = cloudformation.execute_with_capabilities(**cloudformation_args)
+
+    response.pop("ResponseMetadata", None)
+    print(json.dumps(response, indent=4, default=str))
+    print(80 * "-")
+    print("Stack update initiated")
+
+    if wait:
+        cloudformation.wait_stack("Wating for stack to be updated ...", last_event_id)
+        print("Stack updated")
+
+
+def update_stacks(
+    cloudformation: Cloudformation,
+    replace: bool = False,
+    local_path: Union[str, bool] = False,
+    root: bool = False,
+    extra: bool = False,
+    bucket: str = None,
+    version: Union[str, bool] = False,
+    stage: bool = False,
+) -> None:
+    """Update the selected stacks concurrently in dependency order.
+
+    When any of the stacks has capabilities acknowledged, the capabilities
+    are asked once and acknowledged for all of the stacks.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param replace: replace the template during update
+    :type replace: bool, optional
+    :param local_path: Select a template from local machine
+    :type local_path: Union[bool, str], optional
+    :param root: Search local file from root directory
+    :type root: bool, optional
+    :param extra: configure extra options for each stack
+    :type extra: bool, optional
+    :param bucket: specify a bucket/bucketpath to skip s3 selection
+    :type bucket: str, optional
+    :param version: use a previous version of the template on s3 bucket
+    :type version: Union[str, bool], optional
+    :param stage: stage the local template to s3
+    :type stage: bool, optional
+    :raises CloudformationError: when any of the stacks failed to update
+    """
+    stack_names = cloudformation.select_stacks(
+        multi_select=True, header="select stacks to update"
+    )
+    if replace and local_path and type(local_path) != str:
+        fzf = Pyfzf()
+        local_path = str(fzf.get_local_file(search_from_root=root, cloudformation=True))
+
+    stack_actions: Dict[str, Callable[[], Optional[str]]] = {}
+    stack_args: Dict[str, Dict[str, Any]] = {}
+    required_capabilities: Dict[str, List[str]] = {}
+    for stack_name in stack_names:
+        print(80 * "-")
+        print("StackName: %s" % stack_name)
+        cloudformation.stack_name = stack_name
+        cloudformation.stack_details = cloudformation.client.describe_stacks(
+            StackName=cloudformation.stack_summaries.get(stack_name, {}).get(
+                "StackId", stack_name
+            )
+        )["Stacks"][0]
+        cloudformation_args = get_update_args(
+            cloudformation,
+            replace,
+            local_path,
+            root,
+            extra,
+            bucket,
+            version,
+            stage=stage,
+        )
+        cloudformation_args.pop("cloudformation_action", None)
+        if cloudformation.stack_details.get("Capabilities"):
+            required_capabilities[stack_name] = cloudformation.stack_details[
+                "Capabilities"
+            ]
+        stack_args[stack_name] = cloudformation_args
+        stack_actions[stack_name] = partial(
+            start_update, cloudformation, cloudformation_args
+        )
+
+    if required_capabilities:
+        # acknowledge once for all stacks, stacks still missing a capability
+        # fail with InsufficientCapabilities in the results
+        capabilities = cloudformation._get_capabilities(
+            message="Requires capabilities: %s"
+            % ", ".join(
+                "%s [%s]" % (stack_name, ", ".join(stack_capabilities))
+                for stack_name, stack_capabilities in required_capabilities.items()
+            )
+        )
+        if capabilities:
+            for cloudformation_args in stack_args.values():
+                cloudformation_args.setdefault("Capabilities", capabilities)
+
+    export_index = get_export_index(cloudformation)
+    export_index.load()
+    dependencies: Dict[str, Set[str]] = {
+        stack_name: export_index.dependencies.get(stack_name, set())
+        for stack_name in stack_names
+    }
+    print(80 * "-")
+    # reverse of the delete order, exporting stacks are updated first
+    for level in export_index.get_delete_order(stack_names)[::-1]:
+        for stack_name in level:
+            print("(dryrun) update: %s" % stack_name)
+    if not get_confirmation("Are you sure you want to update the stacks?"):
+        sys.exit(1)
+
+    results = cloudformation.execute_stacks(stack_actions, dependencies)
+    cloudformation.print_stack_results(results)
+
+
+def start_update(
+    cloudformation: Cloudformation, cloudformation_args: Dict[str, Any]
+) -> Optional[str]:
+    """Start the update of a stack.
+
+    :param cloudformation: Cloudformation instance
+    :type cloudformation: Cloudformation
+    :param cloudformation_args: arguments of update_stack
+    :type cloudformation_args: Dict[str, Any]
+    :return: STACK_NO_CHANGES when there is nothing to update
+    :rtype: Optional[str]
+    """
+    try:
+        cloudformation.client.update_stack(**cloudformation_args)
+    except ClientError as e:
+        if "No updates are to be performed" in e.response.get("Error", {}).get(
+            "Message", ""
+        ):
+            return STACK_NO_CHANGES
+        raise
+    return None
+
+
+def get_update_args(
+    cloudformation: Cloudformation,
+    replace: bool = False,
+    local_path: Union[str, bool] = False,
+    root: bool = False,
+    extra: bool = False,
+    bucket: str = None,
+    version: Union[str, bool] = False,
+    dryrun: bool = False,
+    stage: bool = False,
+) -> Dict[str, Any]:
+    """Process the template and parameters of the current stack for update.
+
+    :param cloudformation: Cloudformation instance, make sure contains the stack
+    :type cloudformation: Cloudformation
+    :param replace: replace the template during update
+    :type replace: bool, optional
+    :param local_path: local template path
+    :type local_path: Union[bool, str], optional
+    :param root: Search local file from root directory
+    :type root: bool, optional
+    :param extra: configure extra options for the stack
+    :type extra: bool, optional
+    :param bucket: specify a bucket/bucketpath to skip s3 selection
+    :type bucket: str, optional
+    :param version: use a previous version of the template on s3 bucket
+    :type version: Union[str, bool], optional
+    :param dryrun: used by changeset_stack
+    :type dryrun: bool, optional
+    :param stage: stage the local template to s3
+    :type stage: bool, optional
+    :return: formatted argument that's ready to be used by boto3
+    :rtype: Dict[str, Any]
+    """
     extra_args = CloudformationArgs(cloudformation)
 
     if not replace:
@@ -73,13 +298,8 @@ def update_stack(
         # replace existing template
         if local_path:
             # template provided in local machine
-            if type(local_path) != str:
-                fzf = Pyfzf()
-                local_path = str(
-                    fzf.get_local_file(search_from_root=root, cloudformation=True)
-                )
             cloudformation_args = local_replacing_update(
-                cloudformation, str(local_path)
+                cloudformation, str(local_path), stage
             )
 
         else:
@@ -89,22 +309,7 @@ def update_stack(
     if extra:
         extra_args.set_extra_args(update=True, search_from_root=root, dryrun=dryrun)
         cloudformation_args.update(extra_args.extra_args)
-
-    if dryrun:
-        return cloudformation_args
-
-    response = cloudformation.execute_with_capabilities(**cloudformation_args)
-
-    response.pop("ResponseMetadata", None)
-    print(json.dumps(response, indent=4, default=str))
-    print(80 * "-")
-    print("Stack update initiated")
-
-    if wait:
-        cloudformation.wait(
-            "stack_update_complete", "Wating for stack to be updated ..."
-        )
-        print("Stack updated")
+    return cloudformation_args
 
 
 def non_replacing_update(cloudformation: Cloudformation) -> Dict[str, Any]:
@@ -151,7 +356,7 @@ def non_replacing_update(cloudformation: Cloudformation) -> Dict[str, Any]:
 
 
 def local_replacing_update(
-    cloudformation: Cloudformation, local_path: str
+    cloudformation: Cloudformation, local_path: str, stage: bool = False
 ) -> Dict[str, Any]:
     """Format cloudformation argument for a local replacing update.
 
@@ -161,21 +366,41 @@ def local_replacing_update(
     Process the new template and also comparing with previous parameter
     value to provide an old value preview.
 
+    With stage, the template and its local artifacts are uploaded to s3
+    and the stack is updated with TemplateURL instead of TemplateBody.
+
     :param cloudformation: Cloudformation instance
     :type cloudformation: Cloudformation
     :param local_path: local file path to the template
     :type local_path: str
+    :param stage: stage the template to s3
+    :type stage: bool, optional
     :return: formatted argument thats ready to be used by boto3
     :rtype: Dict[str, Any]
     """
     check_is_valid(local_path)
 
-    validate_stack(
-        cloudformation.profile,
-        cloudformation.region,
-        local_path=local_path,
-        no_print=True,
-    )
+    template_args: Dict[str, str] = {}
+    if stage:
+        template_stage = get_template_stage(
+            cloudformation.profile, cloudformation.region
+        )
+        template_key = template_stage.stage(local_path)
+        validate_stack(
+            cloudformation.profile,
+            cloudformation.region,
+            bucket="%s/%s" % (template_stage.s3.bucket_name, template_key),
+            no_print=True,
+        )
+        template_args["TemplateURL"] = template_stage.get_template_url(template_key)
+    else:
+        check_template_size(local_path)
+        validate_stack(
+            cloudformation.profile,
+            cloudformation.region,
+            local_path=local_path,
+            no_print=True,
+        )
 
     fileloader = FileLoader(path=local_path)
     file_data: Dict[str, Any] = {}
@@ -204,6 +429,9 @@ def local_replacing_update(
         "UsePreviousTemplate": False,
         "Parameters": updated_parameters,
     }
+    if template_args:
+        cloudformation_args.pop("TemplateBody")
+        cloudformation_args.update(template_args)
 
     return cloudformation_args
 
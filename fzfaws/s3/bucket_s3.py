@@ -1,6 +1,6 @@
 """Contains bucket_s3 function to handle operation between buckets."""
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
@@ -147,14 +147,7 @@ def bucket_s3(
                 )
                 copy_source = {"Bucket": target_bucket, "Key": target_path}
                 if not preserve:
-                    s3transferwrapper = S3TransferWrapper()
-                    s3.client.copy(
-                        copy_source,
-                        dest_bucket,
-                        s3_key,
-                        Callback=S3Progress(target_path, target_bucket, s3.client),
-                        Config=s3transferwrapper.transfer_config,
-                    )
+                    copy_object(s3, copy_source, dest_bucket, s3_key)
                 else:
                     s3.bucket_name = target_bucket
                     copy_and_preserve(
@@ -223,19 +216,7 @@ def copy_version(
                 "VersionId": obj_version.get("VersionId"),
             }
             if not preserve:
-                s3transferwrapper = S3TransferWrapper()
-                s3.client.copy(
-                    copy_source,
-                    dest_bucket,
-                    s3_key,
-                    Callback=S3Progress(
-                        obj_version.get("Key", ""),
-                        target_bucket,
-                        s3.client,
-                        version_id=obj_version.get("VersionId"),
-                    ),
-                    Config=s3transferwrapper.transfer_config,
-                )
+                copy_object(s3, copy_source, dest_bucket, s3_key)
             else:
                 s3.bucket_name = target_bucket
                 copy_and_preserve(
@@ -278,7 +259,7 @@ def recursive_copy(
     :type preserve: bool
     """
     file_list = walk_s3_folder(
-        s3.client,
+        s3.get_client(target_bucket),
         target_bucket,
         target_path,
         target_path,
@@ -298,14 +279,7 @@ def recursive_copy(
             )
             copy_source = {"Bucket": target_bucket, "Key": s3_key}
             if not preserve:
-                s3transferwrapper = S3TransferWrapper()
-                s3.client.copy(
-                    copy_source,
-                    dest_bucket,
-                    dest_pathname,
-                    Callback=S3Progress(s3_key, target_bucket, s3.client),
-                    Config=s3transferwrapper.transfer_config,
-                )
+                copy_object(s3, copy_source, dest_bucket, dest_pathname)
             else:
                 s3.bucket_name = target_bucket
                 copy_and_preserve(s3, target_bucket, s3_key, dest_bucket, dest_pathname)
@@ -346,15 +320,7 @@ def copy_and_preserve(
     while attempt_count < 2:
         try:
             attempt_count += 1
-            s3transferwrapper = S3TransferWrapper()
-            s3.client.copy(
-                copy_source,
-                dest_bucket,
-                dest_path,
-                Callback=S3Progress(target_path, s3.bucket_name, s3.client),
-                ExtraArgs=copy_object_args,
-                Config=s3transferwrapper.transfer_config,
-            )
+            copy_object(s3, copy_source, dest_bucket, dest_path, copy_object_args)
             break
         except ClientError as e:
             error_pattern = r"^.*\((.*)\).*$"
@@ -382,6 +348,48 @@ def copy_and_preserve(
                 raise
 
 
+def copy_object(
+    s3: S3,
+    copy_source: Dict[str, str],
+    dest_bucket: str,
+    dest_key: str,
+    extra_args: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Copy the object through the client in the destination bucket region.
+
+    The copy request is sent to the destination bucket region while
+    the head request on the source object is sent through the client in
+    the source bucket region, so cross region copy doesn't hit the wrong endpoint.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param copy_source: source of the copy, contains Bucket, Key and optional VersionId
+    :type copy_source: Dict[str, str]
+    :param dest_bucket: destination bucket
+    :type dest_bucket: str
+    :param dest_key: destination key
+    :type dest_key: str
+    :param extra_args: extra args to pass to the copy
+    :type extra_args: Dict[str, Any], optional
+    """
+    source_client = s3.get_client(copy_source["Bucket"])
+    s3transferwrapper = S3TransferWrapper()
+    s3.get_client(dest_bucket).copy(
+        copy_source,
+        dest_bucket,
+        dest_key,
+        ExtraArgs=extra_args,
+        Callback=S3Progress(
+            copy_source["Key"],
+            copy_source["Bucket"],
+            source_client,
+            version_id=copy_source.get("VersionId"),
+        ),
+        SourceClient=source_client,
+        Config=s3transferwrapper.transfer_config,
+    )
+
+
 def process_path_param(
     bucket: str, s3: S3, search_folder: bool, version: bool = False
 ) -> Tuple[str, str, List[str]]:
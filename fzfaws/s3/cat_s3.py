@@ -0,0 +1,197 @@
+"""Contains function to stream s3 objects to stdout."""
+import os
+import sys
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+from fzfaws.s3.helper.compression import get_decompressor, parse_content_encoding
+from fzfaws.s3.helper.ranged_download import iter_ranges
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import S3
+from fzfaws.utils.exceptions import S3Error
+
+# smaller ranges for line peek to avoid fetching more than required
+PEEK_PART_SIZE = 1024 * 1024
+
+
+def cat_s3(
+    profile: Union[str, bool] = False,
+    bucket: str = None,
+    version: bool = False,
+    byte_range: str = "",
+    lines: int = 0,
+    decompress: bool = False,
+) -> None:
+    """Stream s3 objects to stdout.
+
+    Objects are streamed through concurrent ranged get with an
+    ordered read-ahead window, useful for piping objects to other programs.
+    Progress spinners are disabled to keep stdout clean.
+
+    :param profile: profile to use for this operation
+    :type profile: Union[str, bool], optional
+    :param bucket: specify bucket and object to stream
+    :type bucket: str, optional
+    :param version: choose versions of the object to stream
+    :type version: bool, optional
+    :param byte_range: only stream a byte range, START-END, START-, -LAST or N
+    :type byte_range: str, optional
+    :param lines: only stream the first n lines of each object
+    :type lines: int, optional
+    :param decompress: decompress gzip/zstd encoded objects
+    :type decompress: bool, optional
+    """
+    s3 = S3(profile)
+    s3.set_bucket_and_path(bucket)
+    if not s3.bucket_name:
+        s3.set_s3_bucket(no_progress=True)
+    if not s3.path_list[0]:
+        s3.set_s3_object(version=version, multi_select=True, no_progress=True)
+
+    obj_versions: List[Dict[str, Any]] = []
+    if version:
+        obj_versions = s3.get_object_version(no_progress=True)
+    else:
+        obj_versions = [{"Key": s3_key} for s3_key in s3.path_list]
+
+    try:
+        for obj_version in obj_versions:
+            cat_object(
+                s3.get_client(),
+                s3.bucket_name,
+                obj_version.get("Key", ""),
+                sys.stdout.buffer,
+                obj_version.get("VersionId"),
+                byte_range,
+                lines,
+                decompress,
+            )
+        sys.stdout.buffer.flush()
+    except BrokenPipeError:
+        # reader exited early (e.g. head), silence the flush at interpreter exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
+def cat_object(
+    client,
+    bucket: str,
+    key: str,
+    output: BinaryIO,
+    version_id: Optional[str] = None,
+    byte_range: str = "",
+    lines: int = 0,
+    decompress: bool = False,
+) -> None:
+    """Stream a single s3 object to the output.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param bucket: bucket of the object
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param output: binary stream to write to
+    :type output: BinaryIO
+    :param version_id: version of the object
+    :type version_id: str, optional
+    :param byte_range: only stream a byte range of the stored object
+    :type byte_range: str, optional
+    :param lines: only stream the first n lines
+    :type lines: int, optional
+    :param decompress: decompress gzip/zstd encoded objects
+    :type decompress: bool, optional
+    :raises S3Error: when decompressing a byte range not starting at 0
+    """
+    extra_args = {"VersionId": version_id} if version_id else {}
+    head = client.head_object(Bucket=bucket, Key=key, **extra_args)
+    size = head.get("ContentLength", 0)
+    if size <= 0:
+        return
+    start, end = parse_byte_range(byte_range, size)
+    encoding = parse_content_encoding(head) if decompress else ""
+    decompressor = get_decompressor(encoding) if encoding else None
+    if decompressor and start:
+        # the compressed stream can only be decoded from its first byte
+        raise S3Error(
+            "Byte range %s of %s encoded object must start at 0 to decompress"
+            % (byte_range, encoding)
+        )
+    transfer_config = S3TransferWrapper().transfer_config
+
+    remaining = lines
+    for data in iter_ranges(
+        client,
+        bucket,
+        key,
+        head.get("ETag", ""),
+        start,
+        end,
+        transfer_config,
+        version_id,
+        min(PEEK_PART_SIZE, transfer_config.multipart_chunksize) if lines else None,
+    ):
+        if decompressor:
+            data = decompressor.decompress(data)
+        if lines:
+            data, remaining = take_lines(data, remaining)
+        output.write(data)
+        if lines and remaining <= 0:
+            return
+    if decompressor and hasattr(decompressor, "flush"):
+        data = decompressor.flush()
+        if lines:
+            data, remaining = take_lines(data, remaining)
+        output.write(data)
+
+
+def parse_byte_range(byte_range: str, size: int) -> Tuple[int, int]:
+    """Parse the byte range option into inclusive start and end offset.
+
+    Supported format: START-END, START-, -LAST (last n bytes), N (first n bytes).
+
+    :param byte_range: byte range string, empty for the whole object
+    :type byte_range: str
+    :param size: size of the object
+    :type size: int
+    :raises S3Error: when the byte range is invalid
+    :return: a tuple of start and end offset
+    :rtype: Tuple[int, int]
+    """
+    if not byte_range:
+        return 0, size - 1
+    try:
+        if "-" not in byte_range:
+            start, end = 0, int(byte_range) - 1
+        elif byte_range.startswith("-"):
+            start, end = max(size - int(byte_range[1:]), 0), size - 1
+        else:
+            raw_start, raw_end = byte_range.split("-", 1)
+            start = int(raw_start)
+            end = int(raw_end) if raw_end else size - 1
+    except ValueError:
+        raise S3Error("Invalid byte range %s" % byte_range)
+    end = min(end, size - 1)
+    if start < 0 or start > end:
+        raise S3Error(
+            "Invalid byte range %s for object of %s bytes" % (byte_range, size)
+        )
+    return start, end
+
+
+def take_lines(data: bytes, remaining: int) -> Tuple[bytes, int]:
+    """Take up to remaining lines from the data.
+
+    :param data: data to process
+    :type data: bytes
+    :param remaining: number of lines still required
+    :type remaining: int
+    :return: a tuple of the data to output and the number of lines still required
+    :rtype: Tuple[bytes, int]
+    """
+    position = -1
+    while remaining > 0:
+        position = data.find(b"\n", position + 1)
+        if position == -1:
+            return data, remaining
+        remaining -= 1
+    return data[: position + 1], 0
@@ -1,7 +1,7 @@
 """Contains function for handling delete operation on s3."""
 from typing import Dict, List, Optional, Union
 
-from fzfaws.s3.helper.exclude_file import exclude_file
+from fzfaws.s3.helper.exclude_file import get_matcher
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 from fzfaws.s3.s3 import S3
 from fzfaws.utils.util import get_confirmation
@@ -90,9 +90,10 @@ def delete_s3(
         for s3_path in s3.path_list:
             print("(dryrun) delete: s3://%s/%s" % (s3.bucket_name, s3_path))
         if get_confirmation("Confirm?"):
+            client = s3.get_client()
             for s3_path in s3.path_list:
                 print("delete: s3://%s/%s" % (s3.bucket_name, s3_path))
-                s3.client.delete_object(
+                client.delete_object(
                     Bucket=s3.bucket_name,
                     Key=s3_path,
                 )
@@ -118,6 +119,7 @@ def delete_object_version(s3: S3, allversion: bool = False, mfa: str = "") -> No
             % (s3.bucket_name, obj_version.get("Key"), obj_version.get("VersionId"))
         )
     if get_confirmation("Confirm?"):
+        client = s3.get_client()
         for obj_version in obj_versions:
             print(
                 "delete: s3://%s/%s with version %s"
@@ -127,7 +129,7 @@ def delete_object_version(s3: S3, allversion: bool = False, mfa: str = "") -> No
                     obj_version.get("VersionId"),
                 )
             )
-            s3.client.delete_object(
+            client.delete_object(
                 Bucket=s3.bucket_name,
                 Key=obj_version.get("Key"),
                 MFA=mfa,
@@ -158,12 +160,13 @@ def delete_object_recursive(
     :param allversion: delete allversions, use to nuke the entire bucket or folder
     :type allversion: bool, optional
     """
+    client = s3.get_client()
     if allversion:
         # use a different method other than the walk s3 folder
         # since walk_s3_folder doesn't provide access to deleted version object
         # delete_all_versions method will list all files including deleted versions or even delete marker
         file_list = find_all_version_files(
-            s3.client,
+            client,
             s3.bucket_name,
             s3.path_list[0],
             [],
@@ -202,7 +205,7 @@ def delete_object_recursive(
                         obj_version.get("VersionId"),
                     )
                 )
-                s3.client.delete_object(
+                client.delete_object(
                     Bucket=s3.bucket_name,
                     Key=obj_version.get("Key"),
                     VersionId=obj_version.get("VersionId"),
@@ -210,7 +213,7 @@ def delete_object_recursive(
 
     else:
         file_list = walk_s3_folder(
-            s3.client,
+            client,
             s3.bucket_name,
             s3.path_list[0],
             s3.path_list[0],
@@ -222,7 +225,7 @@ def delete_object_recursive(
         if get_confirmation("Confirm?"):
             for s3_key, _ in file_list:
                 print("delete: s3://%s/%s" % (s3.bucket_name, s3_key))
-                s3.client.delete_object(
+                client.delete_object(
                     Bucket=s3.bucket_name,
                     Key=s3_key,
                 )
@@ -265,24 +268,29 @@ def find_all_version_files(
         exclude = []
     if include is None:
         include = []
+    matcher = get_matcher(exclude, include)
+    if matcher.can_skip(path):
+        return file_list
 
     paginator = client.get_paginator("list_object_versions")
     for result in paginator.paginate(Bucket=bucket, Delimiter="/", Prefix=path):
         if result.get("CommonPrefixes") is not None:
             for subdir in result.get("CommonPrefixes"):
+                if matcher.can_skip(subdir.get("Prefix")):
+                    continue
                 file_list = find_all_version_files(
                     client, bucket, subdir.get("Prefix"), file_list, exclude, include
                 )
         if not deletemark:
             for file in result.get("Versions", []):
-                if exclude_file(exclude, include, file.get("Key")):
+                if matcher.is_excluded(file.get("Key")):
                     continue
                 if file.get("Key") in file_list:
                     continue
                 else:
                     file_list.append(file.get("Key"))
         for file in result.get("DeleteMarkers", []):
-            if exclude_file(exclude, include, file.get("Key")):
+            if matcher.is_excluded(file.get("Key")):
                 continue
             if file.get("Key") in file_list:
                 continue
@@ -2,6 +2,12 @@
 import os
 from typing import Dict, List, Optional, Union
 
+from fzfaws.s3.helper.compression import (
+    download_decompressed,
+    get_decompressed_path,
+    parse_content_encoding,
+)
+from fzfaws.s3.helper.ranged_download import ranged_download
 from fzfaws.s3.helper.s3progress import S3Progress
 from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
 from fzfaws.s3.helper.sync_s3 import sync_s3
@@ -22,6 +28,7 @@ def download_s3(
     include: Optional[List[str]] = None,
     hidden: bool = False,
     version: bool = False,
+    decompress: bool = False,
 ) -> None:
     """Download files/'directory' from s3.
 
@@ -48,6 +55,8 @@ def download_s3(
     :type hidden: bool, optional
     :param version: download version object
     :type version: bool, optional
+    :param decompress: decompress gzip/zstd encoded objects during download
+    :type decompress: bool, optional
     """
     if not exclude:
         exclude = []
@@ -83,10 +92,10 @@ def download_s3(
             to_path=local_path,
         )
     elif recursive:
-        download_recusive(s3, exclude, include, local_path)
+        download_recusive(s3, exclude, include, local_path, decompress)
 
     elif version:
-        download_version(s3, obj_versions, local_path)
+        download_version(s3, obj_versions, local_path, decompress)
 
     else:
         for s3_path in s3.path_list:
@@ -104,17 +113,80 @@ def download_s3(
                     "download: s3://%s/%s to %s"
                     % (s3.bucket_name, s3_path, destination_path)
                 )
-                transfer = S3TransferWrapper(s3.client)
-                transfer.s3transfer.download_file(
-                    s3.bucket_name,
-                    s3_path,
-                    destination_path,
-                    callback=S3Progress(s3_path, s3.bucket_name, s3.client),
-                )
+                download_object(s3, s3_path, destination_path, decompress=decompress)
+
+
+def download_object(
+    s3: S3,
+    key: str,
+    destination_path: str,
+    version_id: Optional[str] = None,
+    decompress: bool = False,
+) -> None:
+    """Download a single s3 object to the destination path.
+
+    When decompress is set and the object has a supported Content-Encoding,
+    the object is decompressed on the fly and the compression suffix is
+    stripped from the destination path.
+
+    Objects larger than the multipart_threshold are downloaded by
+    concurrent ranged get directly into the destination file.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param key: key of the object
+    :type key: str
+    :param destination_path: local destination path
+    :type destination_path: str
+    :param version_id: version of the object to download
+    :type version_id: str, optional
+    :param decompress: decompress gzip/zstd encoded objects
+    :type decompress: bool, optional
+    """
+    client = s3.get_client()
+    transfer = S3TransferWrapper(client)
+    extra_args = {"VersionId": version_id} if version_id else {}
+    head = client.head_object(Bucket=s3.bucket_name, Key=key, **extra_args)
+    size = head.get("ContentLength", 0)
+    encoding = parse_content_encoding(head) if decompress else ""
+    if encoding:
+        download_decompressed(
+            client,
+            s3.bucket_name,
+            key,
+            get_decompressed_path(destination_path, encoding),
+            encoding,
+            transfer.transfer_config,
+            version_id,
+            size,
+        )
+    elif size > transfer.transfer_config.multipart_threshold:
+        ranged_download(
+            client,
+            s3.bucket_name,
+            key,
+            destination_path,
+            transfer.transfer_config,
+            head=head,
+            version_id=version_id,
+            callback=S3Progress(key, size=size),
+        )
+    else:
+        transfer.s3transfer.download_file(
+            s3.bucket_name,
+            key,
+            destination_path,
+            extra_args=extra_args,
+            callback=S3Progress(key, size=size),
+        )
 
 
 def download_recusive(
-    s3: S3, exclude: List[str], include: List[str], local_path: str
+    s3: S3,
+    exclude: List[str],
+    include: List[str],
+    local_path: str,
+    decompress: bool = False,
 ) -> None:
     """Download s3 recursive.
 
@@ -126,9 +198,11 @@ def download_recusive(
     :type include: List[str]
     :param local_path: local directory to download
     :type local_path: str
+    :param decompress: decompress gzip/zstd encoded objects
+    :type decompress: bool, optional
     """
     download_list = walk_s3_folder(
-        s3.client,
+        s3.get_client(),
         s3.bucket_name,
         s3.path_list[0],
         s3.path_list[0],
@@ -146,17 +220,14 @@ def download_recusive(
             print(
                 "download: s3://%s/%s to %s" % (s3.bucket_name, s3_key, dest_pathname)
             )
-            transfer = S3TransferWrapper(s3.client)
-            transfer.s3transfer.download_file(
-                s3.bucket_name,
-                s3_key,
-                dest_pathname,
-                callback=S3Progress(s3_key, s3.bucket_name, s3.client),
-            )
+            download_object(s3, s3_key, dest_pathname, decompress=decompress)
 
 
 def download_version(
-    s3: S3, obj_versions: List[Dict[str, str]], local_path: str
+    s3: S3,
+    obj_versions: List[Dict[str, str]],
+    local_path: str,
+    decompress: bool = False,
 ) -> None:
     """Download versions of a object.
 
@@ -166,6 +237,8 @@ def download_version(
     :type obj_versions: List[Dict[str, str]]
     :param local_path: local directory to download
     :type local_path: str
+    :param decompress: decompress gzip/zstd encoded objects
+    :type decompress: bool, optional
     """
     for obj_version in obj_versions:
         destination_path = os.path.join(
@@ -195,16 +268,10 @@ def download_version(
                     obj_version.get("VersionId"),
                 )
             )
-            transfer = S3TransferWrapper(s3.client)
-            transfer.s3transfer.download_file(
-                s3.bucket_name,
-                obj_version.get("Key"),
+            download_object(
+                s3,
+                obj_version.get("Key", ""),
                 destination_path,
-                extra_args={"VersionId": obj_version.get("VersionId")},
-                callback=S3Progress(
-                    obj_version.get("Key", ""),
-                    s3.bucket_name,
-                    s3.client,
-                    obj_version.get("VersionId"),
-                ),
+                version_id=obj_version.get("VersionId"),
+                decompress=decompress,
             )
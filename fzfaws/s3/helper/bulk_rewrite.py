@@ -0,0 +1,250 @@
+"""Contains the bulk engine to rewrite object attributes through copy in place."""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from boto3.s3.transfer import create_transfer_manager
+from botocore.exceptions import BotoCoreError, ClientError
+from s3transfer.subscribers import BaseSubscriber
+
+from fzfaws.s3.helper.get_copy_args import check_acl_update, get_copy_args
+from fzfaws.s3.helper.s3args import S3Args
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.helper.tag_acl import merge_tags
+from fzfaws.s3.s3 import S3
+from fzfaws.utils import get_cache_path
+from fzfaws.utils.exceptions import S3Error
+from fzfaws.utils.throttle import raise_failures, run_bounded
+
+REWRITE_JOURNAL = "s3_rewrite_%s.journal"
+
+# upload_part_copy doesn't carry these over from the source object,
+# pass them explicitly when the copy is done in multipart
+MULTIPART_PRESERVE_ARGS = [
+    "CacheControl",
+    "ContentDisposition",
+    "ContentEncoding",
+    "ContentLanguage",
+    "ContentType",
+    "Metadata",
+]
+
+
+class ProvideSizeSubscriber(BaseSubscriber):
+    """Provide the object size to the transfer future.
+
+    Avoid s3transfer sending another head_object to the source object.
+
+    :param size: size of the object
+    :type size: int
+    """
+
+    def __init__(self, size: int) -> None:
+        """Construct the subscriber."""
+        self._size = size
+
+    def on_queued(self, future, **kwargs) -> None:
+        """Provide the transfer size when the transfer is queued."""
+        future.meta.provide_transfer_size(self._size)
+
+
+def rewrite_objects(
+    s3: S3, keys: List[str], s3_args: S3Args, merge: bool = False
+) -> None:
+    """Rewrite the attributes of the objects through copy in place.
+
+    Object metadata is fetched through head_object and objects already in
+    the target state are skipped. Objects are processed by a bounded pool
+    sized by max_concurrency of the transfer config, large objects are
+    copied through multipart copy by the shared transfer manager.
+
+    Processed keys are written to a journal under the fzfaws cache directory,
+    running the same update again resumes from where it stopped.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param keys: keys of the objects to rewrite
+    :type keys: List[str]
+    :param s3_args: S3Args instance contains the target attributes
+    :type s3_args: S3Args
+    :param merge: merge the tags with the existing tags of each object
+    :type merge: bool, optional
+    :raises S3Error: when any of the objects failed to update
+    """
+    client = s3.get_client()
+    transfer = S3TransferWrapper()
+    transfer_config = transfer.transfer_config
+    journal_path = get_cache_path(
+        REWRITE_JOURNAL % get_journal_id(s3.bucket_name, keys, s3_args.extra_args)
+    )
+    completed = load_journal(journal_path)
+    if completed:
+        print("resume: %s objects already processed" % len(completed))
+
+    failed: List[Tuple[str, str]] = []
+    # generator keeps the queue bounded, listing could contain millions of keys
+    pending = (key for key in keys if key not in completed)
+
+    with create_transfer_manager(client, transfer_config) as manager, open(
+        journal_path, "a"
+    ) as journal:
+
+        def _rewrite(key: str) -> bool:
+            return rewrite_object(
+                s3, client, manager, key, s3_args, transfer_config, merge
+            )
+
+        for key, future in run_bounded(_rewrite, pending, transfer.max_workers):
+            try:
+                updated = future.result()
+            except (ClientError, BotoCoreError) as e:
+                failed.append(("s3://%s/%s" % (s3.bucket_name, key), str(e)))
+                continue
+            if updated:
+                print("update: s3://%s/%s" % (s3.bucket_name, key))
+            else:
+                print("skip: s3://%s/%s (up to date)" % (s3.bucket_name, key))
+            journal.write("%s\n" % key)
+            journal.flush()
+
+    raise_failures(
+        failed,
+        S3Error,
+        "%s objects failed to update, run the same update again to resume",
+    )
+    os.remove(journal_path)
+
+
+def rewrite_object(
+    s3: S3,
+    client,
+    manager,
+    key: str,
+    s3_args: S3Args,
+    transfer_config,
+    merge: bool = False,
+) -> bool:
+    """Rewrite a single object through copy in place.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param manager: transfer manager to perform the copy
+    :type manager: s3transfer.manager.TransferManager
+    :param key: key of the object
+    :type key: str
+    :param s3_args: S3Args instance contains the target attributes
+    :type s3_args: S3Args
+    :param transfer_config: transfer config of the copy
+    :type transfer_config: boto3.s3.transfer.TransferConfig
+    :param merge: merge the tags with the existing tags of the object
+    :type merge: bool, optional
+    :return: False if the object is already in the target state
+    :rtype: bool
+    """
+    head = client.head_object(Bucket=s3.bucket_name, Key=key)
+    if is_target_state(head, s3_args):
+        return False
+    copy_args = get_copy_args(s3, key, s3_args, extra_args=True, head=head)
+    if merge and s3_args.tags:
+        original = client.get_object_tagging(Bucket=s3.bucket_name, Key=key)
+        tags = merge_tags(
+            original.get("TagSet", []),
+            [
+                {"Key": tag_key, "Value": value}
+                for tag_key, value in parse_qsl(s3_args.tags, keep_blank_values=True)
+            ],
+        )
+        copy_args["Tagging"] = urlencode([(tag["Key"], tag["Value"]) for tag in tags])
+
+    size = head.get("ContentLength", 0)
+    if size >= transfer_config.multipart_threshold:
+        for arg in MULTIPART_PRESERVE_ARGS:
+            if arg not in copy_args and head.get(arg):
+                copy_args[arg] = head[arg]
+        if "Tagging" not in copy_args:
+            tags = client.get_object_tagging(Bucket=s3.bucket_name, Key=key)
+            if tags.get("TagSet"):
+                copy_args["Tagging"] = urlencode(
+                    [(tag["Key"], tag["Value"]) for tag in tags["TagSet"]]
+                )
+
+    manager.copy(
+        {"Bucket": s3.bucket_name, "Key": key},
+        s3.bucket_name,
+        key,
+        extra_args=copy_args,
+        subscribers=[ProvideSizeSubscriber(size)],
+    ).result()
+    return True
+
+
+def is_target_state(head: Dict[str, Any], s3_args: S3Args) -> bool:
+    """Check if the object already have the target attributes.
+
+    Tags and acl couldn't be verified through head_object, objects
+    are never considered up to date when they are updated.
+
+    :param head: head_object response of the object
+    :type head: Dict[str, Any]
+    :param s3_args: S3Args instance contains the target attributes
+    :type s3_args: S3Args
+    :return: True if the copy could be skipped
+    :rtype: bool
+    """
+    if s3_args.tags or s3_args.acl or not check_acl_update(s3_args):
+        return False
+    if s3_args.storage_class and s3_args.storage_class != head.get(
+        "StorageClass", "STANDARD"
+    ):
+        return False
+    if s3_args.encryption:
+        # "None" use the bucket default which couldn't be compared
+        if s3_args.encryption != head.get("ServerSideEncryption"):
+            return False
+        if s3_args.encryption == "aws:kms" and s3_args.kms_id != head.get(
+            "SSEKMSKeyId"
+        ):
+            return False
+    if s3_args.metadata and s3_args.metadata != head.get("Metadata", {}):
+        return False
+    return True
+
+
+def get_journal_id(bucket: str, keys: List[str], extra_args: Dict[str, Any]) -> str:
+    """Return the id of the journal for the update.
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param keys: keys to update
+    :type keys: List[str]
+    :param extra_args: target attributes of the update
+    :type extra_args: Dict[str, Any]
+    :return: hex digest identifying the update
+    :rtype: str
+    """
+    digest = hashlib.sha1()
+    digest.update(bucket.encode("utf-8"))
+    digest.update(json.dumps(extra_args, sort_keys=True, default=str).encode("utf-8"))
+    for key in keys:
+        digest.update(key.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_journal(journal_path: str) -> Set[str]:
+    """Load the processed keys from the journal.
+
+    :param journal_path: path to the journal
+    :type journal_path: str
+    :return: set of keys already processed
+    :rtype: Set[str]
+    """
+    try:
+        with open(journal_path, "r") as journal:
+            return {line[:-1] for line in journal if line.endswith("\n")}
+    except OSError:
+        return set()
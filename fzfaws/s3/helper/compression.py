@@ -0,0 +1,421 @@
+"""Module contains the streaming compression helpers for s3 transfer.
+
+Objects are compressed/decompressed chunk by chunk in a background thread
+and exchanged with the s3transfer manager through a bounded queue, this way
+the cpu bound (de)compression is overlapped with the network io and the memory
+usage is capped regardless of the object size.
+
+zstd support require the optional dependency zstandard (pip3 install zstandard).
+"""
+import os
+import queue
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from boto3.s3.transfer import TransferConfig
+
+from fzfaws.s3.helper.s3progress import S3Progress
+from fzfaws.utils.exceptions import InvalidFileType, MissingDependency
+
+COMPRESSION_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def get_compressor(encoding: str) -> Any:
+    """Return a streaming compressor object for the encoding.
+
+    The returned object has the zlib style compress()/flush() interface.
+
+    :param encoding: compression type, gzip or zstd
+    :type encoding: str
+    :raises InvalidFileType: when the encoding is not supported
+    :return: compressor object
+    :rtype: Any
+    """
+    if encoding == "gzip":
+        # wbits 31 produce gzip header and trailer
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    elif encoding == "zstd":
+        return _import_zstandard().ZstdCompressor().compressobj()
+    raise InvalidFileType("Unsupported compression type: %s" % encoding)
+
+
+def get_decompressor(encoding: str) -> Any:
+    """Return a streaming decompressor object for the encoding.
+
+    The returned object has the zlib style decompress() interface.
+
+    :param encoding: content encoding of the object, gzip or zstd
+    :type encoding: str
+    :raises InvalidFileType: when the encoding is not supported
+    :return: decompressor object
+    :rtype: Any
+    """
+    if encoding == "gzip":
+        # wbits 47 auto detect the zlib/gzip header
+        return zlib.decompressobj(47)
+    elif encoding == "zstd":
+        return _import_zstandard().ZstdDecompressor().decompressobj()
+    raise InvalidFileType("Unsupported compression type: %s" % encoding)
+
+
+def get_compressed_key(key: str, encoding: str) -> str:
+    """Append the compression suffix to the s3 key.
+
+    :param key: destination s3 key
+    :type key: str
+    :param encoding: compression type
+    :type encoding: str
+    :return: s3 key with the suffix appended, key is unchanged if suffix already exists
+    :rtype: str
+    """
+    suffix = COMPRESSION_SUFFIX.get(encoding, "")
+    if not suffix or key.endswith(suffix):
+        return key
+    return key + suffix
+
+
+def get_decompressed_path(path: str, encoding: str) -> str:
+    """Strip the compression suffix from the local destination path.
+
+    :param path: local destination path
+    :type path: str
+    :param encoding: content encoding of the object
+    :type encoding: str
+    :return: local path without the compression suffix
+    :rtype: str
+    """
+    suffix = COMPRESSION_SUFFIX.get(encoding, "")
+    if suffix and path.endswith(suffix) and len(path) > len(suffix):
+        return path[: -len(suffix)]
+    return path
+
+
+class CompressedReader:
+    """Non-seekable file like object which compress a local file on the fly.
+
+    Pass the instance to client.upload_fileobj, the file is read and compressed
+    in a background thread, compressed chunks are handed over to the transfer
+    manager through a bounded queue.
+
+    :param filename: local file to compress
+    :type filename: str
+    :param encoding: compression type, gzip or zstd
+    :type encoding: str
+    :param chunksize: bytes to read from the local file each time
+    :type chunksize: int, optional
+    :param max_queue: maximum number of compressed chunks waiting to be uploaded
+    :type max_queue: int, optional
+    :param callback: called with the number of raw bytes compressed, e.g. S3Progress
+    :type callback: Callable[[int], None], optional
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        encoding: str,
+        chunksize: int = 256 * 1024,
+        max_queue: int = 100,
+        callback: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Construct the reader and start the compression thread."""
+        self._filename: str = filename
+        self._compressor = get_compressor(encoding)
+        self._chunksize: int = chunksize
+        self._callback = callback
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_queue)
+        self._buffer: bytes = b""
+        self._finished: bool = False
+        self._exception: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._compress, daemon=True)
+        self._thread.start()
+
+    def _compress(self) -> None:
+        """Read and compress the local file, run in the background thread."""
+        try:
+            with open(self._filename, "rb") as file:
+                while True:
+                    if self._stop.is_set():
+                        return
+                    data = file.read(self._chunksize)
+                    if not data:
+                        break
+                    compressed = self._compressor.compress(data)
+                    if compressed:
+                        self._queue.put(compressed)
+                    if self._callback:
+                        self._callback(len(data))
+            self._queue.put(self._compressor.flush())
+        except BaseException as e:
+            self._exception = e
+        finally:
+            self._queue.put(None)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read compressed bytes.
+
+        :param size: maximum bytes to read, -1 to read everything
+        :type size: int, optional
+        :return: compressed bytes, empty bytes indicate EOF
+        :rtype: bytes
+        """
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            chunk = self._queue.get()
+            if chunk is None:
+                self._finished = True
+                if self._exception:
+                    raise self._exception
+            else:
+                self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self) -> None:
+        """Stop the compression thread and wait for it to exit.
+
+        Queued chunks are discarded, call after the upload finished or failed.
+        """
+        self._stop.set()
+        while not self._finished:
+            if self._queue.get() is None:
+                self._finished = True
+        self._thread.join()
+
+    def readable(self) -> bool:
+        """Indicate the object support read()."""
+        return True
+
+    def seekable(self) -> bool:
+        """Indicate s3transfer to treat this object as a stream."""
+        return False
+
+
+class DecompressedWriter:
+    """Non-seekable file like object which decompress written bytes into a local file.
+
+    Pass the instance to client.download_fileobj, the transfer manager write the
+    downloaded bytes in order and a background thread decompress them into the
+    destination file. Call close() to wait for the decompression to finish.
+
+    :param filename: local destination file
+    :type filename: str
+    :param encoding: content encoding of the object, gzip or zstd
+    :type encoding: str
+    :param max_queue: maximum number of downloaded chunks waiting to be decompressed
+    :type max_queue: int, optional
+    """
+
+    def __init__(self, filename: str, encoding: str, max_queue: int = 100) -> None:
+        """Construct the writer and start the decompression thread."""
+        self._filename: str = filename
+        self._decompressor = get_decompressor(encoding)
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_queue)
+        self._exception: Optional[BaseException] = None
+        self._aborted: bool = False
+        self._thread = threading.Thread(target=self._decompress, daemon=True)
+        self._thread.start()
+
+    def _decompress(self) -> None:
+        """Decompress the queued chunks into the file, run in the background thread."""
+        try:
+            with open(self._filename, "wb") as file:
+                while True:
+                    chunk = self._queue.get()
+                    if chunk is None:
+                        break
+                    if self._aborted:
+                        continue
+                    file.write(self._decompressor.decompress(chunk))
+                if hasattr(self._decompressor, "flush"):
+                    file.write(self._decompressor.flush())
+        except BaseException as e:
+            self._exception = e
+            # keep draining so that the writer never block on a dead consumer
+            while self._queue.get() is not None:
+                pass
+
+    def write(self, data: bytes) -> int:
+        """Queue downloaded bytes for decompression.
+
+        :param data: downloaded bytes
+        :type data: bytes
+        :return: number of bytes accepted
+        :rtype: int
+        """
+        if self._exception:
+            raise self._exception
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def close(self) -> None:
+        """Wait for the decompression to finish and raise any error."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._exception:
+            if os.path.isfile(self._filename):
+                os.remove(self._filename)
+            raise self._exception
+
+    def abort(self) -> None:
+        """Stop the decompression and remove the partial file.
+
+        Used when the download failed, errors of the decompression are
+        ignored so that the download error is not replaced.
+        """
+        self._aborted = True
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            os.remove(self._filename)
+        except OSError:
+            pass
+
+    def seekable(self) -> bool:
+        """Indicate s3transfer to write the data in order."""
+        return False
+
+
+def upload_compressed(
+    client,
+    filepath: str,
+    bucket: str,
+    key: str,
+    encoding: str,
+    transfer_config: TransferConfig,
+    extra_args: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Compress and upload a local file to s3 as a stream.
+
+    Content-Encoding is set on the object so that download_compressed
+    and http clients could decode it transparently.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param filepath: local file to upload
+    :type filepath: str
+    :param bucket: destination bucket
+    :type bucket: str
+    :param key: destination key, suffix should already be applied
+    :type key: str
+    :param encoding: compression type, gzip or zstd
+    :type encoding: str
+    :param transfer_config: transfer config controlling the chunk size and concurrency
+    :type transfer_config: TransferConfig
+    :param extra_args: extra arguments for the upload, e.g. ACL, StorageClass
+    :type extra_args: Dict[str, Any], optional
+    """
+    upload_args = dict(extra_args or {})
+    upload_args["ContentEncoding"] = encoding
+    reader = CompressedReader(
+        filepath,
+        encoding,
+        chunksize=transfer_config.io_chunksize,
+        max_queue=transfer_config.max_io_queue,
+        callback=S3Progress(filepath),
+    )
+    try:
+        client.upload_fileobj(
+            reader, bucket, key, ExtraArgs=upload_args, Config=transfer_config
+        )
+    finally:
+        reader.close()
+
+
+def download_decompressed(
+    client,
+    bucket: str,
+    key: str,
+    destination_path: str,
+    encoding: str,
+    transfer_config: TransferConfig,
+    version_id: Optional[str] = None,
+    size: Optional[float] = None,
+) -> None:
+    """Download a compressed object and decompress it into the destination.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param bucket: bucket of the object
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param destination_path: local destination path, suffix should already be stripped
+    :type destination_path: str
+    :param encoding: content encoding of the object, gzip or zstd
+    :type encoding: str
+    :param transfer_config: transfer config controlling the chunk size and concurrency
+    :type transfer_config: TransferConfig
+    :param version_id: version of the object to download
+    :type version_id: str, optional
+    :param size: size of the object, retrieved if not provided
+    :type size: float, optional
+    """
+    extra_args = {"VersionId": version_id} if version_id else {}
+    writer = DecompressedWriter(
+        destination_path, encoding, max_queue=transfer_config.max_io_queue
+    )
+    try:
+        client.download_fileobj(
+            bucket,
+            key,
+            writer,
+            ExtraArgs=extra_args,
+            Callback=S3Progress(key, bucket, client, version_id, size),
+            Config=transfer_config,
+        )
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+
+
+def get_content_encoding(
+    client, bucket: str, key: str, version_id: Optional[str] = None
+) -> str:
+    """Get the supported content encoding of a s3 object.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param bucket: bucket of the object
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param version_id: version of the object
+    :type version_id: str, optional
+    :return: gzip or zstd, empty string if the object is not compressed by a supported encoding
+    :rtype: str
+    """
+    extra_args = {"VersionId": version_id} if version_id else {}
+    response = client.head_object(Bucket=bucket, Key=key, **extra_args)
+    return parse_content_encoding(response)
+
+
+def parse_content_encoding(response: Dict[str, Any]) -> str:
+    """Get the supported content encoding from the head_object response.
+
+    :param response: response of head_object or get_object
+    :type response: Dict[str, Any]
+    :return: gzip or zstd, empty string if the object is not compressed by a supported encoding
+    :rtype: str
+    """
+    encoding = response.get("ContentEncoding", "").lower()
+    return encoding if encoding in COMPRESSION_SUFFIX else ""
+
+
+def _import_zstandard() -> Any:
+    """Import the optional zstandard module.
+
+    :raises MissingDependency: when zstandard is not installed
+    """
+    try:
+        import zstandard
+
+        return zstandard
+    except ImportError:
+        raise MissingDependency(
+            "zstd compression require zstandard to be installed (pip3 install zstandard)"
+        )
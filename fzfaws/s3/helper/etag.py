@@ -0,0 +1,126 @@
+"""Contains function to compute the s3 ETag of local files and cache them."""
+import hashlib
+import json
+import os
+from typing import Dict
+
+from boto3.s3.transfer import TransferConfig
+from s3transfer.utils import ChunksizeAdjuster
+
+from fzfaws.utils import get_cache_path
+
+ETAG_CACHE = "s3_etag_cache.json"
+
+# size of each read when hashing the file
+READ_SIZE = 1024 * 1024
+
+
+def compute_etag(filepath: str, size: int, transfer_config: TransferConfig) -> str:
+    """Compute the ETag s3 would return for the file uploaded with the config.
+
+    Files smaller than the multipart threshold are uploaded in a single
+    request and their ETag is the md5 of the content. Otherwise the ETag is
+    the md5 of the concatenated part digests suffixed with the number of parts,
+    parts are sized the same way s3transfer does.
+
+    :param filepath: local file path
+    :type filepath: str
+    :param size: size of the file
+    :type size: int
+    :param transfer_config: transfer config used for the upload
+    :type transfer_config: TransferConfig
+    :return: ETag without the surrounding quotes
+    :rtype: str
+    """
+    if size < transfer_config.multipart_threshold:
+        digest = hashlib.md5()
+        with open(filepath, "rb") as file:
+            for chunk in iter(lambda: file.read(READ_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    chunksize = ChunksizeAdjuster().adjust_chunksize(
+        transfer_config.multipart_chunksize, size
+    )
+    part_digests = []
+    with open(filepath, "rb") as file:
+        while True:
+            remaining = chunksize
+            digest = hashlib.md5()
+            while remaining > 0:
+                chunk = file.read(min(remaining, READ_SIZE))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if remaining == chunksize:
+                break
+            part_digests.append(digest.digest())
+    return "%s-%s" % (
+        hashlib.md5(b"".join(part_digests)).hexdigest(),
+        len(part_digests),
+    )
+
+
+class ETagCache:
+    """Cache of the computed ETag of local files.
+
+    Entries are keyed by the absolute path of the file and invalidated when
+    the size, mtime or the multipart settings of the transfer config change.
+
+    :param transfer_config: transfer config used for the upload
+    :type transfer_config: TransferConfig
+    :param cache_path: path of the cache file, default under the fzfaws cache directory
+    :type cache_path: str, optional
+    """
+
+    def __init__(self, transfer_config: TransferConfig, cache_path: str = "") -> None:
+        """Construct the cache and load the cache file."""
+        self.transfer_config = transfer_config
+        self.cache_path: str = cache_path or get_cache_path(ETAG_CACHE)
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.updated: bool = False
+        try:
+            with open(self.cache_path, "r") as file:
+                entries = json.load(file)
+            if isinstance(entries, dict):
+                self.entries = entries
+        except (OSError, ValueError):
+            pass
+
+    def get_etag(self, filepath: str, size: int, mtime: float) -> str:
+        """Return the ETag of the file, compute it if not cached.
+
+        :param filepath: local file path
+        :type filepath: str
+        :param size: size of the file
+        :type size: int
+        :param mtime: modified time of the file
+        :type mtime: float
+        :return: ETag without the surrounding quotes
+        :rtype: str
+        """
+        filepath = os.path.abspath(filepath)
+        signature = "%s:%s:%s:%s" % (
+            size,
+            mtime,
+            self.transfer_config.multipart_threshold,
+            self.transfer_config.multipart_chunksize,
+        )
+        entry = self.entries.get(filepath)
+        if entry and entry.get("signature") == signature:
+            return entry["etag"]
+        etag = compute_etag(filepath, size, self.transfer_config)
+        self.entries[filepath] = {"signature": signature, "etag": etag}
+        self.updated = True
+        return etag
+
+    def save(self) -> None:
+        """Write the cache file atomically if any entry is updated."""
+        if not self.updated:
+            return
+        tmp_path = "%s.%s.tmp" % (self.cache_path, os.getpid())
+        with open(tmp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(tmp_path, self.cache_path)
+        self.updated = False
@@ -1,6 +1,119 @@
 """Contains function to handle glob pattern and determine if file should be excluded."""
 import fnmatch
-from typing import List, Optional
+import re
+from functools import lru_cache
+from typing import List, Optional, Pattern, Tuple
+
+# characters starting a wildcard in a fnmatch glob pattern
+GLOB_WILDCARDS = re.compile(r"[*?\[]")
+
+
+class FileMatcher:
+    """Compiled exclude and include glob patterns.
+
+    All patterns of each list are compiled into a single regex, a file is
+    excluded when it matches any exclude pattern and no include pattern.
+
+    Also determine whether every file under a prefix is excluded, so that
+    walkers could prune the whole prefix without listing it.
+
+    :param exclude: exclude glob pattern
+    :type exclude: List[str], optional
+    :param include: include glob pattern
+    :type include: List[str], optional
+    """
+
+    def __init__(
+        self, exclude: Optional[List[str]] = None, include: Optional[List[str]] = None
+    ) -> None:
+        """Construct the matcher."""
+        self.exclude: List[str] = list(exclude or [])
+        self.include: List[str] = list(include or [])
+        self._exclude_regex = self._compile(self.exclude)
+        self._include_regex = self._compile(self.include)
+        # patterns ending with * match everything after a matched prefix
+        self._exclude_prefix_regex = self._compile(
+            [pattern for pattern in self.exclude if pattern.endswith("*")]
+        )
+        self._include_literals: List[str] = [
+            GLOB_WILDCARDS.split(pattern, maxsplit=1)[0] for pattern in self.include
+        ]
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> Optional[Pattern]:
+        """Compile the glob patterns into one regex.
+
+        :param patterns: list of glob pattern
+        :type patterns: List[str]
+        :return: compiled regex or None if no pattern
+        :rtype: Optional[Pattern]
+        """
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+    def is_excluded(self, filename: str) -> bool:
+        """Check if the file should be excluded.
+
+        :param filename: relative path of the file or key of the object
+        :type filename: str
+        :return: bool value indicating whether the file should be excluded
+        :rtype: bool
+        """
+        if not self._exclude_regex or not self._exclude_regex.match(filename):
+            return False
+        return not self._include_regex or not self._include_regex.match(filename)
+
+    def can_skip(self, prefix: str) -> bool:
+        """Check if every file starting with the prefix is excluded.
+
+        The check is conservative, False only means the prefix
+        may contain files that are not excluded.
+
+        :param prefix: key prefix or relative directory path with trailing separator
+        :type prefix: str
+        :return: bool value indicating whether the prefix could be skipped
+        :rtype: bool
+        """
+        if not self._exclude_prefix_regex or not self._exclude_prefix_regex.match(
+            prefix
+        ):
+            return False
+        for literal in self._include_literals:
+            if literal.startswith(prefix) or prefix.startswith(literal):
+                return False
+        return True
+
+
+@lru_cache(maxsize=32)
+def _get_matcher(exclude: Tuple[str, ...], include: Tuple[str, ...]) -> FileMatcher:
+    """Return the cached matcher of the patterns.
+
+    :param exclude: exclude glob pattern
+    :type exclude: Tuple[str, ...]
+    :param include: include glob pattern
+    :type include: Tuple[str, ...]
+    :return: compiled matcher
+    :rtype: FileMatcher
+    """
+    return FileMatcher(list(exclude), list(include))
+
+
+def get_matcher(
+    exclude: Optional[List[str]] = None, include: Optional[List[str]] = None
+) -> FileMatcher:
+    """Return the compiled matcher of the patterns.
+
+    Matchers are cached, calling it repeatedly with the same patterns is cheap.
+
+    :param exclude: exclude glob pattern
+    :type exclude: List[str], optional
+    :param include: include glob pattern
+    :type include: List[str], optional
+    :return: compiled matcher
+    :rtype: FileMatcher
+    """
+    return _get_matcher(tuple(exclude or []), tuple(include or []))
 
 
 def exclude_file(
@@ -22,19 +135,4 @@ def exclude_file(
     :return: bool value indicating whether the file should be excluded
     :rtype: bool
     """
-    if not exclude:
-        exclude = []
-    if not include:
-        include = []
-
-    should_exclude = False
-    # validate the relative_path against exclude list
-    for pattern in exclude:
-        if fnmatch.fnmatch(filename, pattern):
-            should_exclude = True
-    # validate against include list if it is previous denied
-    if should_exclude:
-        for pattern in include:
-            if fnmatch.fnmatch(filename, pattern):
-                should_exclude = False
-    return should_exclude
+    return get_matcher(exclude, include).is_excluded(filename)
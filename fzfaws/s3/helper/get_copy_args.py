@@ -1,11 +1,16 @@
 """Contains the function to get s3 copy argument for preserving all object information."""
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from fzfaws.s3 import S3
 from fzfaws.s3.helper.s3args import S3Args
 
 
 def get_copy_args(
-    s3: S3, s3_key: str, s3_args: S3Args, extra_args: bool = False, version: str = None
+    s3: S3,
+    s3_key: str,
+    s3_args: S3Args,
+    extra_args: bool = False,
+    version: str = None,
+    head: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Get copy argument for s3 operations.
 
@@ -30,25 +35,26 @@ def get_copy_args(
     :type extra_args: bool, optional
     :param version: specify object version id
     :type version: str, optional
+    :param head: head_object response of the object, skip the head_object call if provided
+    :type head: Dict[str, Any], optional
     :return: copy object argument
     :rtype: dict
     """
-    if version:
-        s3_obj = s3.client.get_object(
-            Bucket=s3.bucket_name, Key=s3_key, VersionId=version
-        )
-        s3_acl = s3.client.get_object_acl(
-            Bucket=s3.bucket_name, Key=s3_key, VersionId=version
-        )
-    else:
-        s3_obj = s3.client.get_object(Bucket=s3.bucket_name, Key=s3_key)
-        s3_acl = s3.client.get_object_acl(Bucket=s3.bucket_name, Key=s3_key)
+    version_args = {"VersionId": version} if version else {}
+    client = s3.get_client()
+    s3_obj = head
+    if s3_obj is None:
+        s3_obj = client.head_object(Bucket=s3.bucket_name, Key=s3_key, **version_args)
 
     permission_read = []
     permission_acp_read = []
     permission_acp_write = []
     permission_full = []
-    if check_acl_update(s3_args):
+    # original grants are only required when acl is not updated
+    if check_acl_update(s3_args) and not s3_args.acl:
+        s3_acl = client.get_object_acl(
+            Bucket=s3.bucket_name, Key=s3_key, **version_args
+        )
         for grantee in s3_acl.get("Grants"):
             if grantee.get("Permission") == "READ":
                 if grantee["Grantee"].get("ID"):
@@ -0,0 +1,130 @@
+"""Contains the offline sigv4 presigner for s3 GET urls."""
+import hashlib
+import hmac
+import re
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+
+from fzfaws.utils.exceptions import S3Error
+
+# maximum expiration period of a sigv4 presigned url
+MAX_EXPIRES_IN = 604800
+
+DNS_COMPATIBLE_BUCKET = re.compile(r"^[a-z0-9][a-z0-9\-]{1,61}[a-z0-9]$")
+
+
+class S3Presigner:
+    """Presign s3 GET urls locally with sigv4 query authentication.
+
+    The signing key is derived once per day and reused for every url,
+    no request serialization or api model lookup is involved, which
+    makes it suitable for presigning millions of keys.
+
+    :param credentials: frozen credentials of the session
+    :type credentials: botocore.credentials.ReadOnlyCredentials
+    :param region: region of the bucket
+    :type region: str
+    """
+
+    def __init__(self, credentials, region: str) -> None:
+        """Construct the presigner."""
+        self.credentials = credentials
+        self.region = region
+        self.endpoint = "s3.%s.amazonaws.com" % region
+        if region.startswith("cn-"):
+            self.endpoint += ".cn"
+        self._datestamp: str = ""
+        self._signing_key: bytes = b""
+
+    def presign(
+        self,
+        bucket: str,
+        key: str,
+        expires_in: int = 3600,
+        version_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> str:
+        """Return the presigned GET url of the object.
+
+        :param bucket: name of the bucket
+        :type bucket: str
+        :param key: key of the object
+        :type key: str
+        :param expires_in: expiration period of the url in seconds
+        :type expires_in: int, optional
+        :param version_id: version of the object
+        :type version_id: str, optional
+        :param now: signing time, default to current time
+        :type now: datetime, optional
+        :raises S3Error: when the expiration period is not valid
+        :return: presigned url
+        :rtype: str
+        """
+        if expires_in <= 0 or expires_in > MAX_EXPIRES_IN:
+            raise S3Error(
+                "Expiration period must be between 1 and %s seconds" % MAX_EXPIRES_IN
+            )
+        if not now:
+            now = datetime.utcnow()
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = amz_date[:8]
+        scope = "%s/%s/s3/aws4_request" % (datestamp, self.region)
+
+        if DNS_COMPATIBLE_BUCKET.match(bucket):
+            host = "%s.%s" % (bucket, self.endpoint)
+            path = "/%s" % quote(key, safe="/~")
+        else:
+            host = self.endpoint
+            path = "/%s/%s" % (bucket, quote(key, safe="/~"))
+
+        params = [
+            ("X-Amz-Algorithm", "AWS4-HMAC-SHA256"),
+            ("X-Amz-Credential", "%s/%s" % (self.credentials.access_key, scope)),
+            ("X-Amz-Date", amz_date),
+            ("X-Amz-Expires", str(expires_in)),
+            ("X-Amz-SignedHeaders", "host"),
+        ]
+        if self.credentials.token:
+            params.append(("X-Amz-Security-Token", self.credentials.token))
+        if version_id:
+            params.append(("versionId", version_id))
+        query = "&".join(
+            "%s=%s" % (quote(name, safe="~"), quote(value, safe="~"))
+            for name, value in sorted(params)
+        )
+
+        canonical_request = "GET\n%s\n%s\nhost:%s\n\nhost\nUNSIGNED-PAYLOAD" % (
+            path,
+            query,
+            host,
+        )
+        string_to_sign = "AWS4-HMAC-SHA256\n%s\n%s\n%s" % (
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        )
+        signature = hmac.new(
+            self._get_signing_key(datestamp),
+            string_to_sign.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+        return "https://%s%s?%s&X-Amz-Signature=%s" % (host, path, query, signature)
+
+    def _get_signing_key(self, datestamp: str) -> bytes:
+        """Return the signing key of the date, derived once per day.
+
+        :param datestamp: date of the signing time, format YYYYMMDD
+        :type datestamp: str
+        :return: sigv4 signing key
+        :rtype: bytes
+        """
+        if datestamp != self._datestamp:
+            signing_key = ("AWS4%s" % self.credentials.secret_key).encode("utf-8")
+            for message in (datestamp, self.region, "s3", "aws4_request"):
+                signing_key = hmac.new(
+                    signing_key, message.encode("utf-8"), hashlib.sha256
+                ).digest()
+            self._signing_key = signing_key
+            self._datestamp = datestamp
+        return self._signing_key
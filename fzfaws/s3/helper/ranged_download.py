@@ -0,0 +1,459 @@
+"""Module contains the parallel ranged download for large s3 objects.
+
+The destination file is preallocated and byte ranges of the object are
+fetched concurrently, each range is written straight to its offset with
+os.pwrite so there is no temp file or final copy involved.
+
+iter_ranges reuse the same range fetching to stream an object in order
+with a bounded read-ahead window, used by s3 cat.
+"""
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.utils.exceptions import S3Error
+
+# maximum number of parts to confirm by head_object for the multipart ETag,
+# objects with more parts are downloaded without the checksum verification
+PART_CHECK_LIMIT = 16
+
+
+def ranged_download(
+    client,
+    bucket: str,
+    key: str,
+    destination_path: str,
+    transfer_config: TransferConfig,
+    head: Optional[Dict[str, Any]] = None,
+    version_id: Optional[str] = None,
+    callback: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Download a s3 object by concurrent ranged get.
+
+    Part size and worker count are controlled by multipart_chunksize and
+    max_concurrency of the transfer config, a failed range is retried alone
+    up to num_download_attempts times.
+
+    Every range is verified against the Content-Range returned by s3 and all
+    requests are pinned to the ETag of the object. The whole object is verified
+    against the ETag when it is a md5 checksum (not encrypted by SSE-KMS or SSE-C).
+    For multipart uploaded objects the ranges are aligned to the original parts
+    when possible so that the multipart ETag could be computed from the ranges.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param bucket: bucket of the object
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param destination_path: local destination path
+    :type destination_path: str
+    :param transfer_config: transfer config controlling the part size and concurrency
+    :type transfer_config: TransferConfig
+    :param head: response of head_object, retrieved if not provided
+    :type head: Dict[str, Any], optional
+    :param version_id: version of the object to download
+    :type version_id: str, optional
+    :param callback: called with the number of bytes downloaded, e.g. S3Progress
+    :type callback: Callable[[int], None], optional
+    :raises S3Error: when the downloaded object does not match the checksum
+    """
+    extra_args = {"VersionId": version_id} if version_id else {}
+    if head is None:
+        head = client.head_object(Bucket=bucket, Key=key, **extra_args)
+    size: int = head.get("ContentLength", 0)
+    etag: str = head.get("ETag", "")
+
+    part_size, aligned = get_part_size(
+        client,
+        bucket,
+        key,
+        head,
+        transfer_config.multipart_chunksize,
+        extra_args,
+        transfer_config.max_concurrency,
+    )
+    ranges: List[Tuple[int, int]] = [
+        (start, min(start + part_size, size) - 1) for start in range(0, size, part_size)
+    ]
+
+    fd = os.open(destination_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _preallocate(fd, size)
+        digests: List[bytes] = [b""] * len(ranges)
+        with ThreadPoolExecutor(
+            max_workers=transfer_config.max_concurrency
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _download_range,
+                    client,
+                    bucket,
+                    key,
+                    etag,
+                    start,
+                    end,
+                    transfer_config,
+                    extra_args,
+                    partial(_pwrite, fd),
+                    callback,
+                ): index
+                for index, (start, end) in enumerate(ranges)
+            }
+            try:
+                for future in as_completed(futures):
+                    digests[futures[future]] = future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        _verify_checksum(fd, head, digests, aligned, part_size)
+    except BaseException:
+        os.close(fd)
+        os.remove(destination_path)
+        raise
+    os.close(fd)
+
+
+def get_part_size(
+    client,
+    bucket: str,
+    key: str,
+    head: Dict[str, Any],
+    chunksize: int,
+    extra_args: Dict[str, str],
+    max_workers: int = 1,
+) -> Tuple[int, bool]:
+    """Get the range size to use for the object.
+
+    Multipart uploaded objects are split by their original part size
+    when the parts are uniform, this way the multipart ETag could be verified.
+    The size of every part is confirmed with head_object, objects uploaded with
+    mixed part sizes or more than PART_CHECK_LIMIT parts fall back to the
+    configured part size without verification.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param bucket: bucket of the object
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param head: response of head_object
+    :type head: Dict[str, Any]
+    :param chunksize: configured part size
+    :type chunksize: int
+    :param extra_args: extra args for head_object, e.g. VersionId
+    :type extra_args: Dict[str, str]
+    :param max_workers: number of concurrent head_object calls to check the part sizes
+    :type max_workers: int, optional
+    :return: a tuple of the part size and whether it's aligned to the original parts
+    :rtype: Tuple[int, bool]
+    """
+    size = head.get("ContentLength", 0)
+    etag = head.get("ETag", "").strip('"')
+    if "-" not in etag or not _is_md5_etag(head):
+        return max(chunksize, 1), False
+    part = client.head_object(Bucket=bucket, Key=key, PartNumber=1, **extra_args)
+    part_size = part.get("ContentLength", 0)
+    parts_count = part.get("PartsCount", 0)
+    if parts_count > PART_CHECK_LIMIT:
+        print(
+            "checksum verification skipped: s3://%s/%s has %s parts"
+            % (bucket, key, parts_count)
+        )
+        return max(chunksize, 1), False
+    if (
+        part_size > 0
+        and -(-size // part_size) == parts_count
+        and _is_uniform_parts(
+            client, bucket, key, size, part_size, parts_count, extra_args, max_workers
+        )
+    ):
+        return part_size, True
+    return max(chunksize, 1), False
+
+
+def _is_uniform_parts(
+    client,
+    bucket: str,
+    key: str,
+    size: int,
+    part_size: int,
+    parts_count: int,
+    extra_args: Dict[str, str],
+    max_workers: int,
+) -> bool:
+    """Check the size of each part after the first one by head_object.
+
+    Every part should be the same size as the first one except the last part.
+
+    :return: True if all parts match, False when any part differ or failed to check
+    :rtype: bool
+    """
+    expected: Dict[int, int] = {
+        part_number: part_size for part_number in range(2, parts_count)
+    }
+    if parts_count > 1:
+        expected[parts_count] = size - part_size * (parts_count - 1)
+
+    def _get_size(part_number: int) -> int:
+        return client.head_object(
+            Bucket=bucket, Key=key, PartNumber=part_number, **extra_args
+        ).get("ContentLength", 0)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            sizes = executor.map(_get_size, list(expected))
+            return all(
+                part_size == expected[part_number]
+                for part_number, part_size in zip(expected, sizes)
+            )
+    except (ClientError, BotoCoreError):
+        return False
+
+
+def iter_ranges(
+    client,
+    bucket: str,
+    key: str,
+    etag: str,
+    start: int,
+    end: int,
+    transfer_config: TransferConfig,
+    version_id: Optional[str] = None,
+    part_size: Optional[int] = None,
+) -> Iterator[bytearray]:
+    """Yield the byte range start-end of a s3 object in order.
+
+    Ranges are fetched concurrently ahead of the consumer, the read-ahead
+    window start from a single range and double every time a range is consumed
+    up to max_concurrency, so a short peek doesn't fetch the whole object while
+    a long stream is not bottlenecked by a single connection. Memory usage is
+    capped at roughly max_concurrency * part_size.
+
+    :param client: boto3 s3 client
+    :type client: boto3.client
+    :param bucket: bucket of the object
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :param etag: ETag of the object, all ranges are pinned to the ETag
+    :type etag: str
+    :param start: first byte to read
+    :type start: int
+    :param end: last byte to read, inclusive
+    :type end: int
+    :param transfer_config: transfer config controlling the part size and concurrency
+    :type transfer_config: TransferConfig
+    :param version_id: version of the object to read
+    :type version_id: str, optional
+    :param part_size: size of each range, default to multipart_chunksize
+    :type part_size: int, optional
+    :return: generator of the ranges in order
+    :rtype: Iterator[bytearray]
+    """
+    extra_args = {"VersionId": version_id} if version_id else {}
+    part_size = max(part_size or transfer_config.multipart_chunksize, 1)
+    max_window = max(transfer_config.max_concurrency, 1)
+    ranges = (
+        (range_start, min(range_start + part_size, end + 1) - 1)
+        for range_start in range(start, end + 1, part_size)
+    )
+    window = 1
+    pending: Deque[Any] = deque()
+    with ThreadPoolExecutor(max_workers=max_window) as executor:
+        try:
+            while True:
+                while len(pending) < window:
+                    next_range = next(ranges, None)
+                    if not next_range:
+                        break
+                    pending.append(
+                        executor.submit(
+                            _read_range,
+                            client,
+                            bucket,
+                            key,
+                            etag,
+                            next_range[0],
+                            next_range[1],
+                            transfer_config,
+                            extra_args,
+                        )
+                    )
+                if not pending:
+                    break
+                data = pending.popleft().result()
+                window = min(window * 2, max_window)
+                yield data
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _read_range(
+    client,
+    bucket: str,
+    key: str,
+    etag: str,
+    start: int,
+    end: int,
+    transfer_config: TransferConfig,
+    extra_args: Dict[str, str],
+) -> bytearray:
+    """Read a byte range into memory.
+
+    :return: content of the range
+    :rtype: bytearray
+    """
+    buffer = bytearray(end - start + 1)
+
+    def write(data: bytes, offset: int) -> None:
+        buffer[offset - start : offset - start + len(data)] = data
+
+    _download_range(
+        client, bucket, key, etag, start, end, transfer_config, extra_args, write
+    )
+    return buffer
+
+
+def _download_range(
+    client,
+    bucket: str,
+    key: str,
+    etag: str,
+    start: int,
+    end: int,
+    transfer_config: TransferConfig,
+    extra_args: Dict[str, str],
+    write: Callable[[bytes, int], None],
+    callback: Optional[Callable[[int], None]] = None,
+) -> bytes:
+    """Download a byte range and write it to its offset through the write function.
+
+    A retried range is written again from the start offset.
+
+    :return: md5 digest of the range
+    :rtype: bytes
+    """
+    attempts = max(transfer_config.num_download_attempts, 1)
+    for attempt in range(attempts):
+        written = 0
+        md5 = hashlib.md5()
+        try:
+            response = client.get_object(
+                Bucket=bucket,
+                Key=key,
+                Range="bytes=%s-%s" % (start, end),
+                IfMatch=etag,
+                **extra_args
+            )
+            content_range = response.get("ContentRange", "")
+            if content_range.split("/")[0] != "bytes %s-%s" % (start, end):
+                raise S3Error(
+                    "Unexpected range %s, expected bytes %s-%s"
+                    % (content_range, start, end)
+                )
+            body = response["Body"]
+            while True:
+                chunk = body.read(transfer_config.io_chunksize)
+                if not chunk:
+                    break
+                write(chunk, start + written)
+                md5.update(chunk)
+                written += len(chunk)
+                if callback:
+                    callback(len(chunk))
+            if written != end - start + 1:
+                raise S3Error(
+                    "Range bytes %s-%s incomplete, received %s bytes"
+                    % (start, end, written)
+                )
+            return md5.digest()
+        except ClientError as e:
+            # object changed during download, retry won't help
+            if e.response["Error"]["Code"] in ("PreconditionFailed", "412"):
+                raise
+            if attempt == attempts - 1:
+                raise
+        except (BotoCoreError, S3Error, OSError):
+            if attempt == attempts - 1:
+                raise
+        if callback and written:
+            callback(-written)
+    raise S3Error("Failed to download range bytes %s-%s" % (start, end))
+
+
+def _verify_checksum(
+    fd: int,
+    head: Dict[str, Any],
+    digests: List[bytes],
+    aligned: bool,
+    part_size: int,
+) -> None:
+    """Verify the downloaded object against the ETag when possible.
+
+    :raises S3Error: when checksum doesn't match
+    """
+    if not _is_md5_etag(head):
+        return
+    etag = head.get("ETag", "").strip('"')
+    if "-" in etag:
+        if not aligned:
+            return
+        result = "%s-%s" % (
+            hashlib.md5(b"".join(digests)).hexdigest(),
+            len(digests),
+        )
+    elif len(digests) == 1:
+        result = digests[0].hex()
+    else:
+        # ranges of a plain md5 can't be combined, hash the written file in order
+        md5 = hashlib.md5()
+        offset = 0
+        while True:
+            chunk = os.pread(fd, part_size, offset)
+            if not chunk:
+                break
+            md5.update(chunk)
+            offset += len(chunk)
+        result = md5.hexdigest()
+    if result != etag:
+        raise S3Error("Checksum mismatch, expected %s got %s" % (etag, result))
+
+
+def _is_md5_etag(head: Dict[str, Any]) -> bool:
+    """Check if the ETag of the object is a md5 checksum.
+
+    ETag of objects encrypted by SSE-KMS or SSE-C are not md5 checksum.
+    """
+    return (
+        bool(head.get("ETag"))
+        and head.get("ServerSideEncryption") != "aws:kms"
+        and not head.get("SSECustomerAlgorithm")
+    )
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Preallocate the destination file to reduce fragmentation."""
+    if size <= 0:
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        os.ftruncate(fd, size)
+
+
+def _pwrite(fd: int, data: bytes, offset: int) -> None:
+    """Write all data to the offset, handle partial writes."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
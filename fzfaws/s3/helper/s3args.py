@@ -244,11 +244,11 @@ class S3Args:
         if original:
             acls = None
             if not version:
-                acls = self.s3.client.get_object_acl(
+                acls = self.s3.get_client().get_object_acl(
                     Bucket=self.s3.bucket_name, Key=self.s3.path_list[0]
                 )
             elif len(version) == 1:
-                acls = self.s3.client.get_object_acl(
+                acls = self.s3.get_client().get_object_acl(
                     Bucket=self.s3.bucket_name,
                     Key=self.s3.path_list[0],
                     VersionId=version[0].get("VersionId"),
@@ -362,11 +362,8 @@ class S3Args:
         if result:
             self._extra_args["ServerSideEncryption"] = result
         if result == "aws:kms":
-            current_region = self.s3.client.get_bucket_location(
-                Bucket=self.s3.bucket_name
-            )
-            current_region = current_region.get("LocationConstraint")
-            kms = KMS(self.s3.profile, self.s3.region)
+            # kms key has to be in the same region as the bucket
+            kms = KMS(self.s3.profile, self.s3.get_bucket_region())
             kms.set_keyids(header="select encryption key to use")
             self._extra_args["SSEKMSKeyId"] = kms.keyids[0]
 
@@ -392,7 +389,7 @@ class S3Args:
             original_tags: list = []
             original_values: str = ""
             if not version:
-                tags = self.s3.client.get_object_tagging(
+                tags = self.s3.get_client().get_object_tagging(
                     Bucket=self.s3.bucket_name,
                     Key=self.s3.path_list[0],
                 )
@@ -401,7 +398,7 @@ class S3Args:
                 original_values = "&".join(original_tags)
                 print("Orignal: %s" % original_values)
             elif len(version) == 1:
-                tags = self.s3.client.get_object_tagging(
+                tags = self.s3.get_client().get_object_tagging(
                     Bucket=self.s3.bucket_name,
                     Key=self.s3.path_list[0],
                     VersionId=version[0].get("VersionId"),
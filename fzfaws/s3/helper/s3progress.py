@@ -30,6 +30,8 @@ class S3Progress(object):
     :type client: boto3.client
     :param version_id: specify version id if download/copy is a version
     :type version_id: str
+    :param size: total size of the transfer, skip the size lookup when known
+    :type size: float, optional
     """
 
     def __init__(
@@ -38,13 +40,16 @@ class S3Progress(object):
         bucket: str = None,
         client=None,
         version_id: str = None,
+        size: Optional[float] = None,
     ) -> None:
         """Construct the progress bar instance."""
         self._filename: str = filename
         self._seen_so_far: float = 0
         self._lock = threading.Lock()
         self._size: float = 0
-        if bucket and client:
+        if size is not None:
+            self._size = float(size)
+        elif bucket and client:
             if not version_id:
                 self._size = client.head_object(Bucket=bucket, Key=filename).get(
                     "ContentLength"
@@ -80,7 +85,8 @@ class S3Progress(object):
             # remove the progress bar line
             sys.stdout.write("\033[2K\033[1G")
 
-    def human_readable_size(self, value: float) -> Optional[str]:
+    @staticmethod
+    def human_readable_size(value: float) -> Optional[str]:
         """Convert bytes to some human readable size.
 
         Copied from awscli, try to provide the same experience.
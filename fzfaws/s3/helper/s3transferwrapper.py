@@ -21,3 +21,12 @@ class S3TransferWrapper:
         self.transfer_config = TransferConfig(**raw_transfer_config)
         if client:
             self.s3transfer = S3Transfer(client, config=self.transfer_config)
+
+    @property
+    def max_workers(self) -> int:
+        """Return the number of workers of a concurrent s3 operation.
+
+        :return: max_concurrency of the transfer config, at least 1
+        :rtype: int
+        """
+        return max(self.transfer_config.max_concurrency, 1)
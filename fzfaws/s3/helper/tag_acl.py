@@ -0,0 +1,125 @@
+"""Contains the concurrent pipeline to update tags and acl of s3 objects."""
+from typing import Any, Dict, List, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import S3, get_bucket_limiter
+from fzfaws.utils.exceptions import S3Error
+from fzfaws.utils.throttle import (
+    RateLimiter,
+    call_with_retry,
+    raise_failures,
+    run_bounded,
+)
+
+
+def update_tag_acl(
+    s3: S3,
+    objects: List[Dict[str, str]],
+    check_result: Dict[str, Any],
+    merge: bool = False,
+) -> None:
+    """Update tags and acl of the objects concurrently.
+
+    Updates run on a pool sized by max_concurrency of the transfer config,
+    requests to the bucket are rate limited and throttled calls are retried.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param objects: objects to update, list of dict contains Key and optional VersionId
+    :type objects: List[Dict[str, str]]
+    :param check_result: tags and grants to update, return value of S3Args.check_tag_acl
+    :type check_result: Dict[str, Any]
+    :param merge: merge the tags with the existing tags of each object
+    :type merge: bool, optional
+    :raises S3Error: when any of the objects failed to update
+    """
+    client = s3.get_client()
+    limiter = get_bucket_limiter(s3.bucket_name)
+    failed: List[Tuple[str, str]] = []
+
+    def _update(s3_object: Dict[str, str]) -> None:
+        update_object_tag_acl(
+            client, limiter, s3.bucket_name, s3_object, check_result, merge
+        )
+
+    for s3_object, future in run_bounded(
+        _update, objects, S3TransferWrapper().max_workers
+    ):
+        name = "s3://%s/%s" % (s3.bucket_name, s3_object.get("Key"))
+        if s3_object.get("VersionId"):
+            name += " with version %s" % s3_object.get("VersionId")
+        try:
+            future.result()
+        except (ClientError, BotoCoreError) as e:
+            failed.append((name, str(e)))
+            continue
+        print("update: %s" % name)
+
+    raise_failures(failed, S3Error, "%s objects failed to update")
+
+
+def update_object_tag_acl(
+    client,
+    limiter: RateLimiter,
+    bucket: str,
+    s3_object: Dict[str, str],
+    check_result: Dict[str, Any],
+    merge: bool = False,
+) -> None:
+    """Update tags and acl of a single object or version.
+
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param limiter: rate limiter of the bucket
+    :type limiter: RateLimiter
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param s3_object: dict contains Key and optional VersionId
+    :type s3_object: Dict[str, str]
+    :param check_result: tags and grants to update
+    :type check_result: Dict[str, Any]
+    :param merge: merge the tags with the existing tags of the object
+    :type merge: bool, optional
+    """
+    object_args = {"Bucket": bucket, "Key": s3_object.get("Key")}
+    if s3_object.get("VersionId"):
+        object_args["VersionId"] = s3_object.get("VersionId")
+
+    if check_result.get("Tags"):
+        tags = check_result["Tags"]
+        if merge:
+            response = call_with_retry(
+                client.get_object_tagging, limiter, **object_args
+            )
+            tags = merge_tags(response.get("TagSet", []), tags)
+        call_with_retry(
+            client.put_object_tagging, limiter, Tagging={"TagSet": tags}, **object_args
+        )
+    if check_result.get("Grants"):
+        call_with_retry(
+            client.put_object_acl,
+            limiter,
+            **object_args,
+            **check_result.get("Grants", {})
+        )
+
+
+def merge_tags(
+    original: List[Dict[str, str]], tags: List[Dict[str, str]]
+) -> List[Dict[str, str]]:
+    """Merge the new tags into the original tags.
+
+    Tags with the same key are overwritten by the new value.
+
+    :param original: original tag set of the object
+    :type original: List[Dict[str, str]]
+    :param tags: new tags to set
+    :type tags: List[Dict[str, str]]
+    :return: merged tag set
+    :rtype: List[Dict[str, str]]
+    """
+    merged: Dict[str, str] = {tag["Key"]: tag["Value"] for tag in original}
+    merged.update({tag["Key"]: tag["Value"] for tag in tags})
+    return [{"Key": key, "Value": value} for key, value in merged.items()]
@@ -3,7 +3,7 @@ import os
 import re
 from typing import List, Optional, Tuple
 
-from fzfaws.s3.helper.exclude_file import exclude_file
+from fzfaws.s3.helper.exclude_file import get_matcher
 from fzfaws.utils.exceptions import InvalidS3PathPattern
 
 
@@ -64,11 +64,17 @@ def walk_s3_folder(
         exclude = []
     if include is None:
         include = []
+    matcher = get_matcher(exclude, include)
+    if matcher.can_skip(bucket_path):
+        return file_list
 
     paginator = client.get_paginator("list_objects")
     for result in paginator.paginate(Bucket=bucket, Delimiter="/", Prefix=bucket_path):
         if result.get("CommonPrefixes") is not None:
             for subdir in result.get("CommonPrefixes"):
+                if matcher.can_skip(subdir.get("Prefix")):
+                    # every object under the prefix is excluded, skip listing it
+                    continue
                 file_list = walk_s3_folder(
                     client,
                     bucket,
@@ -85,7 +91,7 @@ def walk_s3_folder(
             if file.get("Key").endswith("/") or not file.get("Key"):
                 # user created dir in S3 console will appear in the result and is not downloadable
                 continue
-            if exclude_file(exclude, include, file.get("Key")):
+            if matcher.is_excluded(file.get("Key")):
                 continue
             if not root:
                 dest_pathname = os.path.join(destination_path, file.get("Key"))
@@ -1,9 +1,21 @@
 """Contains function to list information of s3."""
 import json
-from typing import Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Union
 
+from botocore.exceptions import ClientError
+
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
 from fzfaws.s3.s3 import S3
 
+# optional bucket configuration could be denied without denying the listing
+PERMISSION_ERROR_CODES = {
+    "AccessDenied",
+    "AccessDeniedException",
+    "AllAccessDisabled",
+    "UnauthorizedOperation",
+}
+
 
 def ls_s3(
     profile: Union[str, bool] = False,
@@ -46,8 +58,7 @@ def ls_s3(
         s3.set_s3_bucket(no_progress=True)
 
     if bucket and url:
-        response = s3.client.get_bucket_location(Bucket=s3.bucket_name)
-        bucket_location = response["LocationConstraint"]
+        bucket_location = s3.get_bucket_region()
         print(
             "https://s3-%s.amazonaws.com/%s/"
             % (
@@ -123,6 +134,9 @@ def get_detailed_info(
 ) -> None:
     """Print detailed information about bucket, object or version.
 
+    Detail calls are sent concurrently, object details are printed
+    as soon as each object completes.
+
     :param s3: S3 instance
     :type s3: S3
     :param bucket: print detailed information about the bucket
@@ -132,77 +146,138 @@ def get_detailed_info(
     :param obj_version: list of object versions to print details
     :type obj_version: List[Dict[str, str]]
     """
+    client = s3.get_client()
     if bucket:
-        response = {}
-        acls = s3.client.get_bucket_acl(Bucket=s3.bucket_name)
-        versions = s3.client.get_bucket_versioning(Bucket=s3.bucket_name)
-        region = s3.client.get_bucket_location(Bucket=s3.bucket_name)
-        response["Owner"] = acls.get("Owner")
-        response["Region"] = region.get("LocationConstraint")
-        try:
-            encryption = s3.client.get_bucket_encryption(Bucket=s3.bucket_name)
-            response["Encryption"] = encryption.get("ServerSideEncryptionConfiguration")
-        except:
-            response["Encryption"] = None
-        try:
-            public = s3.client.get_bucket_policy_status(Bucket=s3.bucket_name)
-            response["Public"] = public.get("PolicyStatus").get("IsPublic")
-            policy = s3.client.get_bucket_policy(Bucket=s3.bucket_name)
-            response["Policy"] = policy.get("Policy")
-        except:
-            pass
-        response["Grants"] = acls.get("Grants")
-        response["Versioning"] = versions.get("Status")
-        response["MFA"] = versions.get("MFADelete")
-        try:
-            tags = s3.client.get_bucket_tagging(Bucket=s3.bucket_name)
-            response["Tags"] = tags.get("TagSet")
-        except:
-            response["Tags"] = None
         print(80 * "-")
         print("s3://%s" % s3.bucket_name)
+        response = get_bucket_detail(s3, client)
         print(json.dumps(response, indent=4, default=str))
+        return
 
-    elif version:
-        for obj_version in obj_versions:
-            response = s3.client.head_object(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                VersionId=obj_version.get("VersionId"),
-            )
-            tags = s3.client.get_object_tagging(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                VersionId=obj_version.get("VersionId"),
-            )
-            acls = s3.client.get_object_acl(
-                Bucket=s3.bucket_name,
-                Key=obj_version.get("Key"),
-                VersionId=obj_version.get("VersionId"),
+    objects: List[Dict[str, str]] = (
+        obj_versions if version else [{"Key": s3_key} for s3_key in s3.path_list]
+    )
+    max_workers = min(S3TransferWrapper().max_workers, len(objects))
+    if not max_workers:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for s3_object in objects:
+            future = executor.submit(
+                get_object_detail, client, s3.bucket_name, s3_object
             )
-            response.pop("ResponseMetadata", None)
-            response["Tags"] = tags.get("TagSet")
-            response["Owner"] = acls.get("Owner")
-            response["Grants"] = acls.get("Grants")
+            futures[future] = s3_object
+        for future in as_completed(futures):
+            s3_object = futures[future]
+            response = future.result()
             print(80 * "-")
-            print(
-                "s3://%s/%s versioned %s"
-                % (s3.bucket_name, obj_version.get("Key"), obj_version.get("VersionId"))
-            )
+            if version:
+                print(
+                    "s3://%s/%s versioned %s"
+                    % (s3.bucket_name, s3_object.get("Key"), s3_object.get("VersionId"))
+                )
+            else:
+                print("s3://%s/%s" % (s3.bucket_name, s3_object.get("Key")))
             print(json.dumps(response, indent=4, default=str))
 
-    else:
-        for s3_key in s3.path_list:
-            response = s3.client.head_object(
-                Bucket=s3.bucket_name,
-                Key=s3_key,
+
+def get_bucket_detail(s3: S3, client) -> Dict[str, Any]:
+    """Fetch the details of the bucket concurrently.
+
+    Configuration that is not set on the bucket or not permitted to read
+    is reported as None instead of failing the whole listing.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :return: details of the bucket
+    :rtype: Dict[str, Any]
+    """
+    calls = {
+        "acl": (client.get_bucket_acl, None),
+        "versioning": (client.get_bucket_versioning, None),
+        "encryption": (
+            client.get_bucket_encryption,
+            "ServerSideEncryptionConfigurationNotFoundError",
+        ),
+        "public": (client.get_bucket_policy_status, "NoSuchBucketPolicy"),
+        "policy": (client.get_bucket_policy, "NoSuchBucketPolicy"),
+        "tags": (client.get_bucket_tagging, "NoSuchTagSet"),
+    }
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = {
+            name: executor.submit(
+                get_optional, func, missing_code, Bucket=s3.bucket_name
             )
-            tags = s3.client.get_object_tagging(Bucket=s3.bucket_name, Key=s3_key)
-            acls = s3.client.get_object_acl(Bucket=s3.bucket_name, Key=s3_key)
-            response.pop("ResponseMetadata", None)
-            response["Tags"] = tags.get("TagSet")
-            response["Owner"] = acls.get("Owner")
-            response["Grants"] = acls.get("Grants")
-            print(80 * "-")
-            print("s3://%s/%s" % (s3.bucket_name, s3_key))
-            print(json.dumps(response, indent=4, default=str))
+            for name, (func, missing_code) in calls.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    response: Dict[str, Any] = {}
+    response["Owner"] = results["acl"].get("Owner")
+    response["Region"] = s3.get_bucket_region()
+    response["Encryption"] = (results["encryption"] or {}).get(
+        "ServerSideEncryptionConfiguration"
+    )
+    if results["public"] is not None:
+        response["Public"] = results["public"].get("PolicyStatus", {}).get("IsPublic")
+    if results["policy"] is not None:
+        response["Policy"] = results["policy"].get("Policy")
+    response["Grants"] = results["acl"].get("Grants")
+    response["Versioning"] = results["versioning"].get("Status")
+    response["MFA"] = results["versioning"].get("MFADelete")
+    response["Tags"] = (results["tags"] or {}).get("TagSet")
+    return response
+
+
+def get_object_detail(client, bucket: str, s3_object: Dict[str, str]) -> Dict[str, Any]:
+    """Fetch the head, tags and acl of the object or version.
+
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param s3_object: dict contains Key and optional VersionId
+    :type s3_object: Dict[str, str]
+    :return: details of the object
+    :rtype: Dict[str, Any]
+    """
+    object_args = {"Bucket": bucket, "Key": s3_object.get("Key")}
+    if s3_object.get("VersionId"):
+        object_args["VersionId"] = s3_object.get("VersionId")
+    response = client.head_object(**object_args)
+    tags = client.get_object_tagging(**object_args)
+    acls = client.get_object_acl(**object_args)
+    response.pop("ResponseMetadata", None)
+    response["Tags"] = tags.get("TagSet")
+    response["Owner"] = acls.get("Owner")
+    response["Grants"] = acls.get("Grants")
+    return response
+
+
+def get_optional(
+    func: Callable[..., Dict[str, Any]], missing_code: Optional[str], **kwargs
+) -> Optional[Dict[str, Any]]:
+    """Call the api and return None when the configuration is unavailable.
+
+    The configuration is unavailable when it is not set on the bucket
+    or the caller doesn't have the permission to read it.
+
+    :param func: boto3 client method to call
+    :type func: Callable[..., Dict[str, Any]]
+    :param missing_code: error code returned when the configuration is not set
+    :type missing_code: str, optional
+    :raises ClientError: when the call failed for other reasons
+    :return: response of the call or None if the configuration is unavailable
+    :rtype: Optional[Dict[str, Any]]
+    """
+    try:
+        return func(**kwargs)
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code")
+        if missing_code and (
+            error_code == missing_code or error_code in PERMISSION_ERROR_CODES
+        ):
+            return None
+        raise
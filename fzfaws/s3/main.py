@@ -4,11 +4,16 @@ import sys
 from typing import Any, List
 
 from fzfaws.s3.bucket_s3 import bucket_s3
+from fzfaws.s3.cat_s3 import cat_s3
 from fzfaws.s3.delete_s3 import delete_s3
 from fzfaws.s3.download_s3 import download_s3
 from fzfaws.s3.ls_s3 import ls_s3
+from fzfaws.s3.multipart_s3 import multipart_s3
 from fzfaws.s3.object_s3 import object_s3
-from fzfaws.s3.presign_s3 import presign_s3
+from fzfaws.s3.presign_s3 import PRESIGN_OUTPUTS, presign_s3
+from fzfaws.s3.restore_s3 import POLL_INTERVAL, RESTORE_TIERS, restore_s3
+from fzfaws.s3.search_s3 import search_s3
+from fzfaws.s3.undelete_s3 import undelete_s3
 from fzfaws.s3.upload_s3 import upload_s3
 from fzfaws.utils.pyfzf import Pyfzf
 
@@ -90,7 +95,7 @@ def s3(raw_args: List[Any]) -> None:
         "--hidden",
         action="store_true",
         default=False,
-        help="include hidden files during file search, useful when fd is installed",
+        help="include hidden files during file search",
     )
     upload_cmd.add_argument(
         "-E",
@@ -99,6 +104,23 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="configure extra settings for the upload operation (e.g. ACL, StorageClass, Encryption)",
     )
+    upload_cmd.add_argument(
+        "-z",
+        "--compress",
+        nargs="?",
+        action="store",
+        choices=["gzip", "zstd"],
+        const="gzip",
+        default="",
+        help="compress files on the fly and set the Content-Encoding, default gzip (zstd requires zstandard)",
+    )
+    upload_cmd.add_argument(
+        "-u",
+        "--skip-unchanged",
+        action="store_true",
+        default=False,
+        help="skip files unchanged since the last upload during recursive upload, compared by size, time and ETag",
+    )
     upload_cmd.add_argument(
         "-P",
         "--profile",
@@ -169,7 +191,7 @@ def s3(raw_args: List[Any]) -> None:
         "--hidden",
         action="store_true",
         default=False,
-        help="include hidden directories during directory search, useful when fd is installed",
+        help="include hidden directories during directory search",
     )
     download_cmd.add_argument(
         "-v",
@@ -178,6 +200,13 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="choose versions of the object to download, does not support recursive flag",
     )
+    download_cmd.add_argument(
+        "-z",
+        "--decompress",
+        action="store_true",
+        default=False,
+        help="decompress gzip/zstd encoded objects on the fly and strip the compression suffix",
+    )
     download_cmd.add_argument(
         "-P",
         "--profile",
@@ -339,6 +368,153 @@ def s3(raw_args: List[Any]) -> None:
         help="choose/specify a profile for the operation",
     )
 
+    undelete_cmd = subparsers.add_parser(
+        "undelete",
+        description="Restore deleted objects under a prefix of a versioned bucket by removing their delete markers.",
+    )
+    undelete_cmd.add_argument(
+        "-b",
+        "--bucketpath",
+        nargs=1,
+        action="store",
+        default=[],
+        help="specify a s3 path (bucketName/path/ or bucketName/) and skip s3 bucket/path selection",
+    )
+    undelete_cmd.add_argument(
+        "-s",
+        "--since",
+        nargs=1,
+        action="store",
+        default=[],
+        help="only restore objects deleted after the time, relative (e.g. 30m, 2h, 1d) or timestamp (e.g. 2020-01-01T10:00:00Z)",
+    )
+    undelete_cmd.add_argument(
+        "-u",
+        "--until",
+        nargs=1,
+        action="store",
+        default=[],
+        help="only restore objects deleted before the time, relative (e.g. 30m, 2h, 1d) or timestamp (e.g. 2020-01-01T10:00:00Z)",
+    )
+    undelete_cmd.add_argument(
+        "-m",
+        "--mfa",
+        nargs=2,
+        action="store",
+        default=[],
+        help="perform MFA deletion, require two arguments: the authentication device serial number "
+        + "and the value that is displayed on the authentication device",
+    )
+    undelete_cmd.add_argument(
+        "-P",
+        "--profile",
+        nargs="?",
+        action="store",
+        default=False,
+        help="choose/specify a profile for the operation",
+    )
+
+    restore_cmd = subparsers.add_parser(
+        "restore",
+        description="Restore archived objects under a prefix from glacier or deep archive and track the restore status.",
+    )
+    restore_cmd.add_argument(
+        "-b",
+        "--bucketpath",
+        nargs=1,
+        action="store",
+        default=[],
+        help="specify a s3 path (bucketName/path/ or bucketName/) and skip s3 bucket/path selection",
+    )
+    restore_cmd.add_argument(
+        "-t",
+        "--tier",
+        nargs=1,
+        action="store",
+        choices=RESTORE_TIERS,
+        default=["Standard"],
+        help="retrieval tier of the restore, default is Standard",
+    )
+    restore_cmd.add_argument(
+        "-d",
+        "--days",
+        nargs=1,
+        action="store",
+        type=int,
+        default=[1],
+        help="number of days the restored copy is available, default is 1 day",
+    )
+    restore_cmd.add_argument(
+        "-w",
+        "--wait",
+        action="store_true",
+        default=False,
+        help="keep checking the restore status until all objects are restored",
+    )
+    restore_cmd.add_argument(
+        "-D",
+        "--download",
+        nargs=1,
+        action="store",
+        default=[],
+        help="download objects to the local directory once they are restored, implies --wait",
+    )
+    restore_cmd.add_argument(
+        "-i",
+        "--interval",
+        nargs=1,
+        action="store",
+        type=int,
+        default=[POLL_INTERVAL],
+        help="seconds between each restore status check, default is %s seconds"
+        % POLL_INTERVAL,
+    )
+    restore_cmd.add_argument(
+        "-P",
+        "--profile",
+        nargs="?",
+        action="store",
+        default=False,
+        help="choose/specify a profile for the operation",
+    )
+
+    multipart_cmd = subparsers.add_parser(
+        "multipart",
+        description="Find incomplete multipart uploads across buckets and abort them.",
+    )
+    multipart_cmd.add_argument(
+        "-b",
+        "--bucket",
+        nargs="+",
+        action="store",
+        default=[],
+        help="specify buckets to scan, default to scan all buckets",
+    )
+    multipart_cmd.add_argument(
+        "-s",
+        "--select",
+        action="store_true",
+        default=False,
+        help="select buckets to scan through fzf",
+    )
+    multipart_cmd.add_argument(
+        "-o",
+        "--older",
+        nargs=1,
+        action="store",
+        type=int,
+        default=[],
+        help="skip selection and abort all uploads initiated more than the specified days ago",
+    )
+    multipart_cmd.add_argument(
+        "-P",
+        "--profile",
+        nargs="?",
+        action="store",
+        default=False,
+        help="choose/specify a profile for the operation",
+    )
+
     presign_cmd = subparsers.add_parser(
         "presign",
         description="Generate presign url for GET operation on the selected object based on the current profile permission.",
@@ -358,6 +534,30 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="generate presign url on specific object versions",
     )
+    presign_cmd.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        default=False,
+        help="presign all objects under the selected path, urls are signed locally and streamed as ndjson by default",
+    )
+    presign_cmd.add_argument(
+        "-f",
+        "--file",
+        nargs=1,
+        action="store",
+        default=[],
+        help="presign keys read from a file (one key or s3://bucket/key per line), use - to read from stdin",
+    )
+    presign_cmd.add_argument(
+        "-o",
+        "--output",
+        nargs=1,
+        action="store",
+        default=[],
+        choices=PRESIGN_OUTPUTS,
+        help="output the presigned urls as ndjson, csv or tsv",
+    )
     presign_cmd.add_argument(
         "-e",
         "--expires",
@@ -430,6 +630,13 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="update the name of the selected object",
     )
+    object_cmd.add_argument(
+        "-m",
+        "--merge",
+        action="store_true",
+        default=False,
+        help="merge the new tags with the existing tags of the objects instead of replacing them",
+    )
     object_cmd.add_argument(
         "-P",
         "--profile",
@@ -508,6 +715,110 @@ def s3(raw_args: List[Any]) -> None:
         default=False,
         help="choose/specify a profile for the operation",
     )
+
+    cat_cmd = subparsers.add_parser(
+        "cat", description="Stream s3 objects to stdout, useful for piping."
+    )
+    cat_cmd.add_argument(
+        "-b",
+        "--bucketpath",
+        nargs=1,
+        action="store",
+        default=[],
+        help="specify a s3 path (bucketName/filename or bucketName/path/ or bucketName/) and skip s3 bucket/path selection",
+    )
+    cat_cmd.add_argument(
+        "-v",
+        "--version",
+        action="store_true",
+        default=False,
+        help="choose versions of the object to stream",
+    )
+    cat_cmd.add_argument(
+        "-c",
+        "--bytes",
+        nargs=1,
+        action="store",
+        default=[],
+        help="only stream a byte range of the object (e.g. 0-1023, 1024-, -1024 for the last 1024 bytes, 1024 for the first 1024 bytes), must start at 0 with -z",
+    )
+    cat_cmd.add_argument(
+        "-n",
+        "--lines",
+        nargs=1,
+        action="store",
+        type=int,
+        default=[0],
+        help="only stream the first n lines of each object",
+    )
+    cat_cmd.add_argument(
+        "-z",
+        "--decompress",
+        action="store_true",
+        default=False,
+        help="decompress gzip/zstd encoded objects on the fly",
+    )
+    cat_cmd.add_argument(
+        "-P",
+        "--profile",
+        nargs="?",
+        action="store",
+        default=False,
+        help="choose/specify a profile for the operation",
+    )
+
+    search_cmd = subparsers.add_parser(
+        "search",
+        description="Search keys matching a prefix or glob pattern across buckets, then download, delete or presign the selected keys.",
+    )
+    search_cmd.add_argument(
+        "-p",
+        "--pattern",
+        nargs=1,
+        action="store",
+        default=[],
+        help="key prefix or bash style globbing pattern to search (e.g. logs/ or logs/*.json)",
+    )
+    search_cmd.add_argument(
+        "-b",
+        "--bucket",
+        nargs="+",
+        action="store",
+        default=[],
+        help="specify buckets to search, default to search all buckets",
+    )
+    search_cmd.add_argument(
+        "-s",
+        "--select",
+        action="store_true",
+        default=False,
+        help="select buckets to search through fzf",
+    )
+    search_cmd.add_argument(
+        "-a",
+        "--action",
+        nargs=1,
+        action="store",
+        choices=["download", "delete", "presign"],
+        default=[],
+        help="action to perform on the selected keys, skip the action selection",
+    )
+    search_cmd.add_argument(
+        "-e",
+        "--expires",
+        nargs=1,
+        action="store",
+        default=[3600],
+        help="specify an expiration period of the presign url in seconds, default is 3600 seconds",
+    )
+    search_cmd.add_argument(
+        "-P",
+        "--profile",
+        nargs="?",
+        action="store",
+        default=False,
+        help="choose/specify a profile for the operation",
+    )
     args = parser.parse_args(raw_args)
 
     if not raw_args:
@@ -516,9 +827,14 @@ def s3(raw_args: List[Any]) -> None:
             "download",
             "bucket",
             "delete",
+            "undelete",
+            "restore",
+            "multipart",
             "object",
             "ls",
             "presign",
+            "cat",
+            "search",
         ]
         fzf = Pyfzf()
         for command in available_commands:
@@ -535,12 +851,22 @@ def s3(raw_args: List[Any]) -> None:
             bucket_cmd.print_help()
         elif selected_command == "delete":
             delete_cmd.print_help()
+        elif selected_command == "undelete":
+            undelete_cmd.print_help()
+        elif selected_command == "restore":
+            restore_cmd.print_help()
+        elif selected_command == "multipart":
+            multipart_cmd.print_help()
         elif selected_command == "object":
             object_cmd.print_help()
         elif selected_command == "ls":
             ls_cmd.print_help()
         elif selected_command == "presign":
             presign_cmd.print_help()
+        elif selected_command == "cat":
+            cat_cmd.print_help()
+        elif selected_command == "search":
+            search_cmd.print_help()
         sys.exit(0)
 
     if args.profile == None:
@@ -561,6 +887,8 @@ def s3(raw_args: List[Any]) -> None:
             args.exclude,
             args.include,
             args.extra,
+            args.compress,
+            args.skip_unchanged,
         )
     elif args.subparser_name == "download":
         local_path = args.path[0] if args.path else None
@@ -575,6 +903,7 @@ def s3(raw_args: List[Any]) -> None:
             args.include,
             args.hidden,
             args.version,
+            args.decompress,
         )
     elif args.subparser_name == "bucket":
         from_bucket = args.bucketpath[0] if args.bucketpath else None
@@ -604,8 +933,37 @@ def s3(raw_args: List[Any]) -> None:
             args.deletemark,
             args.clean,
         )
+    elif args.subparser_name == "undelete":
+        since = args.since[0] if args.since else ""
+        until = args.until[0] if args.until else ""
+        mfa = " ".join(args.mfa)
+        undelete_s3(args.profile, args.bucketpath, since, until, mfa)
+    elif args.subparser_name == "restore":
+        download = args.download[0] if args.download else ""
+        restore_s3(
+            args.profile,
+            args.bucketpath,
+            args.tier[0],
+            args.days[0],
+            args.wait,
+            download,
+            args.interval[0],
+        )
+    elif args.subparser_name == "multipart":
+        older_than = args.older[0] if args.older else None
+        multipart_s3(args.profile, args.bucket, args.select, older_than)
     elif args.subparser_name == "presign":
-        presign_s3(args.profile, args.bucketpath, args.version, int(args.expires[0]))
+        key_file = args.file[0] if args.file else ""
+        output = args.output[0] if args.output else ""
+        presign_s3(
+            args.profile,
+            args.bucketpath,
+            args.version,
+            int(args.expires[0]),
+            args.recursive,
+            key_file,
+            output,
+        )
     elif args.subparser_name == "object":
         object_s3(
             args.profile,
@@ -616,6 +974,7 @@ def s3(raw_args: List[Any]) -> None:
             args.exclude,
             args.include,
             args.name,
+            merge=args.merge,
         )
     elif args.subparser_name == "ls":
         ls_s3(
@@ -630,3 +989,24 @@ def s3(raw_args: List[Any]) -> None:
             args.versionid,
             args.bucketpath,
         )
+    elif args.subparser_name == "cat":
+        byte_range = args.bytes[0] if args.bytes else ""
+        cat_s3(
+            args.profile,
+            args.bucketpath,
+            args.version,
+            byte_range,
+            args.lines[0],
+            args.decompress,
+        )
+    elif args.subparser_name == "search":
+        pattern = args.pattern[0] if args.pattern else ""
+        action = args.action[0] if args.action else ""
+        search_s3(
+            args.profile,
+            pattern,
+            args.bucket,
+            args.select,
+            action,
+            int(args.expires[0]),
+        )
@@ -0,0 +1,206 @@
+"""Contains function to find and abort incomplete multipart uploads."""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.s3.helper.s3progress import S3Progress
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import S3, get_bucket_limiter
+from fzfaws.utils import Pyfzf, Spinner, get_confirmation
+from fzfaws.utils.exceptions import S3Error
+from fzfaws.utils.throttle import call_with_retry, raise_failures, run_bounded
+
+
+def multipart_s3(
+    profile: Union[str, bool] = False,
+    buckets: Optional[List[str]] = None,
+    select_bucket: bool = False,
+    older_than: Optional[int] = None,
+) -> None:
+    """Find incomplete multipart uploads and abort them.
+
+    Buckets and the parts of each upload are listed concurrently, uploads
+    are selected through fzf or all uploads older than the given days are aborted.
+
+    :param profile: profile to use for this operation
+    :type profile: Union[str, bool], optional
+    :param buckets: buckets to scan, default to all buckets
+    :type buckets: List[str], optional
+    :param select_bucket: select buckets to scan through fzf
+    :type select_bucket: bool, optional
+    :param older_than: skip selection, abort all uploads initiated more than the days ago
+    :type older_than: int, optional
+    :raises S3Error: when any of the uploads failed to abort
+    """
+    s3 = S3(profile)
+    if not buckets:
+        with Spinner.spin(message="Fetching s3 buckets ..."):
+            response = s3.client.list_buckets()
+        buckets = [bucket["Name"] for bucket in response.get("Buckets", [])]
+        if select_bucket:
+            fzf = Pyfzf()
+            for bucket in buckets:
+                fzf.append_fzf("%s\n" % bucket)
+            buckets = list(
+                fzf.execute_fzf(
+                    print_col=1, multi_select=True, header="select buckets to scan"
+                )
+            )
+
+    skipped: List[Tuple[str, str]] = []
+    with Spinner.spin(message="Scanning multipart uploads ..."):
+        uploads = scan_uploads(s3, buckets, older_than, skipped)
+    for bucket, reason in skipped:
+        print("skipped: s3://%s (%s)" % (bucket, reason))
+    if not uploads:
+        print("No incomplete multipart uploads found")
+        return
+
+    if older_than is None:
+        fzf = Pyfzf()
+        fzf.process_list(
+            uploads, "UploadId", "Bucket", "Key", "Initiated", "Age", "Size", "Parts"
+        )
+        selected_ids = set(
+            fzf.execute_fzf(
+                print_col=2, multi_select=True, header="select uploads to abort"
+            )
+        )
+        uploads = [upload for upload in uploads if upload["UploadId"] in selected_ids]
+
+    total_size = 0
+    for upload in uploads:
+        print(
+            "(dryrun) abort: s3://%s/%s (%s, %s)"
+            % (upload["Bucket"], upload["Key"], upload["Age"], upload["Size"])
+        )
+        total_size += upload["Bytes"]
+    print(
+        "(dryrun) %s uploads to abort, %s"
+        % (len(uploads), S3Progress.human_readable_size(total_size))
+    )
+    if get_confirmation("Confirm?"):
+        abort_uploads(s3, uploads)
+
+
+def scan_uploads(
+    s3: S3,
+    buckets: List[str],
+    older_than: Optional[int] = None,
+    skipped: Optional[List[Tuple[str, str]]] = None,
+) -> List[Dict[str, Any]]:
+    """Scan incomplete multipart uploads of the buckets concurrently.
+
+    Size of each upload is the sum of its uploaded parts, parts
+    of different uploads are listed concurrently.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param buckets: buckets to scan
+    :type buckets: List[str]
+    :param older_than: only return uploads initiated more than the days ago
+    :type older_than: int, optional
+    :param skipped: buckets unable to scan and the reason are appended to the list
+    :type skipped: List[Tuple[str, str]], optional
+    :return: list of uploads sorted by initiated time, oldest first
+    :rtype: List[Dict[str, Any]]
+    """
+    if skipped is None:
+        skipped = []
+    max_workers = S3TransferWrapper().max_workers
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=older_than) if older_than is not None else None
+
+    def _list(bucket: str) -> List[Dict[str, Any]]:
+        paginator = s3.get_client(bucket).get_paginator("list_multipart_uploads")
+        return [
+            {"Bucket": bucket, **upload}
+            for page in paginator.paginate(Bucket=bucket)
+            for upload in page.get("Uploads", [])
+            if cutoff is None or upload["Initiated"] < cutoff
+        ]
+
+    uploads: List[Dict[str, Any]] = []
+    for bucket, future in run_bounded(_list, buckets, max_workers):
+        try:
+            uploads.extend(future.result())
+        except (ClientError, BotoCoreError) as e:
+            skipped.append((bucket, str(e)))
+
+    def _parts(upload: Dict[str, Any]) -> Tuple[int, int]:
+        paginator = s3.get_client(upload["Bucket"]).get_paginator("list_parts")
+        size, parts = 0, 0
+        for page in paginator.paginate(
+            Bucket=upload["Bucket"], Key=upload["Key"], UploadId=upload["UploadId"]
+        ):
+            for part in page.get("Parts", []):
+                size += part.get("Size", 0)
+                parts += 1
+        return size, parts
+
+    results: List[Dict[str, Any]] = []
+    for upload, future in run_bounded(_parts, uploads, max_workers):
+        try:
+            size, parts = future.result()
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchUpload":
+                # completed or aborted during the scan
+                continue
+            skipped.append((upload["Bucket"], str(e)))
+            continue
+        except BotoCoreError as e:
+            skipped.append((upload["Bucket"], str(e)))
+            continue
+        results.append(
+            {
+                "Bucket": upload["Bucket"],
+                "Key": upload["Key"],
+                "UploadId": upload["UploadId"],
+                "Initiated": upload["Initiated"].isoformat(),
+                "Age": "%sd" % (now - upload["Initiated"]).days,
+                "Size": S3Progress.human_readable_size(size),
+                "Parts": parts,
+                "Bytes": size,
+            }
+        )
+    return sorted(results, key=lambda upload: upload["Initiated"])
+
+
+def abort_uploads(s3: S3, uploads: List[Dict[str, Any]]) -> None:
+    """Abort the multipart uploads concurrently.
+
+    Requests to each bucket are rate limited and throttled calls are retried,
+    uploads already completed or aborted are ignored.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param uploads: uploads to abort, return value of scan_uploads
+    :type uploads: List[Dict[str, Any]]
+    :raises S3Error: when any of the uploads failed to abort
+    """
+    max_workers = S3TransferWrapper().max_workers
+
+    def _abort(upload: Dict[str, Any]) -> None:
+        try:
+            call_with_retry(
+                s3.get_client(upload["Bucket"]).abort_multipart_upload,
+                get_bucket_limiter(upload["Bucket"]),
+                Bucket=upload["Bucket"],
+                Key=upload["Key"],
+                UploadId=upload["UploadId"],
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                raise
+
+    failed: List[Tuple[str, str]] = []
+    for upload, future in run_bounded(_abort, uploads, max_workers):
+        try:
+            future.result()
+        except (ClientError, BotoCoreError) as e:
+            failed.append(("s3://%s/%s" % (upload["Bucket"], upload["Key"]), str(e)))
+            continue
+        print("abort: s3://%s/%s" % (upload["Bucket"], upload["Key"]))
+
+    raise_failures(failed, S3Error, "%s uploads failed to abort")
@@ -2,10 +2,12 @@
 from typing import List, Optional, Union
 
 from fzfaws.s3 import S3
+from fzfaws.s3.helper.bulk_rewrite import rewrite_objects
 from fzfaws.s3.helper.get_copy_args import get_copy_args
 from fzfaws.s3.helper.s3args import S3Args
 from fzfaws.s3.helper.s3progress import S3Progress
 from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.helper.tag_acl import update_tag_acl
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 from fzfaws.utils import get_confirmation
 
@@ -24,6 +26,7 @@ def object_s3(
     metadata: bool = False,
     tagging: bool = False,
     acl: bool = False,
+    merge: bool = False,
 ) -> None:
     """Update selected object settings.
 
@@ -54,6 +57,8 @@ def object_s3(
     :type tagging: bool, optional
     :param acl: update acl
     :type acl: bool, optional
+    :param merge: merge new tags with the existing tags instead of replacing them
+    :type merge: bool, optional
     """
     if exclude is None:
         exclude = []
@@ -80,11 +85,11 @@ def object_s3(
 
     elif recursive:
         update_object_recursive(
-            s3, storage, acl, metadata, encryption, tagging, exclude, include
+            s3, storage, acl, metadata, encryption, tagging, exclude, include, merge
         )
 
     elif version:
-        update_object_version(s3, allversion, acl, tagging)
+        update_object_version(s3, allversion, acl, tagging, merge)
 
     else:
         # update single object
@@ -97,35 +102,16 @@ def object_s3(
         for s3_key in s3.path_list:
             print("(dryrun) update: s3://%s/%s" % (s3.bucket_name, s3_key))
         if get_confirmation("Confirm?"):
-            for s3_key in s3.path_list:
-                print("update: s3://%s/%s" % (s3.bucket_name, s3_key))
-                if check_result:
-                    if check_result.get("Tags"):
-                        s3.client.put_object_tagging(
-                            Bucket=s3.bucket_name,
-                            Key=s3_key,
-                            Tagging={"TagSet": check_result.get("Tags")},
-                        )
-                    if check_result.get("Grants"):
-                        grant_args = {"Bucket": s3.bucket_name, "Key": s3_key}
-                        grant_args.update(check_result.get("Grants", {}))
-                        s3.client.put_object_acl(**grant_args)
-
-                else:
-                    # Note: this will create new version if version is enabled
-                    copy_object_args = get_copy_args(
-                        s3, s3_key, s3_args, extra_args=True
-                    )
-                    copy_source = {"Bucket": s3.bucket_name, "Key": s3_key}
-                    s3transferwrapper = S3TransferWrapper()
-                    s3.client.copy(
-                        copy_source,
-                        s3.bucket_name,
-                        s3_key,
-                        Callback=S3Progress(s3_key, s3.bucket_name, s3.client),
-                        ExtraArgs=copy_object_args,
-                        Config=s3transferwrapper.transfer_config,
-                    )
+            if check_result:
+                update_tag_acl(
+                    s3,
+                    [{"Key": s3_key} for s3_key in s3.path_list],
+                    check_result,
+                    merge,
+                )
+            else:
+                # Note: this will create new version if version is enabled
+                rewrite_objects(s3, s3.path_list, s3_args, merge)
 
 
 def update_object_version(
@@ -133,6 +119,7 @@ def update_object_version(
     allversion: bool = False,
     acl: bool = False,
     tagging: bool = False,
+    merge: bool = False,
 ) -> None:
     """Update versions of object's attributes.
 
@@ -147,6 +134,8 @@ def update_object_version(
     :type acl: bool, optional
     :param tagging: update tagging
     :type tagging: bool, optional
+    :param merge: merge new tags with the existing tags
+    :type merge: bool, optional
     """
     obj_versions = s3.get_object_version(select_all=allversion)
     s3_args = S3Args(s3)
@@ -161,33 +150,10 @@ def update_object_version(
             % (s3.bucket_name, obj_version.get("Key"), obj_version.get("VersionId"))
         )
     if get_confirmation("Confirm?"):
-        for obj_version in obj_versions:
-            print(
-                "update: s3://%s/%s with version %s"
-                % (
-                    s3.bucket_name,
-                    obj_version.get("Key"),
-                    obj_version.get("VersionId"),
-                )
-            )
-            if check_result:
-                if check_result.get("Tags"):
-                    s3.client.put_object_tagging(
-                        Bucket=s3.bucket_name,
-                        Key=obj_version.get("Key"),
-                        VersionId=obj_version.get("VersionId"),
-                        Tagging={"TagSet": check_result.get("Tags")},
-                    )
-                if check_result.get("Grants"):
-                    grant_args = {
-                        "Bucket": s3.bucket_name,
-                        "Key": obj_version.get("Key"),
-                        "VersionId": obj_version.get("VersionId"),
-                    }
-                    grant_args.update(check_result.get("Grants", {}))
-                    s3.client.put_object_acl(**grant_args)
-            else:
-                print("Nothing to update")
+        if check_result:
+            update_tag_acl(s3, obj_versions, check_result, merge)
+        else:
+            print("Nothing to update")
 
 
 def update_object_recursive(
@@ -199,9 +165,14 @@ def update_object_recursive(
     tagging: bool = False,
     exclude: Optional[List[str]] = None,
     include: Optional[List[str]] = None,
+    merge: bool = False,
 ) -> None:
     """Recursive update object attributes.
 
+    Storage class, encryption and metadata updates are performed
+    concurrently through the bulk rewrite engine, tags and acl only
+    updates through the tag and acl pipeline.
+
     :param s3: S3 class instance
     :type s3: S3
     :param storage: update storage
@@ -218,6 +189,8 @@ def update_object_recursive(
     :type exclude: List[str], optional
     :param include: glob pattern to include
     :type include: List[str], optional
+    :param merge: merge new tags with the existing tags
+    :type merge: bool, optional
     """
     if exclude is None:
         exclude = []
@@ -231,7 +204,7 @@ def update_object_recursive(
     check_result = s3_args.check_tag_acl()
 
     file_list = walk_s3_folder(
-        s3.client,
+        s3.get_client(),
         s3.bucket_name,
         s3.path_list[0],
         s3.path_list[0],
@@ -244,36 +217,17 @@ def update_object_recursive(
     )
     if get_confirmation("Confirm?"):
         if check_result:
-            for original_key, _ in file_list:
-                print("update: s3://%s/%s" % (s3.bucket_name, original_key))
-                if check_result.get("Tags"):
-                    s3.client.put_object_tagging(
-                        Bucket=s3.bucket_name,
-                        Key=original_key,
-                        Tagging={"TagSet": check_result.get("Tags")},
-                    )
-                if check_result.get("Grants"):
-                    grant_args = {"Bucket": s3.bucket_name, "Key": original_key}
-                    grant_args.update(check_result.get("Grants", {}))
-                    s3.client.put_object_acl(**grant_args)
-
+            update_tag_acl(
+                s3,
+                [{"Key": original_key} for original_key, _ in file_list],
+                check_result,
+                merge,
+            )
         else:
-            for original_key, _ in file_list:
-                print("update: s3://%s/%s" % (s3.bucket_name, original_key))
-                # Note: this will create new version if version is enabled
-                copy_object_args = get_copy_args(
-                    s3, original_key, s3_args, extra_args=True
-                )
-                copy_source = {"Bucket": s3.bucket_name, "Key": original_key}
-                s3transferwrapper = S3TransferWrapper()
-                s3.client.copy(
-                    copy_source,
-                    s3.bucket_name,
-                    original_key,
-                    Callback=S3Progress(original_key, s3.bucket_name, s3.client),
-                    ExtraArgs=copy_object_args,
-                    Config=s3transferwrapper.transfer_config,
-                )
+            # Note: this will create new version if version is enabled
+            rewrite_objects(
+                s3, [original_key for original_key, _ in file_list], s3_args, merge
+            )
 
 
 def update_object_name(s3: S3, version: bool = False) -> None:
@@ -306,16 +260,17 @@ def update_object_name(s3: S3, version: bool = False) -> None:
                 "Bucket": s3.bucket_name,
                 "Key": s3.path_list[0],
             }
+            client = s3.get_client()
             s3transferwrapper = S3TransferWrapper()
-            s3.client.copy(
+            client.copy(
                 copy_source,
                 s3.bucket_name,
                 new_name,
-                Callback=S3Progress(s3.path_list[0], s3.bucket_name, s3.client),
+                Callback=S3Progress(s3.path_list[0], s3.bucket_name, client),
                 ExtraArgs=copy_object_args,
                 Config=s3transferwrapper.transfer_config,
             )
-            s3.client.delete_object(
+            client.delete_object(
                 Bucket=s3.bucket_name,
                 Key=s3.path_list[0],
             )
@@ -358,15 +313,16 @@ def update_object_name(s3: S3, version: bool = False) -> None:
                 "Key": obj_version.get("Key"),
                 "VersionId": obj_version.get("VersionId"),
             }
+            client = s3.get_client()
             s3transferwrapper = S3TransferWrapper()
-            s3.client.copy(
+            client.copy(
                 copy_source,
                 s3.bucket_name,
                 new_name,
                 Callback=S3Progress(
                     obj_version.get("Key", ""),
                     s3.bucket_name,
-                    s3.client,
+                    client,
                     version_id=obj_version.get("VersionId"),
                 ),
                 ExtraArgs=copy_object_args,
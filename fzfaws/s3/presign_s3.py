@@ -1,7 +1,17 @@
 """Contains function to presign url."""
-from typing import Union
+import csv
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, TextIO, Tuple, Union
 
+from botocore.exceptions import NoCredentialsError
+
+from fzfaws.s3.helper.presigner import S3Presigner
 from fzfaws.s3.s3 import S3
+from fzfaws.utils.exceptions import S3Error
+
+PRESIGN_OUTPUTS = ["ndjson", "csv", "tsv"]
 
 
 def presign_s3(
@@ -9,9 +19,15 @@ def presign_s3(
     bucket: str = None,
     version: bool = False,
     expires_in: int = 3600,
+    recursive: bool = False,
+    key_file: str = "",
+    output: str = "",
 ) -> None:
     """Get an object from s3 using fzf and generate presign url for getting the s3 object.
 
+    Bulk mode presign all keys under a prefix (recursive) or keys read
+    from a file or stdin, urls are signed locally and streamed in the output format.
+
     :param profile: use a different profile for this operation
     :type profile: Union[str, bool]
     :param bucket: s3 bucket name, if specified, skip fzf selection
@@ -20,15 +36,50 @@ def presign_s3(
     :type version: bool, optional
     :param expires_in: expiration period of the url
     :type expires_in: int, optional
+    :param recursive: presign all keys under the prefix
+    :type recursive: bool, optional
+    :param key_file: presign keys read from the file, one key or s3://bucket/key per line, - for stdin
+    :type key_file: str, optional
+    :param output: output format, ndjson, csv or tsv, default to ndjson in bulk mode
+    :type output: str, optional
     """
     s3 = S3(profile)
     s3.set_bucket_and_path(bucket)
+
+    objects: Iterator[Tuple[str, str, Optional[str]]]
+    if key_file == "-":
+        objects = read_keys(sys.stdin, s3.bucket_name)
+        write_presigned(s3, objects, expires_in, output or "ndjson")
+        return
+    elif key_file:
+        with open(key_file, "r") as file:
+            objects = read_keys(file, s3.bucket_name)
+            write_presigned(s3, objects, expires_in, output or "ndjson")
+        return
+
     if not s3.bucket_name:
         s3.set_s3_bucket()
+    if recursive:
+        if not s3.path_list[0]:
+            s3.set_s3_path()
+        objects = list_keys(s3, s3.bucket_name, s3.path_list[0])
+        write_presigned(s3, objects, expires_in, output or "ndjson")
+        return
+
     if not s3.path_list[0]:
         s3.set_s3_object(version=version, multi_select=True)
 
-    if version:
+    if output:
+        if version:
+            objects = (
+                (s3.bucket_name, obj_version["Key"], obj_version.get("VersionId"))
+                for obj_version in s3.get_object_version()
+            )
+        else:
+            objects = ((s3.bucket_name, key, None) for key in s3.path_list)
+        write_presigned(s3, objects, expires_in, output)
+
+    elif version:
         obj_versions = s3.get_object_version()
         for obj_version in obj_versions:
             presign_param = {
@@ -36,7 +87,7 @@ def presign_s3(
                 "Key": obj_version.get("Key"),
                 "VersionId": obj_version.get("VersionId"),
             }
-            url = s3.client.generate_presigned_url(
+            url = s3.get_client().generate_presigned_url(
                 "get_object", Params=presign_param, ExpiresIn=expires_in
             )
             print(80 * "-")
@@ -45,9 +96,122 @@ def presign_s3(
     else:
         for s3_key in s3.path_list:
             presign_param = {"Bucket": s3.bucket_name, "Key": s3_key}
-            url = s3.client.generate_presigned_url(
+            url = s3.get_client().generate_presigned_url(
                 "get_object", Params=presign_param, ExpiresIn=expires_in
             )
             print(80 * "-")
             print("%s:" % s3_key)
             print(url)
+
+
+def read_keys(
+    stream: TextIO, bucket: str = ""
+) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Read keys to presign from the stream.
+
+    :param stream: text stream with one key or s3://bucket/key per line
+    :type stream: TextIO
+    :param bucket: bucket of the keys without s3:// prefix
+    :type bucket: str, optional
+    :raises S3Error: when bucket is not specified for keys without s3:// prefix
+    :return: generator of bucket, key and version id
+    :rtype: Iterator[Tuple[str, str, Optional[str]]]
+    """
+    for line in stream:
+        key = line.rstrip("\r\n")
+        if not key:
+            continue
+        if key.startswith("s3://"):
+            key_bucket, _, key = key[5:].partition("/")
+            yield key_bucket, key, None
+        elif not bucket:
+            raise S3Error(
+                "Bucket is required for key %s, specify it with -b or use s3://bucket/key"
+                % key
+            )
+        else:
+            yield bucket, key, None
+
+
+def list_keys(
+    s3: S3, bucket: str, prefix: str = ""
+) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """List keys under the prefix to presign.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: key prefix to list
+    :type prefix: str, optional
+    :return: generator of bucket, key and version id
+    :rtype: Iterator[Tuple[str, str, Optional[str]]]
+    """
+    paginator = s3.get_client(bucket).get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for s3_object in page.get("Contents", []):
+            if not s3_object["Key"].endswith("/"):
+                yield bucket, s3_object["Key"], None
+
+
+def write_presigned(
+    s3: S3,
+    objects: Iterator[Tuple[str, str, Optional[str]]],
+    expires_in: int,
+    output: str = "ndjson",
+    stream: TextIO = None,
+) -> None:
+    """Presign the objects locally and stream the urls in the output format.
+
+    All urls share the same signing time and are signed by one presigner
+    per region, no network call is made apart from resolving bucket regions.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param objects: iterator of bucket, key and version id
+    :type objects: Iterator[Tuple[str, str, Optional[str]]]
+    :param expires_in: expiration period of the url
+    :type expires_in: int
+    :param output: output format, ndjson, csv or tsv
+    :type output: str, optional
+    :param stream: text stream to write, default to stdout
+    :type stream: TextIO, optional
+    :raises NoCredentialsError: when credentials couldn't be found for the profile
+    """
+    if stream is None:
+        stream = sys.stdout
+    credentials = s3.session.get_credentials()
+    if not credentials:
+        raise NoCredentialsError()
+    credentials = credentials.get_frozen_credentials()
+    presigners: Dict[str, S3Presigner] = {}
+    now = datetime.utcnow()
+    expires = (now + timedelta(seconds=expires_in)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    writer = None
+    if output != "ndjson":
+        writer = csv.writer(
+            stream, delimiter="\t" if output == "tsv" else ",", lineterminator="\n"
+        )
+        writer.writerow(["bucket", "key", "version_id", "expires", "url"])
+
+    for bucket, key, version_id in objects:
+        region = s3.get_bucket_region(bucket)
+        if region not in presigners:
+            presigners[region] = S3Presigner(credentials, region)
+        url = presigners[region].presign(bucket, key, expires_in, version_id, now)
+        if writer:
+            writer.writerow([bucket, key, version_id or "", expires, url])
+        else:
+            stream.write(
+                "%s\n"
+                % json.dumps(
+                    {
+                        "bucket": bucket,
+                        "key": key,
+                        "version_id": version_id,
+                        "expires": expires,
+                        "url": url,
+                    }
+                )
+            )
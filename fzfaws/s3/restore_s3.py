@@ -0,0 +1,342 @@
+"""Contains function to restore archived objects from glacier and deep archive."""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.s3.download_s3 import download_object
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import S3, get_bucket_limiter
+from fzfaws.utils import get_cache_path
+from fzfaws.utils.exceptions import S3Error
+from fzfaws.utils.throttle import call_with_retry, raise_failures, run_bounded
+from fzfaws.utils.util import get_confirmation
+
+RESTORE_STATE = "s3_restore_%s.json"
+RESTORE_TIERS = ["Standard", "Bulk", "Expedited"]
+ARCHIVE_STORAGE_CLASSES = {"GLACIER", "DEEP_ARCHIVE"}
+
+# seconds between each status check when waiting for the restore
+POLL_INTERVAL = 300
+
+# restore state of each object in the state file
+STATE_REQUESTED = "requested"
+STATE_RESTORED = "restored"
+STATE_DOWNLOADED = "downloaded"
+
+
+def restore_s3(
+    profile: Union[str, bool] = False,
+    bucket: str = None,
+    tier: str = "Standard",
+    days: int = 1,
+    wait_restore: bool = False,
+    download: str = "",
+    interval: int = POLL_INTERVAL,
+) -> None:
+    """Restore archived objects under a prefix and track the restore status.
+
+    Restore requests are sent concurrently and the state of each object is kept
+    in the fzfaws cache directory, running the same restore again only checks
+    the status of the requested objects.
+
+    :param profile: use a different profile for this operation
+    :type profile: Union[str, bool], optional
+    :param bucket: specify a bucket and prefix to operate
+    :type bucket: str, optional
+    :param tier: retrieval tier, Standard, Bulk or Expedited
+    :type tier: str, optional
+    :param days: number of days the restored copy is available
+    :type days: int, optional
+    :param wait_restore: keep checking the status until all objects are restored
+    :type wait_restore: bool, optional
+    :param download: local directory to download objects once restored, implies wait_restore
+    :type download: str, optional
+    :param interval: seconds between each status check
+    :type interval: int, optional
+    :raises S3Error: when any of the restore requests or downloads failed
+    """
+    if tier not in RESTORE_TIERS:
+        raise S3Error("Invalid retrieval tier %s" % tier)
+    s3 = S3(profile)
+    s3.set_bucket_and_path(bucket)
+    if not s3.bucket_name:
+        s3.set_s3_bucket()
+    if not s3.path_list[0]:
+        s3.set_s3_path()
+
+    client = s3.get_client()
+    state_path = get_cache_path(
+        RESTORE_STATE % get_state_id(s3.bucket_name, s3.path_list[0])
+    )
+    state = load_state(state_path)
+    if state:
+        print("resume: %s objects already requested" % len(state))
+
+    new_keys: List[str] = []
+    for key in list_archived(client, s3.bucket_name, s3.path_list[0]):
+        if key not in state:
+            print("(dryrun) restore: s3://%s/%s" % (s3.bucket_name, key))
+            new_keys.append(key)
+    if new_keys:
+        print(
+            "(dryrun) %s objects to restore, %s tier for %s days"
+            % (len(new_keys), tier, days)
+        )
+        if get_confirmation("Confirm?"):
+            request_restore(s3, new_keys, tier, days, state, state_path)
+    if not state:
+        if not new_keys:
+            print("No archived objects found")
+        return
+
+    while True:
+        check_restore(s3, state, state_path)
+        if download:
+            download_restored(s3, state, state_path, download)
+        in_progress = sum(status == STATE_REQUESTED for status in state.values())
+        print(
+            "%s objects restored, %s in progress"
+            % (len(state) - in_progress, in_progress)
+        )
+        if not in_progress or not (wait_restore or download):
+            break
+        time.sleep(interval)
+
+    if not in_progress and (
+        not download or all(status == STATE_DOWNLOADED for status in state.values())
+    ):
+        os.remove(state_path)
+
+
+def list_archived(client, bucket: str, prefix: str = "") -> Iterator[str]:
+    """List keys of the archived objects under the prefix.
+
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: key prefix to list
+    :type prefix: str, optional
+    :return: generator of the archived keys
+    :rtype: Iterator[str]
+    """
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for s3_object in page.get("Contents", []):
+            if s3_object.get("StorageClass") in ARCHIVE_STORAGE_CLASSES:
+                yield s3_object["Key"]
+
+
+def request_restore(
+    s3: S3,
+    keys: List[str],
+    tier: str,
+    days: int,
+    state: Dict[str, str],
+    state_path: str,
+) -> None:
+    """Send restore requests of the keys concurrently.
+
+    Requests to the bucket are rate limited and throttled calls are retried.
+    The restore status of each object is checked first, objects with a restore
+    in progress are treated as requested and restored objects are not requested
+    again.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param keys: keys of the archived objects
+    :type keys: List[str]
+    :param tier: retrieval tier
+    :type tier: str
+    :param days: number of days the restored copy is available
+    :type days: int
+    :param state: restore state of each key, updated in place
+    :type state: Dict[str, str]
+    :param state_path: path of the state file
+    :type state_path: str
+    :raises S3Error: when any of the restore requests failed
+    """
+    client = s3.get_client()
+    limiter = get_bucket_limiter(s3.bucket_name)
+    max_workers = S3TransferWrapper().max_workers
+    restore_request = {"Days": days, "GlacierJobParameters": {"Tier": tier}}
+
+    def _restore(key: str) -> str:
+        head = call_with_retry(
+            client.head_object, limiter, Bucket=s3.bucket_name, Key=key
+        )
+        if is_restored(head):
+            return STATE_RESTORED
+        if 'ongoing-request="true"' in head.get("Restore", ""):
+            return STATE_REQUESTED
+        try:
+            call_with_retry(
+                client.restore_object,
+                limiter,
+                Bucket=s3.bucket_name,
+                Key=key,
+                RestoreRequest=restore_request,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "RestoreAlreadyInProgress":
+                raise
+        return STATE_REQUESTED
+
+    failed: List[Tuple[str, str]] = []
+    try:
+        for key, future in run_bounded(_restore, keys, max_workers):
+            try:
+                state[key] = future.result()
+            except (ClientError, BotoCoreError) as e:
+                failed.append(("s3://%s/%s" % (s3.bucket_name, key), str(e)))
+                continue
+            if state[key] == STATE_RESTORED:
+                print("restored: s3://%s/%s" % (s3.bucket_name, key))
+            else:
+                print("restore: s3://%s/%s" % (s3.bucket_name, key))
+    finally:
+        save_state(state_path, state)
+
+    raise_failures(
+        failed,
+        S3Error,
+        "%s objects failed to restore, run the same restore again to retry",
+    )
+
+
+def check_restore(s3: S3, state: Dict[str, str], state_path: str) -> None:
+    """Check the restore status of the requested objects concurrently.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param state: restore state of each key, updated in place
+    :type state: Dict[str, str]
+    :param state_path: path of the state file
+    :type state_path: str
+    """
+    client = s3.get_client()
+    limiter = get_bucket_limiter(s3.bucket_name)
+    max_workers = S3TransferWrapper().max_workers
+    requested = [key for key, status in state.items() if status == STATE_REQUESTED]
+
+    def _head(key: str) -> Dict[str, Any]:
+        return call_with_retry(
+            client.head_object, limiter, Bucket=s3.bucket_name, Key=key
+        )
+
+    for key, future in run_bounded(_head, requested, max_workers):
+        try:
+            head = future.result()
+        except (ClientError, BotoCoreError) as e:
+            print("failed: s3://%s/%s (%s)" % (s3.bucket_name, key, e))
+            continue
+        if is_restored(head):
+            print("restored: s3://%s/%s" % (s3.bucket_name, key))
+            state[key] = STATE_RESTORED
+    save_state(state_path, state)
+
+
+def is_restored(head: Dict[str, Any]) -> bool:
+    """Check if the object is available to download.
+
+    :param head: response of head_object
+    :type head: Dict[str, Any]
+    :return: True if the restore is completed or the object is not archived
+    :rtype: bool
+    """
+    if head.get("StorageClass") not in ARCHIVE_STORAGE_CLASSES:
+        return True
+    return 'ongoing-request="false"' in head.get("Restore", "")
+
+
+def download_restored(
+    s3: S3, state: Dict[str, str], state_path: str, local_path: str
+) -> None:
+    """Download the restored objects one at a time.
+
+    Keys are downloaded relative to the restore prefix, large objects are
+    already split into concurrent ranged gets by download_object.
+
+    :param s3: S3 instance, make sure contains bucket name and path
+    :type s3: S3
+    :param state: restore state of each key, updated in place
+    :type state: Dict[str, str]
+    :param state_path: path of the state file
+    :type state_path: str
+    :param local_path: local directory to download
+    :type local_path: str
+    :raises S3Error: when any of the downloads failed
+    """
+    restored = [key for key, status in state.items() if status == STATE_RESTORED]
+    prefix = s3.path_list[0]
+    root = prefix[: prefix.rfind("/") + 1]
+
+    failed: List[Tuple[str, str]] = []
+    try:
+        for key in restored:
+            destination_path = os.path.join(local_path, key[len(root) :])
+            print(
+                "download: s3://%s/%s to %s" % (s3.bucket_name, key, destination_path)
+            )
+            try:
+                os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+                download_object(s3, key, destination_path)
+            except (ClientError, BotoCoreError, OSError) as e:
+                failed.append(("s3://%s/%s" % (s3.bucket_name, key), str(e)))
+                continue
+            state[key] = STATE_DOWNLOADED
+    finally:
+        save_state(state_path, state)
+
+    raise_failures(
+        failed,
+        S3Error,
+        "%s objects failed to download, run the same restore again to retry",
+    )
+
+
+def get_state_id(bucket: str, prefix: str) -> str:
+    """Return the id of the state file of the restore.
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: prefix of the restore
+    :type prefix: str
+    :return: sha1 hex digest identifying the restore
+    :rtype: str
+    """
+    return hashlib.sha1(("%s\0%s" % (bucket, prefix)).encode("utf-8")).hexdigest()
+
+
+def load_state(state_path: str) -> Dict[str, str]:
+    """Load the restore state of each key.
+
+    :param state_path: path of the state file
+    :type state_path: str
+    :return: dict of key and restore state, empty if the state file doesn't exist
+    :rtype: Dict[str, str]
+    """
+    try:
+        with open(state_path, "r") as file:
+            state = json.load(file)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state_path: str, state: Dict[str, str]) -> None:
+    """Write the restore state atomically.
+
+    :param state_path: path of the state file
+    :type state_path: str
+    :param state: restore state of each key
+    :type state: Dict[str, str]
+    """
+    tmp_path = "%s.%s.tmp" % (state_path, os.getpid())
+    with open(tmp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, state_path)
@@ -1,17 +1,52 @@
 """Contains the s3 wrapper class."""
+import atexit
 import itertools
+import json
 import os
 import re
+import threading
 from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple, Union
 
 from botocore.exceptions import ClientError
 
-from fzfaws.utils import BaseSession, FileLoader, Pyfzf, Spinner, get_confirmation
+from fzfaws.utils import (
+    BaseSession,
+    FileLoader,
+    Pyfzf,
+    Spinner,
+    get_cache_path,
+    get_confirmation,
+)
 from fzfaws.utils.exceptions import (
     InvalidFileType,
     InvalidS3PathPattern,
     NoSelectionMade,
 )
+from fzfaws.utils.throttle import RateLimiter
+
+# bucket region never change for the lifetime of a bucket, persist across runs
+BUCKET_REGION_CACHE = "s3_bucket_region.json"
+# errors returned when a request is sent to the wrong regional endpoint
+REGION_ERROR_CODES = {"PermanentRedirect", "IllegalLocationConstraintException"}
+# s3 supports 3500 PUT requests per second per prefix, stay below it
+BUCKET_REQUEST_RATE = 3000
+
+_bucket_limiters: Dict[str, RateLimiter] = {}
+_bucket_limiters_lock = threading.Lock()
+
+
+def get_bucket_limiter(bucket: str) -> RateLimiter:
+    """Return the rate limiter shared by all requests to the bucket.
+
+    :param bucket: name of the bucket
+    :type bucket: str
+    :return: rate limiter of the bucket
+    :rtype: RateLimiter
+    """
+    with _bucket_limiters_lock:
+        if bucket not in _bucket_limiters:
+            _bucket_limiters[bucket] = RateLimiter(BUCKET_REQUEST_RATE)
+        return _bucket_limiters[bucket]
 
 
 class S3(BaseSession):
@@ -34,6 +69,13 @@ class S3(BaseSession):
         super().__init__(profile=profile, region=region, service_name="s3")
         self.bucket_name: str = ""
         self.path_list: List[str] = [""]
+        self._bucket_regions: Optional[Dict[str, str]] = None
+        self._region_clients: Dict[str, Any] = {}
+        self._region_lock = threading.Lock()
+        # None marks a bucket to be removed from the persisted cache
+        self._pending_regions: Dict[str, Optional[str]] = {}
+        self._save_registered: bool = False
+        self._watch_region_errors(self.client)
 
     def set_s3_bucket(self, header: str = "", no_progress: bool = False) -> None:
         """List bucket through fzf and let user select a bucket.
@@ -101,7 +143,7 @@ class S3(BaseSession):
             # print("S3 file path is set to root")
             pass
         elif selected_option == "append" or selected_option == "interactively":
-            paginator = self.client.get_paginator("list_objects")
+            paginator = self.get_client().get_paginator("list_objects")
             fzf = Pyfzf()
             parents = []
             # interactively search down 'folders' in s3
@@ -184,7 +226,7 @@ class S3(BaseSession):
         fzf = Pyfzf()
 
         if not version:
-            paginator = self.client.get_paginator("list_objects")
+            paginator = self.get_client().get_paginator("list_objects")
             with Spinner.spin(
                 message="Fetching s3 objects ...", no_progress=no_progress
             ):
@@ -202,7 +244,7 @@ class S3(BaseSession):
                 self.path_list[0] = str(fzf.execute_fzf(delimiter=": "))
 
         else:
-            paginator = self.client.get_paginator("list_object_versions")
+            paginator = self.get_client().get_paginator("list_object_versions")
             with Spinner.spin(
                 message="Fetching s3 objects ...", no_progress=no_progress
             ):
@@ -267,7 +309,9 @@ class S3(BaseSession):
             with Spinner.spin(
                 message="Fetching object versions ...", no_progress=no_progress
             ):
-                paginator = self.client.get_paginator("list_object_versions")
+                paginator = self.get_client(bucket).get_paginator(
+                    "list_object_versions"
+                )
                 for result in paginator.paginate(Bucket=bucket, Prefix=key):
                     response_generator = self._version_generator(
                         result.get("Versions", []),
@@ -340,8 +384,7 @@ class S3(BaseSession):
         if not object_key:
             object_key = self.path_list[0]
 
-        response = self.client.get_bucket_location(Bucket=self.bucket_name)
-        bucket_location = response["LocationConstraint"]
+        bucket_location = self.get_bucket_region()
         if not version:
             return "https://s3-%s.amazonaws.com/%s/%s" % (
                 bucket_location,
@@ -356,6 +399,160 @@ class S3(BaseSession):
                 version,
             )
 
+    def get_bucket_region(self, bucket: str = "") -> str:
+        """Return the region of the bucket.
+
+        The result of get_bucket_location is cached in memory and persisted
+        in the fzfaws cache directory, only unknown buckets hit the api.
+
+        :param bucket: name of the bucket, default to the current selected bucket
+        :type bucket: str, optional
+        :return: region name of the bucket
+        :rtype: str
+        """
+        if not bucket:
+            bucket = self.bucket_name
+        with self._region_lock:
+            if self._bucket_regions is None:
+                self._bucket_regions = self._load_bucket_regions()
+            if bucket in self._bucket_regions:
+                return self._bucket_regions[bucket]
+        response = self.client.get_bucket_location(Bucket=bucket)
+        location = response.get("LocationConstraint")
+        # legacy location constraint returned by get_bucket_location
+        if not location:
+            location = "us-east-1"
+        elif location == "EU":
+            location = "eu-west-1"
+        with self._region_lock:
+            self._bucket_regions[bucket] = location
+            self._add_pending_region(bucket, location)
+        return location
+
+    def invalidate_bucket_region(self, bucket: str) -> None:
+        """Drop the cached region of the bucket.
+
+        The next get_bucket_region call will look up the region again.
+
+        :param bucket: name of the bucket
+        :type bucket: str
+        """
+        with self._region_lock:
+            if self._bucket_regions is None:
+                self._bucket_regions = self._load_bucket_regions()
+            self._bucket_regions.pop(bucket, None)
+            self._add_pending_region(bucket, None)
+
+    def save_bucket_regions(self) -> None:
+        """Persist the bucket regions resolved or dropped in this session.
+
+        Called once at exit, the cache is re-read before writing so
+        concurrent fzfaws processes don't drop each others entries,
+        and replaced atomically. Failing to write the cache is not fatal.
+        """
+        with self._region_lock:
+            pending = self._pending_regions
+            self._pending_regions = {}
+        if not pending:
+            return
+        try:
+            cache_path = get_cache_path(BUCKET_REGION_CACHE)
+            cached = self._load_bucket_regions()
+            for bucket, region in pending.items():
+                if region is None:
+                    cached.pop(bucket, None)
+                else:
+                    cached[bucket] = region
+            tmp_path = "%s.%s.tmp" % (cache_path, os.getpid())
+            with open(tmp_path, "w") as file:
+                json.dump(cached, file)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    def get_client(self, bucket: str = ""):
+        """Return a s3 client in the home region of the bucket.
+
+        Clients are created once per region and shared, avoid the
+        redirect and retry of sending requests to the wrong regional endpoint.
+
+        :param bucket: name of the bucket, default to the current selected bucket
+        :type bucket: str, optional
+        :return: boto3 s3 client
+        :rtype: boto3.client
+        """
+        region = self.get_bucket_region(bucket)
+        if region == self.client.meta.region_name:
+            return self.client
+        with self._region_lock:
+            if region not in self._region_clients:
+                self._region_clients[region] = self.session.client(
+                    "s3", region_name=region
+                )
+                self._watch_region_errors(self._region_clients[region])
+            return self._region_clients[region]
+
+    @staticmethod
+    def _load_bucket_regions() -> Dict[str, str]:
+        """Load the persisted bucket region cache.
+
+        :return: dict of bucket name and region, empty if the cache is unavailable
+        :rtype: Dict[str, str]
+        """
+        try:
+            with open(get_cache_path(BUCKET_REGION_CACHE), "r") as file:
+                bucket_regions = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return bucket_regions if isinstance(bucket_regions, dict) else {}
+
+    def _add_pending_region(self, bucket: str, region: Optional[str]) -> None:
+        """Record a change to persist, caller should hold the region lock.
+
+        :param bucket: name of the bucket
+        :type bucket: str
+        :param region: region of the bucket, None to remove the bucket
+        :type region: Optional[str]
+        """
+        self._pending_regions[bucket] = region
+        if not self._save_registered:
+            self._save_registered = True
+            atexit.register(self.save_bucket_regions)
+
+    def _watch_region_errors(self, client) -> None:
+        """Drop the cached region of a bucket when a request hits the wrong region.
+
+        Only a region mismatch reported by the error code or by a
+        x-amz-bucket-region header different from the client region
+        drops the cache, other errors are left to the caller.
+
+        :param client: boto3 s3 client to watch
+        :type client: boto3.client
+        """
+
+        def _on_region_error(request_dict, response, **kwargs):
+            if not response or not response[1]:
+                return None
+            http_response, parsed = response
+            error = parsed.get("Error", {})
+            if not error:
+                return None
+            # head requests have no error body, the region is only in the header
+            region = (getattr(http_response, "headers", None) or {}).get(
+                "x-amz-bucket-region"
+            ) or error.get("Region")
+            is_region_error = error.get("Code") in REGION_ERROR_CODES or bool(
+                region and region != client.meta.region_name
+            )
+            if not is_region_error:
+                return None
+            bucket = request_dict.get("context", {}).get("signing", {}).get("bucket")
+            if bucket:
+                self.invalidate_bucket_region(bucket)
+            return None
+
+        client.meta.events.register("needs-retry.s3", _on_region_error)
+
     def get_s3_destination_key(self, local_path: str, recursive: bool = False) -> str:
         """Set the s3 key for upload destination.
 
@@ -0,0 +1,271 @@
+"""Contains function to search keys across multiple s3 buckets."""
+import fnmatch
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from fzfaws.s3.download_s3 import download_object
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import S3
+from fzfaws.utils import Pyfzf, Spinner, get_confirmation
+
+SEARCH_ACTIONS = ["download", "delete", "presign"]
+
+
+def search_s3(
+    profile: Union[str, bool] = False,
+    pattern: str = "",
+    buckets: Optional[List[str]] = None,
+    select_bucket: bool = False,
+    action: str = "",
+    expires_in: int = 3600,
+) -> None:
+    """Search keys matching a prefix or glob pattern across buckets.
+
+    Buckets are searched concurrently through their home region
+    and the matches are streamed into fzf as they are found. Buckets
+    that couldn't be reached are skipped and reported after the search.
+
+    :param profile: profile to use for this operation
+    :type profile: Union[str, bool], optional
+    :param pattern: key prefix or glob pattern to search (e.g. logs/ or logs/*.json)
+    :type pattern: str, optional
+    :param buckets: buckets to search, default to all buckets
+    :type buckets: List[str], optional
+    :param select_bucket: select buckets to search through fzf
+    :type select_bucket: bool, optional
+    :param action: action to perform on the selected keys, download, delete or presign
+    :type action: str, optional
+    :param expires_in: expiration period of the presign url
+    :type expires_in: int, optional
+    """
+    s3 = S3(profile)
+    if not pattern:
+        pattern = input("Key prefix or glob pattern to search: ")
+
+    if not buckets:
+        with Spinner.spin(message="Fetching s3 buckets ..."):
+            response = s3.client.list_buckets()
+        buckets = [bucket["Name"] for bucket in response.get("Buckets", [])]
+        if select_bucket:
+            fzf = Pyfzf()
+            for bucket in buckets:
+                fzf.append_fzf("%s\n" % bucket)
+            buckets = list(
+                fzf.execute_fzf(
+                    print_col=1, multi_select=True, header="select buckets to search"
+                )
+            )
+
+    stop_event = threading.Event()
+    skipped: List[Tuple[str, str]] = []
+    fzf = Pyfzf()
+    try:
+        selected_keys = fzf.stream_fzf(
+            search_keys(s3, buckets, pattern, stop_event, skipped),
+            print_col=0,
+            multi_select=True,
+            header="searching %s in %s buckets" % (pattern, len(buckets)),
+        )
+    finally:
+        stop_event.set()
+    for bucket, reason in skipped:
+        print("skipped: s3://%s (%s)" % (bucket, reason))
+
+    results: List[Tuple[str, str]] = [
+        (bucket_key.split("/", 1)[0], bucket_key.split("/", 1)[1])
+        for bucket_key in selected_keys
+    ]
+    if not action:
+        fzf = Pyfzf()
+        for search_action in SEARCH_ACTIONS:
+            fzf.append_fzf("%s\n" % search_action)
+        action = str(
+            fzf.execute_fzf(print_col=1, header="select an action for the keys")
+        )
+
+    if action == "download":
+        search_download(s3, results)
+    elif action == "delete":
+        search_delete(s3, results)
+    elif action == "presign":
+        search_presign(s3, results, expires_in)
+
+
+def search_keys(
+    s3: S3,
+    buckets: List[str],
+    pattern: str,
+    stop_event: threading.Event,
+    skipped: List[Tuple[str, str]],
+) -> Iterator[str]:
+    """Search keys concurrently and yield matches as bucket/key.
+
+    Each bucket is listed with the literal prefix of the pattern through
+    its regional client, glob pattern are then matched on the listed keys.
+    Number of concurrent buckets is controlled by max_concurrency of the
+    s3 transfer config.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param buckets: buckets to search
+    :type buckets: List[str]
+    :param pattern: key prefix or glob pattern
+    :type pattern: str
+    :param stop_event: set the event to stop the search
+    :type stop_event: threading.Event
+    :param skipped: buckets unable to search and the reason are appended to the list
+    :type skipped: List[Tuple[str, str]]
+    :return: generator of matched bucket/key
+    :rtype: Iterator[str]
+    """
+    prefix = get_literal_prefix(pattern)
+    is_glob = prefix != pattern
+    results: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1000)
+
+    def _put(item: Optional[str]) -> None:
+        while not stop_event.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _search(bucket: str) -> None:
+        try:
+            client = s3.get_client(bucket)
+            paginator = client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                if stop_event.is_set():
+                    return
+                for s3_object in page.get("Contents", []):
+                    if not is_glob or fnmatch.fnmatch(s3_object["Key"], pattern):
+                        _put("%s/%s" % (bucket, s3_object["Key"]))
+        except (ClientError, BotoCoreError) as e:
+            skipped.append((bucket, str(e)))
+        finally:
+            _put(None)
+
+    max_workers = S3TransferWrapper().transfer_config.max_concurrency
+    executor = ThreadPoolExecutor(max_workers=max(max_workers, 1))
+    try:
+        for bucket in buckets:
+            executor.submit(_search, bucket)
+        remaining = len(buckets)
+        while remaining > 0:
+            try:
+                item = results.get(timeout=0.1)
+            except queue.Empty:
+                if stop_event.is_set():
+                    return
+                continue
+            if item is None:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=False)
+
+
+def get_literal_prefix(pattern: str) -> str:
+    """Return the literal prefix of the glob pattern.
+
+    :param pattern: key prefix or glob pattern
+    :type pattern: str
+    :return: part of the pattern before the first glob character
+    :rtype: str
+    """
+    return re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+
+
+def search_download(s3: S3, results: List[Tuple[str, str]]) -> None:
+    """Download the searched keys.
+
+    Keys are downloaded to bucket/key under the selected directory so that
+    keys with the same name in different buckets or prefixes don't overwrite each other.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param results: list of bucket and key
+    :type results: List[Tuple[str, str]]
+    """
+    fzf = Pyfzf()
+    local_path = str(fzf.get_local_file(directory=True))
+    for bucket, key in results:
+        print(
+            "(dryrun) download: s3://%s/%s to %s"
+            % (bucket, key, get_search_destination(local_path, bucket, key))
+        )
+    if get_confirmation("Confirm?"):
+        for bucket, key in results:
+            destination_path = get_search_destination(local_path, bucket, key)
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            print("download: s3://%s/%s to %s" % (bucket, key, destination_path))
+            s3.bucket_name = bucket
+            download_object(s3, key, destination_path)
+
+
+def get_search_destination(local_path: str, bucket: str, key: str) -> str:
+    """Return the local path of the searched key.
+
+    Empty, "." and ".." components of the key are dropped so
+    the destination never escape the local directory.
+
+    :param local_path: local directory to download
+    :type local_path: str
+    :param bucket: bucket of the key
+    :type bucket: str
+    :param key: key of the object
+    :type key: str
+    :return: local path of bucket/key under the directory
+    :rtype: str
+    """
+    parts = [part for part in key.split("/") if part not in ("", ".", "..")]
+    return os.path.join(local_path, bucket, *parts)
+
+
+def search_delete(s3: S3, results: List[Tuple[str, str]]) -> None:
+    """Delete the searched keys.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param results: list of bucket and key
+    :type results: List[Tuple[str, str]]
+    """
+    for bucket, key in results:
+        print("(dryrun) delete: s3://%s/%s" % (bucket, key))
+    if get_confirmation("Confirm?"):
+        for bucket, key in results:
+            print("delete: s3://%s/%s" % (bucket, key))
+            s3.get_client(bucket).delete_object(Bucket=bucket, Key=key)
+
+
+def search_presign(
+    s3: S3, results: List[Tuple[str, str]], expires_in: int = 3600
+) -> None:
+    """Generate presign url for the searched keys.
+
+    Urls are signed by the client in the bucket region.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param results: list of bucket and key
+    :type results: List[Tuple[str, str]]
+    :param expires_in: expiration period of the url
+    :type expires_in: int, optional
+    """
+    for bucket, key in results:
+        url = s3.get_client(bucket).generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+        print(80 * "-")
+        print("s3://%s/%s:" % (bucket, key))
+        print(url)
@@ -0,0 +1,288 @@
+"""Contains function to restore deleted objects in versioned bucket."""
+import itertools
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from botocore.exceptions import BotoCoreError, ClientError
+from botocore.utils import parse_timestamp
+
+from fzfaws.s3.helper.s3progress import S3Progress
+from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
+from fzfaws.s3.s3 import S3, get_bucket_limiter
+from fzfaws.utils.exceptions import S3Error
+from fzfaws.utils.throttle import (
+    RateLimiter,
+    call_with_retry,
+    raise_failures,
+    run_bounded,
+)
+from fzfaws.utils.util import get_confirmation
+
+# maximum number of keys of a single delete_objects call
+DELETE_BATCH_SIZE = 1000
+
+RELATIVE_TIME = re.compile(r"^(?P<value>\d+)(?P<unit>[smhd])$")
+RELATIVE_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def undelete_s3(
+    profile: Union[str, bool] = False,
+    bucket: str = None,
+    since: str = "",
+    until: str = "",
+    mfa: str = "",
+) -> None:
+    """Restore deleted objects under a prefix by removing their delete markers.
+
+    Objects whose latest version is a delete marker are restored to
+    their previous version, markers are removed in batches concurrently.
+
+    :param profile: use a different profile for this operation
+    :type profile: Union[str, bool], optional
+    :param bucket: specify a bucket and prefix to operate
+    :type bucket: str, optional
+    :param since: only restore objects deleted after the time, e.g. 2h or 2020-01-01T10:00:00Z
+    :type since: str, optional
+    :param until: only restore objects deleted before the time
+    :type until: str, optional
+    :param mfa: specify mfa information to operate MFA delete
+    :type mfa: str, optional
+    :raises S3Error: when any of the delete markers failed to remove
+    """
+    s3 = S3(profile)
+    s3.set_bucket_and_path(bucket)
+    if not s3.bucket_name:
+        s3.set_s3_bucket()
+    if not s3.path_list[0]:
+        s3.set_s3_path()
+
+    now = datetime.now(timezone.utc)
+    since_time = parse_time(since, now) if since else None
+    until_time = parse_time(until, now) if until else None
+
+    client = s3.get_client()
+    targets: List[Dict[str, Any]] = []
+    total_size = 0
+    for target in find_undelete_targets(
+        client, s3.bucket_name, s3.path_list[0], since_time, until_time
+    ):
+        print("(dryrun) undelete: s3://%s/%s" % (s3.bucket_name, target["Key"]))
+        targets.append(target)
+        total_size += target["Size"]
+
+    if not targets:
+        print("No deleted objects found")
+        return
+    print(
+        "(dryrun) %s objects to restore, %s"
+        % (len(targets), S3Progress.human_readable_size(total_size))
+    )
+    if get_confirmation("Confirm?"):
+        remove_delete_markers(s3, targets, mfa)
+
+
+def parse_time(value: str, now: datetime) -> datetime:
+    """Parse the time of the undelete window.
+
+    :param value: relative time before now, e.g. 30m, 2h, 1d, or timestamp, e.g. 2020-01-01T10:00:00Z
+    :type value: str
+    :param now: current time
+    :type now: datetime
+    :raises S3Error: when the value is not a valid time
+    :return: timezone aware datetime
+    :rtype: datetime
+    """
+    relative = RELATIVE_TIME.match(value)
+    if relative:
+        return now - timedelta(
+            **{RELATIVE_UNITS[relative.group("unit")]: int(relative.group("value"))}
+        )
+    try:
+        result = parse_timestamp(value)
+    except (ValueError, TypeError):
+        raise S3Error("Invalid time %s, use 30m, 2h, 1d or a timestamp" % value)
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=timezone.utc)
+    return result
+
+
+def iter_versions(client, bucket: str, prefix: str) -> Iterator[Dict[str, Any]]:
+    """Stream versions and delete markers ordered by key, newest first.
+
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: key prefix to list
+    :type prefix: str
+    :return: generator of versions, delete markers have IsDeleteMarker set to True
+    :rtype: Iterator[Dict[str, Any]]
+    """
+    paginator = client.get_paginator("list_object_versions")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        entries = page.get("Versions", []) + [
+            dict(marker, IsDeleteMarker=True)
+            for marker in page.get("DeleteMarkers", [])
+        ]
+        # both lists are ordered by key then newest first, merge them,
+        # LastModified has a resolution of a second, the latest goes first on ties
+        entries.sort(
+            key=lambda entry: (
+                entry["Key"],
+                not entry.get("IsLatest"),
+                -entry["LastModified"].timestamp(),
+            )
+        )
+        yield from entries
+
+
+def find_undelete_targets(
+    client,
+    bucket: str,
+    prefix: str = "",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Find objects with a delete marker as the latest version.
+
+    Objects without any previous version are skipped since there
+    is nothing to restore.
+
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param prefix: key prefix to search
+    :type prefix: str, optional
+    :param since: only find objects deleted after the time
+    :type since: datetime, optional
+    :param until: only find objects deleted before the time
+    :type until: datetime, optional
+    :return: generator of dict contains Key, Markers (version ids of the delete markers),
+        Size and LastModified of the version to restore
+    :rtype: Iterator[Dict[str, Any]]
+    """
+    versions = iter_versions(client, bucket, prefix)
+    for key, entries in itertools.groupby(versions, key=lambda entry: entry["Key"]):
+        markers: List[str] = []
+        deleted_at: Optional[datetime] = None
+        for entry in entries:
+            if not entry.get("IsDeleteMarker"):
+                if markers:
+                    yield {
+                        "Key": key,
+                        "Markers": markers,
+                        "Size": entry.get("Size", 0),
+                        "LastModified": entry.get("LastModified"),
+                    }
+                break
+            if not markers:
+                if not entry.get("IsLatest"):
+                    break
+                deleted_at = entry["LastModified"]
+                if (since and deleted_at < since) or (until and deleted_at > until):
+                    break
+            markers.append(entry["VersionId"])
+
+
+def remove_delete_markers(s3: S3, targets: List[Dict[str, Any]], mfa: str = "") -> None:
+    """Remove the delete markers of the targets with batched delete_objects.
+
+    Batches are sent on a pool sized by max_concurrency of the transfer config,
+    requests to the bucket are rate limited and throttled calls are retried.
+
+    :param s3: S3 instance, make sure contains bucket name
+    :type s3: S3
+    :param targets: return value of find_undelete_targets
+    :type targets: List[Dict[str, Any]]
+    :param mfa: specify mfa information to operate MFA delete
+    :type mfa: str, optional
+    :raises S3Error: when any of the delete markers failed to remove
+    """
+    client = s3.get_client()
+    limiter = get_bucket_limiter(s3.bucket_name)
+    failed: List[Tuple[str, str]] = []
+
+    def _delete(batch: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return delete_marker_batch(client, limiter, s3.bucket_name, batch, mfa)
+
+    for batch, future in run_bounded(
+        _delete, batch_markers(targets), S3TransferWrapper().max_workers
+    ):
+        try:
+            errors = future.result()
+        except (ClientError, BotoCoreError) as e:
+            failed.extend(
+                ("s3://%s/%s" % (s3.bucket_name, marker["Key"]), str(e))
+                for marker in batch
+            )
+            continue
+        failed.extend(
+            (
+                "s3://%s/%s" % (s3.bucket_name, error.get("Key")),
+                error.get("Message", error.get("Code")),
+            )
+            for error in errors
+        )
+        failed_keys = {error.get("Key") for error in errors}
+        for key in sorted({marker["Key"] for marker in batch} - failed_keys):
+            print("undelete: s3://%s/%s" % (s3.bucket_name, key))
+
+    raise_failures(failed, S3Error, "%s delete markers failed to remove")
+
+
+def batch_markers(targets: List[Dict[str, Any]]) -> Iterator[List[Dict[str, str]]]:
+    """Group the delete markers of the targets into delete_objects batches.
+
+    Markers of the same key are kept in the same batch.
+
+    :param targets: return value of find_undelete_targets
+    :type targets: List[Dict[str, Any]]
+    :return: generator of list of dict contains Key and VersionId
+    :rtype: Iterator[List[Dict[str, str]]]
+    """
+    batch: List[Dict[str, str]] = []
+    for target in targets:
+        markers = [
+            {"Key": target["Key"], "VersionId": version_id}
+            for version_id in target["Markers"]
+        ]
+        if batch and len(batch) + len(markers) > DELETE_BATCH_SIZE:
+            yield batch
+            batch = []
+        batch.extend(markers)
+    if batch:
+        yield batch
+
+
+def delete_marker_batch(
+    client,
+    limiter: RateLimiter,
+    bucket: str,
+    batch: List[Dict[str, str]],
+    mfa: str = "",
+) -> List[Dict[str, str]]:
+    """Remove a batch of delete markers.
+
+    :param client: boto3 s3 client in the bucket region
+    :type client: boto3.client
+    :param limiter: rate limiter of the bucket
+    :type limiter: RateLimiter
+    :param bucket: name of the bucket
+    :type bucket: str
+    :param batch: list of dict contains Key and VersionId of the delete markers
+    :type batch: List[Dict[str, str]]
+    :param mfa: specify mfa information to operate MFA delete
+    :type mfa: str, optional
+    :return: errors of the keys failed to remove
+    :rtype: List[Dict[str, str]]
+    """
+    delete_args: Dict[str, Any] = {
+        "Bucket": bucket,
+        "Delete": {"Objects": batch, "Quiet": True},
+    }
+    if mfa:
+        delete_args["MFA"] = mfa
+    response = call_with_retry(client.delete_objects, limiter, **delete_args)
+    return response.get("Errors", [])
@@ -1,14 +1,16 @@
 """Contains function to upload file to s3."""
-import os
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from fzfaws.s3 import S3
-from fzfaws.s3.helper.exclude_file import exclude_file
+from fzfaws.s3.helper.compression import get_compressed_key, upload_compressed
+from fzfaws.s3.helper.etag import ETagCache
+from fzfaws.s3.helper.exclude_file import get_matcher
 from fzfaws.s3.helper.s3args import S3Args
 from fzfaws.s3.helper.s3progress import S3Progress
 from fzfaws.s3.helper.s3transferwrapper import S3TransferWrapper
 from fzfaws.s3.helper.sync_s3 import sync_s3
 from fzfaws.utils import Pyfzf, get_confirmation
+from fzfaws.utils.scanner import LocalEntry, scan_local
 
 
 def upload_s3(
@@ -22,6 +24,8 @@ def upload_s3(
     exclude: Optional[List[str]] = None,
     include: Optional[List[str]] = None,
     extra_config: bool = False,
+    compress: str = "",
+    skip_unchanged: bool = False,
 ) -> None:
     """Upload local files/directories to s3.
 
@@ -48,6 +52,10 @@ def upload_s3(
     :type include: List[str], optional
     :param extra_config: configure extra settings during upload
     :type extra_config: bool, optional
+    :param compress: compress the files on the fly before upload, gzip or zstd
+    :type compress: str, optional
+    :param skip_unchanged: skip files unchanged since the last upload during recursive upload
+    :type skip_unchanged: bool, optional
     """
     if not local_paths:
         local_paths = []
@@ -97,12 +105,16 @@ def upload_s3(
         )
 
     elif recursive:
-        recursive_upload(s3, local_path, exclude, include, extra_args)
+        recursive_upload(
+            s3, local_path, exclude, include, extra_args, compress, skip_unchanged
+        )
 
     else:
         for filepath in local_paths:
             # get the formated s3 destination
-            destination_key = s3.get_s3_destination_key(filepath)
+            destination_key = get_compressed_key(
+                s3.get_s3_destination_key(filepath), compress
+            )
             print(
                 "(dryrun) upload: %s to s3://%s/%s"
                 % (filepath, s3.bucket_name, destination_key)
@@ -110,27 +122,80 @@ def upload_s3(
 
         if get_confirmation("Confirm?"):
             for filepath in local_paths:
-                destination_key = s3.get_s3_destination_key(filepath)
+                destination_key = get_compressed_key(
+                    s3.get_s3_destination_key(filepath), compress
+                )
                 print(
                     "upload: %s to s3://%s/%s"
                     % (filepath, s3.bucket_name, destination_key)
                 )
-                transfer = S3TransferWrapper(s3.client)
-                transfer.s3transfer.upload_file(
-                    filepath,
-                    s3.bucket_name,
-                    destination_key,
-                    callback=S3Progress(filepath),
-                    extra_args=extra_args.extra_args,
+                upload_file(
+                    s3, filepath, destination_key, extra_args.extra_args, compress
                 )
 
 
+def upload_file(
+    s3: S3,
+    filepath: str,
+    key: str,
+    extra_args: Dict[str, Any],
+    compress: str = "",
+    size: Optional[int] = None,
+) -> None:
+    """Upload a single local file to the s3 bucket.
+
+    :param s3: S3 instance
+    :type s3: S3
+    :param filepath: local file path
+    :type filepath: str
+    :param key: destination s3 key
+    :type key: str
+    :param extra_args: extra arguments for the upload
+    :type extra_args: Dict[str, Any]
+    :param compress: compress the file on the fly before upload, gzip or zstd
+    :type compress: str, optional
+    :param size: size of the file if already known, skip the size lookup
+    :type size: int, optional
+    """
+    client = s3.get_client()
+    transfer = S3TransferWrapper(client)
+    if compress:
+        upload_compressed(
+            client,
+            filepath,
+            s3.bucket_name,
+            key,
+            compress,
+            transfer.transfer_config,
+            extra_args,
+        )
+    else:
+        transfer.s3transfer.upload_file(
+            filepath,
+            s3.bucket_name,
+            key,
+            callback=S3Progress(filepath, size=size),
+            extra_args=extra_args,
+        )
+
+
 def recursive_upload(
-    s3: S3, local_path: str, exclude: List[str], include: List[str], extra_args: S3Args
+    s3: S3,
+    local_path: str,
+    exclude: List[str],
+    include: List[str],
+    extra_args: S3Args,
+    compress: str = "",
+    skip_unchanged: bool = False,
 ) -> None:
     """Recursive upload local directory to s3.
 
-    Perform a os.walk to upload everyfile under a directory.
+    Scan the local directory to upload everyfile under it, directories with
+    every file excluded are not scanned. Files are planned in the order the
+    scan yields them, hidden files and directories are included.
+
+    With skip_unchanged, the destination prefix is listed once and files
+    unchanged since the last upload are not uploaded again.
 
     :param s3: S3 instance
     :type s3: S3
@@ -142,29 +207,53 @@ def recursive_upload(
     :type include: List[str]
     :param extra_args: S3Args instance to set extra argument
     :type extra_args: S3Args
+    :param compress: compress the files on the fly before upload, gzip or zstd
+    :type compress: str, optional
+    :param skip_unchanged: skip files unchanged since the last upload
+    :type skip_unchanged: bool, optional
     """
-    upload_list: List[Dict[str, str]] = []
-    for root, _, files in os.walk(local_path):
-        for filename in files:
-            full_path = os.path.join(root, filename)
-            relative_path = os.path.relpath(full_path, local_path)
-
-            if not exclude_file(exclude, include, relative_path):
-                destination_key = s3.get_s3_destination_key(
-                    relative_path, recursive=True
-                )
-                print(
-                    "(dryrun) upload: %s to s3://%s/%s"
-                    % (relative_path, s3.bucket_name, destination_key)
-                )
-                upload_list.append(
-                    {
-                        "local_path": full_path,
-                        "bucket": s3.bucket_name,
-                        "key": destination_key,
-                        "relative": relative_path,
-                    }
-                )
+    upload_list: List[Dict[str, Any]] = []
+    matcher = get_matcher(exclude, include)
+    remote_objects: Dict[str, Dict[str, Any]] = {}
+    etag_cache: Optional[ETagCache] = None
+    if skip_unchanged:
+        remote_objects = list_destination(s3)
+        etag_cache = ETagCache(S3TransferWrapper().transfer_config)
+    skipped_count, skipped_size = 0, 0
+    entries = scan_local(local_path, hidden=True, skip_dir=matcher.can_skip)
+    for entry in entries:
+        if matcher.is_excluded(entry.relative):
+            continue
+        destination_key = get_compressed_key(
+            s3.get_s3_destination_key(entry.relative, recursive=True), compress
+        )
+        if etag_cache and is_unchanged(
+            entry, remote_objects.get(destination_key), etag_cache, compress
+        ):
+            skipped_count += 1
+            skipped_size += entry.size
+            continue
+        print(
+            "(dryrun) upload: %s to s3://%s/%s"
+            % (entry.relative, s3.bucket_name, destination_key)
+        )
+        upload_list.append(
+            {
+                "local_path": entry.path,
+                "bucket": s3.bucket_name,
+                "key": destination_key,
+                "relative": entry.relative,
+                "size": entry.size,
+            }
+        )
+    if etag_cache:
+        etag_cache.save()
+        print(
+            "(dryrun) %s files unchanged, %s skipped"
+            % (skipped_count, S3Progress.human_readable_size(skipped_size))
+        )
+        if not upload_list:
+            return
 
     if get_confirmation("Confirm?"):
         for item in upload_list:
@@ -172,11 +261,67 @@ def recursive_upload(
                 "upload: %s to s3://%s/%s"
                 % (item["relative"], item["bucket"], item["key"])
             )
-            transfer = S3TransferWrapper(s3.client)
-            transfer.s3transfer.upload_file(
+            upload_file(
+                s3,
                 item["local_path"],
-                item["bucket"],
                 item["key"],
-                callback=S3Progress(item["local_path"]),
-                extra_args=extra_args.extra_args,
+                extra_args.extra_args,
+                compress,
+                item["size"],
             )
+
+
+def list_destination(s3: S3) -> Dict[str, Dict[str, Any]]:
+    """List the objects under the destination prefix once.
+
+    :param s3: S3 instance, make sure contains bucket name and path
+    :type s3: S3
+    :return: dict of key and the listed object
+    :rtype: Dict[str, Dict[str, Any]]
+    """
+    paginator = s3.get_client().get_paginator("list_objects_v2")
+    return {
+        s3_object["Key"]: s3_object
+        for page in paginator.paginate(Bucket=s3.bucket_name, Prefix=s3.path_list[0])
+        for s3_object in page.get("Contents", [])
+    }
+
+
+def is_unchanged(
+    entry: LocalEntry,
+    s3_object: Optional[Dict[str, Any]],
+    etag_cache: ETagCache,
+    compress: str = "",
+) -> bool:
+    """Check if the local file is unchanged since the last upload.
+
+    The file is unchanged when the size matches and the object is uploaded
+    after the file is modified. Files modified afterwards are compared with
+    the ETag of the object. Compressed objects are only compared by time since
+    their size differs from the local file.
+
+    :param entry: scanned local file
+    :type entry: LocalEntry
+    :param s3_object: listed object at the destination key, None if not exists
+    :type s3_object: Dict[str, Any], optional
+    :param etag_cache: cache of the computed local ETag
+    :type etag_cache: ETagCache
+    :param compress: compression used for the upload, gzip or zstd
+    :type compress: str, optional
+    :return: bool value indicating whether the upload could be skipped
+    :rtype: bool
+    """
+    if not s3_object:
+        return False
+    uploaded_after = s3_object["LastModified"].timestamp() >= entry.mtime
+    if compress:
+        return uploaded_after
+    if s3_object.get("Size") != entry.size:
+        return False
+    if uploaded_after:
+        return True
+    try:
+        etag = etag_cache.get_etag(entry.path, entry.size, entry.mtime)
+    except OSError:
+        return False
+    return etag == s3_object.get("ETag", "").strip('"')
@@ -35,3 +35,21 @@ class EC2Error(Exception):
     """Generic exception when the error is caused by during EC2 operation."""
 
     pass
+
+
+class MissingDependency(Exception):
+    """An optional dependency required by the operation is not installed."""
+
+    pass
+
+
+class S3Error(Exception):
+    """Generic exception when the error is caused by during S3 operation."""
+
+    pass
+
+
+class CloudformationError(Exception):
+    """Generic exception when the error is caused by during Cloudformation operation."""
+
+    pass
@@ -3,16 +3,104 @@
 Import this module to process yaml, json files.
 """
 
+import hashlib
 import json
 import os
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Tuple, Union
 
 import yaml
 from yaml.error import YAMLError
 
-# make yaml class ignore all undefined tags and keep parsing
-# yaml doesn't understand all the !Ref, !FindInMap etc
-yaml.SafeLoader.add_multi_constructor("!", lambda loader, suffix, node: None)
+# use the libyaml C loader when PyYAML is built with it
+BaseTemplateLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_parsed_templates: Dict[Tuple[str, str], Any] = {}
+_parsed_templates_lock = threading.Lock()
+
+
+class IntrinsicFunction:
+    """Intrinsic function in the short form yaml tag, e.g. !Ref, !GetAtt.
+
+    :param tag: name of the tag without the leading "!"
+    :type tag: str
+    :param value: value of the tagged node
+    :type value: Any
+    """
+
+    __slots__ = ("tag", "value")
+
+    def __init__(self, tag: str, value: Any) -> None:
+        """Construct the instance."""
+        self.tag: str = tag
+        self.value: Any = value
+
+    @property
+    def name(self) -> str:
+        """Return the name of the function in the full form, e.g. Fn::GetAtt."""
+        return self.tag if self.tag in {"Ref", "Condition"} else "Fn::%s" % self.tag
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the tag and value."""
+        if not isinstance(other, IntrinsicFunction):
+            return NotImplemented
+        return self.tag == other.tag and self.value == other.value
+
+    def __repr__(self) -> str:
+        """Return the tag and value."""
+        return "IntrinsicFunction(%r, %r)" % (self.tag, self.value)
+
+
+class TemplateLoader(BaseTemplateLoader):
+    """Yaml loader which keeps the intrinsic function tags as IntrinsicFunction."""
+
+
+def _construct_intrinsic(loader, suffix: str, node: yaml.Node) -> IntrinsicFunction:
+    """Construct the tagged node as IntrinsicFunction.
+
+    :param loader: yaml loader
+    :type loader: TemplateLoader
+    :param suffix: tag without the leading "!"
+    :type suffix: str
+    :param node: tagged yaml node
+    :type node: yaml.Node
+    :return: intrinsic function of the node
+    :rtype: IntrinsicFunction
+    """
+    if isinstance(node, yaml.ScalarNode):
+        return IntrinsicFunction(suffix, loader.construct_scalar(node))
+    if isinstance(node, yaml.SequenceNode):
+        return IntrinsicFunction(suffix, loader.construct_sequence(node, deep=True))
+    return IntrinsicFunction(suffix, loader.construct_mapping(node, deep=True))
+
+
+TemplateLoader.add_multi_constructor("!", _construct_intrinsic)
+
+
+def load_template(body: Union[str, bytes], template_format: str = "yaml") -> Any:
+    """Parse the template body, parsed templates are cached by content hash.
+
+    The parsed template is shared by every caller loading the same body,
+    copy it before modifying.
+
+    :param body: template body
+    :type body: Union[str, bytes]
+    :param template_format: format of the body, yaml or json
+    :type template_format: str, optional
+    :return: parsed template
+    :rtype: Any
+    """
+    content = body.encode("utf-8") if isinstance(body, str) else body
+    key = (template_format, hashlib.sha256(content).hexdigest())
+    with _parsed_templates_lock:
+        if key in _parsed_templates:
+            return _parsed_templates[key]
+    if template_format == "json":
+        parsed = json.loads(body)
+    else:
+        parsed = yaml.load(body, Loader=TemplateLoader)
+    with _parsed_templates_lock:
+        return _parsed_templates.setdefault(key, parsed)
 
 
 class FileLoader:
@@ -24,6 +112,9 @@ class FileLoader:
     The main use of the class is to load user configuration file and set
     appropriate env variables for other functions in fzfaws to consume.
 
+    Templates are parsed by load_template, intrinsic function tags are
+    kept as IntrinsicFunction and the parsed result is cached by content hash.
+
     :param path: file path to read
     :type path: str, optional
     :param body: body to process
@@ -47,7 +138,7 @@ class FileLoader:
         """
         with open(self.path, "r") as file:
             body = file.read()
-            formated_body = yaml.safe_load(body)
+            formated_body = load_template(body)
             return {"body": body, "dictBody": formated_body}
 
     def process_json_file(self) -> Dict[str, Any]:
@@ -58,7 +149,7 @@ class FileLoader:
         """
         with open(self.path, "r") as file:
             body = file.read()
-            formated_body = json.loads(body)
+            formated_body = load_template(body, "json")
             return {"body": body, "dictBody": formated_body}
 
     def process_yaml_body(self) -> dict:
@@ -67,7 +158,7 @@ class FileLoader:
         :return: loaded dictionary
         :rtyrp: dict
         """
-        return yaml.safe_load(self.body)
+        return load_template(self.body)
 
     def process_json_body(self) -> dict:
         """Process the json body.
@@ -75,7 +166,7 @@ class FileLoader:
         :return: loaded dictionary
         :rtyrp: dict
         """
-        return json.loads(self.body)
+        return load_template(self.body, "json")
 
     def load_config_file(self, config_path: str = None) -> None:
         """Load config file into dict.
@@ -146,6 +237,10 @@ class FileLoader:
         if cloudformation_settings.get("default_args"):
             for key, value in cloudformation_settings["default_args"].items():
                 os.environ["FZFAWS_CLOUDFORMATION_%s" % key.upper()] = value
+        if cloudformation_settings.get("template_bucket"):
+            os.environ[
+                "FZFAWS_CLOUDFORMATION_TEMPLATE_BUCKET"
+            ] = cloudformation_settings["template_bucket"]
         if cloudformation_settings.get("waiter"):
             os.environ["FZFAWS_CLOUDFORMATION_WAITER"] = json.dumps(
                 cloudformation_settings.get("waiter", {})
@@ -4,12 +4,15 @@ The fzf class should be used for all occasion when fzf needs
 to be launched. fzfaws comes with 4 fzf binary files and will
 be used if user doesn't specify to use system fzf in config file.
 """
+import itertools
 import os
 import subprocess
 import sys
-from typing import Any, Dict, Generator, List, Optional, Union
+import threading
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
 
 from fzfaws.utils.exceptions import EmptyList, NoSelectionMade
+from fzfaws.utils.scanner import scan_local
 
 
 class Pyfzf:
@@ -150,6 +153,108 @@ class Pyfzf:
                 else:
                     return ""
 
+        return self._format_selection(selection_str, multi_select, print_col, delimiter)
+
+    def stream_fzf(
+        self,
+        entries: Iterable[str],
+        empty_allow: bool = False,
+        print_col: int = 2,
+        preview: Optional[str] = None,
+        multi_select: bool = False,
+        header: Optional[str] = None,
+        delimiter: Optional[str] = None,
+    ) -> Union[List[Any], List[str], str]:
+        """Stream entries into fzf as they are produced and return formated string.
+
+        Unlike execute_fzf, fzf is launched immediately and entries are written
+        to fzf in a background thread, user could start searching and
+        selecting before all entries are produced.
+
+        Example:
+            fzf = Pyfzf()
+            fzf.stream_fzf(("%s" % key for key in slow_generator()), print_col=0)
+
+        :param entries: iterable of entries, each entry is a single line
+        :type entries: Iterable[str]
+        :param empty_allow: determine if empty selection is allowed
+        :type empty_allow: bool, optional
+        :param print_col: which column of the result to print (used by awk), -1 print everything except first col
+        :type print_col: int, optional
+        :param preview: display preview in fzf, e.g.(echo 'hello')
+        :type preview: str, optional
+        :param multi_select: enable fzf multi selection
+        :type multi_select: bool, optional
+        :param header: header to display in fzf
+        :type header: str, optional
+        :param delimiter: the delimiter to seperate print_col, like awk number
+        :type delimiter: Optional[str]
+        :raises NoSelectionMade: when user did not make a selection and empty_allow is False
+        :return: selected entry from fzf
+        :rtype: Union[list[Any], list[str], str]
+        """
+        cmd_list: list = self._construct_fzf_cmd()
+        if header:
+            cmd_list.append("--header=%s" % header)
+        if multi_select:
+            cmd_list.append("--multi")
+        else:
+            cmd_list.append("--no-multi")
+        if preview:
+            cmd_list.extend(["--preview", preview])
+
+        process = subprocess.Popen(
+            cmd_list, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+        def _write_entries() -> None:
+            try:
+                for entry in entries:
+                    process.stdin.write(("%s\n" % entry).encode("utf-8"))
+                    process.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                # fzf exited before all entries are produced
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        writer = threading.Thread(target=_write_entries, daemon=True)
+        writer.start()
+        selection = process.stdout.read()
+        process.wait()
+        selection_str = str(selection, "utf-8")
+
+        if process.returncode != 0 or not selection:
+            if not empty_allow:
+                raise NoSelectionMade
+            return [] if multi_select else ""
+        self._check_ctrl_c(selection_str)
+
+        return self._format_selection(selection_str, multi_select, print_col, delimiter)
+
+    def _format_selection(
+        self,
+        selection_str: str,
+        multi_select: bool,
+        print_col: int,
+        delimiter: Optional[str],
+    ) -> Union[List[Any], List[str], str]:
+        """Format the raw fzf output into the selected columns.
+
+        :param selection_str: raw output of fzf
+        :type selection_str: str
+        :param multi_select: if fzf was launched with multi selection
+        :type multi_select: bool
+        :param print_col: which column of the result to return
+        :type print_col: int
+        :param delimiter: the delimiter to seperate print_col
+        :type delimiter: Optional[str]
+        :return: selected entry or entries
+        :rtype: Union[list[Any], list[str], str]
+        """
         if multi_select:
             return_list: List[str] = []
             # multi_select would return everything seperate by \n
@@ -177,7 +282,9 @@ class Pyfzf:
         Populate the local files into fzf, if search_from_root is true
         all files would be populated.
 
-        Note: could be extremely slow to seach from root if fd not installed.
+        Files are scanned in process and streamed into fzf while
+        the scan is still running. Hidden files and directories are
+        skipped at every depth unless hidden is set, same as fd.
 
         :param search_from_root: search files from root
         :type search_from_root: bool, optional
@@ -185,7 +292,7 @@ class Pyfzf:
         :type cloudformation: bool, optional
         :param directory: search directory
         :type directory: bool, optional
-        :param hidden: search hidden file, only has effect when fd installed
+        :param hidden: search hidden files and directories
         :type hidden: bool, optional
         :param empty_allow: allow empty selection
         :type empty_allow: bool, optional
@@ -203,63 +310,24 @@ class Pyfzf:
         if not header and directory:
             header = r"Selecting ./ will use current directory"
 
-        cmd: str = ""
-
-        if self._check_fd():
-            if directory:
-                cmd = "echo \033[33m./\033[0m; fd --type d"
-            elif cloudformation:
-                cmd = "fd --type f --regex '(yaml|yml|json)$'"
-            else:
-                cmd = "fd --type f"
-            if hidden:
-                cmd += " -H"
-
-        else:
-            if directory:
-                cmd = "echo \033[33m./\033[0m; find * -type d"
-            elif cloudformation:
-                cmd = 'find * -type f -name "*.json" -o -name "*.yaml" -o -name "*.yml"'
-            else:
-                cmd = "find * -type f"
-
-        list_file = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, shell=True
-        )
-
-        selected_file_path: bytes = b""
-        selected_file_path_str: str = ""
-
-        try:
-            cmd_list: list = self._construct_fzf_cmd()
-            if header:
-                cmd_list.append("--header=%s" % header)
-            if multi_select:
-                cmd_list.append("-m")
-            else:
-                cmd_list.append("+m")
-            selected_file_path = subprocess.check_output(
-                cmd_list, stdin=list_file.stdout
+        entries = (
+            entry.relative
+            for entry in scan_local(
+                directory=directory,
+                hidden=hidden,
+                suffixes=(".json", ".yaml", ".yml") if cloudformation else None,
             )
-            selected_file_path_str = str(selected_file_path, "utf-8")
-
-            if not empty_allow and not selected_file_path:
-                raise NoSelectionMade
-
-            self._check_ctrl_c(selected_file_path_str)
-
-        except subprocess.CalledProcessError:
-            # subprocess exception will raise when user press ecs to exit fzf
-            if not empty_allow:
-                raise NoSelectionMade
-            elif empty_allow:
-                return [] if empty_allow else ""
-
-        if multi_select:
-            # multi_select would return everything seperate by \n
-            return selected_file_path_str.strip().splitlines()
-        else:
-            return selected_file_path_str.strip()
+        )
+        if directory:
+            entries = itertools.chain(("\033[33m./\033[0m",), entries)
+
+        return self.stream_fzf(
+            entries,
+            empty_allow=empty_allow,
+            print_col=0,
+            multi_select=multi_select,
+            header=header,
+        )
 
     def _construct_fzf_cmd(self) -> List[str]:
         """Construct command for fzf.
@@ -289,16 +357,6 @@ class Pyfzf:
         if result[0] == "ctrl-c":
             raise KeyboardInterrupt
 
-    def _check_fd(self):
-        """Check if fd is intalled on the machine."""
-        try:
-            subprocess.run(
-                ["command", "-v", "fd"], stdout=subprocess.DEVNULL, check=True
-            )
-            return True
-        except:
-            return False
-
     def process_list(
         self,
         response_list: Union[list, Generator],
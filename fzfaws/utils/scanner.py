@@ -0,0 +1,123 @@
+"""Contains the parallel local directory scanner."""
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# number of directories scanned concurrently
+SCAN_WORKERS = 8
+
+
+class LocalEntry(NamedTuple):
+    """A local file or directory found by the scanner.
+
+    The size and mtime come from the stat of the scan, consumers
+    should reuse them instead of stating the file again.
+    """
+
+    path: str
+    relative: str
+    size: int
+    mtime: float
+    is_dir: bool
+
+
+def scan_local(
+    root: str = ".",
+    directory: bool = False,
+    hidden: bool = False,
+    suffixes: Optional[Tuple[str, ...]] = None,
+    skip_dir: Optional[Callable[[str], bool]] = None,
+    max_workers: int = SCAN_WORKERS,
+) -> Iterator[LocalEntry]:
+    """Scan the local directory recursively and stream the entries.
+
+    Directories are scanned concurrently with os.scandir, entries are
+    yielded as soon as their parent directory is scanned, so the order
+    is not deterministic. Symlinked directories are not followed.
+
+    Example:
+        for entry in scan_local("/tmp", skip_dir=lambda path: path == ".git/"):
+            print(entry.relative, entry.size)
+
+    :param root: directory to scan
+    :type root: str, optional
+    :param directory: yield directories instead of files
+    :type directory: bool, optional
+    :param hidden: include hidden files and directories, skipped at every depth otherwise
+    :type hidden: bool, optional
+    :param suffixes: only yield files ending with one of the suffixes
+    :type suffixes: Tuple[str, ...], optional
+    :param skip_dir: called with the relative path of each directory with trailing separator,
+        the directory is not scanned when it returns True
+    :type skip_dir: Callable[[str], bool], optional
+    :param max_workers: number of directories scanned concurrently
+    :type max_workers: int, optional
+    :return: generator of the scanned entries
+    :rtype: Iterator[LocalEntry]
+    """
+    stopped = threading.Event()
+
+    def _scan(
+        path: str, relative: str
+    ) -> Tuple[List[LocalEntry], List[Tuple[str, str]]]:
+        entries: List[LocalEntry] = []
+        subdirs: List[Tuple[str, str]] = []
+        if stopped.is_set():
+            return entries, subdirs
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    if not hidden and entry.name.startswith("."):
+                        continue
+                    relative_path = relative + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if skip_dir and skip_dir(relative_path + os.sep):
+                                continue
+                            subdirs.append((entry.path, relative_path + os.sep))
+                            if directory:
+                                stat = entry.stat(follow_symlinks=False)
+                                entries.append(
+                                    LocalEntry(
+                                        entry.path,
+                                        relative_path,
+                                        0,
+                                        stat.st_mtime,
+                                        True,
+                                    )
+                                )
+                        elif not directory and entry.is_file():
+                            if suffixes and not entry.name.endswith(suffixes):
+                                continue
+                            stat = entry.stat()
+                            entries.append(
+                                LocalEntry(
+                                    entry.path,
+                                    relative_path,
+                                    stat.st_size,
+                                    stat.st_mtime,
+                                    False,
+                                )
+                            )
+                    except OSError:
+                        # file removed or not accessible during the scan
+                        continue
+        except OSError:
+            pass
+        return entries, subdirs
+
+    executor = ThreadPoolExecutor(max_workers=max(max_workers, 1))
+    try:
+        pending: Dict[Future, str] = {executor.submit(_scan, root, ""): root}
+        while pending:
+            done = wait(pending, return_when=FIRST_COMPLETED).done
+            for future in done:
+                pending.pop(future)
+                entries, subdirs = future.result()
+                for path, relative in subdirs:
+                    pending[executor.submit(_scan, path, relative)] = path
+                yield from entries
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False)
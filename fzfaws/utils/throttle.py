@@ -0,0 +1,151 @@
+"""Contains rate limiting and throttled call retry for concurrent api calls."""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from botocore.exceptions import ClientError
+
+# error codes returned by aws when the request rate is exceeded
+THROTTLE_ERROR_CODES = {
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+}
+
+
+class RateLimiter:
+    """Thread safe limiter spacing out calls to a maximum rate.
+
+    :param rate: maximum number of calls per second
+    :type rate: float
+    """
+
+    def __init__(self, rate: float) -> None:
+        """Construct the rate limiter."""
+        self._interval = 1.0 / rate
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_call - now
+            self._next_call = max(self._next_call, now) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def is_throttled(error: ClientError) -> bool:
+    """Check if the client error is caused by throttling.
+
+    :param error: the client error raised by boto3
+    :type error: ClientError
+    :return: True if the request is throttled
+    :rtype: bool
+    """
+    return error.response.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES
+
+
+def call_with_retry(
+    func: Callable[..., Any],
+    limiter: Optional[RateLimiter] = None,
+    attempts: int = 5,
+    base_delay: float = 0.1,
+    **kwargs
+) -> Any:
+    """Call the function and retry when the call is throttled.
+
+    Throttled calls are retried with exponential backoff and full jitter,
+    other errors are raised immediately.
+
+    :param func: function to call, e.g. client.put_object_tagging
+    :type func: Callable[..., Any]
+    :param limiter: rate limiter to acquire before each call
+    :type limiter: RateLimiter, optional
+    :param attempts: maximum number of attempts
+    :type attempts: int, optional
+    :param base_delay: delay in seconds of the first retry
+    :type base_delay: float, optional
+    :raises ClientError: when the call failed or still throttled after all attempts
+    :return: return value of the function
+    :rtype: Any
+    """
+    attempt = 0
+    while True:
+        if limiter:
+            limiter.acquire()
+        try:
+            return func(**kwargs)
+        except ClientError as e:
+            attempt += 1
+            if not is_throttled(e) or attempt >= attempts:
+                raise
+            time.sleep(random.uniform(0, base_delay * 2 ** attempt))
+
+
+def run_bounded(
+    func: Callable[..., Any], items: Iterable[Any], max_workers: int, **kwargs
+) -> Iterator[Tuple[Any, Future]]:
+    """Run the function on each item concurrently and yield the completed futures.
+
+    At most max_workers * 2 items are queued at the same time.
+
+    :param func: function to run, called with the item and kwargs
+    :type func: Callable[..., Any]
+    :param items: items to process
+    :type items: Iterable[Any]
+    :param max_workers: number of concurrent workers
+    :type max_workers: int
+    :return: generator of item and its completed future
+    :rtype: Iterator[Tuple[Any, Future]]
+    """
+    pending: Dict[Future, Any] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            if len(pending) >= max_workers * 2:
+                for future in wait(pending, return_when=FIRST_COMPLETED).done:
+                    yield pending.pop(future), future
+            pending[executor.submit(func, item, **kwargs)] = item
+        for future in wait(pending).done:
+            yield pending.pop(future), future
+
+
+def raise_failures(
+    failed: List[Tuple[str, str]], error: Type[Exception], message: str
+) -> None:
+    """Print each failed item with its reason and raise the error.
+
+    Nothing happens when there is no failure.
+
+    :param failed: name and failure reason of each failed item
+    :type failed: List[Tuple[str, str]]
+    :param error: exception class to raise
+    :type error: Type[Exception]
+    :param message: error message, formatted with the number of failures
+    :type message: str
+    :raises Exception: the error when any of the items failed
+    """
+    if not failed:
+        return
+    for name, reason in failed:
+        print("failed: %s (%s)" % (name, reason))
+    raise error(message % len(failed))
@@ -120,3 +120,21 @@ def get_default_args(action_command: str, curr_args: List[Any]) -> List[Any]:
         return curr_args
     else:
         return [action_subcommand] + default_args.split() + action_options
+
+
+def get_cache_path(filename: str) -> str:
+    """Return the path of the cache file under the fzfaws cache directory.
+
+    The cache directory is $XDG_CACHE_HOME/fzfaws or $HOME/.cache/fzfaws,
+    the directory is created if not exists.
+
+    :param filename: name of the cache file
+    :type filename: str
+    :return: absolute path to the cache file
+    :rtype: str
+    """
+    home = os.path.expanduser("~")
+    base_directory = os.getenv("XDG_CACHE_HOME", "%s/.cache" % home)
+    cache_directory = "%s/fzfaws" % base_directory
+    os.makedirs(cache_directory, exist_ok=True)
+    return "%s/%s" % (cache_directory, filename)
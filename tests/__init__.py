@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# keep the persisted caches of the test run away from the user cache directory
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp()
@@ -90,8 +90,9 @@ class TestCloudformationChangesetStack(unittest.TestCase):
         cloudformation.client.execute_change_set.assert_called_once_with(
             ChangeSetName="fooboo", StackName="testing1"
         )
-        cloudformation.wait.assert_called_once_with(
-            "stack_update_complete", "Wating for stack to be updated ..."
+        cloudformation.wait_stack.assert_called_once_with(
+            "Wating for stack to be updated ...",
+            cloudformation.get_last_event_id.return_value,
         )
 
     @patch("fzfaws.cloudformation.changeset_stack.get_confirmation")
@@ -160,6 +161,7 @@ class TestCloudformationChangesetStack(unittest.TestCase):
             False,
             cloudformation=cloudformation,
             dryrun=True,
+            stage=False,
         )
         MockedCloudformation.assert_called_with("root", "us-east-1")
 
@@ -179,4 +181,5 @@ class TestCloudformationChangesetStack(unittest.TestCase):
             False,
             cloudformation=cloudformation,
             dryrun=True,
+            stage=False,
         )
@@ -3,14 +3,17 @@ import json
 import os
 import sys
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import ANY, call, patch
 from pathlib import Path
 
+from botocore.exceptions import ClientError
 from botocore.paginate import Paginator
 from botocore.waiter import Waiter
 
 from fzfaws.cloudformation import Cloudformation
 from fzfaws.utils import FileLoader
+from fzfaws.utils.exceptions import CloudformationError
 from fzfaws.utils.pyfzf import Pyfzf
 
 
@@ -47,70 +50,43 @@ class TestCloudformation(unittest.TestCase):
             "../data/cloudformation_stacks.json",
         )
         with open(data_path, "r") as file:
-            response = json.load(file)
-
-        mocked_page.return_value = response
-        mocked_execute.return_value = "dotbare-cicd"
-        self.cloudformation.set_stack()
-        mocked_list.assert_called_once_with(
-            response[0]["Stacks"], "StackName", "StackStatus", "Description"
-        )
-        mocked_execute.assert_called_once_with(empty_allow=False)
-        self.assertEqual(
-            self.cloudformation.stack_details,
+            stacks = json.load(file)[0]["Stacks"]
+        summaries = [
             {
-                "Capabilities": ["CAPABILITY_NAMED_IAM"],
-                "Description": "CodeBuild template for dotbare, webhook trigger from Github "
-                "only on Master push",
-                "DisableRollback": False,
-                "DriftInformation": {"StackDriftStatus": "IN_SYNC"},
-                "NotificationARNs": [],
-                "RollbackConfiguration": {"RollbackTriggers": []},
-                "StackId": "arn:aws:cloudformation:ap-southeast-2:1111111:stack/dotbare-cicd/0ae5ef60-9651-11ea-b6d0-0223bf2782f0",
-                "StackName": "dotbare-cicd",
-                "StackStatus": "UPDATE_COMPLETE",
-                "Tags": [],
-            },
-        )
-        self.assertEqual(self.cloudformation.stack_name, "dotbare-cicd")
+                "StackId": stack["StackId"],
+                "StackName": stack["StackName"],
+                "StackStatus": stack["StackStatus"],
+                "TemplateDescription": stack.get("Description", ""),
+            }
+            for stack in stacks
+        ]
 
-        mocked_list.reset_mock()
-        mocked_execute.reset_mock()
+        mocked_page.return_value = [{"StackSummaries": summaries}]
         mocked_execute.return_value = "hellotesting"
-        self.cloudformation.set_stack()
+        with patch.object(
+            self.cloudformation.client, "describe_stacks"
+        ) as mocked_describe:
+            mocked_describe.return_value = {"Stacks": [stacks[1]]}
+            self.cloudformation.set_stack()
+            mocked_describe.assert_called_once_with(StackName=stacks[1]["StackId"])
+        mocked_page.assert_called_once_with(ANY, StackStatusFilter=ANY)
+        self.assertNotIn(
+            "DELETE_COMPLETE", mocked_page.call_args[1]["StackStatusFilter"]
+        )
         mocked_list.assert_called_once_with(
-            response[0]["Stacks"], "StackName", "StackStatus", "Description"
+            summaries, "StackName", "StackStatus", "TemplateDescription"
         )
         mocked_execute.assert_called_once_with(empty_allow=False)
+        self.assertEqual(self.cloudformation.stack_details, stacks[1])
+        self.assertEqual(self.cloudformation.stack_name, "hellotesting")
         self.assertEqual(
-            self.cloudformation.stack_details,
-            {
-                "Description": "testing purposes only",
-                "DisableRollback": False,
-                "DriftInformation": {"StackDriftStatus": "IN_SYNC"},
-                "NotificationARNs": [],
-                "Outputs": [
-                    {
-                        "Description": "The security group id for EC2 import reference",
-                        "ExportName": "hellotesting-SecurityGroupId",
-                        "OutputKey": "SecurityGroupId",
-                        "OutputValue": "sg-006ae18653dc5acd7",
-                    }
-                ],
-                "Parameters": [
-                    {"ParameterKey": "SSHLocation", "ParameterValue": "0.0.0.0/0"},
-                    {"ParameterKey": "Hello", "ParameterValue": "i-0a23663d658dcee1c"},
-                    {"ParameterKey": "WebServer", "ParameterValue": "No"},
-                ],
-                "RoleARN": "arn:aws:iam::1111111:role/admincloudformaitontest",
-                "RollbackConfiguration": {},
-                "StackId": "arn:aws:cloudformation:ap-southeast-2:1111111:stack/hellotesting/05feb330-88f3-11ea-ae79-0aa5d4eec80a",
-                "StackName": "hellotesting",
-                "StackStatus": "UPDATE_COMPLETE",
-                "Tags": [{"Key": "hasdf", "Value": "asdfa"}],
-            },
+            list(self.cloudformation.stack_summaries),
+            [
+                "dotbare-cicd",
+                "hellotesting",
+                "Auto-check-drift-LambdaStack-27L1HVBQ16PR",
+            ],
         )
-        self.assertEqual(self.cloudformation.stack_name, "hellotesting")
 
     @patch.object(Paginator, "paginate")
     @patch.object(Pyfzf, "execute_fzf")
@@ -173,6 +149,13 @@ class TestCloudformation(unittest.TestCase):
         mocked_execute.assert_called_once_with(
             multi_select=True, header="hello", empty_allow=True
         )
+        # resources are cached per stack
+        mocked_page.assert_called_once_with(ANY, StackName="")
+        self.assertEqual(
+            list(self.cloudformation.list_stack_resources()),
+            ["CodeBuild", "ParameterStorePolicy", "ServiceRole"],
+        )
+        mocked_page.assert_called_once()
 
     @patch.object(Waiter, "wait")
     def test_wait(self, mocked_wait):
@@ -190,7 +173,9 @@ class TestCloudformation(unittest.TestCase):
         self.cloudformation.stack_name = "fooboo"
         self.cloudformation.wait(waiter_name="stack_create_complete", message="hello")
         mocked_wait.assert_called_once_with(
-            ANY, StackName="fooboo", WaiterConfig={"Delay": 15, "MaxAttempts": 40},
+            ANY,
+            StackName="fooboo",
+            WaiterConfig={"Delay": 15, "MaxAttempts": 40},
         )
 
         self.capturedOutput.truncate(0)
@@ -210,6 +195,427 @@ class TestCloudformation(unittest.TestCase):
         )
         self.assertRegex(self.capturedOutput.getvalue(), r"hello")
 
+    @patch("fzfaws.cloudformation.cloudformation.time")
+    @patch.object(Paginator, "paginate")
+    def test_wait_stack(self, mocked_page, mocked_time):
+        stack_id = "arn:aws:cloudformation:us-east-1:1111111:stack/testing1/1"
+        mocked_time.monotonic.return_value = 0
+
+        def event(event_id, logical_id, status, reason="", timestamp=None):
+            return {
+                "EventId": event_id,
+                "StackId": stack_id,
+                "LogicalResourceId": logical_id,
+                "PhysicalResourceId": stack_id if logical_id == "testing1" else "",
+                "ResourceType": "AWS::CloudFormation::Stack"
+                if logical_id == "testing1"
+                else "AWS::S3::Bucket",
+                "ResourceStatus": status,
+                "ResourceStatusReason": reason,
+                "Timestamp": timestamp or datetime(2020, 1, 1, tzinfo=timezone.utc),
+            }
+
+        previous = [
+            event("3", "testing1", "UPDATE_COMPLETE"),
+            event("2", "Bucket", "UPDATE_COMPLETE"),
+            event("1", "testing1", "UPDATE_IN_PROGRESS"),
+        ]
+        started = [
+            event("5", "Bucket", "UPDATE_IN_PROGRESS"),
+            event("4", "testing1", "UPDATE_IN_PROGRESS"),
+        ] + previous
+        mocked_page.side_effect = [
+            [{"StackEvents": previous}],
+            [{"StackEvents": started[:1]}, {"StackEvents": started[1:]}],
+            [{"StackEvents": started}],
+            [{"StackEvents": [event("6", "testing1", "UPDATE_COMPLETE")] + started}],
+        ]
+        self.cloudformation.stack_name = "testing1"
+        self.cloudformation.stack_details = {
+            "StackName": "testing1",
+            "StackId": stack_id,
+        }
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        self.cloudformation.wait_stack("hello")
+        mocked_page.assert_called_with(ANY, StackName=stack_id)
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "hello\n"
+            "00:00:00 UPDATE_IN_PROGRESS AWS::CloudFormation::Stack testing1\n"
+            "00:00:00 UPDATE_IN_PROGRESS AWS::S3::Bucket Bucket\n"
+            "00:00:00 UPDATE_COMPLETE AWS::CloudFormation::Stack testing1\n",
+        )
+        self.assertEqual(mocked_time.sleep.call_args_list, [call(4), call(2), call(4)])
+
+        mocked_page.side_effect = [
+            [
+                {
+                    "StackEvents": [
+                        event(
+                            "9",
+                            "testing1",
+                            "UPDATE_ROLLBACK_COMPLETE",
+                            timestamp=datetime.now(timezone.utc),
+                        ),
+                        event("8", "Bucket", "UPDATE_FAILED", "access denied"),
+                        event("7", "testing1", "UPDATE_IN_PROGRESS"),
+                    ]
+                    + previous
+                }
+            ]
+        ]
+        with self.assertRaises(CloudformationError) as context:
+            self.cloudformation.wait_stack()
+        self.assertEqual(
+            str(context.exception),
+            "Stack testing1 UPDATE_ROLLBACK_COMPLETE\nBucket: access denied",
+        )
+
+        mocked_page.side_effect = None
+        mocked_page.return_value = [{"StackEvents": previous}]
+        mocked_time.monotonic.side_effect = [0, 10000]
+        self.assertRaises(CloudformationError, self.cloudformation.wait_stack)
+
+        # terminal event of the previous operation within the clock skew
+        recent = [
+            event(
+                "10",
+                "testing1",
+                "UPDATE_COMPLETE",
+                timestamp=datetime.now(timezone.utc),
+            )
+        ] + previous
+        mocked_page.return_value = None
+        mocked_page.side_effect = [
+            [{"StackEvents": recent}],
+            [
+                {
+                    "StackEvents": [
+                        event("12", "testing1", "UPDATE_COMPLETE"),
+                        event("11", "testing1", "UPDATE_IN_PROGRESS"),
+                    ]
+                    + recent
+                }
+            ],
+        ]
+        mocked_time.monotonic.side_effect = None
+        mocked_time.monotonic.return_value = 0
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        self.cloudformation.wait_stack(last_event_id="10")
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "00:00:00 UPDATE_IN_PROGRESS AWS::CloudFormation::Stack testing1\n"
+            "00:00:00 UPDATE_COMPLETE AWS::CloudFormation::Stack testing1\n",
+        )
+
+    def test_get_last_event_id(self):
+        with patch.object(self.cloudformation, "_client") as mocked_client:
+            mocked_client.describe_stack_events.return_value = {
+                "StackEvents": [{"EventId": "2"}, {"EventId": "1"}]
+            }
+            self.cloudformation.stack_name = "testing1"
+            self.assertEqual(self.cloudformation.get_last_event_id(), "2")
+            mocked_client.describe_stack_events.assert_called_with(StackName="testing1")
+            mocked_client.describe_stack_events.return_value = {"StackEvents": []}
+            self.assertIsNone(self.cloudformation.get_last_event_id("arn:stack/1"))
+            mocked_client.describe_stack_events.assert_called_with(
+                StackName="arn:stack/1"
+            )
+
+    @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(Pyfzf, "process_list")
+    @patch.object(Cloudformation, "_fetch_resources")
+    def test_load_stack_tree(self, mocked_fetch, mocked_process, mocked_execute):
+        arn = "arn:aws:cloudformation:us-east-1:1111111:stack/%s/1"
+
+        def nested(logical_id, stack_name):
+            return {
+                "LogicalResourceId": logical_id,
+                "PhysicalResourceId": arn % stack_name,
+                "ResourceType": "AWS::CloudFormation::Stack",
+                "ResourceStatus": "CREATE_COMPLETE",
+                "DriftInformation": {"StackResourceDriftStatus": "NOT_CHECKED"},
+            }
+
+        bucket = {
+            "LogicalResourceId": "Bucket",
+            "ResourceType": "AWS::S3::Bucket",
+            "DriftInformation": {"StackResourceDriftStatus": "IN_SYNC"},
+        }
+        resources = {
+            "root": {"Network": nested("Network", "root-Network"), "Bucket": bucket},
+            arn % "root-Network": {"Subnet": nested("Subnet", "root-Network-Subnet")},
+            arn % "root-Network-Subnet": {},
+        }
+        mocked_fetch.side_effect = lambda stack_name: resources[stack_name]
+        self.cloudformation.stack_name = "root"
+        self.cloudformation.stack_details = {
+            "StackName": "root",
+            "StackId": "root",
+            "StackStatus": "UPDATE_COMPLETE",
+            "DriftInformation": {"StackDriftStatus": "IN_SYNC"},
+        }
+
+        tree = self.cloudformation.load_stack_tree()
+        self.assertEqual(
+            list(tree),
+            ["root", "root/Network", "root/Network/Subnet"],
+        )
+        self.assertEqual(
+            [(node["StackName"], node["Depth"]) for node in tree.values()],
+            [("root", 0), ("root-Network", 1), ("root-Network-Subnet", 2)],
+        )
+        self.assertEqual(mocked_fetch.call_count, 3)
+
+        mocked_execute.return_value = ["root/Network/Subnet", "root/Bucket"]
+        result = self.cloudformation.get_stack_resources(nested=True)
+        self.assertEqual(
+            [
+                resource["LogicalResourceId"]
+                for resource in mocked_process.call_args[0][0]
+            ],
+            ["root/Network", "root/Bucket", "root/Network/Subnet"],
+        )
+        self.assertEqual(mocked_fetch.call_count, 3)
+        self.assertEqual(
+            [self.cloudformation.get_resource_stack(resource) for resource in result],
+            [(arn % "root-Network", "Subnet"), ("root", "Bucket")],
+        )
+
+    @patch("fzfaws.cloudformation.cloudformation.time")
+    @patch.object(Paginator, "paginate")
+    def test_wait_stack_nested(self, mocked_page, mocked_time):
+        stack_id = "arn:aws:cloudformation:us-east-1:1111111:stack/testing1/1"
+        nested_id = "arn:aws:cloudformation:us-east-1:1111111:stack/testing1-Child/1"
+        mocked_time.monotonic.return_value = 0
+        now = datetime.now(timezone.utc)
+
+        def event(event_id, stack, logical_id, physical_id, status, seconds):
+            return {
+                "EventId": event_id,
+                "StackId": stack,
+                "StackName": stack.split("/")[1],
+                "LogicalResourceId": logical_id,
+                "PhysicalResourceId": physical_id,
+                "ResourceType": "AWS::CloudFormation::Stack",
+                "ResourceStatus": status,
+                "Timestamp": now + timedelta(seconds=seconds),
+            }
+
+        root_events = [
+            [event("1", stack_id, "testing1", stack_id, "CREATE_IN_PROGRESS", 0)],
+            [
+                event("2", stack_id, "Child", nested_id, "CREATE_IN_PROGRESS", 1),
+                event("1", stack_id, "testing1", stack_id, "CREATE_IN_PROGRESS", 0),
+            ],
+            [
+                event("5", stack_id, "testing1", stack_id, "CREATE_COMPLETE", 4),
+                event("2", stack_id, "Child", nested_id, "CREATE_IN_PROGRESS", 1),
+            ],
+        ]
+        nested_events = [
+            [
+                event(
+                    "4", nested_id, "testing1-Child", nested_id, "CREATE_COMPLETE", 3
+                ),
+                event(
+                    "3", nested_id, "testing1-Child", nested_id, "CREATE_IN_PROGRESS", 2
+                ),
+            ]
+        ]
+
+        def paginate(*args, StackName):
+            events = root_events if StackName == stack_id else nested_events
+            return [{"StackEvents": events.pop(0)}]
+
+        mocked_page.side_effect = paginate
+        self.cloudformation.stack_name = "testing1"
+        self.cloudformation.stack_details = {
+            "StackName": "testing1",
+            "StackId": stack_id,
+        }
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        self.cloudformation.wait_stack()
+        self.assertEqual(
+            [
+                line.split(" ", 1)[1]
+                for line in self.capturedOutput.getvalue().splitlines()
+            ],
+            [
+                "CREATE_IN_PROGRESS AWS::CloudFormation::Stack testing1",
+                "CREATE_IN_PROGRESS AWS::CloudFormation::Stack Child",
+                "CREATE_IN_PROGRESS AWS::CloudFormation::Stack testing1-Child/testing1-Child",
+                "CREATE_COMPLETE AWS::CloudFormation::Stack testing1-Child/testing1-Child",
+                "CREATE_COMPLETE AWS::CloudFormation::Stack testing1",
+            ],
+        )
+
+    @patch("fzfaws.cloudformation.cloudformation.time")
+    @patch.object(Cloudformation, "get_last_event_id")
+    @patch.object(Cloudformation, "_get_new_events")
+    def test_execute_stacks(self, mocked_events, mocked_last, mocked_time):
+        mocked_time.monotonic.return_value = 0
+        mocked_last.side_effect = lambda stack_id: "%s-last" % stack_id
+        started = []
+
+        def action(stack_name, status=None, error=None):
+            def _start():
+                started.append(stack_name)
+                if error:
+                    raise error
+                return status
+
+            return _start
+
+        def event(stack_name, status, logical_id=None, reason=""):
+            return {
+                "EventId": "%s-%s" % (stack_name, status),
+                "StackId": stack_name,
+                "LogicalResourceId": logical_id or stack_name,
+                "PhysicalResourceId": stack_name if not logical_id else "",
+                "ResourceType": "AWS::CloudFormation::Stack"
+                if not logical_id
+                else "AWS::S3::Bucket",
+                "ResourceStatus": status,
+                "ResourceStatusReason": reason,
+                "Timestamp": datetime(2020, 1, 1, tzinfo=timezone.utc),
+            }
+
+        events = {
+            "vpc": [[], [event("vpc", "UPDATE_COMPLETE")]],
+            "app": [
+                [
+                    event("app", "UPDATE_FAILED", "Bucket", "access denied"),
+                    event("app", "UPDATE_ROLLBACK_COMPLETE"),
+                ]
+            ],
+        }
+        mocked_events.side_effect = lambda stack_id, *args: events[stack_id].pop(0)
+        self.cloudformation.stack_summaries = {}
+        results = self.cloudformation.execute_stacks(
+            {
+                "vpc": action("vpc"),
+                "db": action("db", status="NO_CHANGES"),
+                "app": action("app"),
+                "web": action("web"),
+                "worker": action(
+                    "worker",
+                    error=ClientError(
+                        {"Error": {"Code": "ValidationError", "Message": "invalid"}},
+                        "UpdateStack",
+                    ),
+                ),
+                "cron": action("cron"),
+            },
+            {"app": {"vpc", "db"}, "web": {"app"}, "cron": {"worker", "other"}},
+            max_in_flight=2,
+        )
+        self.assertEqual(
+            results,
+            {
+                "vpc": {"Status": "UPDATE_COMPLETE", "Reason": ""},
+                "db": {"Status": "NO_CHANGES", "Reason": ""},
+                "app": {
+                    "Status": "UPDATE_ROLLBACK_COMPLETE",
+                    "Reason": "Bucket: access denied",
+                },
+                "web": {"Status": "SKIPPED", "Reason": "app failed"},
+                "worker": {
+                    "Status": "FAILED",
+                    "Reason": "An error occurred (ValidationError) when calling the UpdateStack operation: invalid",
+                },
+                "cron": {"Status": "SKIPPED", "Reason": "worker failed"},
+            },
+        )
+        self.assertEqual(sorted(started[:2]), ["db", "vpc"])
+        self.assertEqual(started[2:], ["worker", "app"])
+        mocked_events.assert_has_calls(
+            [
+                call("vpc", "vpc-last", ANY),
+                call("vpc", "vpc-last", ANY),
+                call("app", "app-last", ANY),
+            ]
+        )
+        self.assertRegex(
+            self.capturedOutput.getvalue(),
+            r"app UPDATE_FAILED AWS::S3::Bucket Bucket \(access denied\)",
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        self.assertRaises(
+            CloudformationError, self.cloudformation.print_stack_results, results
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue().splitlines()[1:4],
+            [
+                "StackName  Status                    Reason",
+                "app        UPDATE_ROLLBACK_COMPLETE  Bucket: access denied",
+                "cron       SKIPPED                   worker failed",
+            ],
+        )
+        self.cloudformation.print_stack_results(
+            {"vpc": {"Status": "DELETE_COMPLETE", "Reason": ""}}
+        )
+
+    @patch("fzfaws.cloudformation.cloudformation.time")
+    @patch.object(Cloudformation, "get_last_event_id", return_value=None)
+    @patch.object(Cloudformation, "_get_waiter_config")
+    @patch.object(Cloudformation, "_get_new_events")
+    def test_execute_stacks_timeout(
+        self, mocked_events, mocked_config, mocked_last, mocked_time
+    ):
+        now = [0]
+        mocked_time.monotonic.side_effect = lambda: now[0]
+
+        def sleep(interval):
+            now[0] += 10
+
+        mocked_time.sleep.side_effect = sleep
+        mocked_config.return_value = (10, 3)
+        events = {
+            "b-fast": [
+                [],
+                [
+                    {
+                        "EventId": "1",
+                        "StackId": "b-fast",
+                        "LogicalResourceId": "b-fast",
+                        "PhysicalResourceId": "b-fast",
+                        "ResourceType": "AWS::CloudFormation::Stack",
+                        "ResourceStatus": "DELETE_COMPLETE",
+                        "Timestamp": datetime(2020, 1, 1, tzinfo=timezone.utc),
+                    }
+                ],
+            ]
+        }
+        mocked_events.side_effect = lambda stack_id, *args: (
+            events[stack_id].pop(0) if stack_id in events else []
+        )
+        self.cloudformation.stack_summaries = {}
+        # each stack is timed from its own start, not from the start of the batch
+        results = self.cloudformation.execute_stacks(
+            {"a-slow": lambda: None, "b-fast": lambda: None}, max_in_flight=1
+        )
+        self.assertEqual(
+            results,
+            {
+                "a-slow": {"Status": "TIMED_OUT", "Reason": ""},
+                "b-fast": {"Status": "DELETE_COMPLETE", "Reason": ""},
+            },
+        )
+        self.assertEqual(now[0], 40)
+
+        # boto3 responses are not statuses
+        self.assertRaises(
+            TypeError,
+            self.cloudformation.execute_stacks,
+            {"vpc": lambda: {"ResponseMetadata": {"HTTPStatusCode": 200}}},
+        )
+
     @patch("fzfaws.cloudformation.cloudformation.get_confirmation")
     def test_execute_with_capabilities(self, mocked_confirm):
         def hello(**kwargs):
@@ -269,14 +675,3 @@ class TestCloudformation(unittest.TestCase):
             header="\nPlease select the capabilities to acknowledge and proceed\nMore information: https://docs.aws.amazon.com/AWSCloudFormation/latest/APIReference/API_CreateStack.html",
         )
         self.assertEqual(result, ["CAPABILITY_IAM", "CAPABILITY_AUTO_EXPAND"])
-
-    def test_get_stack_generator(self):
-        self.capturedOutput.truncate(0)
-        self.capturedOutput.seek(0)
-        data = [{"Stacks": [{"foo": "boo"}]}, {"Stacks": [{"hello": "world"}]}]
-        generator = self.cloudformation._get_stack_generator(data)
-        for item in generator:
-            print(item)
-        self.assertEqual(
-            self.capturedOutput.getvalue(), "{'foo': 'boo'}\n{'hello': 'world'}\n"
-        )
@@ -4,7 +4,7 @@ import io
 import os
 import sys
 import unittest
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, MagicMock, patch
 from pathlib import Path
 
 from fzfaws.cloudformation.cloudformation import Cloudformation
@@ -29,7 +29,7 @@ class TestCloudformationCreateStack(unittest.TestCase):
         sys.stdout = sys.__stdout__
 
     @patch.object(ParamProcessor, "process_stack_params")
-    @patch.object(Cloudformation, "wait")
+    @patch.object(Cloudformation, "wait_stack")
     @patch.object(Cloudformation, "execute_with_capabilities")
     @patch("builtins.input")
     @patch("fzfaws.cloudformation.create_stack.validate_stack")
@@ -62,9 +62,7 @@ class TestCloudformationCreateStack(unittest.TestCase):
             TemplateBody=ANY,
             cloudformation_action=ANY,
         )
-        mocked_wait.assert_called_with(
-            "stack_create_complete", "Waiting for stack to be ready ..."
-        )
+        mocked_wait.assert_called_with("Waiting for stack to be ready ...")
 
         mocked_local.reset_mock()
         create_stack(
@@ -80,12 +78,33 @@ class TestCloudformationCreateStack(unittest.TestCase):
             TemplateBody=ANY,
             cloudformation_action=ANY,
         )
-        mocked_wait.assert_called_with(
-            "stack_create_complete", "Waiting for stack to be ready ..."
+        mocked_wait.assert_called_with("Waiting for stack to be ready ...")
+
+        mocked_stage = MagicMock()
+        mocked_stage.s3.bucket_name = "kazhala-lol"
+        mocked_stage.stage.return_value = "templates/1111.yaml"
+        mocked_stage.get_template_url.return_value = "https://s3/templates/1111.yaml"
+        with patch(
+            "fzfaws.cloudformation.create_stack.get_template_stage",
+            return_value=mocked_stage,
+        ):
+            create_stack(local_path=self.data_path, stage=True)
+        mocked_stage.stage.assert_called_once_with(self.data_path)
+        mocked_validate.assert_called_with(
+            "default",
+            "us-east-1",
+            bucket="kazhala-lol/templates/1111.yaml",
+            no_print=True,
+        )
+        mocked_execute.assert_called_with(
+            Parameters=[],
+            StackName="testing_stack",
+            TemplateURL="https://s3/templates/1111.yaml",
+            cloudformation_action=ANY,
         )
 
     @patch.object(ParamProcessor, "process_stack_params")
-    @patch.object(Cloudformation, "wait")
+    @patch.object(Cloudformation, "wait_stack")
     @patch.object(Cloudformation, "execute_with_capabilities")
     @patch("builtins.input")
     @patch("fzfaws.cloudformation.create_stack.validate_stack")
@@ -152,11 +171,9 @@ class TestCloudformationCreateStack(unittest.TestCase):
             TemplateURL="https://s3-ap-southeast-2.amazonaws.com/kazhala-lol/hello.yaml?versionId=111111",
             cloudformation_action=ANY,
         )
-        mocked_wait.assert_called_with(
-            "stack_create_complete", "Waiting for stack to be ready ..."
-        )
+        mocked_wait.assert_called_with("Waiting for stack to be ready ...")
 
-    @patch.object(Cloudformation, "wait")
+    @patch.object(Cloudformation, "wait_stack")
     @patch.object(Cloudformation, "execute_with_capabilities")
     @patch.object(CloudformationArgs, "set_extra_args")
     @patch("fzfaws.cloudformation.create_stack.construct_s3_creation_args")
@@ -3,6 +3,7 @@ import io
 import sys
 import unittest
 from unittest.mock import patch
+from botocore.exceptions import ClientError
 from fzfaws.cloudformation.delete_stack import delete_stack
 
 
@@ -14,13 +15,17 @@ class TestCloudformationDeleteStack(unittest.TestCase):
     def tearDown(self):
         sys.stdout = sys.__stdout__
 
+    @patch("fzfaws.cloudformation.delete_stack.get_export_index")
     @patch("fzfaws.cloudformation.delete_stack.get_confirmation")
     @patch("fzfaws.cloudformation.delete_stack.Cloudformation")
-    def test_normal_delete(self, MockedCloudformation, mocked_confirm):
+    def test_normal_delete(self, MockedCloudformation, mocked_confirm, mocked_index):
         mocked_confirm.return_value = True
         cloudformation = MockedCloudformation()
         cloudformation.stack_name = "testing1"
-        cloudformation.stack_details = {"StackStatus": "UPDATE_COMPLETE"}
+        cloudformation.stack_details = {
+            "StackStatus": "UPDATE_COMPLETE",
+            "StackId": "arn:aws:cloudformation:us-east-1:1111111:stack/testing1/1",
+        }
         delete_stack()
         cloudformation.set_stack.assert_called_once()
         mocked_confirm.assert_called_with(
@@ -31,17 +36,23 @@ class TestCloudformationDeleteStack(unittest.TestCase):
 
         delete_stack(wait=True, profile="root", region="us-east-1")
         MockedCloudformation.assert_called_with("root", "us-east-1")
-        cloudformation.wait.assert_called_once_with(
-            "stack_delete_complete", "Wating for stack to be deleted ..."
+        cloudformation.get_last_event_id.assert_called_once_with()
+        cloudformation.wait_stack.assert_called_once_with(
+            "Wating for stack to be deleted ...",
+            cloudformation.get_last_event_id.return_value,
         )
 
+    @patch("fzfaws.cloudformation.delete_stack.get_export_index")
     @patch("fzfaws.cloudformation.delete_stack.get_confirmation")
     @patch("fzfaws.cloudformation.delete_stack.Cloudformation")
-    def test_retain_delete(self, MockedCloudformation, mocked_confirm):
+    def test_retain_delete(self, MockedCloudformation, mocked_confirm, mocked_index):
         mocked_confirm.return_value = True
         cloudformation = MockedCloudformation()
         cloudformation.stack_name = "testing1"
-        cloudformation.stack_details = {"StackStatus": "DELETE_FAILED"}
+        cloudformation.stack_details = {
+            "StackStatus": "DELETE_FAILED",
+            "StackId": "arn:aws:cloudformation:us-east-1:1111111:stack/testing1/1",
+        }
         cloudformation.get_stack_resources.return_value = ["S3Bucket", "OAI"]
         delete_stack()
         cloudformation.set_stack.assert_called_once()
@@ -55,18 +66,24 @@ class TestCloudformationDeleteStack(unittest.TestCase):
         cloudformation.client.delete_stack.assert_called_with(
             RetainResources=["S3Bucket", "OAI"], StackName="testing1"
         )
-        cloudformation.wait.assert_not_called()
+        cloudformation.wait_stack.assert_not_called()
 
     @patch("fzfaws.cloudformation.delete_stack.IAM")
+    @patch("fzfaws.cloudformation.delete_stack.get_export_index")
     @patch("fzfaws.cloudformation.delete_stack.get_confirmation")
     @patch("fzfaws.cloudformation.delete_stack.Cloudformation")
-    def test_iam_delete(self, MockedCloudformation, mocked_confirm, MockedIAM):
+    def test_iam_delete(
+        self, MockedCloudformation, mocked_confirm, mocked_index, MockedIAM
+    ):
         mocked_confirm.return_value = True
         iam = MockedIAM()
         iam.arns = ["111111"]
         cloudformation = MockedCloudformation()
         cloudformation.stack_name = "testing1"
-        cloudformation.stack_details = {"StackStatus": "CREATE_COMPLETE"}
+        cloudformation.stack_details = {
+            "StackStatus": "CREATE_COMPLETE",
+            "StackId": "arn:aws:cloudformation:us-east-1:1111111:stack/testing1/1",
+        }
         delete_stack(iam=True)
         iam.set_arns.assert_called_once_with(
             header="select a iam role with permissions to delete the current stack",
@@ -82,3 +99,78 @@ class TestCloudformationDeleteStack(unittest.TestCase):
         cloudformation.client.delete_stack.assert_called_with(
             RoleARN="222222", StackName="testing1"
         )
+
+    @patch("fzfaws.cloudformation.delete_stack.get_export_index")
+    @patch("fzfaws.cloudformation.delete_stack.get_confirmation")
+    @patch("fzfaws.cloudformation.delete_stack.Cloudformation")
+    def test_imported_delete(self, MockedCloudformation, mocked_confirm, mocked_index):
+        mocked_confirm.return_value = True
+        cloudformation = MockedCloudformation()
+        cloudformation.stack_name = "vpc"
+        cloudformation.stack_details = {
+            "StackStatus": "UPDATE_COMPLETE",
+            "StackId": "arn:aws:cloudformation:us-east-1:1111111:stack/vpc/1",
+        }
+        export_index = mocked_index.return_value
+        export_index.load_stack_imports.return_value = {"vpc-id": ["app", "db"]}
+        delete_stack()
+        mocked_index.assert_called_once_with(cloudformation)
+        export_index.load.assert_not_called()
+        export_index.load_stack_imports.assert_called_once_with(
+            "arn:aws:cloudformation:us-east-1:1111111:stack/vpc/1"
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "Warning: export 'vpc-id' is imported by app, db\nStack deletion initiated\n",
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        export_index.load_stack_imports.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "ListExports"
+        )
+        delete_stack()
+        self.assertRegex(
+            self.capturedOutput.getvalue(), r"^Unable to check stack imports"
+        )
+        cloudformation.client.delete_stack.assert_called_with(StackName="vpc")
+
+    @patch("fzfaws.cloudformation.delete_stack.get_export_index")
+    @patch("fzfaws.cloudformation.delete_stack.get_confirmation")
+    @patch("fzfaws.cloudformation.delete_stack.Cloudformation")
+    def test_multi_delete(self, MockedCloudformation, mocked_confirm, mocked_index):
+        mocked_confirm.return_value = True
+        cloudformation = MockedCloudformation()
+        cloudformation.select_stacks.return_value = ["vpc", "app"]
+        export_index = mocked_index.return_value
+        export_index.dependents = {"vpc": {"app", "web"}}
+        export_index.get_delete_order.return_value = [["app"], ["vpc"]]
+        export_index.get_stack_imports.side_effect = lambda stack_name: (
+            {"vpc-id": ["app", "web"]} if stack_name == "vpc" else {}
+        )
+        delete_stack(multi=True, iam="arn:111111")
+        cloudformation.select_stacks.assert_called_once_with(
+            multi_select=True, header="select stacks to delete"
+        )
+        cloudformation.set_stack.assert_not_called()
+        export_index.get_delete_order.assert_called_once_with(["vpc", "app"])
+        mocked_confirm.assert_called_once_with(
+            "Are you sure you want to delete the stacks?"
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "Warning: export 'vpc-id' is imported by web\n"
+            "(dryrun) delete: app\n(dryrun) delete: vpc\n",
+        )
+        stack_actions, dependencies = cloudformation.execute_stacks.call_args[0]
+        self.assertEqual(dependencies, {"vpc": {"app", "web"}, "app": set()})
+        cloudformation.client.delete_stack.return_value = {
+            "ResponseMetadata": {"RequestId": "111111", "HTTPStatusCode": 200}
+        }
+        self.assertIsNone(stack_actions["vpc"]())
+        cloudformation.client.delete_stack.assert_called_once_with(
+            StackName="vpc", RoleARN="arn:111111"
+        )
+        cloudformation.print_stack_results.assert_called_once_with(
+            cloudformation.execute_stacks.return_value
+        )
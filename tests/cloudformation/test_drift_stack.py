@@ -2,10 +2,17 @@ import os
 import io
 import sys
 import unittest
-from unittest.mock import patch
-from fzfaws.cloudformation.drift_stack import drift_stack, wait_drift_result
+from unittest.mock import call, patch
+from botocore.exceptions import ClientError
+from fzfaws.cloudformation.drift_stack import (
+    drift_stack,
+    poll_drift_detections,
+    scan_drift,
+    wait_drift_result,
+)
 from fzfaws.cloudformation import Cloudformation
 from fzfaws.utils import FileLoader
+from fzfaws.utils.exceptions import CloudformationError
 
 
 class TestCloudformationDriftStack(unittest.TestCase):
@@ -130,7 +137,7 @@ class TestCloudformationDriftStack(unittest.TestCase):
         cloudformation._get_waiter_config.return_value = (1, 120)
         cloudformation.client.describe_stack_drift_detection_status.return_value = {
             "DetectionStatus": "DETECTION_COMPLETE",
-            "StackResourceDriftStatus": "IN_SYNC",
+            "StackDriftStatus": "IN_SYNC",
             "DriftedStackResourceCount": 0,
         }
         wait_drift_result(cloudformation, "1111111")
@@ -141,3 +148,141 @@ class TestCloudformationDriftStack(unittest.TestCase):
         self.assertRegex(
             self.capturedOutput.getvalue(), r"DriftedStackResourceCount: 0"
         )
+
+    @patch("fzfaws.cloudformation.drift_stack.time")
+    @patch("fzfaws.cloudformation.drift_stack.Cloudformation")
+    def test_poll_drift_detections(self, MockedCloudformation, mocked_time):
+        cloudformation = MockedCloudformation()
+        cloudformation._get_waiter_config.return_value = (5, 4)
+        statuses = {
+            "1": iter(["DETECTION_IN_PROGRESS", "DETECTION_COMPLETE"]),
+            "2": iter(["DETECTION_IN_PROGRESS"] * 4),
+        }
+        cloudformation.client.describe_stack_drift_detection_status.side_effect = (
+            lambda StackDriftDetectionId: {
+                "DetectionStatus": next(statuses[StackDriftDetectionId])
+            }
+        )
+        result = list(poll_drift_detections(cloudformation, ["1", "2"]))
+        self.assertEqual(result, [("1", {"DetectionStatus": "DETECTION_COMPLETE"})])
+        self.assertEqual(mocked_time.sleep.call_args_list, [call(4), call(2), call(4)])
+
+    @patch("fzfaws.cloudformation.drift_stack.poll_drift_detections")
+    @patch("fzfaws.cloudformation.drift_stack.Cloudformation")
+    def test_scan_drift(self, MockedCloudformation, mocked_poll):
+        cloudformation = MockedCloudformation()
+        cloudformation.client.detect_stack_drift.side_effect = lambda StackName: {
+            "StackDriftDetectionId": "id-%s" % StackName
+        }
+        mocked_poll.return_value = iter(
+            [
+                (
+                    "id-stack1",
+                    {
+                        "DetectionStatus": "DETECTION_COMPLETE",
+                        "StackDriftStatus": "DRIFTED",
+                        "DriftedStackResourceCount": 1,
+                    },
+                ),
+                (
+                    "id-stack2",
+                    {
+                        "DetectionStatus": "DETECTION_COMPLETE",
+                        "StackDriftStatus": "IN_SYNC",
+                        "DriftedStackResourceCount": 0,
+                    },
+                ),
+            ]
+        )
+        cloudformation.client.describe_stack_resource_drifts.side_effect = [
+            {
+                "StackResourceDrifts": [
+                    {
+                        "LogicalResourceId": "Bucket",
+                        "ResourceType": "AWS::S3::Bucket",
+                        "StackResourceDriftStatus": "MODIFIED",
+                        "PropertyDifferences": [
+                            {
+                                "DifferenceType": "NOT_EQUAL",
+                                "PropertyPath": "/VersioningConfiguration/Status",
+                                "ExpectedValue": "Enabled",
+                                "ActualValue": "Suspended",
+                            }
+                        ],
+                    }
+                ],
+                "NextToken": "next",
+            },
+            {
+                "StackResourceDrifts": [
+                    {
+                        "LogicalResourceId": "Queue",
+                        "ResourceType": "AWS::SQS::Queue",
+                        "StackResourceDriftStatus": "DELETED",
+                    }
+                ]
+            },
+        ]
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        scan_drift(cloudformation, ["stack1", "stack2"])
+        cloudformation.client.describe_stack_resource_drifts.assert_called_with(
+            StackName="stack1",
+            StackResourceDriftStatusFilters=["MODIFIED", "DELETED"],
+            NextToken="next",
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "Drift detection initiated on 2 stacks\n"
+            "stack1: DRIFTED (1 drifted resources)\n"
+            "stack2: IN_SYNC (0 drifted resources)\n" + 80 * "-" + "\n"
+            "stack1 Bucket AWS::S3::Bucket MODIFIED\n"
+            "    NOT_EQUAL /VersioningConfiguration/Status: Enabled -> Suspended\n"
+            "stack1 Queue AWS::SQS::Queue DELETED\n",
+        )
+
+        cloudformation.client.detect_stack_drift.side_effect = ClientError(
+            {"Error": {"Code": "ValidationError", "Message": "in progress"}},
+            "DetectStackDrift",
+        )
+        mocked_poll.return_value = iter([])
+        self.assertRaises(CloudformationError, scan_drift, cloudformation, ["stack1"])
+
+    @patch("fzfaws.cloudformation.drift_stack.scan_drift")
+    @patch("fzfaws.cloudformation.drift_stack.Cloudformation")
+    def test_drift_multi(self, MockedCloudformation, mocked_scan):
+        cloudformation = MockedCloudformation()
+        cloudformation.select_stacks.return_value = ["stack1", "stack2"]
+        drift_stack(multi=True)
+        cloudformation.select_stacks.assert_called_once_with(
+            multi_select=True, header="select stacks to detect drift"
+        )
+        mocked_scan.assert_called_once_with(cloudformation, ["stack1", "stack2"])
+        cloudformation.set_stack.assert_not_called()
+
+        cloudformation.load_stack_summaries.return_value = {
+            "stack3": {"StackStatus": "UPDATE_COMPLETE"},
+            "stack4": {"StackStatus": "UPDATE_IN_PROGRESS"},
+            "stack5": {"StackStatus": "ROLLBACK_COMPLETE"},
+            "stack6": {"StackStatus": "IMPORT_ROLLBACK_COMPLETE"},
+        }
+        drift_stack(all_stacks=True)
+        mocked_scan.assert_called_with(cloudformation, ["stack3", "stack6"])
+        self.assertIn(
+            "skip: stack4 (UPDATE_IN_PROGRESS)", self.capturedOutput.getvalue()
+        )
+        self.assertIn(
+            "skip: stack5 (ROLLBACK_COMPLETE)", self.capturedOutput.getvalue()
+        )
+
+    @patch("fzfaws.cloudformation.drift_stack.scan_drift")
+    @patch("fzfaws.cloudformation.drift_stack.Cloudformation")
+    def test_drift_nested(self, MockedCloudformation, mocked_scan):
+        cloudformation = MockedCloudformation()
+        cloudformation.load_stack_tree.return_value = {
+            "root": {"StackName": "root"},
+            "root/Network": {"StackName": "root-Network"},
+        }
+        drift_stack(nested=True)
+        cloudformation.set_stack.assert_called_once_with()
+        mocked_scan.assert_called_once_with(cloudformation, ["root", "root-Network"])
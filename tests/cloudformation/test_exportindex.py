@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+from fzfaws.cloudformation.helper.exportindex import ExportIndex, get_export_index
+from fzfaws.utils.exceptions import CloudformationError
+
+
+class TestExportIndex(unittest.TestCase):
+    def setUp(self):
+        self.cloudformation = MagicMock()
+        self.cloudformation.profile = "default"
+        self.cloudformation.region = "us-east-1"
+        self.cloudformation.client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Exports": [
+                    {
+                        "ExportingStackId": "arn:aws:cloudformation:us-east-1:1111111:stack/vpc/1",
+                        "Name": "vpc-id",
+                        "Value": "vpc-111111",
+                    },
+                    {
+                        "ExportingStackId": "arn:aws:cloudformation:us-east-1:1111111:stack/db/1",
+                        "Name": "db-endpoint",
+                        "Value": "db.example.com",
+                    },
+                ]
+            },
+            {
+                "Exports": [
+                    {
+                        "ExportingStackId": "arn:aws:cloudformation:us-east-1:1111111:stack/vpc/1",
+                        "Name": "vpc-cidr",
+                        "Value": "10.0.0.0/16",
+                    }
+                ]
+            },
+        ]
+        imports = {
+            "vpc-id": [
+                {"Imports": ["db", "app"], "NextToken": "1"},
+                {"Imports": ["web"]},
+            ],
+            "db-endpoint": [{"Imports": ["app"]}],
+        }
+
+        def list_imports(ExportName, NextToken=None):
+            if ExportName not in imports:
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "ValidationError",
+                            "Message": "Export '%s' is not imported by any stack."
+                            % ExportName,
+                        }
+                    },
+                    "ListImports",
+                )
+            return imports[ExportName][1 if NextToken else 0]
+
+        self.cloudformation.client.list_imports.side_effect = list_imports
+        self.export_index = ExportIndex(self.cloudformation)
+
+    def test_get_export_index(self):
+        export_index = get_export_index(self.cloudformation)
+        self.assertIs(get_export_index(self.cloudformation), export_index)
+        self.cloudformation.region = "us-west-2"
+        self.assertIsNot(get_export_index(self.cloudformation), export_index)
+
+    def test_load(self):
+        self.export_index.load()
+        self.assertEqual(
+            self.export_index.exports["vpc-cidr"],
+            {
+                "Name": "vpc-cidr",
+                "Value": "10.0.0.0/16",
+                "ExportingStackId": "arn:aws:cloudformation:us-east-1:1111111:stack/vpc/1",
+                "ExportingStackName": "vpc",
+            },
+        )
+        self.assertEqual(
+            self.export_index.imports,
+            {"vpc-id": ["db", "app", "web"], "db-endpoint": ["app"], "vpc-cidr": []},
+        )
+        self.assertEqual(
+            self.export_index.dependents, {"vpc": {"db", "app", "web"}, "db": {"app"}}
+        )
+        self.assertEqual(
+            self.export_index.dependencies,
+            {"db": {"vpc"}, "app": {"vpc", "db"}, "web": {"vpc"}},
+        )
+        self.assertEqual(self.cloudformation.client.list_imports.call_count, 4)
+
+        self.export_index.load()
+        self.assertEqual(self.cloudformation.client.list_imports.call_count, 4)
+        self.export_index.load(refresh=True)
+        self.assertEqual(self.cloudformation.client.list_imports.call_count, 8)
+
+    def test_get_stack_imports(self):
+        self.export_index.load()
+        self.assertEqual(
+            self.export_index.get_stack_imports("vpc"),
+            {"vpc-id": ["app", "db", "web"]},
+        )
+        self.assertEqual(self.export_index.get_stack_imports("app"), {})
+
+    def test_load_stack_imports(self):
+        self.assertEqual(
+            self.export_index.load_stack_imports(
+                "arn:aws:cloudformation:us-east-1:1111111:stack/vpc/1"
+            ),
+            {"vpc-id": ["app", "db", "web"]},
+        )
+        # only the exports of the stack are checked
+        self.assertEqual(self.cloudformation.client.list_imports.call_count, 3)
+        self.assertFalse(self.export_index.loaded)
+
+        self.export_index.load()
+        self.cloudformation.client.list_imports.reset_mock()
+        self.assertEqual(
+            self.export_index.load_stack_imports(
+                "arn:aws:cloudformation:us-east-1:1111111:stack/db/1"
+            ),
+            {"db-endpoint": ["app"]},
+        )
+        self.cloudformation.client.list_imports.assert_not_called()
+
+    def test_get_delete_order(self):
+        self.export_index.load()
+        self.assertEqual(
+            self.export_index.get_delete_order(["vpc", "db", "app", "web", "other"]),
+            [["app", "other", "web"], ["db"], ["vpc"]],
+        )
+        self.assertEqual(
+            self.export_index.get_delete_order(["vpc", "db"]), [["db"], ["vpc"]]
+        )
+
+        self.export_index.dependents["app"] = {"vpc"}
+        self.assertRaises(
+            CloudformationError, self.export_index.get_delete_order, ["vpc", "app"]
+        )
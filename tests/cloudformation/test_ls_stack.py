@@ -53,9 +53,33 @@ class TestCloudformationLsStack(unittest.TestCase):
             "EC2InstanceSecurityGroup",
             "fooboo",
         ]
+        cloudformation.list_stack_resources.return_value = {
+            "EC2InstanceSecurityGroup": {
+                "LogicalResourceId": "EC2InstanceSecurityGroup",
+                "ResourceType": "AWS::EC2::SecurityGroup",
+            },
+            "fooboo": {
+                "LogicalResourceId": "fooboo",
+                "ResourceType": "AWS::SNS::Topic",
+            },
+        }
         ls_stack(resource=True)
         cloudformation.set_stack.assert_called_once()
         cloudformation.get_stack_resources.assert_called_once()
+        cloudformation.client.describe_stack_resource.assert_not_called()
+        cloudformation.list_stack_resources.assert_called_with(
+            "testing2", no_progress=True
+        )
+        self.assertRegex(self.capturedOutput.getvalue(), r'"StackName": "testing2"')
+        self.assertRegex(
+            self.capturedOutput.getvalue(), r'"ResourceType": "AWS::SNS::Topic"'
+        )
+
+        # metadata is only available through describe_stack_resource
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        ls_stack(resource=True, metadata=True)
+        self.assertRegex(self.capturedOutput.getvalue(), r'"Metadata": "{}"')
         self.assertRegex(self.capturedOutput.getvalue(), r'"StackName": "testing2"')
         self.assertRegex(
             self.capturedOutput.getvalue(),
@@ -67,15 +91,20 @@ class TestCloudformationLsStack(unittest.TestCase):
                     StackName="testing2", LogicalResourceId="EC2InstanceSecurityGroup"
                 ),
                 call(StackName="testing2", LogicalResourceId="fooboo"),
-            ]
+            ],
+            any_order=True,
         )
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
+        cloudformation.client.describe_stack_resource.reset_mock()
         cloudformation.get_stack_resources.return_value = [
             "EC2InstanceSecurityGroup",
         ]
-        ls_stack(resource=True, name=True, arn=True, resource_type=True)
+        ls_stack(
+            resource=True, name=True, arn=True, resource_type=True, metadata=True
+        )
+        cloudformation.client.describe_stack_resource.assert_not_called()
         self.assertNotRegex(self.capturedOutput.getvalue(), r'"StackName": "testing2"')
         self.assertNotRegex(
             self.capturedOutput.getvalue(),
@@ -113,3 +142,27 @@ class TestCloudformationLsStack(unittest.TestCase):
             self.capturedOutput.getvalue(),
             "dotbare-cicd\narn:aws:cloudformation:ap-southeast-2:111111:stack/dotbare-cicd/aadsfadsf\n[{'Key': 'Application', 'Value': 'mealternative'}, {'Key': 'Name', 'Value': 'mealternative'}]\n",
         )
+
+    @patch("fzfaws.cloudformation.ls_stack.Cloudformation")
+    def test_ls_nested(self, MockedCloudformation):
+        cloudformation = MockedCloudformation()
+        cloudformation.load_stack_tree.return_value = {
+            "root": {
+                "StackName": "root",
+                "Depth": 0,
+                "StackStatus": "UPDATE_COMPLETE",
+                "Drift": "IN_SYNC",
+            },
+            "root/Network": {
+                "StackName": "root-Network",
+                "Depth": 1,
+                "StackStatus": "UPDATE_COMPLETE",
+                "Drift": "DRIFTED",
+            },
+        }
+        ls_stack(nested=True)
+        cloudformation.load_stack_tree.assert_called_once_with(no_progress=True)
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "root UPDATE_COMPLETE IN_SYNC\n  root-Network UPDATE_COMPLETE DRIFTED\n",
+        )
@@ -26,51 +26,127 @@ class TestCloudformationMain(unittest.TestCase):
     def test_create_stack(self, mocked_create):
         cloudformation(["create"])
         mocked_create.assert_called_with(
-            False, False, False, False, False, False, None, False
+            False, False, False, False, False, False, None, False, False
         )
 
         cloudformation(
             ["create", "-P", "-R", "-l", "hello.yaml", "-b", "kazhala-lol/", "-w", "-v"]
         )
         mocked_create.assert_called_with(
-            True, True, "hello.yaml", False, True, False, "kazhala-lol/", True
+            True, True, "hello.yaml", False, True, False, "kazhala-lol/", True, False
+        )
+
+        cloudformation(["create", "-l", "hello.yaml", "-s"])
+        mocked_create.assert_called_with(
+            False, False, "hello.yaml", False, False, False, None, False, True
         )
 
     @patch("fzfaws.cloudformation.main.update_stack")
     def test_update_stack(self, mocked_update):
         cloudformation(["update"])
         mocked_update.assert_called_with(
-            False, False, False, False, False, False, False, None, False
+            False,
+            False,
+            False,
+            False,
+            False,
+            False,
+            False,
+            None,
+            False,
+            multi=False,
+            stage=False,
         )
 
         cloudformation(["update", "-P", "root", "-R", "us-east-1", "-l", "-x", "-E"])
         mocked_update.assert_called_with(
-            "root", "us-east-1", True, True, False, False, True, None, False
+            "root",
+            "us-east-1",
+            True,
+            True,
+            False,
+            False,
+            True,
+            None,
+            False,
+            multi=False,
+            stage=False,
+        )
+
+        cloudformation(["update", "-l", "-x", "-s"])
+        mocked_update.assert_called_with(
+            False,
+            False,
+            True,
+            True,
+            False,
+            False,
+            False,
+            None,
+            False,
+            multi=False,
+            stage=True,
+        )
+
+        cloudformation(["update", "-m"])
+        mocked_update.assert_called_with(
+            False,
+            False,
+            False,
+            False,
+            False,
+            False,
+            False,
+            None,
+            False,
+            multi=True,
+            stage=False,
         )
 
     @patch("fzfaws.cloudformation.main.delete_stack")
     def test_delete_stack(self, mocked_delete):
         cloudformation(["delete"])
-        mocked_delete.assert_called_with(False, False, False, False)
+        mocked_delete.assert_called_with(False, False, False, False, False)
 
         cloudformation(["delete", "-P", "-w", "-i", "arn:111111"])
-        mocked_delete.assert_called_with(True, False, True, "arn:111111")
+        mocked_delete.assert_called_with(True, False, True, "arn:111111", False)
+
+        cloudformation(["delete", "-m"])
+        mocked_delete.assert_called_with(False, False, False, False, True)
 
     @patch("fzfaws.cloudformation.main.ls_stack")
     def test_ls_stack(self, mocked_ls):
         cloudformation(["ls"])
-        mocked_ls.assert_called_with(False, False, False, False, False, False, False)
+        mocked_ls.assert_called_with(
+            False, False, False, False, False, False, False, False, False
+        )
 
-        cloudformation(["ls", "-R", "--resource"])
-        mocked_ls.assert_called_with(False, True, True, False, False, False, False)
+        cloudformation(["ls", "-R", "--resource", "--nested"])
+        mocked_ls.assert_called_with(
+            False, True, True, False, False, False, False, True, False
+        )
+
+        cloudformation(["ls", "-r", "--metadata"])
+        mocked_ls.assert_called_with(
+            False, False, True, False, False, False, False, False, True
+        )
 
     @patch("fzfaws.cloudformation.main.drift_stack")
     def test_drift_stack(self, mocked_drift):
         cloudformation(["drift"])
-        mocked_drift.assert_called_with(False, False, False, False, False)
+        mocked_drift.assert_called_with(
+            False, False, False, False, False, False, False, False
+        )
 
         cloudformation(["drift", "-i", "-s", "-w"])
-        mocked_drift.assert_called_with(False, False, True, True, True)
+        mocked_drift.assert_called_with(
+            False, False, True, True, True, False, False, False
+        )
+
+        cloudformation(["drift", "-m", "-a", "-n"])
+        mocked_drift.assert_called_with(
+            False, False, False, False, False, True, True, True
+        )
 
     @patch("fzfaws.cloudformation.main.changeset_stack")
     def test_changeset_stack(self, mocked_change):
@@ -88,6 +164,7 @@ class TestCloudformationMain(unittest.TestCase):
             False,
             None,
             False,
+            False,
         )
 
         cloudformation(
@@ -115,6 +192,7 @@ class TestCloudformationMain(unittest.TestCase):
             True,
             "kazhala-lol/hello.yaml",
             "111111",
+            False,
         )
 
         cloudformation(["changeset", "-i"])
@@ -131,6 +209,24 @@ class TestCloudformationMain(unittest.TestCase):
             False,
             None,
             False,
+            False,
+        )
+
+        cloudformation(["changeset", "-x", "-l", "-s"])
+        mocked_change.assert_called_with(
+            False,
+            False,
+            True,
+            True,
+            False,
+            False,
+            False,
+            False,
+            False,
+            False,
+            None,
+            False,
+            True,
         )
 
     @patch("fzfaws.cloudformation.main.validate_stack")
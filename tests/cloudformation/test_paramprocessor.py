@@ -7,6 +7,7 @@ import io
 import sys
 import unittest
 from unittest.mock import PropertyMock, call, patch
+from fzfaws.cloudformation.helper import paramprocessor
 from fzfaws.cloudformation.helper.paramprocessor import ParamProcessor
 from fzfaws.utils import FileLoader
 import boto3
@@ -26,6 +27,7 @@ class TestCloudformationParams(unittest.TestCase):
         config_path = Path(__file__).resolve().parent.joinpath("../data/fzfaws.yml")
         fileloader.load_config_file(config_path=str(config_path))
         self.paramprocessor = ParamProcessor(params=params)
+        paramprocessor._param_choices.clear()
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
 
@@ -50,9 +52,11 @@ class TestCloudformationParams(unittest.TestCase):
         self.assertEqual(paramprocessor.processed_params, [])
         self.assertEqual(paramprocessor.original_params, [])
 
+    @patch.object(ParamProcessor, "_fetch_choices")
     @patch.object(ParamProcessor, "_get_user_input")
-    def test_process_stack_params(self, mocked_input):
+    def test_process_stack_params(self, mocked_input, mocked_fetch):
         mocked_input.return_value = "111111"
+        mocked_fetch.return_value = []
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
@@ -98,6 +102,17 @@ class TestCloudformationParams(unittest.TestCase):
         )
 
         mocked_input.return_value = "222222"
+        for future in list(paramprocessor._param_choices.values()):
+            future.result()
+        self.assertEqual(
+            sorted(call_args[0][0] for call_args in mocked_fetch.call_args_list),
+            [
+                "AWS::EC2::KeyPair::KeyName",
+                "AWS::EC2::SecurityGroup::Id",
+                "AWS::EC2::Subnet::Id",
+            ],
+        )
+
         self.paramprocessor.processed_params = []
         self.paramprocessor.original_params = [
             {"ParameterKey": "KeyName", "ParameterValue": "fooboo"},
@@ -269,115 +284,214 @@ class TestCloudformationParams(unittest.TestCase):
         result = self.paramprocessor._print_parameter_key("SecurityGroups")
         self.assertEqual(result, "choose a value for SecurityGroups")
 
-    @patch.object(Route53, "set_zone_id")
-    @patch.object(EC2, "get_security_groups")
-    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    @patch.object(ParamProcessor, "_fetch_choices")
     @patch.object(Pyfzf, "execute_fzf")
     @patch.object(Pyfzf, "process_list")
     def test_get_selected_param_value(
-        self, mocked_process, mocked_execute, mocked_client, mocked_sg, mocked_zone,
+        self, mocked_process, mocked_execute, mocked_fetch
     ):
         mocked_execute.return_value = "111111"
-
-        # keypair test for normal client test
-        keypair_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "../data/ec2_keypair.json"
-        )
-        with open(keypair_path, "r") as file:
-            keypair_response = json.load(file)
-        ec2 = boto3.client("ec2")
-        stubber = Stubber(ec2)
-        stubber.add_response("describe_key_pairs", keypair_response)
-        stubber.activate()
-        mocked_client.return_value = ec2
+        mocked_fetch.return_value = [{"KeyName": "ap-southeast-foo-boo"}]
         result = self.paramprocessor._get_selected_param_value(
             "AWS::EC2::KeyPair::KeyName", "foo boo"
         )
+        mocked_fetch.assert_called_once_with("AWS::EC2::KeyPair::KeyName")
         mocked_process.assert_called_once_with(
-            [
-                {
-                    "KeyPairId": "key-111111",
-                    "KeyFingerprint": "asdfasfsadfasdfafasf",
-                    "KeyName": "ap-southeast-foo-boo",
-                    "Tags": [],
-                }
-            ],
-            "KeyName",
-            empty_allow=True,
+            [{"KeyName": "ap-southeast-foo-boo"}], "KeyName", empty_allow=True
         )
         mocked_execute.assert_called_once_with(empty_allow=True, header="foo boo")
-        mocked_sg.assert_not_called()
         self.assertEqual(result, "111111")
 
-        # security group test for ec2 method
-        mocked_execute.reset_mock()
+        # choices are memoised per type
         mocked_process.reset_mock()
-        mocked_sg.return_value = "111111"
-        result = self.paramprocessor._get_selected_param_value(
-            "AWS::EC2::SecurityGroup::Id", "foo boo"
+        self.paramprocessor._get_selected_param_value(
+            "AWS::EC2::KeyPair::KeyName", "foo boo"
+        )
+        mocked_fetch.assert_called_once()
+        mocked_process.assert_called_once_with(
+            [{"KeyName": "ap-southeast-foo-boo"}], "KeyName", empty_allow=True
         )
-        mocked_sg.assert_called_once_with(header="foo boo")
-        mocked_execute.assert_not_called()
-        mocked_process.assert_not_called()
-        self.assertEqual(result, "111111")
 
-        # route53 zone test
-        result = self.paramprocessor._get_selected_param_value(
-            "AWS::Route53::HostedZone::Id", "foo boo"
+        mocked_process.reset_mock()
+        mocked_fetch.return_value = [{"GroupId": "sg-111111"}]
+        self.paramprocessor._get_selected_param_value(
+            "AWS::EC2::SecurityGroup::Id", "foo boo"
+        )
+        mocked_process.assert_called_once_with(
+            [{"GroupId": "sg-111111"}],
+            "GroupId",
+            "GroupName",
+            "Name",
+            empty_allow=True,
         )
-        mocked_execute.assert_not_called()
-        mocked_process.assert_not_called()
-        mocked_zone.assert_called_once()
-        self.assertEqual(result, "")
 
-    @patch.object(Route53, "set_zone_id")
-    @patch.object(EC2, "get_security_groups")
-    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    @patch.object(ParamProcessor, "_fetch_choices")
     @patch.object(Pyfzf, "process_list")
     @patch.object(Pyfzf, "execute_fzf")
-    def test_get_list_param_value(
-        self, mocked_execute, mocked_process, mocked_client, mocked_sg, mocked_zone
-    ):
-
+    def test_get_list_param_value(self, mocked_execute, mocked_process, mocked_fetch):
         mocked_execute.return_value = ["111111", "222222"]
-        # az list test for normal client test
-        az_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "../data/ec2_az.json"
-        )
-        with open(az_path, "r") as file:
-            az_response = json.load(file)
-        ec2 = boto3.client("ec2")
-        stubber = Stubber(ec2)
-        stubber.add_response("describe_availability_zones", az_response)
-        stubber.activate()
-        mocked_client.return_value = ec2
+        mocked_fetch.return_value = [{"ZoneName": "us-east-1a"}]
         result = self.paramprocessor._get_list_param_value(
             "List<AWS::EC2::AvailabilityZone::Name>", "foo boo"
         )
+        mocked_fetch.assert_called_once_with("AWS::EC2::AvailabilityZone::Name")
         mocked_process.assert_called_once_with(
-            az_response["AvailabilityZones"], "ZoneName", empty_allow=True,
+            [{"ZoneName": "us-east-1a"}], "ZoneName", empty_allow=True
         )
         mocked_execute.assert_called_once_with(
             multi_select=True, empty_allow=True, header="foo boo"
         )
-        mocked_sg.assert_not_called()
         self.assertEqual(result, ["111111", "222222"])
 
-        # sg test for ec2 method
-        mocked_process.reset_mock()
-        mocked_execute.reset_mock()
-        mocked_sg.return_value = ["111111", "222222"]
-        result = self.paramprocessor._get_list_param_value(
-            "List<AWS::EC2::SecurityGroup::GroupName>", "foo boo"
+    @patch.object(ParamProcessor, "_fetch_choices")
+    def test_get_choice_future(self, mocked_fetch):
+        mocked_fetch.side_effect = [[{"Id": "111111"}], ValueError("denied"), []]
+        future = self.paramprocessor._get_choice_future("AWS::Route53::HostedZone::Id")
+        self.assertEqual(future.result(), [{"Id": "111111"}])
+        self.assertIn(
+            ("default", None, "AWS::Route53::HostedZone::Id"),
+            paramprocessor._param_choices,
+        )
+        # hosted zones are global, other regions reuse the same fetch
+        self.paramprocessor.ec2.region = "ap-southeast-2"
+        self.assertIs(
+            self.paramprocessor._get_choice_future("AWS::Route53::HostedZone::Id"),
+            future,
+        )
+
+        self.assertRaises(
+            ValueError, self.paramprocessor._get_choices, "AWS::EC2::VPC::Id"
         )
-        mocked_sg.assert_called_once_with(
-            multi_select=True, return_attr="name", header="foo boo"
+        self.assertNotIn(
+            ("default", "ap-southeast-2", "AWS::EC2::VPC::Id"),
+            paramprocessor._param_choices,
         )
-        self.assertEqual(result, ["111111", "222222"])
+        self.assertEqual(self.paramprocessor._get_choices("AWS::EC2::VPC::Id"), [])
+        self.assertEqual(mocked_fetch.call_count, 3)
 
-        # zone test for route53 method
-        result = self.paramprocessor._get_list_param_value(
-            "List<AWS::Route53::HostedZone::Id>", "foo boo"
+    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    def test_fetch_choices(self, mocked_client):
+        keypair_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "../data/ec2_keypair.json"
+        )
+        with open(keypair_path, "r") as file:
+            keypair_response = json.load(file)
+        ec2 = boto3.client("ec2")
+        stubber = Stubber(ec2)
+        stubber.add_response("describe_key_pairs", keypair_response)
+        stubber.add_response(
+            "describe_subnets",
+            {
+                "Subnets": [
+                    {
+                        "SubnetId": "subnet-111111",
+                        "Tags": [{"Key": "Name", "Value": "public"}],
+                    }
+                ]
+            },
+        )
+        stubber.add_response(
+            "describe_instances",
+            {
+                "Reservations": [
+                    {
+                        "Instances": [
+                            {"InstanceId": "i-111111"},
+                            {"InstanceId": "i-222222"},
+                        ]
+                    }
+                ]
+            },
+        )
+        stubber.activate()
+        mocked_client.return_value = ec2
+        self.assertEqual(
+            self.paramprocessor._fetch_choices("AWS::EC2::KeyPair::KeyName"),
+            keypair_response["KeyPairs"],
+        )
+        self.assertEqual(
+            self.paramprocessor._fetch_choices("AWS::EC2::Subnet::Id"),
+            [
+                {
+                    "SubnetId": "subnet-111111",
+                    "Tags": [{"Key": "Name", "Value": "public"}],
+                    "Name": "public",
+                }
+            ],
+        )
+        self.assertEqual(
+            self.paramprocessor._fetch_choices("AWS::EC2::Instance::Id"),
+            [
+                {"InstanceId": "i-111111", "Name": None},
+                {"InstanceId": "i-222222", "Name": None},
+            ],
+        )
+
+        route53 = boto3.client("route53")
+        stubber = Stubber(route53)
+        stubber.add_response(
+            "list_hosted_zones",
+            {
+                "HostedZones": [
+                    {
+                        "Id": "/hostedzone/111111",
+                        "Name": "example.com.",
+                        "CallerReference": "1",
+                    }
+                ],
+                "Marker": "",
+                "IsTruncated": False,
+                "MaxItems": "100",
+            },
+        )
+        stubber.activate()
+        mocked_client.return_value = route53
+        self.assertEqual(
+            self.paramprocessor._fetch_choices("AWS::Route53::HostedZone::Id"),
+            [{"Id": "111111", "Name": "example.com."}],
+        )
+
+    @patch("fzfaws.cloudformation.helper.paramprocessor.get_export_index")
+    @patch("builtins.input")
+    @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(Pyfzf, "process_list")
+    def test_get_export_value(
+        self, mocked_process, mocked_execute, mocked_input, mocked_index
+    ):
+        export_index = mocked_index.return_value
+        export_index.exports = {
+            "vpc-id": {
+                "Name": "vpc-id",
+                "Value": "vpc-111111",
+                "ExportingStackName": "vpc",
+            },
+            "db-endpoint": {
+                "Name": "db-endpoint",
+                "Value": "db.example.com",
+                "ExportingStackName": "db",
+            },
+        }
+        mocked_input.return_value = "!ImportValue"
+        mocked_execute.return_value = "vpc-id"
+        result = self.paramprocessor._get_user_input(
+            "InstanceRole", "String", "foo boo\n"
+        )
+        self.assertEqual(result, "vpc-111111")
+        export_index.load.assert_called_once_with()
+        mocked_process.assert_called_once_with(
+            [export_index.exports["db-endpoint"], export_index.exports["vpc-id"]],
+            "Name",
+            "Value",
+            "ExportingStackName",
+            empty_allow=True,
+        )
+        mocked_execute.assert_called_once_with(
+            empty_allow=True, header="foo boo\nchoose a value for InstanceRole"
+        )
+
+        mocked_execute.return_value = ""
+        result = self.paramprocessor._get_user_input(
+            "InstanceRole", "String", "foo boo\n", "Default", "hello"
         )
-        mocked_zone.assert_called_once()
-        self.assertEqual(result, [""])
+        self.assertEqual(result, "hello")
+        mocked_index.assert_called_once()
@@ -0,0 +1,278 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.cloudformation.helper import templatestage
+from fzfaws.cloudformation.helper.templatestage import (
+    TemplateStage,
+    check_template_size,
+    is_local_artifact,
+    replace_yaml_property,
+    zip_directory,
+)
+from fzfaws.s3 import S3
+from fzfaws.utils.exceptions import CloudformationError
+from fzfaws.utils.fileloader import load_template
+
+
+class TestTemplateStage(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmpdir.name, "src", "lib"))
+        self.write("src/handler.py", "def handler(event, context):\n    pass\n")
+        self.write("src/lib/util.py", "VALUE = 1\n")
+        self.write("layer.zip", "layer")
+        self.write(
+            "nested.yaml",
+            "Resources:\n  Topic:\n    Type: AWS::SNS::Topic\n",
+        )
+        self.template_path = self.write(
+            "template.yaml",
+            "\n".join(
+                [
+                    "Resources:",
+                    "  Function:",
+                    "    Type: AWS::Serverless::Function",
+                    "    Properties:",
+                    "      CodeUri: ./src # source code",
+                    '      Handler: !Sub "${AWS::StackName}.handler"',
+                    "  Layer:",
+                    "    Type: AWS::Lambda::LayerVersion",
+                    "    Properties:",
+                    "      Content: layer.zip",
+                    "  Nested:",
+                    "    Type: AWS::CloudFormation::Stack",
+                    "    Properties:",
+                    "      TemplateURL: 'nested.yaml'",
+                    "  Remote:",
+                    "    Type: AWS::CloudFormation::Stack",
+                    "    Properties:",
+                    "      TemplateURL: https://example.com/remote.yaml",
+                    "",
+                ]
+            ),
+        )
+        self.client = MagicMock()
+        self.client.head_object.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+        )
+        client_patcher = patch.object(S3, "get_client", return_value=self.client)
+        region_patcher = patch.object(S3, "get_bucket_region", return_value="us-east-1")
+        client_patcher.start()
+        region_patcher.start()
+        self.addCleanup(client_patcher.stop)
+        self.addCleanup(region_patcher.stop)
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.tmpdir.cleanup()
+
+    def write(self, path, content):
+        path = os.path.join(self.tmpdir.name, path)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_constructor(self):
+        template_stage = TemplateStage(bucket="kazhala-lol")
+        self.assertEqual(template_stage.s3.bucket_name, "kazhala-lol")
+        self.assertEqual(template_stage.prefix, "")
+
+        with patch.dict(
+            os.environ, {templatestage.TEMPLATE_BUCKET_ENV: "kazhala-lol/templates"}
+        ):
+            template_stage = TemplateStage()
+        self.assertEqual(template_stage.s3.bucket_name, "kazhala-lol")
+        self.assertEqual(template_stage.prefix, "templates/")
+
+    def test_stage_yaml(self):
+        template_stage = TemplateStage(bucket="kazhala-lol/templates/")
+        key = template_stage.stage(self.template_path)
+
+        self.assertEqual(self.client.put_object.call_count, 4)
+        body = template_stage.uploads[key].decode("utf-8")
+        self.assertEqual(
+            key, "templates/%s.yaml" % hashlib.sha256(body.encode("utf-8")).hexdigest()
+        )
+        zip_key = (
+            "templates/%s.zip"
+            % hashlib.sha256(
+                zip_directory(os.path.join(self.tmpdir.name, "src"))
+            ).hexdigest()
+        )
+        layer_key = "templates/%s.zip" % hashlib.sha256(b"layer").hexdigest()
+        nested_key = template_stage.templates[
+            os.path.join(self.tmpdir.name, "nested.yaml")
+        ]
+        self.assertIn("CodeUri: s3://kazhala-lol/%s # source code" % zip_key, body)
+        self.assertIn('Handler: !Sub "${AWS::StackName}.handler"', body)
+        self.assertIn("Content: {S3Bucket: kazhala-lol, S3Key: %s}" % layer_key, body)
+        self.assertIn(
+            "TemplateURL: https://s3-us-east-1.amazonaws.com/kazhala-lol/%s"
+            % nested_key,
+            body,
+        )
+        self.assertIn("TemplateURL: https://example.com/remote.yaml", body)
+        self.assertEqual(
+            template_stage.get_template_url(key),
+            "https://s3-us-east-1.amazonaws.com/kazhala-lol/%s" % key,
+        )
+        self.assertRegex(self.capturedOutput.getvalue(), r"upload: s3://kazhala-lol/")
+
+        # already uploaded in this session
+        self.client.reset_mock()
+        self.assertEqual(template_stage.stage(self.template_path), key)
+        self.client.head_object.assert_not_called()
+        self.client.put_object.assert_not_called()
+
+        # keys already exist in the bucket
+        self.client.head_object.side_effect = None
+        self.client.head_object.return_value = {}
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        template_stage = TemplateStage(bucket="kazhala-lol/templates/")
+        self.assertEqual(template_stage.stage(self.template_path), key)
+        self.assertEqual(self.client.head_object.call_count, 4)
+        self.client.put_object.assert_not_called()
+        self.assertRegex(self.capturedOutput.getvalue(), r"exists: s3://kazhala-lol/")
+
+    def test_stage_json(self):
+        template_path = self.write(
+            "template.json",
+            json.dumps(
+                {
+                    "Resources": {
+                        "Function": {
+                            "Type": "AWS::Lambda::Function",
+                            "Properties": {"Code": "src", "Handler": "index.handler"},
+                        },
+                        "Inline": {
+                            "Type": "AWS::Lambda::Function",
+                            "Properties": {"Code": {"ZipFile": "print(1)"}},
+                        },
+                    }
+                }
+            ),
+        )
+        template_stage = TemplateStage(bucket="kazhala-lol/")
+        key = template_stage.stage(template_path)
+        self.assertRegex(key, r"^[0-9a-f]{64}\.json$")
+        template = json.loads(template_stage.uploads[key].decode("utf-8"))
+        self.assertEqual(
+            template["Resources"]["Function"]["Properties"]["Code"],
+            {
+                "S3Bucket": "kazhala-lol",
+                "S3Key": "%s.zip"
+                % hashlib.sha256(
+                    zip_directory(os.path.join(self.tmpdir.name, "src"))
+                ).hexdigest(),
+            },
+        )
+        self.assertEqual(
+            template["Resources"]["Inline"]["Properties"]["Code"],
+            {"ZipFile": "print(1)"},
+        )
+        self.assertEqual(self.client.put_object.call_count, 2)
+        # the cached parse result of the original template is not modified
+        with open(template_path, "r") as file:
+            template = load_template(file.read(), "json")
+        self.assertEqual(template["Resources"]["Function"]["Properties"]["Code"], "src")
+
+    def test_stage_error(self):
+        template_path = self.write(
+            "missing.yaml",
+            "Resources:\n  Function:\n    Type: AWS::Serverless::Function\n"
+            "    Properties:\n      CodeUri: ./missing\n",
+        )
+        template_stage = TemplateStage(bucket="kazhala-lol/")
+        self.assertRaises(CloudformationError, template_stage.stage, template_path)
+
+        template_path = self.write(
+            "loop.yaml",
+            "Resources:\n  Nested:\n    Type: AWS::CloudFormation::Stack\n"
+            "    Properties:\n      TemplateURL: loop.yaml\n",
+        )
+        self.assertRaises(CloudformationError, template_stage.stage, template_path)
+
+        self.client.put_object.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}},
+            "PutObject",
+        )
+        self.assertRaises(
+            CloudformationError,
+            template_stage.stage,
+            os.path.join(self.tmpdir.name, "nested.yaml"),
+        )
+        self.assertRegex(self.capturedOutput.getvalue(), r"failed: s3://kazhala-lol/")
+
+    def test_stage_yaml_error(self):
+        template_path = self.write(
+            "block.yaml",
+            "Resources:\n  Function:\n    Type: AWS::Serverless::Function\n"
+            "    Properties:\n      CodeUri: >-\n        src\n",
+        )
+        template_stage = TemplateStage(bucket="kazhala-lol/")
+        self.assertRaisesRegex(
+            CloudformationError,
+            "Unable to replace CodeUri: src",
+            template_stage.stage,
+            template_path,
+        )
+
+        # artifact shared by multiple resources
+        template_path = self.write(
+            "shared.yaml",
+            "Resources:\n  Function:\n    Type: AWS::Serverless::Function\n"
+            "    Properties:\n      CodeUri: src\n"
+            "  Other:\n    Type: AWS::Serverless::Function\n"
+            "    Properties:\n      CodeUri: src\n",
+        )
+        key = template_stage.stage(template_path)
+        self.assertEqual(
+            template_stage.uploads[key].decode("utf-8").count("CodeUri: s3://"), 2
+        )
+
+    def test_zip_directory(self):
+        src_path = os.path.join(self.tmpdir.name, "src")
+        data = zip_directory(src_path)
+        os.utime(os.path.join(src_path, "handler.py"), (0, 0))
+        self.assertEqual(zip_directory(src_path), data)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), ["handler.py", "lib/util.py"])
+
+    def test_helpers(self):
+        self.assertTrue(is_local_artifact("./src"))
+        self.assertFalse(is_local_artifact("s3://kazhala-lol/src.zip"))
+        self.assertFalse(is_local_artifact("https://example.com/template.yaml"))
+        self.assertFalse(is_local_artifact({"ZipFile": "print(1)"}))
+        self.assertFalse(is_local_artifact(None))
+
+        self.assertEqual(
+            replace_yaml_property(
+                "  CodeUri: src\n  OtherUri: src\n", "CodeUri", "src", "s3://a/b"
+            ),
+            "  CodeUri: s3://a/b\n  OtherUri: src\n",
+        )
+        # value not on the same line couldn't be replaced
+        self.assertRaises(
+            CloudformationError,
+            replace_yaml_property,
+            "  CodeUri:\n    src\n",
+            "CodeUri",
+            "src",
+            "s3://a/b",
+        )
+
+        check_template_size(self.template_path)
+        with patch.object(templatestage, "TEMPLATE_BODY_LIMIT", 10):
+            self.assertRaises(
+                CloudformationError, check_template_size, self.template_path
+            )
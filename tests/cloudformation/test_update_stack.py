@@ -4,8 +4,9 @@ import os
 import io
 import sys
 import unittest
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, MagicMock, patch
 from fzfaws.cloudformation.update_stack import update_stack
+from botocore.exceptions import ClientError
 from fzfaws.utils import Pyfzf, FileLoader
 from fzfaws.cloudformation import Cloudformation
 from pathlib import Path
@@ -67,14 +68,15 @@ class TestCloudformationUpdateStack(unittest.TestCase):
         )
 
         # extra args
-        cloudformation.wait.return_value = None
+        cloudformation.wait_stack.return_value = None
         args = MockedArgs()
         args.set_extra_args.return_value = None
         args.extra_args = {"foo": "boo"}
         update_stack(wait=True, extra=True, profile=True, region="us-east-1")
         MockedCloudformation.assert_called_with(True, "us-east-1")
-        cloudformation.wait.assert_called_with(
-            "stack_update_complete", "Wating for stack to be updated ..."
+        cloudformation.wait_stack.assert_called_with(
+            "Wating for stack to be updated ...",
+            cloudformation.get_last_event_id.return_value,
         )
         cloudformation.execute_with_capabilities.assert_called_with(
             Parameters=[
@@ -172,6 +174,30 @@ class TestCloudformationUpdateStack(unittest.TestCase):
             "default", "us-east-1", local_path=self.data_path, no_print=True
         )
 
+        mocked_stage = MagicMock()
+        mocked_stage.s3.bucket_name = "kazhala-lol"
+        mocked_stage.stage.return_value = "templates/1111.yaml"
+        mocked_stage.get_template_url.return_value = "https://s3/templates/1111.yaml"
+        with patch(
+            "fzfaws.cloudformation.update_stack.get_template_stage",
+            return_value=mocked_stage,
+        ):
+            update_stack(local_path=self.data_path, replace=True, stage=True)
+        mocked_stage.stage.assert_called_once_with(self.data_path)
+        mocked_validate.assert_called_with(
+            "default",
+            "us-east-1",
+            bucket="kazhala-lol/templates/1111.yaml",
+            no_print=True,
+        )
+        mocked_execute.assert_called_with(
+            Parameters=[],
+            StackName="",
+            TemplateURL="https://s3/templates/1111.yaml",
+            cloudformation_action=ANY,
+            UsePreviousTemplate=False,
+        )
+
     @patch.object(Cloudformation, "execute_with_capabilities")
     @patch.object(S3, "get_object_url")
     @patch.object(ParamProcessor, "process_stack_params")
@@ -227,3 +253,74 @@ class TestCloudformationUpdateStack(unittest.TestCase):
             UsePreviousTemplate=False,
             cloudformation_action=ANY,
         )
+
+    @patch("fzfaws.cloudformation.update_stack.get_confirmation")
+    @patch("fzfaws.cloudformation.update_stack.get_export_index")
+    @patch("fzfaws.cloudformation.update_stack.non_replacing_update")
+    @patch("fzfaws.cloudformation.update_stack.Cloudformation")
+    def test_multi_update(
+        self, MockedCloudformation, mocked_update, mocked_index, mocked_confirm
+    ):
+        cloudformation = MockedCloudformation()
+        cloudformation.select_stacks.return_value = ["app", "vpc"]
+        cloudformation.stack_summaries = {"app": {"StackId": "app-id"}}
+        cloudformation.client.describe_stacks.side_effect = [
+            {"Stacks": [{"StackName": "app", "Capabilities": ["CAPABILITY_IAM"]}]},
+            {"Stacks": [{"StackName": "vpc"}]},
+        ]
+        mocked_update.side_effect = lambda cloudformation: {
+            "cloudformation_action": cloudformation.client.update_stack,
+            "StackName": cloudformation.stack_name,
+            "UsePreviousTemplate": True,
+            "Parameters": [],
+        }
+        export_index = mocked_index.return_value
+        export_index.dependencies = {"app": {"vpc"}, "web": {"vpc"}}
+        export_index.get_delete_order.return_value = [["app"], ["vpc"]]
+        mocked_confirm.return_value = True
+        cloudformation._get_capabilities.return_value = ["CAPABILITY_IAM"]
+
+        update_stack(multi=True)
+        cloudformation._get_capabilities.assert_called_once_with(
+            message="Requires capabilities: app [CAPABILITY_IAM]"
+        )
+        cloudformation.select_stacks.assert_called_once_with(
+            multi_select=True, header="select stacks to update"
+        )
+        cloudformation.set_stack.assert_not_called()
+        cloudformation.client.describe_stacks.assert_any_call(StackName="app-id")
+        cloudformation.client.describe_stacks.assert_any_call(StackName="vpc")
+        self.assertRegex(
+            self.capturedOutput.getvalue(),
+            r"\(dryrun\) update: vpc\n\(dryrun\) update: app\n",
+        )
+        stack_actions, dependencies = cloudformation.execute_stacks.call_args[0]
+        self.assertEqual(dependencies, {"app": {"vpc"}, "vpc": set()})
+        self.assertEqual(sorted(stack_actions), ["app", "vpc"])
+        cloudformation.print_stack_results.assert_called_once_with(
+            cloudformation.execute_stacks.return_value
+        )
+
+        self.assertEqual(stack_actions["app"](), None)
+        cloudformation.client.update_stack.assert_called_with(
+            StackName="app",
+            UsePreviousTemplate=True,
+            Parameters=[],
+            Capabilities=["CAPABILITY_IAM"],
+        )
+        cloudformation.client.update_stack.side_effect = ClientError(
+            {
+                "Error": {
+                    "Code": "ValidationError",
+                    "Message": "No updates are to be performed.",
+                }
+            },
+            "UpdateStack",
+        )
+        self.assertEqual(stack_actions["vpc"](), "NO_CHANGES")
+        cloudformation.client.update_stack.assert_called_with(
+            StackName="vpc",
+            UsePreviousTemplate=True,
+            Parameters=[],
+            Capabilities=["CAPABILITY_IAM"],
+        )
@@ -51,13 +51,20 @@ class TestS3BucketCopy(unittest.TestCase):
             ["*"], ["hello*"], "s3://kazhala-lol/", "s3://kazhala-yes/foo/"
         )
 
+    @patch.object(S3, "get_client")
     @patch.object(S3, "set_s3_path")
     @patch.object(S3, "set_s3_bucket")
     @patch.object(S3, "get_object_version")
     @patch("fzfaws.s3.bucket_s3.walk_s3_folder")
     @patch("fzfaws.s3.bucket_s3.get_confirmation")
     def test_recusive(
-        self, mocked_confirm, mocked_walk, mocked_version, mocked_bucket, mocked_path
+        self,
+        mocked_confirm,
+        mocked_walk,
+        mocked_version,
+        mocked_bucket,
+        mocked_path,
+        mocked_client,
     ):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
@@ -203,13 +210,20 @@ class TestS3BucketCopy(unittest.TestCase):
         self.assertEqual(result, ("lol", "", [""]))
         mocked_object.assert_called_with(multi_select=True, version=True)
 
+    @patch.object(S3, "get_client")
     @patch("fzfaws.s3.bucket_s3.walk_s3_folder")
     @patch.object(S3, "set_s3_path")
     @patch.object(S3, "get_object_version")
     @patch("fzfaws.s3.bucket_s3.get_confirmation")
     @patch("fzfaws.s3.bucket_s3.copy_and_preserve")
     def test_copy_and_preserve(
-        self, mocked_copy, mocked_confirm, mocked_version, mocked_path, mocked_walk
+        self,
+        mocked_copy,
+        mocked_confirm,
+        mocked_version,
+        mocked_path,
+        mocked_walk,
+        mocked_client,
     ):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
@@ -0,0 +1,184 @@
+import io
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from fzfaws.s3 import S3
+from fzfaws.s3.helper.bulk_rewrite import (
+    REWRITE_JOURNAL,
+    get_journal_id,
+    is_target_state,
+    rewrite_objects,
+)
+from fzfaws.s3.helper.s3args import S3Args
+from fzfaws.utils import BaseSession, get_cache_path
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestBulkRewrite(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.s3 = S3()
+        self.s3.bucket_name = "kazhala-lol"
+        self.s3_args = S3Args(self.s3)
+        self.s3_args._extra_args["StorageClass"] = "STANDARD_IA"
+        self.heads = {
+            "hello.txt": {"ContentLength": 10, "StorageClass": "STANDARD"},
+            "world.txt": {"ContentLength": 10, "StorageClass": "STANDARD_IA"},
+            "large.txt": {
+                "ContentLength": 1000,
+                "ContentType": "text/plain",
+                "Metadata": {"hello": "world"},
+            },
+        }
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def mocked_client(self):
+        client = MagicMock()
+        client.head_object.side_effect = lambda Bucket, Key: self.heads[Key]
+        client.get_object_acl.return_value = {"Grants": []}
+        client.get_object_tagging.return_value = {
+            "TagSet": [{"Key": "foo", "Value": "boo"}]
+        }
+        return client
+
+    def test_is_target_state(self):
+        s3_args = S3Args(self.s3)
+        self.assertTrue(is_target_state({}, s3_args))
+        s3_args._extra_args["StorageClass"] = "GLACIER"
+        self.assertFalse(is_target_state({}, s3_args))
+        self.assertTrue(is_target_state({"StorageClass": "GLACIER"}, s3_args))
+        s3_args._extra_args["ServerSideEncryption"] = "aws:kms"
+        s3_args._extra_args["SSEKMSKeyId"] = "111"
+        head = {"StorageClass": "GLACIER", "ServerSideEncryption": "aws:kms"}
+        self.assertFalse(is_target_state(head, s3_args))
+        head["SSEKMSKeyId"] = "111"
+        self.assertTrue(is_target_state(head, s3_args))
+        s3_args._extra_args["Metadata"] = {"hello": "world"}
+        self.assertFalse(is_target_state(head, s3_args))
+        head["Metadata"] = {"hello": "world"}
+        self.assertTrue(is_target_state(head, s3_args))
+        s3_args._extra_args["Tagging"] = "hello=world"
+        self.assertFalse(is_target_state(head, s3_args))
+
+    @patch("fzfaws.s3.helper.bulk_rewrite.S3TransferWrapper")
+    @patch("fzfaws.s3.helper.bulk_rewrite.create_transfer_manager")
+    @patch.object(S3, "get_client")
+    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    def test_rewrite_objects(
+        self, mocked_client, mocked_get_client, mocked_manager, mocked_wrapper
+    ):
+        client = self.mocked_client()
+        mocked_client.return_value = client
+        mocked_get_client.return_value = client
+        mocked_wrapper().transfer_config = TransferConfig(
+            multipart_threshold=100, max_concurrency=2
+        )
+        mocked_wrapper().max_workers = 2
+        manager = mocked_manager.return_value.__enter__.return_value
+
+        keys = ["hello.txt", "world.txt", "large.txt"]
+        rewrite_objects(self.s3, keys, self.s3_args)
+        self.assertEqual(manager.copy.call_count, 2)
+        manager.copy.assert_any_call(
+            {"Bucket": "kazhala-lol", "Key": "hello.txt"},
+            "kazhala-lol",
+            "hello.txt",
+            extra_args={"StorageClass": "STANDARD_IA"},
+            subscribers=manager.copy.call_args_list[0][1]["subscribers"],
+        )
+        large_args = [
+            call[1]["extra_args"]
+            for call in manager.copy.call_args_list
+            if call[0][2] == "large.txt"
+        ][0]
+        self.assertEqual(
+            large_args,
+            {
+                "StorageClass": "STANDARD_IA",
+                "ContentType": "text/plain",
+                "Metadata": {"hello": "world"},
+                "Tagging": "foo=boo",
+            },
+        )
+        client.get_object.assert_not_called()
+        self.assertIn(
+            "skip: s3://kazhala-lol/world.txt (up to date)",
+            self.capturedOutput.getvalue(),
+        )
+        journal_path = get_cache_path(
+            REWRITE_JOURNAL
+            % get_journal_id("kazhala-lol", keys, self.s3_args.extra_args)
+        )
+        self.assertFalse(os.path.exists(journal_path))
+
+        # failed object keeps the journal, rerun resumes from the journal
+        manager.copy.reset_mock()
+        client.head_object.side_effect = [
+            self.heads["hello.txt"],
+            ClientError({"Error": {"Code": "AccessDenied"}}, "HeadObject"),
+            self.heads["large.txt"],
+        ]
+        self.s3_args._extra_args["StorageClass"] = "GLACIER"
+        keys = ["hello.txt", "world.txt", "large.txt"]
+        mocked_wrapper().transfer_config = TransferConfig(
+            multipart_threshold=100, max_concurrency=1
+        )
+        mocked_wrapper().max_workers = 1
+        self.assertRaises(S3Error, rewrite_objects, self.s3, keys, self.s3_args)
+        journal_path = get_cache_path(
+            REWRITE_JOURNAL
+            % get_journal_id("kazhala-lol", keys, self.s3_args.extra_args)
+        )
+        with open(journal_path, "r") as file:
+            self.assertEqual(sorted(file.read().split()), ["hello.txt", "large.txt"])
+
+        manager.copy.reset_mock()
+        client.head_object.side_effect = lambda Bucket, Key: self.heads[Key]
+        rewrite_objects(self.s3, keys, self.s3_args)
+        self.assertEqual(manager.copy.call_count, 1)
+        self.assertEqual(manager.copy.call_args[0][2], "world.txt")
+        self.assertIn(
+            "resume: 2 objects already processed", self.capturedOutput.getvalue()
+        )
+        self.assertFalse(os.path.exists(journal_path))
+
+    @patch("fzfaws.s3.helper.bulk_rewrite.S3TransferWrapper")
+    @patch("fzfaws.s3.helper.bulk_rewrite.create_transfer_manager")
+    @patch.object(S3, "get_client")
+    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    def test_rewrite_objects_merge(
+        self, mocked_client, mocked_get_client, mocked_manager, mocked_wrapper
+    ):
+        client = self.mocked_client()
+        mocked_client.return_value = client
+        mocked_get_client.return_value = client
+        mocked_wrapper().transfer_config = TransferConfig(
+            multipart_threshold=100, max_concurrency=1
+        )
+        mocked_wrapper().max_workers = 1
+        manager = mocked_manager.return_value.__enter__.return_value
+        self.s3_args._extra_args["Tagging"] = "foo=bar&hello=world"
+
+        rewrite_objects(self.s3, ["hello.txt"], self.s3_args)
+        self.assertEqual(
+            manager.copy.call_args[1]["extra_args"]["Tagging"], "foo=bar&hello=world"
+        )
+        client.get_object_tagging.assert_not_called()
+
+        client.get_object_tagging.return_value = {
+            "TagSet": [{"Key": "foo", "Value": "boo"}, {"Key": "lol", "Value": "yes"}]
+        }
+        rewrite_objects(self.s3, ["hello.txt"], self.s3_args, merge=True)
+        self.assertEqual(
+            manager.copy.call_args[1]["extra_args"]["Tagging"],
+            "foo=bar&lol=yes&hello=world",
+        )
+        self.assertEqual(
+            manager.copy.call_args[1]["extra_args"]["TaggingDirective"], "REPLACE"
+        )
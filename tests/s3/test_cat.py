@@ -0,0 +1,188 @@
+import gzip
+import io
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+from boto3.s3.transfer import TransferConfig
+from fzfaws.s3 import S3
+from fzfaws.s3.cat_s3 import cat_object, cat_s3, parse_byte_range, take_lines
+from fzfaws.s3.helper.ranged_download import iter_ranges
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestS3Cat(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.data = b"".join(b"line %d\n" % i for i in range(1000))
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def mocked_client(self, data, head=None):
+        def get_object(Bucket, Key, Range, IfMatch, **kwargs):
+            start, end = [int(i) for i in Range[6:].split("-")]
+            return {
+                "ContentRange": "bytes %s-%s/%s" % (start, end, len(data)),
+                "Body": io.BytesIO(data[start : end + 1]),
+            }
+
+        client = MagicMock()
+        client.get_object.side_effect = get_object
+        client.head_object.return_value = head or {
+            "ContentLength": len(data),
+            "ETag": '"abc"',
+        }
+        return client
+
+    @patch.object(S3, "get_client")
+    @patch("fzfaws.s3.cat_s3.cat_object")
+    @patch.object(S3, "get_object_version")
+    @patch.object(S3, "set_s3_object")
+    @patch.object(S3, "set_s3_bucket")
+    def test_cat_s3(
+        self, mocked_bucket, mocked_object, mocked_version, mocked_cat, mocked_client
+    ):
+        with patch("sys.stdout") as mocked_stdout:
+            cat_s3(bucket="kazhala-lol/hello.txt")
+            mocked_bucket.assert_not_called()
+            mocked_object.assert_not_called()
+            mocked_cat.assert_called_with(
+                mocked_client.return_value,
+                "kazhala-lol",
+                "hello.txt",
+                mocked_stdout.buffer,
+                None,
+                "",
+                0,
+                False,
+            )
+
+        mocked_version.return_value = [
+            {"Key": "hello.txt", "VersionId": "111"},
+            {"Key": "hello.txt", "VersionId": "222"},
+        ]
+        with patch("sys.stdout") as mocked_stdout:
+            cat_s3(bucket="kazhala-lol/", version=True, lines=10, decompress=True)
+            mocked_object.assert_called_with(
+                version=True, multi_select=True, no_progress=True
+            )
+            mocked_version.assert_called_with(no_progress=True)
+            self.assertEqual(mocked_cat.call_count, 3)
+            mocked_cat.assert_called_with(
+                mocked_cat.call_args[0][0],
+                "kazhala-lol",
+                "hello.txt",
+                mocked_stdout.buffer,
+                "222",
+                "",
+                10,
+                True,
+            )
+
+    @patch("fzfaws.s3.cat_s3.S3TransferWrapper")
+    def test_cat_object(self, mocked_wrapper):
+        mocked_wrapper().transfer_config = TransferConfig(
+            multipart_chunksize=100, max_concurrency=4
+        )
+        output = io.BytesIO()
+        client = self.mocked_client(self.data)
+        cat_object(client, "kazhala-lol", "hello.txt", output)
+        self.assertEqual(output.getvalue(), self.data)
+
+        output = io.BytesIO()
+        cat_object(client, "kazhala-lol", "hello.txt", output, byte_range="10-19")
+        self.assertEqual(output.getvalue(), self.data[10:20])
+
+        output = io.BytesIO()
+        client = self.mocked_client(self.data)
+        cat_object(client, "kazhala-lol", "hello.txt", output, lines=3)
+        self.assertEqual(output.getvalue(), b"line 0\nline 1\nline 2\n")
+        self.assertLess(client.get_object.call_count, 5)
+
+        compressed = gzip.compress(self.data)
+        output = io.BytesIO()
+        client = self.mocked_client(
+            compressed,
+            {
+                "ContentLength": len(compressed),
+                "ETag": '"abc"',
+                "ContentEncoding": "gzip",
+            },
+        )
+        cat_object(client, "kazhala-lol", "hello.txt.gz", output, decompress=True)
+        self.assertEqual(output.getvalue(), self.data)
+
+        output = io.BytesIO()
+        cat_object(
+            client,
+            "kazhala-lol",
+            "hello.txt.gz",
+            output,
+            byte_range="0-99",
+            decompress=True,
+        )
+        self.assertTrue(self.data.startswith(output.getvalue()))
+        self.assertRaises(
+            S3Error,
+            cat_object,
+            client,
+            "kazhala-lol",
+            "hello.txt.gz",
+            output,
+            byte_range="10-",
+            decompress=True,
+        )
+
+        output = io.BytesIO()
+        cat_object(client, "kazhala-lol", "hello.txt.gz", output)
+        self.assertEqual(output.getvalue(), compressed)
+
+        output = io.BytesIO()
+        client = self.mocked_client(b"", {"ContentLength": 0})
+        cat_object(client, "kazhala-lol", "hello.txt", output)
+        self.assertEqual(output.getvalue(), b"")
+        client.get_object.assert_not_called()
+
+    def test_iter_ranges(self):
+        client = self.mocked_client(self.data)
+        config = TransferConfig(multipart_chunksize=100, max_concurrency=4)
+        result = list(
+            iter_ranges(
+                client, "kazhala-lol", "hello.txt", '"abc"', 0, 999, config, "111"
+            )
+        )
+        self.assertEqual(len(result), 10)
+        self.assertEqual(b"".join(result), self.data[:1000])
+        client.get_object.assert_any_call(
+            Bucket="kazhala-lol",
+            Key="hello.txt",
+            Range="bytes=900-999",
+            IfMatch='"abc"',
+            VersionId="111",
+        )
+
+        client = self.mocked_client(self.data)
+        generator = iter_ranges(
+            client, "kazhala-lol", "hello.txt", '"abc"', 0, 999, config
+        )
+        next(generator)
+        generator.close()
+        self.assertLessEqual(client.get_object.call_count, 3)
+
+    def test_parse_byte_range(self):
+        self.assertEqual(parse_byte_range("", 100), (0, 99))
+        self.assertEqual(parse_byte_range("10-19", 100), (10, 19))
+        self.assertEqual(parse_byte_range("10-", 100), (10, 99))
+        self.assertEqual(parse_byte_range("-10", 100), (90, 99))
+        self.assertEqual(parse_byte_range("-1000", 100), (0, 99))
+        self.assertEqual(parse_byte_range("10", 100), (0, 9))
+        self.assertEqual(parse_byte_range("10-1000", 100), (10, 99))
+        self.assertRaises(S3Error, parse_byte_range, "abc", 100)
+        self.assertRaises(S3Error, parse_byte_range, "100-", 100)
+        self.assertRaises(S3Error, parse_byte_range, "20-10", 100)
+
+    def test_take_lines(self):
+        self.assertEqual(take_lines(b"a\nb\nc\n", 2), (b"a\nb\n", 0))
+        self.assertEqual(take_lines(b"a\nb", 3), (b"a\nb", 2))
+        self.assertEqual(take_lines(b"a\nb\n", 2), (b"a\nb\n", 0))
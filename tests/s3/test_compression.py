@@ -0,0 +1,210 @@
+import gzip
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import boto3
+from botocore.stub import Stubber
+from boto3.s3.transfer import TransferConfig
+from fzfaws.s3.helper.compression import (
+    CompressedReader,
+    DecompressedWriter,
+    download_decompressed,
+    get_compressed_key,
+    get_compressor,
+    get_content_encoding,
+    get_decompressed_path,
+    upload_compressed,
+)
+from fzfaws.utils.exceptions import InvalidFileType, MissingDependency
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data = b"hello world\n" * 100000
+        self.filepath = os.path.join(self.tmpdir.name, "hello.txt")
+        with open(self.filepath, "wb") as file:
+            file.write(self.data)
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.tmpdir.cleanup()
+
+    def test_get_compressor(self):
+        self.assertRaises(InvalidFileType, get_compressor, "bz2")
+        try:
+            import zstandard
+        except ImportError:
+            self.assertRaises(MissingDependency, get_compressor, "zstd")
+
+    def test_suffix(self):
+        self.assertEqual(get_compressed_key("hello.txt", "gzip"), "hello.txt.gz")
+        self.assertEqual(get_compressed_key("hello.txt.gz", "gzip"), "hello.txt.gz")
+        self.assertEqual(get_compressed_key("hello.txt", "zstd"), "hello.txt.zst")
+        self.assertEqual(get_compressed_key("hello.txt", ""), "hello.txt")
+        self.assertEqual(
+            get_decompressed_path("/tmp/hello.txt.gz", "gzip"), "/tmp/hello.txt"
+        )
+        self.assertEqual(
+            get_decompressed_path("/tmp/hello.txt", "gzip"), "/tmp/hello.txt"
+        )
+
+    def test_compressed_reader(self):
+        callback = MagicMock()
+        reader = CompressedReader(
+            self.filepath, "gzip", chunksize=1024, max_queue=2, callback=callback
+        )
+        self.assertFalse(reader.seekable())
+        result = b""
+        while True:
+            data = reader.read(100)
+            if not data:
+                break
+            self.assertLessEqual(len(data), 100)
+            result += data
+        self.assertEqual(gzip.decompress(result), self.data)
+        self.assertEqual(
+            sum(call[0][0] for call in callback.call_args_list), len(self.data)
+        )
+
+    def test_decompressed_writer(self):
+        destination = os.path.join(self.tmpdir.name, "result.txt")
+        compressed = gzip.compress(self.data)
+        writer = DecompressedWriter(destination, "gzip", max_queue=2)
+        self.assertFalse(writer.seekable())
+        for i in range(0, len(compressed), 1000):
+            writer.write(compressed[i : i + 1000])
+        writer.close()
+        with open(destination, "rb") as file:
+            self.assertEqual(file.read(), self.data)
+
+        writer = DecompressedWriter(destination, "gzip")
+        writer.write(b"not gzip data")
+        self.assertRaises(Exception, writer.close)
+        self.assertFalse(os.path.exists(destination))
+
+    def test_upload_compressed(self):
+        client = MagicMock()
+        uploaded = {}
+
+        def mocked_upload(fileobj, bucket, key, ExtraArgs, Config):
+            uploaded["data"] = fileobj.read()
+
+        client.upload_fileobj.side_effect = mocked_upload
+        upload_compressed(
+            client,
+            self.filepath,
+            "kazhala-lol",
+            "hello.txt.gz",
+            "gzip",
+            TransferConfig(),
+            {"ACL": "private"},
+        )
+        args = client.upload_fileobj.call_args
+        self.assertEqual(args[0][1:], ("kazhala-lol", "hello.txt.gz"))
+        self.assertEqual(
+            args[1]["ExtraArgs"], {"ACL": "private", "ContentEncoding": "gzip"}
+        )
+        self.assertEqual(gzip.decompress(uploaded["data"]), self.data)
+
+    @patch("fzfaws.s3.helper.compression.S3Progress")
+    def test_download_decompressed(self, mocked_progress):
+        client = MagicMock()
+        compressed = gzip.compress(self.data)
+        destination = os.path.join(self.tmpdir.name, "result.txt")
+
+        def mocked_download(bucket, key, fileobj, ExtraArgs, Callback, Config):
+            fileobj.write(compressed[:10])
+            fileobj.write(compressed[10:])
+
+        client.download_fileobj.side_effect = mocked_download
+        download_decompressed(
+            client,
+            "kazhala-lol",
+            "hello.txt.gz",
+            destination,
+            "gzip",
+            TransferConfig(),
+            "111111",
+        )
+        self.assertEqual(
+            client.download_fileobj.call_args[1]["ExtraArgs"], {"VersionId": "111111"}
+        )
+        with open(destination, "rb") as file:
+            self.assertEqual(file.read(), self.data)
+
+    def test_upload_compressed_failed(self):
+        client = MagicMock()
+        readers = []
+
+        def mocked_upload(fileobj, bucket, key, ExtraArgs, Config):
+            readers.append(fileobj)
+            fileobj.read(10)
+            raise ValueError("upload failed")
+
+        client.upload_fileobj.side_effect = mocked_upload
+        self.assertRaises(
+            ValueError,
+            upload_compressed,
+            client,
+            self.filepath,
+            "kazhala-lol",
+            "hello.txt.gz",
+            "gzip",
+            TransferConfig(max_io_queue=1, io_chunksize=1024),
+        )
+        self.assertFalse(readers[0]._thread.is_alive())
+
+    @patch("fzfaws.s3.helper.compression.S3Progress")
+    def test_download_decompressed_failed(self, mocked_progress):
+        client = MagicMock()
+        destination = os.path.join(self.tmpdir.name, "result.txt")
+
+        def mocked_download(bucket, key, fileobj, ExtraArgs, Callback, Config):
+            fileobj.write(gzip.compress(self.data)[:1000])
+            raise ValueError("download failed")
+
+        client.download_fileobj.side_effect = mocked_download
+        with self.assertRaisesRegex(ValueError, "download failed"):
+            download_decompressed(
+                client,
+                "kazhala-lol",
+                "hello.txt.gz",
+                destination,
+                "gzip",
+                TransferConfig(),
+            )
+        self.assertFalse(os.path.exists(destination))
+
+        # error of the decompression doesn't replace the download error
+        def mocked_invalid(bucket, key, fileobj, ExtraArgs, Callback, Config):
+            fileobj.write(b"not gzip data")
+            raise ValueError("download failed")
+
+        client.download_fileobj.side_effect = mocked_invalid
+        with self.assertRaisesRegex(ValueError, "download failed"):
+            download_decompressed(
+                client,
+                "kazhala-lol",
+                "hello.txt.gz",
+                destination,
+                "gzip",
+                TransferConfig(),
+            )
+        self.assertFalse(os.path.exists(destination))
+
+    def test_get_content_encoding(self):
+        client = boto3.client("s3")
+        stubber = Stubber(client)
+        stubber.add_response("head_object", {"ContentEncoding": "gzip"})
+        stubber.add_response("head_object", {"ContentEncoding": "br"})
+        stubber.add_response("head_object", {})
+        stubber.activate()
+        self.assertEqual(get_content_encoding(client, "kazhala-lol", "hello"), "gzip")
+        self.assertEqual(get_content_encoding(client, "kazhala-lol", "hello"), "")
+        self.assertEqual(get_content_encoding(client, "kazhala-lol", "hello"), "")
@@ -18,6 +18,10 @@ class TestS3Delete(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        # route the regional client to the mocked default client
+        patcher = patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
         sys.stdout = sys.__stdout__
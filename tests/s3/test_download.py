@@ -51,9 +51,10 @@ class TestS3Download(unittest.TestCase):
         )
         mocked_local.assert_called_with(True, directory=True, hidden=True)
 
+    @patch.object(S3, "get_client")
     @patch("fzfaws.s3.download_s3.get_confirmation")
     @patch("fzfaws.s3.download_s3.walk_s3_folder")
-    def test_recursive(self, mocked_walk, mocked_confirm):
+    def test_recursive(self, mocked_walk, mocked_confirm, mocked_client):
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         mocked_walk.return_value = [("hello/hello.txt", "hello.txt")]
@@ -0,0 +1,59 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from boto3.s3.transfer import TransferConfig
+from fzfaws.s3.helper.etag import ETagCache, compute_etag
+
+
+class TestETag(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data = b"a" * 10 + b"b" * 10 + b"c" * 5
+        self.filepath = os.path.join(self.tmpdir.name, "hello.txt")
+        with open(self.filepath, "wb") as file:
+            file.write(self.data)
+        self.config = TransferConfig(multipart_threshold=20, multipart_chunksize=10)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_compute_etag(self):
+        self.assertEqual(
+            compute_etag(self.filepath, 25, TransferConfig()),
+            hashlib.md5(self.data).hexdigest(),
+        )
+
+        with patch(
+            "fzfaws.s3.helper.etag.ChunksizeAdjuster.adjust_chunksize",
+            side_effect=lambda chunksize, size: chunksize,
+        ):
+            etag = compute_etag(self.filepath, 25, self.config)
+        parts = b"".join(
+            hashlib.md5(part).digest()
+            for part in (self.data[:10], self.data[10:20], self.data[20:])
+        )
+        self.assertEqual(etag, "%s-3" % hashlib.md5(parts).hexdigest())
+
+    @patch("fzfaws.s3.helper.etag.compute_etag")
+    def test_etag_cache(self, mocked_compute):
+        mocked_compute.return_value = "hello"
+        cache_path = os.path.join(self.tmpdir.name, "cache.json")
+        cache = ETagCache(self.config, cache_path)
+        self.assertEqual(cache.get_etag(self.filepath, 25, 1.0), "hello")
+        self.assertEqual(cache.get_etag(self.filepath, 25, 1.0), "hello")
+        mocked_compute.assert_called_once_with(self.filepath, 25, self.config)
+        cache.save()
+
+        cache = ETagCache(self.config, cache_path)
+        self.assertEqual(cache.get_etag(self.filepath, 25, 1.0), "hello")
+        mocked_compute.assert_called_once()
+        self.assertFalse(cache.updated)
+
+        cache.get_etag(self.filepath, 25, 2.0)
+        self.assertEqual(mocked_compute.call_count, 2)
+
+        cache = ETagCache(TransferConfig(), cache_path)
+        cache.get_etag(self.filepath, 25, 1.0)
+        self.assertEqual(mocked_compute.call_count, 3)
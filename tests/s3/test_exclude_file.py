@@ -1,5 +1,5 @@
 import unittest
-from fzfaws.s3.helper.exclude_file import exclude_file
+from fzfaws.s3.helper.exclude_file import FileMatcher, exclude_file
 
 
 class TestS3ExcludeFile(unittest.TestCase):
@@ -26,3 +26,27 @@ class TestS3ExcludeFile(unittest.TestCase):
 
         result = exclude_file(["*"], [".*"], "src/hello.txt")
         self.assertEqual(result, True)
+
+    def test_file_matcher(self):
+        matcher = FileMatcher(["*.txt", ".git/*"], ["src/*"])
+        self.assertTrue(matcher.is_excluded("hello.txt"))
+        self.assertTrue(matcher.is_excluded("foo/hello.txt"))
+        self.assertTrue(matcher.is_excluded(".git/COMMIT_EDITMSG"))
+        self.assertFalse(matcher.is_excluded("src/hello.txt"))
+        self.assertFalse(matcher.is_excluded("hello.py"))
+
+        self.assertTrue(matcher.can_skip(".git/"))
+        self.assertTrue(matcher.can_skip(".git/refs/"))
+        self.assertFalse(matcher.can_skip("foo/"))
+        self.assertFalse(matcher.can_skip(""))
+
+        matcher = FileMatcher(["*"], ["src/*.py", "docs/[ab]*"])
+        self.assertTrue(matcher.can_skip("tests/"))
+        self.assertTrue(matcher.can_skip("srcs/"))
+        self.assertFalse(matcher.can_skip("src/"))
+        self.assertFalse(matcher.can_skip("src/foo/"))
+        self.assertFalse(matcher.can_skip("docs/"))
+        self.assertFalse(matcher.can_skip(""))
+
+        self.assertFalse(FileMatcher().is_excluded("hello.txt"))
+        self.assertFalse(FileMatcher([], ["*"]).can_skip("src/"))
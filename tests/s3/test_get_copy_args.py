@@ -11,6 +11,12 @@ from fzfaws.s3.helper.s3args import S3Args
 
 
 class TestS3GetCopyArgs(unittest.TestCase):
+    def setUp(self):
+        # route the regional client to the mocked default client
+        patcher = patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch.object(S3Args, "acl_full", new_callable=PropertyMock)
     @patch.object(S3Args, "acl_read", new_callable=PropertyMock)
     @patch.object(S3Args, "acl_acp_write", new_callable=PropertyMock)
@@ -48,6 +54,8 @@ class TestS3GetCopyArgs(unittest.TestCase):
         )
         with open(data_path1, "r") as file:
             response1 = json.load(file)
+            response1.pop("Body")
+            response1.pop("TagCount")
         data_path2 = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "../data/s3_acl.json"
         )
@@ -57,7 +65,7 @@ class TestS3GetCopyArgs(unittest.TestCase):
         # no version, update acl true
         s3_client = boto3.client("s3")
         stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
+        stubber.add_response("head_object", response1)
         stubber.add_response("get_object_acl", response2)
         stubber.activate()
         s3 = S3()
@@ -81,8 +89,7 @@ class TestS3GetCopyArgs(unittest.TestCase):
         # no version, update acl false
         s3_client = boto3.client("s3")
         stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
-        stubber.add_response("get_object_acl", response2)
+        stubber.add_response("head_object", response1)
         stubber.activate()
         s3 = S3()
         s3._client = s3_client
@@ -90,6 +97,7 @@ class TestS3GetCopyArgs(unittest.TestCase):
         s3_args = S3Args(s3)
         s3_args._extra_args["GrantFullControl"] = "email=hello@gmail.com"
         result = get_copy_args(s3, "hello.json", s3_args, False)
+        stubber.assert_no_pending_responses()
         self.assertEqual(
             result,
             {
@@ -106,8 +114,7 @@ class TestS3GetCopyArgs(unittest.TestCase):
         # no version, no extra_args
         s3_client = boto3.client("s3")
         stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
-        stubber.add_response("get_object_acl", response2)
+        stubber.add_response("head_object", response1)
         stubber.activate()
         s3 = S3()
         s3._client = s3_client
@@ -131,6 +138,8 @@ class TestS3GetCopyArgs(unittest.TestCase):
         )
         with open(data_path1, "r") as file:
             response1 = json.load(file)
+            response1.pop("Body")
+            response1.pop("TagCount")
         data_path2 = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "../data/s3_acl.json"
         )
@@ -140,7 +149,7 @@ class TestS3GetCopyArgs(unittest.TestCase):
         # with version
         s3_client = boto3.client("s3")
         stubber = Stubber(s3_client)
-        stubber.add_response("get_object", response1)
+        stubber.add_response("head_object", response1)
         stubber.add_response("get_object_acl", response2)
         stubber.activate()
         s3 = S3()
@@ -160,3 +169,27 @@ class TestS3GetCopyArgs(unittest.TestCase):
                 "GrantRead": "uri=http://acs.amazonaws.com/groups/global/AllUsers",
             },
         )
+
+        # head provided, only acl is fetched
+        s3_client = boto3.client("s3")
+        stubber = Stubber(s3_client)
+        stubber.add_response(
+            "get_object_acl",
+            response2,
+            {"Bucket": "hello", "Key": "hello.json", "VersionId": "111"},
+        )
+        stubber.activate()
+        s3._client = s3_client
+        result = get_copy_args(
+            s3, "hello.json", s3_args, True, version="111", head=response1
+        )
+        stubber.assert_no_pending_responses()
+        self.assertEqual(
+            result,
+            {
+                "StorageClass": "REDUCED_REDUNDANCY",
+                "ServerSideEncryption": "aws:kms",
+                "SSEKMSKeyId": "arn:aws:kms:ap-southeast-2:11111111:key/11111111-f48d-48b8-90d4-d5bd03a603d4",
+                "GrantRead": "uri=http://acs.amazonaws.com/groups/global/AllUsers",
+            },
+        )
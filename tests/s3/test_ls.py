@@ -1,8 +1,10 @@
 from fzfaws.s3.s3 import S3
 import io
+import json
 import sys
 import unittest
-from unittest.mock import ANY, PropertyMock, patch
+from unittest.mock import ANY, MagicMock, PropertyMock, patch
+from botocore.exceptions import ClientError
 from fzfaws.s3.ls_s3 import ls_s3, get_detailed_info
 import boto3
 from fzfaws.utils import BaseSession
@@ -41,21 +43,24 @@ class TestS3LS(unittest.TestCase):
         self.capturedOutput.seek(0)
         ls_s3(bucket=True, uri=True, bucketpath="kazhala-lol/")
         self.assertEqual(
-            self.capturedOutput.getvalue(), "s3://kazhala-lol/\n",
+            self.capturedOutput.getvalue(),
+            "s3://kazhala-lol/\n",
         )
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         ls_s3(bucket=True, name=True, bucketpath="kazhala-lol/")
         self.assertEqual(
-            self.capturedOutput.getvalue(), "kazhala-lol\n",
+            self.capturedOutput.getvalue(),
+            "kazhala-lol\n",
         )
 
         self.capturedOutput.truncate(0)
         self.capturedOutput.seek(0)
         ls_s3(bucket=True, arn=True, bucketpath="kazhala-lol/")
         self.assertEqual(
-            self.capturedOutput.getvalue(), "arn:aws:s3:::kazhala-lol/\n",
+            self.capturedOutput.getvalue(),
+            "arn:aws:s3:::kazhala-lol/\n",
         )
 
     @patch.object(S3, "get_object_url")
@@ -139,3 +144,88 @@ class TestS3LS(unittest.TestCase):
         self.assertEqual(
             self.capturedOutput.getvalue(), "arn:aws:s3:::kazhala-lol/hello.txt\n"
         )
+
+    @patch.object(S3, "get_bucket_region")
+    @patch.object(S3, "get_client")
+    def test_get_detailed_info(self, mocked_client, mocked_region):
+        s3 = S3()
+        s3.bucket_name = "kazhala-lol"
+        client = MagicMock()
+        mocked_client.return_value = client
+        mocked_region.return_value = "us-east-1"
+        client.get_bucket_acl.return_value = {"Owner": {"ID": "111"}, "Grants": []}
+        client.get_bucket_versioning.return_value = {"Status": "Enabled"}
+        client.get_bucket_encryption.side_effect = ClientError(
+            {"Error": {"Code": "ServerSideEncryptionConfigurationNotFoundError"}},
+            "GetBucketEncryption",
+        )
+        client.get_bucket_policy_status.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchBucketPolicy"}}, "GetBucketPolicyStatus"
+        )
+        client.get_bucket_policy.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchBucketPolicy"}}, "GetBucketPolicy"
+        )
+        client.get_bucket_tagging.return_value = {
+            "TagSet": [{"Key": "foo", "Value": "boo"}]
+        }
+        get_detailed_info(s3, True, False, [])
+        self.assertEqual(
+            json.loads(self.capturedOutput.getvalue().split("\n", 2)[2]),
+            {
+                "Owner": {"ID": "111"},
+                "Region": "us-east-1",
+                "Encryption": None,
+                "Grants": [],
+                "Versioning": "Enabled",
+                "MFA": None,
+                "Tags": [{"Key": "foo", "Value": "boo"}],
+            },
+        )
+
+        # optional configuration not permitted to read is reported as None
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        client.get_bucket_tagging.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "GetBucketTagging"
+        )
+        client.get_bucket_policy.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "GetBucketPolicy"
+        )
+        get_detailed_info(s3, True, False, [])
+        result = json.loads(self.capturedOutput.getvalue().split("\n", 2)[2])
+        self.assertIsNone(result["Tags"])
+        self.assertNotIn("Policy", result)
+
+        client.get_bucket_tagging.side_effect = ClientError(
+            {"Error": {"Code": "InternalError"}}, "GetBucketTagging"
+        )
+        self.assertRaises(ClientError, get_detailed_info, s3, True, False, [])
+        client.get_bucket_tagging.side_effect = None
+        client.get_bucket_acl.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "GetBucketAcl"
+        )
+        self.assertRaises(ClientError, get_detailed_info, s3, True, False, [])
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        client.head_object.side_effect = lambda **kwargs: {"ContentLength": 10}
+        client.get_object_tagging.return_value = {"TagSet": []}
+        client.get_object_acl.return_value = {"Owner": {"ID": "111"}, "Grants": []}
+        s3.path_list = ["hello.txt", "world.txt"]
+        get_detailed_info(s3, False, False, [])
+        self.assertIn("s3://kazhala-lol/hello.txt\n", self.capturedOutput.getvalue())
+        self.assertIn("s3://kazhala-lol/world.txt\n", self.capturedOutput.getvalue())
+        client.head_object.assert_any_call(Bucket="kazhala-lol", Key="world.txt")
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        get_detailed_info(
+            s3, False, True, [{"Key": "hello.txt", "VersionId": "111111"}]
+        )
+        self.assertIn(
+            "s3://kazhala-lol/hello.txt versioned 111111\n",
+            self.capturedOutput.getvalue(),
+        )
+        client.get_object_acl.assert_called_with(
+            Bucket="kazhala-lol", Key="hello.txt", VersionId="111111"
+        )
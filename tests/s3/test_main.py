@@ -20,7 +20,7 @@ class TestS3Main(unittest.TestCase):
     def test_upload(self, mocked_upload):
         s3(["upload"])
         mocked_upload.assert_called_with(
-            False, None, [], False, False, False, False, [], [], False
+            False, None, [], False, False, False, False, [], [], False, "", False
         )
 
         s3(["upload", "-P", "-b", "kazhala-file-transfer/", "-p", "hello.txt", "-E"])
@@ -35,6 +35,8 @@ class TestS3Main(unittest.TestCase):
             [],
             [],
             True,
+            "",
+            False,
         )
 
         s3(
@@ -64,23 +66,55 @@ class TestS3Main(unittest.TestCase):
             ["*.git", "*.lol"],
             ["hello.txt"],
             False,
+            "",
+            False,
+        )
+
+        s3(["upload", "-z"])
+        mocked_upload.assert_called_with(
+            False, None, [], False, False, False, False, [], [], False, "gzip", False
+        )
+
+        s3(["upload", "-r", "-u"])
+        mocked_upload.assert_called_with(
+            False, None, [], True, False, False, False, [], [], False, "", True
+        )
+
+        s3(["upload", "--compress", "zstd"])
+        mocked_upload.assert_called_with(
+            False, None, [], False, False, False, False, [], [], False, "zstd", False
         )
 
     @patch("fzfaws.s3.main.download_s3")
     def test_download(self, mocked_download):
         s3(["download"])
         mocked_download.assert_called_with(
-            False, None, None, False, False, False, [], [], False, False
+            False, None, None, False, False, False, [], [], False, False, False
         )
 
         s3(["download", "-r", "-R", "-s", "-e", "lol", "-v", "-H"])
         mocked_download.assert_called_with(
-            False, None, None, True, True, True, ["lol"], [], True, True
+            False, None, None, True, True, True, ["lol"], [], True, True, False
         )
 
         s3(["download", "-P", "root", "-b", "kazhala-file"])
         mocked_download.assert_called_with(
-            "root", "kazhala-file", None, False, False, False, [], [], False, False
+            "root",
+            "kazhala-file",
+            None,
+            False,
+            False,
+            False,
+            [],
+            [],
+            False,
+            False,
+            False,
+        )
+
+        s3(["download", "-z"])
+        mocked_download.assert_called_with(
+            False, None, None, False, False, False, [], [], False, False, True
         )
 
     @patch("fzfaws.s3.main.bucket_s3")
@@ -123,13 +157,57 @@ class TestS3Main(unittest.TestCase):
             "root", "kazhala", True, [], [], "111111 010010", True, True, True, True
         )
 
+    @patch("fzfaws.s3.main.undelete_s3")
+    def test_undelete(self, mocked_undelete):
+        s3(["undelete"])
+        mocked_undelete.assert_called_with(False, None, "", "", "")
+
+        s3(["undelete", "-b", "kazhala/logs/", "-s", "2h", "-u", "1h", "-m", "1", "2"])
+        mocked_undelete.assert_called_with(False, "kazhala/logs/", "2h", "1h", "1 2")
+
+    @patch("fzfaws.s3.main.restore_s3")
+    def test_restore(self, mocked_restore):
+        s3(["restore"])
+        mocked_restore.assert_called_with(False, None, "Standard", 1, False, "", 300)
+
+        s3(
+            [
+                "restore",
+                "-b",
+                "kazhala/logs/",
+                "-t",
+                "Bulk",
+                "-d",
+                "7",
+                "-w",
+                "-D",
+                "/tmp",
+                "-i",
+                "60",
+            ]
+        )
+        mocked_restore.assert_called_with(
+            False, "kazhala/logs/", "Bulk", 7, True, "/tmp", 60
+        )
+
+    @patch("fzfaws.s3.main.multipart_s3")
+    def test_multipart(self, mocked_multipart):
+        s3(["multipart"])
+        mocked_multipart.assert_called_with(False, [], False, None)
+
+        s3(["multipart", "-b", "kazhala", "lol", "-s", "-o", "7"])
+        mocked_multipart.assert_called_with(False, ["kazhala", "lol"], True, 7)
+
     @patch("fzfaws.s3.main.presign_s3")
     def test_presign(self, mocked_presign):
         s3(["presign"])
-        mocked_presign.assert_called_with(False, None, False, 3600)
+        mocked_presign.assert_called_with(False, None, False, 3600, False, "", "")
 
         s3(["presign", "-e", "111111", "-v"])
-        mocked_presign.assert_called_with(False, None, True, 111111)
+        mocked_presign.assert_called_with(False, None, True, 111111, False, "", "")
+
+        s3(["presign", "-r", "-f", "-", "-o", "csv"])
+        mocked_presign.assert_called_with(False, None, False, 3600, True, "-", "csv")
 
     @patch("fzfaws.s3.main.ls_s3")
     def test_ls(self, mocked_ls):
@@ -147,8 +225,44 @@ class TestS3Main(unittest.TestCase):
     def test_object(self, mocked_object):
         s3(["object"])
         mocked_object.assert_called_with(
-            False, None, False, False, False, [], [], False
+            False, None, False, False, False, [], [], False, merge=False
+        )
+
+        s3(["object", "-b", "hello", "-r", "-v", "-V", "-n", "-m"])
+        mocked_object.assert_called_with(
+            False, "hello", True, True, True, [], [], True, merge=True
         )
 
-        s3(["object", "-b", "hello", "-r", "-v", "-V", "-n"])
-        mocked_object.assert_called_with(False, "hello", True, True, True, [], [], True)
+    @patch("fzfaws.s3.main.cat_s3")
+    def test_cat(self, mocked_cat):
+        s3(["cat"])
+        mocked_cat.assert_called_with(False, None, False, "", 0, False)
+
+        s3(["cat", "-b", "kazhala/hello.txt", "-v", "-c", "0-100", "-n", "10", "-z"])
+        mocked_cat.assert_called_with(
+            False, "kazhala/hello.txt", True, "0-100", 10, True
+        )
+
+    @patch("fzfaws.s3.main.search_s3")
+    def test_search(self, mocked_search):
+        s3(["search"])
+        mocked_search.assert_called_with(False, "", [], False, "", 3600)
+
+        s3(
+            [
+                "search",
+                "-p",
+                "logs/*.json",
+                "-b",
+                "kazhala",
+                "lol",
+                "-s",
+                "-a",
+                "presign",
+                "-e",
+                "100",
+            ]
+        )
+        mocked_search.assert_called_with(
+            False, "logs/*.json", ["kazhala", "lol"], True, "presign", 100
+        )
@@ -0,0 +1,161 @@
+import io
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, MagicMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.s3 import S3
+from fzfaws.s3.multipart_s3 import abort_uploads, multipart_s3, scan_uploads
+from fzfaws.utils import Pyfzf
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestS3Multipart(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        now = datetime.now(timezone.utc)
+        self.uploads = {
+            "kazhala-lol": [
+                {
+                    "UploadId": "111",
+                    "Key": "large.bin",
+                    "Initiated": now - timedelta(days=10),
+                },
+                {"UploadId": "222", "Key": "new.bin", "Initiated": now},
+            ],
+            "kazhala-file": [
+                {
+                    "UploadId": "333",
+                    "Key": "gone.bin",
+                    "Initiated": now - timedelta(days=20),
+                }
+            ],
+        }
+        self.parts = {
+            "111": [{"PartNumber": 1, "Size": 1024}, {"PartNumber": 2, "Size": 1024}],
+            "222": [{"PartNumber": 1, "Size": 10}],
+        }
+        self.client = MagicMock()
+
+        def _paginator(operation):
+            paginator = MagicMock()
+            if operation == "list_multipart_uploads":
+                paginator.paginate.side_effect = lambda Bucket: [
+                    {"Uploads": self.uploads[Bucket]}
+                ]
+            else:
+
+                def _parts(Bucket, Key, UploadId):
+                    if UploadId not in self.parts:
+                        raise ClientError(
+                            {"Error": {"Code": "NoSuchUpload"}}, "ListParts"
+                        )
+                    return [{"Parts": self.parts[UploadId]}]
+
+                paginator.paginate.side_effect = _parts
+            return paginator
+
+        self.client.get_paginator.side_effect = _paginator
+        self.wrapper = patch("fzfaws.s3.multipart_s3.S3TransferWrapper")
+        mocked_wrapper = self.wrapper.start()
+        mocked_wrapper().max_workers = 2
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.wrapper.stop()
+
+    @patch.object(S3, "get_client")
+    def test_scan_uploads(self, mocked_client):
+        mocked_client.return_value = self.client
+        s3 = S3()
+        result = scan_uploads(s3, ["kazhala-lol", "kazhala-file"])
+        self.assertEqual(
+            [
+                (upload["UploadId"], upload["Bytes"], upload["Parts"], upload["Age"])
+                for upload in result
+            ],
+            [("111", 2048, 2, "10d"), ("222", 10, 1, "0d")],
+        )
+        self.assertEqual(result[0]["Size"], "2.0 KiB")
+
+        result = scan_uploads(s3, ["kazhala-lol", "kazhala-file"], older_than=7)
+        self.assertEqual([upload["UploadId"] for upload in result], ["111"])
+
+        skipped = []
+        self.uploads["denied"] = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "ListMultipartUploads"
+        )
+        self.client.get_paginator.side_effect = None
+        self.client.get_paginator.return_value.paginate.side_effect = self.uploads[
+            "denied"
+        ]
+        self.assertEqual(scan_uploads(s3, ["denied"], skipped=skipped), [])
+        self.assertEqual(skipped[0][0], "denied")
+
+    @patch.object(S3, "get_client")
+    def test_abort_uploads(self, mocked_client):
+        mocked_client.return_value = self.client
+        s3 = S3()
+        uploads = [
+            {"Bucket": "kazhala-lol", "Key": "large.bin", "UploadId": "111"},
+            {"Bucket": "kazhala-lol", "Key": "new.bin", "UploadId": "222"},
+        ]
+        self.client.abort_multipart_upload.side_effect = [
+            None,
+            ClientError({"Error": {"Code": "NoSuchUpload"}}, "AbortMultipartUpload"),
+        ]
+        abort_uploads(s3, uploads)
+        self.client.abort_multipart_upload.assert_any_call(
+            Bucket="kazhala-lol", Key="large.bin", UploadId="111"
+        )
+        self.assertIn(
+            "abort: s3://kazhala-lol/large.bin\n", self.capturedOutput.getvalue()
+        )
+
+        self.client.abort_multipart_upload.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "AbortMultipartUpload"
+        )
+        self.assertRaises(S3Error, abort_uploads, s3, uploads)
+
+    @patch("fzfaws.s3.multipart_s3.abort_uploads")
+    @patch("fzfaws.s3.multipart_s3.get_confirmation")
+    @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(Pyfzf, "process_list")
+    @patch.object(S3, "get_client")
+    def test_multipart_s3(
+        self, mocked_client, mocked_list, mocked_fzf, mocked_confirm, mocked_abort
+    ):
+        mocked_client.return_value = self.client
+        mocked_confirm.return_value = True
+        mocked_fzf.return_value = ["222"]
+        multipart_s3(buckets=["kazhala-lol"])
+        mocked_list.assert_called_with(
+            ANY, "UploadId", "Bucket", "Key", "Initiated", "Age", "Size", "Parts"
+        )
+        self.assertEqual(
+            [upload["UploadId"] for upload in mocked_abort.call_args[0][1]], ["222"]
+        )
+        self.assertIn(
+            "(dryrun) abort: s3://kazhala-lol/new.bin (0d, 10 Bytes)\n"
+            + "(dryrun) 1 uploads to abort, 10 Bytes\n",
+            self.capturedOutput.getvalue(),
+        )
+
+        mocked_fzf.reset_mock()
+        multipart_s3(buckets=["kazhala-lol", "kazhala-file"], older_than=5)
+        mocked_fzf.assert_not_called()
+        self.assertEqual(
+            [upload["UploadId"] for upload in mocked_abort.call_args[0][1]], ["111"]
+        )
+
+        mocked_abort.reset_mock()
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        multipart_s3(buckets=["kazhala-file"])
+        mocked_abort.assert_not_called()
+        self.assertTrue(
+            self.capturedOutput.getvalue().endswith(
+                "No incomplete multipart uploads found\n"
+            )
+        )
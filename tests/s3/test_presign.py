@@ -1,16 +1,25 @@
+import csv
 import io
+import json
+import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 
-from fzfaws.s3.presign_s3 import presign_s3
+from fzfaws.s3.presign_s3 import presign_s3, read_keys, write_presigned
 from fzfaws.s3.s3 import S3
+from fzfaws.utils.exceptions import S3Error
 
 
 class TestS3Presign(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        # route the regional client to the mocked default client
+        patcher = patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
         sys.stdout = sys.__stdout__
@@ -72,3 +81,85 @@ class TestS3Presign(unittest.TestCase):
             self.capturedOutput.getvalue(),
             "--------------------------------------------------------------------------------\nhello.txt:\nhttps:hello.txt\n",
         )
+
+    def test_read_keys(self):
+        stream = io.StringIO("hello.txt\n\ns3://lol/foo/boo.txt\r\n")
+        self.assertEqual(
+            list(read_keys(stream, "kazhala-lol")),
+            [("kazhala-lol", "hello.txt", None), ("lol", "foo/boo.txt", None)],
+        )
+        stream = io.StringIO("s3://lol/foo/boo.txt\nhello.txt\n")
+        self.assertRaises(S3Error, list, read_keys(stream))
+
+    @patch.object(S3, "get_bucket_region")
+    def test_write_presigned(self, mocked_region):
+        mocked_region.side_effect = lambda bucket: {
+            "kazhala-lol": "ap-southeast-2",
+            "lol": "us-east-1",
+        }[bucket]
+        s3 = S3()
+        objects = [
+            ("kazhala-lol", "hello.txt", None),
+            ("lol", "foo/boo.txt", "111"),
+        ]
+        stream = io.StringIO()
+        write_presigned(s3, iter(objects), 100, "ndjson", stream)
+        result = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0]["key"], "hello.txt")
+        self.assertTrue(
+            result[0]["url"].startswith(
+                "https://kazhala-lol.s3.ap-southeast-2.amazonaws.com/hello.txt?"
+            )
+        )
+        self.assertEqual(result[1]["version_id"], "111")
+        self.assertIn("s3.us-east-1.amazonaws.com/foo/boo.txt?", result[1]["url"])
+        self.assertIn("versionId=111", result[1]["url"])
+
+        stream = io.StringIO()
+        write_presigned(s3, iter(objects), 100, "tsv", stream)
+        rows = list(csv.reader(io.StringIO(stream.getvalue()), delimiter="\t"))
+        self.assertEqual(rows[0], ["bucket", "key", "version_id", "expires", "url"])
+        self.assertEqual(rows[1][:3], ["kazhala-lol", "hello.txt", ""])
+        self.assertEqual(rows[2][:3], ["lol", "foo/boo.txt", "111"])
+
+    @patch("fzfaws.s3.presign_s3.write_presigned")
+    @patch.object(S3, "get_client")
+    @patch.object(S3, "set_s3_path")
+    @patch.object(S3, "set_s3_bucket")
+    def test_bulk(self, mocked_bucket, mocked_path, mocked_client, mocked_write):
+        mocked_write.side_effect = lambda s3, objects, expires_in, output: print(
+            list(objects), expires_in, output
+        )
+        mocked_client.return_value.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "hello/"}, {"Key": "hello/world.txt"}]}
+        ]
+        presign_s3(bucket="kazhala-lol/hello/", recursive=True, expires_in=100)
+        mocked_bucket.assert_not_called()
+        mocked_path.assert_not_called()
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "[('kazhala-lol', 'hello/world.txt', None)] 100 ndjson\n",
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            key_file = os.path.join(tmpdir, "keys.txt")
+            with open(key_file, "w") as file:
+                file.write("hello.txt\ns3://lol/world.txt\n")
+            presign_s3(bucket="kazhala-lol/", key_file=key_file, output="csv")
+        mocked_bucket.assert_not_called()
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "[('kazhala-lol', 'hello.txt', None), ('lol', 'world.txt', None)] 3600 csv\n",
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        with patch("sys.stdin", io.StringIO("s3://lol/world.txt\n")):
+            presign_s3(key_file="-")
+        mocked_bucket.assert_not_called()
+        self.assertEqual(
+            self.capturedOutput.getvalue(), "[('lol', 'world.txt', None)] 3600 ndjson\n"
+        )
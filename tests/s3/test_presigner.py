@@ -0,0 +1,64 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from urllib.parse import quote
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import ReadOnlyCredentials
+from fzfaws.s3.helper.presigner import S3Presigner
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestS3Presigner(unittest.TestCase):
+    def setUp(self):
+        self.credentials = ReadOnlyCredentials(
+            "AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY", "hello+world="
+        )
+        self.now = datetime(2020, 6, 9, 2, 18, 41)
+
+    def botocore_signature(self, url):
+        request = AWSRequest(method="GET", url=url)
+        with patch("botocore.auth.datetime") as mocked_datetime:
+            mocked_datetime.datetime.utcnow.return_value = self.now
+            S3SigV4QueryAuth(
+                self.credentials, "s3", "ap-southeast-2", expires=100
+            ).add_auth(request)
+        return request.url.split("X-Amz-Signature=")[1]
+
+    def test_presign(self):
+        presigner = S3Presigner(self.credentials, "ap-southeast-2")
+        key = "hello world/ü+a~b*.txt"
+        url = presigner.presign("kazhala-lol", key, 100, now=self.now)
+        self.assertTrue(
+            url.startswith(
+                "https://kazhala-lol.s3.ap-southeast-2.amazonaws.com/hello%20world/%C3%BC%2Ba~b%2A.txt?"
+            )
+        )
+        self.assertIn("X-Amz-Security-Token=hello%2Bworld%3D", url)
+        self.assertEqual(
+            url.split("X-Amz-Signature=")[1],
+            self.botocore_signature(
+                "https://kazhala-lol.s3.ap-southeast-2.amazonaws.com/%s"
+                % quote(key, safe="/~")
+            ),
+        )
+
+        url = presigner.presign("Kazhala.lol", "hello.txt", 100, "111+1", self.now)
+        self.assertTrue(
+            url.startswith(
+                "https://s3.ap-southeast-2.amazonaws.com/Kazhala.lol/hello.txt?"
+            )
+        )
+        self.assertEqual(
+            url.split("X-Amz-Signature=")[1],
+            self.botocore_signature(
+                "https://s3.ap-southeast-2.amazonaws.com/Kazhala.lol/hello.txt?versionId=111%2B1"
+            ),
+        )
+
+        self.assertRaises(S3Error, presigner.presign, "kazhala-lol", "a", 0)
+        self.assertRaises(S3Error, presigner.presign, "kazhala-lol", "a", 604801)
+
+    def test_endpoint(self):
+        presigner = S3Presigner(self.credentials, "cn-north-1")
+        self.assertEqual(presigner.endpoint, "s3.cn-north-1.amazonaws.com.cn")
@@ -0,0 +1,236 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from fzfaws.s3.helper.ranged_download import get_part_size, ranged_download
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestRangedDownload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.destination = os.path.join(self.tmpdir.name, "hello.txt")
+        self.data = os.urandom(1000)
+        self.config = TransferConfig(
+            multipart_chunksize=100, max_concurrency=4, num_download_attempts=3
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def raise_error(self):
+        raise ClientError({"Error": {"Code": "403"}}, "HeadObject")
+
+    def mocked_client(self, data, failures=None):
+        failures = failures if failures is not None else {}
+
+        def get_object(Bucket, Key, Range, IfMatch, **kwargs):
+            start, end = [int(i) for i in Range[6:].split("-")]
+            if failures.get(start, 0) > 0:
+                failures[start] -= 1
+                return {
+                    "ContentRange": "bytes %s-%s/%s" % (start, end, len(data)),
+                    "Body": io.BytesIO(data[start:end]),
+                }
+            return {
+                "ContentRange": "bytes %s-%s/%s" % (start, end, len(data)),
+                "Body": io.BytesIO(data[start : end + 1]),
+            }
+
+        client = MagicMock()
+        client.get_object.side_effect = get_object
+        return client
+
+    def test_ranged_download(self):
+        client = self.mocked_client(self.data)
+        callback = MagicMock()
+        head = {
+            "ContentLength": len(self.data),
+            "ETag": '"%s"' % hashlib.md5(self.data).hexdigest(),
+        }
+        ranged_download(
+            client,
+            "kazhala-lol",
+            "hello.txt",
+            self.destination,
+            self.config,
+            head=head,
+            callback=callback,
+        )
+        with open(self.destination, "rb") as file:
+            self.assertEqual(file.read(), self.data)
+        self.assertEqual(client.get_object.call_count, 10)
+        self.assertEqual(
+            sum(call[0][0] for call in callback.call_args_list), len(self.data)
+        )
+        client.get_object.assert_any_call(
+            Bucket="kazhala-lol",
+            Key="hello.txt",
+            Range="bytes=900-999",
+            IfMatch=head["ETag"],
+        )
+
+    def test_retry_range(self):
+        client = self.mocked_client(self.data, failures={200: 2})
+        callback = MagicMock()
+        head = {
+            "ContentLength": len(self.data),
+            "ETag": '"%s"' % hashlib.md5(self.data).hexdigest(),
+        }
+        ranged_download(
+            client,
+            "kazhala-lol",
+            "hello.txt",
+            self.destination,
+            self.config,
+            head=head,
+            version_id="11111",
+            callback=callback,
+        )
+        with open(self.destination, "rb") as file:
+            self.assertEqual(file.read(), self.data)
+        self.assertEqual(client.get_object.call_count, 12)
+        self.assertEqual(
+            sum(call[0][0] for call in callback.call_args_list), len(self.data)
+        )
+
+        client = self.mocked_client(self.data, failures={200: 3})
+        self.assertRaises(
+            S3Error,
+            ranged_download,
+            client,
+            "kazhala-lol",
+            "hello.txt",
+            self.destination,
+            self.config,
+            head=head,
+        )
+        self.assertFalse(os.path.exists(self.destination))
+
+    def test_precondition_failed(self):
+        client = MagicMock()
+        client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "PreconditionFailed"}}, "GetObject"
+        )
+        head = {"ContentLength": len(self.data), "ETag": '"abc"'}
+        self.assertRaises(
+            ClientError,
+            ranged_download,
+            client,
+            "kazhala-lol",
+            "hello.txt",
+            self.destination,
+            self.config,
+            head=head,
+        )
+        self.assertEqual(client.get_object.call_count, 10)
+
+    def test_checksum(self):
+        client = self.mocked_client(self.data)
+        head = {"ContentLength": len(self.data), "ETag": '"abc"'}
+        self.assertRaises(
+            S3Error,
+            ranged_download,
+            client,
+            "kazhala-lol",
+            "hello.txt",
+            self.destination,
+            self.config,
+            head=head,
+        )
+        self.assertFalse(os.path.exists(self.destination))
+
+        head["ServerSideEncryption"] = "aws:kms"
+        ranged_download(
+            client, "kazhala-lol", "hello.txt", self.destination, self.config, head=head
+        )
+        with open(self.destination, "rb") as file:
+            self.assertEqual(file.read(), self.data)
+
+    def test_multipart_checksum(self):
+        digests = b"".join(
+            hashlib.md5(self.data[i : i + 250]).digest() for i in range(0, 1000, 250)
+        )
+        head = {
+            "ContentLength": len(self.data),
+            "ETag": '"%s-4"' % hashlib.md5(digests).hexdigest(),
+        }
+        client = self.mocked_client(self.data)
+        client.head_object.return_value = {"ContentLength": 250, "PartsCount": 4}
+        ranged_download(
+            client, "kazhala-lol", "hello.txt", self.destination, self.config, head=head
+        )
+        client.head_object.assert_any_call(
+            Bucket="kazhala-lol", Key="hello.txt", PartNumber=1
+        )
+        client.head_object.assert_any_call(
+            Bucket="kazhala-lol", Key="hello.txt", PartNumber=4
+        )
+        self.assertEqual(client.get_object.call_count, 4)
+        with open(self.destination, "rb") as file:
+            self.assertEqual(file.read(), self.data)
+
+    def test_get_part_size(self):
+        client = MagicMock()
+        client.head_object.return_value = {"ContentLength": 300, "PartsCount": 3}
+        result = get_part_size(
+            client, "a", "b", {"ContentLength": 1000, "ETag": '"abc-3"'}, 100, {}
+        )
+        self.assertEqual(result, (100, False))
+        result = get_part_size(
+            client, "a", "b", {"ContentLength": 1000, "ETag": '"abc-4"'}, 100, {}
+        )
+        self.assertEqual(result, (100, False))
+        client.head_object.return_value = None
+        client.head_object.side_effect = lambda Bucket, Key, PartNumber: {
+            "ContentLength": 100 if PartNumber == 4 else 300,
+            "PartsCount": 4,
+        }
+        result = get_part_size(
+            client, "a", "b", {"ContentLength": 1000, "ETag": '"abc-4"'}, 100, {}
+        )
+        self.assertEqual(result, (300, True))
+
+        # mixed part sizes, first part size doesn't apply to the other parts
+        client.head_object.side_effect = lambda Bucket, Key, PartNumber: {
+            "ContentLength": {1: 300, 2: 200, 3: 300, 4: 200}[PartNumber],
+            "PartsCount": 4,
+        }
+        result = get_part_size(
+            client, "a", "b", {"ContentLength": 1000, "ETag": '"abc-4"'}, 100, {}, 2
+        )
+        self.assertEqual(result, (100, False))
+
+        client.head_object.side_effect = lambda Bucket, Key, PartNumber: (
+            {"ContentLength": 300, "PartsCount": 4}
+            if PartNumber == 1
+            else self.raise_error()
+        )
+        result = get_part_size(
+            client, "a", "b", {"ContentLength": 1000, "ETag": '"abc-4"'}, 100, {}
+        )
+        self.assertEqual(result, (100, False))
+        result = get_part_size(
+            client, "a", "b", {"ContentLength": 1000, "ETag": '"abc"'}, 100, {}
+        )
+        self.assertEqual(result, (100, False))
+
+        # too many parts to confirm, only the first part is checked
+        client.head_object.reset_mock()
+        client.head_object.side_effect = lambda Bucket, Key, PartNumber: {
+            "ContentLength": 10,
+            "PartsCount": 100,
+        }
+        with patch("sys.stdout", new_callable=io.StringIO) as output:
+            result = get_part_size(
+                client, "a", "b", {"ContentLength": 1000, "ETag": '"abc-100"'}, 100, {}
+            )
+        self.assertEqual(result, (100, False))
+        client.head_object.assert_called_once_with(Bucket="a", Key="b", PartNumber=1)
+        self.assertEqual(
+            output.getvalue(), "checksum verification skipped: s3://a/b has 100 parts\n"
+        )
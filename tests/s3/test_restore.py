@@ -0,0 +1,179 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.s3 import S3
+from fzfaws.s3.restore_s3 import (
+    RESTORE_STATE,
+    STATE_DOWNLOADED,
+    STATE_REQUESTED,
+    STATE_RESTORED,
+    get_state_id,
+    is_restored,
+    list_archived,
+    load_state,
+    request_restore,
+    restore_s3,
+    save_state,
+)
+from fzfaws.utils import get_cache_path
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestS3Restore(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.client = MagicMock()
+        self.client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "logs/a.log", "StorageClass": "GLACIER"},
+                    {"Key": "logs/b.log", "StorageClass": "STANDARD"},
+                    {"Key": "logs/nested/c.log", "StorageClass": "DEEP_ARCHIVE"},
+                ]
+            }
+        ]
+        self.heads = {
+            "logs/a.log": {
+                "StorageClass": "GLACIER",
+                "Restore": 'ongoing-request="true"',
+            },
+            "logs/nested/c.log": {
+                "StorageClass": "DEEP_ARCHIVE",
+                "Restore": 'ongoing-request="false", expiry-date="Fri, 21 Dec 2012 00:00:00 GMT"',
+            },
+        }
+        self.client.head_object.side_effect = lambda Bucket, Key: self.heads[Key]
+        self.wrapper = patch("fzfaws.s3.restore_s3.S3TransferWrapper")
+        mocked_wrapper = self.wrapper.start()
+        mocked_wrapper().max_workers = 2
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.wrapper.stop()
+
+    def test_list_archived(self):
+        self.assertEqual(
+            list(list_archived(self.client, "kazhala-lol", "logs/")),
+            ["logs/a.log", "logs/nested/c.log"],
+        )
+
+    def test_is_restored(self):
+        self.assertFalse(is_restored({"StorageClass": "GLACIER"}))
+        self.assertFalse(is_restored(self.heads["logs/a.log"]))
+        self.assertTrue(is_restored(self.heads["logs/nested/c.log"]))
+        self.assertTrue(is_restored({}))
+
+    def test_state(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_path = os.path.join(tmpdir, "state.json")
+            self.assertEqual(load_state(state_path), {})
+            save_state(state_path, {"hello.txt": STATE_REQUESTED})
+            self.assertEqual(load_state(state_path), {"hello.txt": STATE_REQUESTED})
+            with open(state_path, "w") as file:
+                file.write("[")
+            self.assertEqual(load_state(state_path), {})
+
+    @patch.object(S3, "get_client")
+    def test_request_restore(self, mocked_client):
+        mocked_client.return_value = self.client
+        s3 = S3()
+        s3.bucket_name = "kazhala-lol"
+        for key in ["a.log", "b.log", "c.log"]:
+            self.heads[key] = {"StorageClass": "GLACIER"}
+        self.heads["d.log"] = self.heads["logs/a.log"]
+        self.heads["e.log"] = self.heads["logs/nested/c.log"]
+        self.client.restore_object.side_effect = [
+            None,
+            ClientError(
+                {"Error": {"Code": "RestoreAlreadyInProgress"}}, "RestoreObject"
+            ),
+            ClientError({"Error": {"Code": "AccessDenied"}}, "RestoreObject"),
+        ]
+        state = {}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_path = os.path.join(tmpdir, "state.json")
+            self.assertRaises(
+                S3Error,
+                request_restore,
+                s3,
+                ["a.log", "b.log", "c.log", "d.log", "e.log"],
+                "Bulk",
+                7,
+                state,
+                state_path,
+            )
+            self.assertEqual(len(state), 4)
+            self.assertEqual(state["d.log"], STATE_REQUESTED)
+            self.assertEqual(state["e.log"], STATE_RESTORED)
+            self.assertEqual(load_state(state_path), state)
+        self.client.restore_object.assert_any_call(
+            Bucket="kazhala-lol",
+            Key="a.log",
+            RestoreRequest={"Days": 7, "GlacierJobParameters": {"Tier": "Bulk"}},
+        )
+        self.assertEqual(self.client.restore_object.call_count, 3)
+        self.assertIn("failed: s3://kazhala-lol/", self.capturedOutput.getvalue())
+        self.assertIn(
+            "restored: s3://kazhala-lol/e.log", self.capturedOutput.getvalue()
+        )
+
+    @patch("fzfaws.s3.restore_s3.time")
+    @patch("fzfaws.s3.restore_s3.download_object")
+    @patch("fzfaws.s3.restore_s3.get_confirmation")
+    @patch.object(S3, "get_client")
+    def test_restore_s3(
+        self, mocked_client, mocked_confirm, mocked_download, mocked_time
+    ):
+        mocked_client.return_value = self.client
+        mocked_confirm.return_value = True
+        mocked_sleep = mocked_time.sleep
+        state_path = get_cache_path(
+            RESTORE_STATE % get_state_id("kazhala-lol", "logs/")
+        )
+
+        restore_s3(bucket="kazhala-lol/logs/", tier="Bulk", days=7)
+        # a.log is already in progress and c.log is already restored
+        self.client.restore_object.assert_not_called()
+        self.assertEqual(
+            load_state(state_path),
+            {"logs/a.log": STATE_REQUESTED, "logs/nested/c.log": STATE_RESTORED},
+        )
+        self.assertIn(
+            "(dryrun) 2 objects to restore, Bulk tier for 7 days\n",
+            self.capturedOutput.getvalue(),
+        )
+        self.assertIn(
+            "1 objects restored, 1 in progress\n", self.capturedOutput.getvalue()
+        )
+        mocked_sleep.assert_not_called()
+
+        # rerun resumes from the state file, downloads objects once restored
+        self.client.restore_object.reset_mock()
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+
+        def _sleep(interval):
+            self.heads["logs/a.log"] = self.heads["logs/nested/c.log"]
+
+        mocked_sleep.side_effect = _sleep
+        with tempfile.TemporaryDirectory() as tmpdir:
+            restore_s3(bucket="kazhala-lol/logs/", download=tmpdir, interval=10)
+            mocked_download.assert_any_call(
+                unittest.mock.ANY,
+                "logs/nested/c.log",
+                os.path.join(tmpdir, "nested/c.log"),
+            )
+            mocked_download.assert_any_call(
+                unittest.mock.ANY, "logs/a.log", os.path.join(tmpdir, "a.log")
+            )
+        self.client.restore_object.assert_not_called()
+        mocked_sleep.assert_called_once_with(10)
+        self.assertIn(
+            "resume: 2 objects already requested", self.capturedOutput.getvalue()
+        )
+        self.assertFalse(os.path.exists(state_path))
@@ -4,14 +4,15 @@ import os
 from pathlib import Path
 import sys
 import unittest
-from unittest.mock import PropertyMock, call, patch
+from unittest.mock import MagicMock, PropertyMock, call, patch
 
 import boto3
 from botocore.paginate import Paginator
 from botocore.stub import Stubber
 
 from fzfaws.s3 import S3
-from fzfaws.utils import BaseSession, FileLoader, Pyfzf
+from fzfaws.s3.s3 import BUCKET_REGION_CACHE
+from fzfaws.utils import BaseSession, FileLoader, Pyfzf, get_cache_path
 from fzfaws.utils.exceptions import InvalidFileType, InvalidS3PathPattern
 
 
@@ -156,7 +157,8 @@ class TestS3(unittest.TestCase):
         )
         self.assertEqual(result, "accesspoint")
         self.assertEqual(
-            match, ("arn:aws:s3:us-west-2:123456789012:accesspoint/test/", "hello"),
+            match,
+            ("arn:aws:s3:us-west-2:123456789012:accesspoint/test/", "hello"),
         )
 
         result, match = self.s3._validate_input_path(
@@ -176,6 +178,7 @@ class TestS3(unittest.TestCase):
 
     @patch("fzfaws.s3.s3.get_confirmation")
     @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
     @patch.object(Pyfzf, "append_fzf")
     @patch.object(Paginator, "paginate")
     @patch("builtins.input")
@@ -301,6 +304,7 @@ class TestS3(unittest.TestCase):
         )
         self.assertEqual(self.s3.path_list, ["newpath/obj1"])
 
+    @patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
     @patch.object(Paginator, "paginate")
     @patch.object(Pyfzf, "append_fzf")
     @patch.object(Pyfzf, "execute_fzf")
@@ -401,6 +405,7 @@ class TestS3(unittest.TestCase):
             any_order=True,
         )
 
+    @patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
     @patch.object(Paginator, "paginate")
     @patch.object(Pyfzf, "process_list")
     @patch.object(Pyfzf, "execute_fzf")
@@ -545,6 +550,106 @@ class TestS3(unittest.TestCase):
             % ("ap-southeast-2", self.s3.bucket_name, self.s3.path_list[0], "111111"),
         )
 
+    @patch.object(BaseSession, "client", new_callable=PropertyMock)
+    def test_get_bucket_region(self, mocked_client):
+        cache_path = get_cache_path(BUCKET_REGION_CACHE)
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        s3 = boto3.client("s3")
+        stubber = Stubber(s3)
+        stubber.add_response("get_bucket_location", {})
+        stubber.add_response("get_bucket_location", {"LocationConstraint": "EU"})
+        stubber.add_response(
+            "get_bucket_location", {"LocationConstraint": "ap-southeast-2"}
+        )
+        stubber.activate()
+        mocked_client.return_value = s3
+        self.assertEqual(self.s3.get_bucket_region("hello"), "us-east-1")
+        self.assertEqual(self.s3.get_bucket_region("world"), "eu-west-1")
+        self.s3.bucket_name = "kazhala"
+        self.assertEqual(self.s3.get_bucket_region(), "ap-southeast-2")
+        # cached, no further api call
+        self.assertEqual(self.s3.get_bucket_region("hello"), "us-east-1")
+        stubber.assert_no_pending_responses()
+
+        # persisted once, new instance doesn't call the api
+        self.assertFalse(os.path.exists(cache_path))
+        self.s3.save_bucket_regions()
+        with open(cache_path, "r") as file:
+            self.assertEqual(
+                json.load(file),
+                {
+                    "hello": "us-east-1",
+                    "world": "eu-west-1",
+                    "kazhala": "ap-southeast-2",
+                },
+            )
+        self.assertEqual(S3().get_bucket_region("world"), "eu-west-1")
+        stubber.assert_no_pending_responses()
+
+        # corrupted cache is ignored
+        with open(cache_path, "w") as file:
+            file.write("{hello")
+        stubber.add_response(
+            "get_bucket_location", {"LocationConstraint": "ap-southeast-2"}
+        )
+        s3_instance = S3()
+        self.assertEqual(s3_instance.get_bucket_region("hello"), "ap-southeast-2")
+        stubber.assert_no_pending_responses()
+        s3_instance.save_bucket_regions()
+        with open(cache_path, "r") as file:
+            self.assertEqual(json.load(file), {"hello": "ap-southeast-2"})
+
+        # stale region is dropped
+        s3_instance.invalidate_bucket_region("hello")
+        s3_instance.save_bucket_regions()
+        with open(cache_path, "r") as file:
+            self.assertEqual(json.load(file), {})
+
+    def test_region_error(self):
+        s3 = S3()
+        s3._bucket_regions = {"hello": "us-east-1", "world": "eu-west-1"}
+        client = MagicMock()
+        client.meta.region_name = "us-east-1"
+        s3._watch_region_errors(client)
+        event_name, handler = client.meta.events.register.call_args[0]
+        self.assertEqual(event_name, "needs-retry.s3")
+
+        def emit(bucket, code, headers=None):
+            return handler(
+                request_dict={"context": {"signing": {"bucket": bucket}}},
+                response=(
+                    MagicMock(status_code=400, headers=headers or {}),
+                    {"Error": {"Code": code}},
+                ),
+            )
+
+        emit("world", "NoSuchBucket")
+        # head request failed for other reasons in the same region
+        emit("world", "400", {"x-amz-bucket-region": "us-east-1"})
+        emit("world", "400")
+        self.assertEqual(
+            s3._bucket_regions, {"hello": "us-east-1", "world": "eu-west-1"}
+        )
+        self.assertEqual(s3._pending_regions, {})
+
+        self.assertIsNone(emit("hello", "PermanentRedirect"))
+        self.assertEqual(s3._bucket_regions, {"world": "eu-west-1"})
+        self.assertEqual(s3._pending_regions, {"hello": None})
+
+        emit("world", "400", {"x-amz-bucket-region": "eu-west-2"})
+        self.assertEqual(s3._bucket_regions, {})
+
+    @patch.object(S3, "get_bucket_region")
+    def test_get_client(self, mocked_region):
+        mocked_region.return_value = self.s3.client.meta.region_name
+        self.assertIs(self.s3.get_client("hello"), self.s3.client)
+
+        mocked_region.return_value = "eu-west-1"
+        client = self.s3.get_client("world")
+        self.assertEqual(client.meta.region_name, "eu-west-1")
+        self.assertIs(self.s3.get_client("world"), client)
+
     def test_get_s3_destination_key(self):
         # normal test
         self.s3.bucket_name = "kazhala-version-testing"
@@ -17,6 +17,10 @@ class TestS3Args(unittest.TestCase):
     def setUp(self):
         self.capturedOutput = io.StringIO()
         sys.stdout = self.capturedOutput
+        # route the regional client to the mocked default client
+        patcher = patch.object(S3, "get_client", lambda s3, bucket="": s3.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         s3 = S3()
         s3.bucket_name = "hello"
         s3.path_list = ["hello.json"]
@@ -13,3 +13,10 @@ class TestS3TransferWrapper(unittest.TestCase):
         transfer = S3TransferWrapper(boto3.client("s3"))
         self.assertEqual(transfer.s3transfer._manager.config.num_download_attempts, 6)
         self.assertEqual(transfer.transfer_config.num_download_attempts, 6)
+
+    def test_max_workers(self):
+        transfer = S3TransferWrapper()
+        transfer.transfer_config.max_concurrency = 4
+        self.assertEqual(transfer.max_workers, 4)
+        transfer.transfer_config.max_concurrency = 0
+        self.assertEqual(transfer.max_workers, 1)
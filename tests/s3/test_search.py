@@ -0,0 +1,180 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.s3 import S3
+from fzfaws.s3.search_s3 import (
+    get_literal_prefix,
+    get_search_destination,
+    search_delete,
+    search_download,
+    search_keys,
+    search_presign,
+    search_s3,
+)
+from fzfaws.utils import Pyfzf
+
+
+class TestS3Search(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.s3 = S3()
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def mocked_client(self, pages):
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = pages
+        return client
+
+    def test_get_literal_prefix(self):
+        self.assertEqual(get_literal_prefix("logs/"), "logs/")
+        self.assertEqual(get_literal_prefix("logs/*.json"), "logs/")
+        self.assertEqual(get_literal_prefix("logs/2020-0?/a"), "logs/2020-0")
+        self.assertEqual(get_literal_prefix("[ab]/hello"), "")
+
+    @patch.object(S3, "get_client")
+    def test_search_keys(self, mocked_client):
+        clients = {
+            "kazhala": self.mocked_client(
+                [
+                    {"Contents": [{"Key": "logs/a.json"}, {"Key": "logs/b.txt"}]},
+                    {"Contents": [{"Key": "logs/c/d.json"}]},
+                ]
+            ),
+            "lol": self.mocked_client([{}]),
+        }
+
+        def get_client(bucket):
+            if bucket == "denied":
+                raise ClientError(
+                    {"Error": {"Code": "AccessDenied", "Message": "denied"}},
+                    "GetBucketLocation",
+                )
+            return clients[bucket]
+
+        mocked_client.side_effect = get_client
+        skipped = []
+        result = list(
+            search_keys(
+                self.s3,
+                ["kazhala", "lol", "denied"],
+                "logs/*.json",
+                threading.Event(),
+                skipped,
+            )
+        )
+        self.assertEqual(
+            sorted(result), ["kazhala/logs/a.json", "kazhala/logs/c/d.json"]
+        )
+        clients["kazhala"].get_paginator.return_value.paginate.assert_called_with(
+            Bucket="kazhala", Prefix="logs/"
+        )
+        self.assertEqual(len(skipped), 1)
+        self.assertEqual(skipped[0][0], "denied")
+
+        result = list(
+            search_keys(self.s3, ["kazhala"], "logs/b", threading.Event(), [])
+        )
+        self.assertEqual(len(result), 3)
+
+        stop_event = threading.Event()
+        stop_event.set()
+        result = list(search_keys(self.s3, ["kazhala"], "logs/b", stop_event, []))
+        self.assertEqual(result, [])
+
+    @patch("fzfaws.s3.search_s3.search_presign")
+    @patch("fzfaws.s3.search_s3.search_delete")
+    @patch("fzfaws.s3.search_s3.search_download")
+    @patch.object(Pyfzf, "execute_fzf")
+    @patch.object(Pyfzf, "stream_fzf")
+    @patch.object(S3, "get_client")
+    def test_search_s3(
+        self,
+        mocked_client,
+        mocked_stream,
+        mocked_execute,
+        mocked_download,
+        mocked_delete,
+        mocked_presign,
+    ):
+        mocked_stream.return_value = ["kazhala/hello.txt", "lol/foo/boo.txt"]
+        search_s3(pattern="hello", buckets=["kazhala", "lol"], action="download")
+        mocked_download.assert_called_with(
+            mocked_download.call_args[0][0],
+            [("kazhala", "hello.txt"), ("lol", "foo/boo.txt")],
+        )
+        mocked_execute.assert_not_called()
+
+        mocked_execute.return_value = "presign"
+        search_s3(pattern="hello", buckets=["kazhala", "lol"], expires_in=100)
+        mocked_presign.assert_called_with(
+            mocked_presign.call_args[0][0],
+            [("kazhala", "hello.txt"), ("lol", "foo/boo.txt")],
+            100,
+        )
+        mocked_delete.assert_not_called()
+
+    @patch("fzfaws.s3.search_s3.download_object")
+    @patch("fzfaws.s3.search_s3.get_confirmation")
+    @patch.object(Pyfzf, "get_local_file")
+    def test_search_download(self, mocked_local, mocked_confirm, mocked_download):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        mocked_local.return_value = tmpdir.name
+        mocked_confirm.return_value = True
+        search_download(
+            self.s3,
+            [
+                ("kazhala", "foo/hello.txt"),
+                ("kazhala", "boo/hello.txt"),
+                ("lol", "hello.txt"),
+            ],
+        )
+        destinations = [call[0][2] for call in mocked_download.call_args_list]
+        self.assertEqual(
+            destinations,
+            [
+                os.path.join(tmpdir.name, "kazhala", "foo", "hello.txt"),
+                os.path.join(tmpdir.name, "kazhala", "boo", "hello.txt"),
+                os.path.join(tmpdir.name, "lol", "hello.txt"),
+            ],
+        )
+        self.assertTrue(os.path.isdir(os.path.join(tmpdir.name, "kazhala", "foo")))
+        self.assertEqual(
+            get_search_destination("/tmp", "kazhala", "../../etc//passwd"),
+            os.path.join("/tmp", "kazhala", "etc", "passwd"),
+        )
+
+    @patch("fzfaws.s3.search_s3.get_confirmation")
+    @patch.object(S3, "get_client")
+    def test_search_delete(self, mocked_client, mocked_confirm):
+        mocked_confirm.return_value = True
+        search_delete(self.s3, [("kazhala", "hello.txt")])
+        mocked_client.assert_called_with("kazhala")
+        mocked_client.return_value.delete_object.assert_called_with(
+            Bucket="kazhala", Key="hello.txt"
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "(dryrun) delete: s3://kazhala/hello.txt\ndelete: s3://kazhala/hello.txt\n",
+        )
+
+    @patch.object(S3, "get_client")
+    def test_search_presign(self, mocked_client):
+        mocked_client.return_value.generate_presigned_url.return_value = "url"
+        search_presign(self.s3, [("kazhala", "hello.txt")], 100)
+        mocked_client.return_value.generate_presigned_url.assert_called_with(
+            "get_object",
+            Params={"Bucket": "kazhala", "Key": "hello.txt"},
+            ExpiresIn=100,
+        )
+        self.assertRegex(
+            self.capturedOutput.getvalue(), r"s3://kazhala/hello.txt:\nurl"
+        )
@@ -0,0 +1,112 @@
+import io
+import sys
+import unittest
+from unittest.mock import MagicMock, call, patch
+from botocore.exceptions import ClientError
+from fzfaws.s3 import S3
+from fzfaws.s3.helper.tag_acl import merge_tags, update_tag_acl
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestS3TagAcl(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.s3 = S3()
+        self.s3.bucket_name = "kazhala-lol"
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_merge_tags(self):
+        result = merge_tags(
+            [{"Key": "foo", "Value": "boo"}, {"Key": "hello", "Value": "lol"}],
+            [{"Key": "hello", "Value": "world"}],
+        )
+        self.assertEqual(
+            result,
+            [{"Key": "foo", "Value": "boo"}, {"Key": "hello", "Value": "world"}],
+        )
+
+    @patch.object(S3, "get_client")
+    def test_update_tag_acl(self, mocked_client):
+        client = MagicMock()
+        mocked_client.return_value = client
+        check_result = {
+            "Tags": [{"Key": "hello", "Value": "world"}],
+            "Grants": {"GrantRead": "id=11111111"},
+        }
+        update_tag_acl(
+            self.s3,
+            [{"Key": "hello.txt"}, {"Key": "world.txt", "VersionId": "111"}],
+            check_result,
+        )
+        client.put_object_tagging.assert_has_calls(
+            [
+                call(
+                    Bucket="kazhala-lol",
+                    Key="hello.txt",
+                    Tagging={"TagSet": [{"Key": "hello", "Value": "world"}]},
+                ),
+                call(
+                    Bucket="kazhala-lol",
+                    Key="world.txt",
+                    VersionId="111",
+                    Tagging={"TagSet": [{"Key": "hello", "Value": "world"}]},
+                ),
+            ],
+            any_order=True,
+        )
+        client.put_object_acl.assert_any_call(
+            Bucket="kazhala-lol",
+            Key="world.txt",
+            VersionId="111",
+            GrantRead="id=11111111",
+        )
+        client.get_object_tagging.assert_not_called()
+        self.assertIn(
+            "update: s3://kazhala-lol/world.txt with version 111",
+            self.capturedOutput.getvalue(),
+        )
+
+        client.reset_mock()
+        client.get_object_tagging.return_value = {
+            "TagSet": [{"Key": "foo", "Value": "boo"}]
+        }
+        update_tag_acl(
+            self.s3, [{"Key": "hello.txt"}], {"Tags": check_result["Tags"]}, True
+        )
+        client.get_object_tagging.assert_called_once_with(
+            Bucket="kazhala-lol", Key="hello.txt"
+        )
+        client.put_object_tagging.assert_called_once_with(
+            Bucket="kazhala-lol",
+            Key="hello.txt",
+            Tagging={
+                "TagSet": [
+                    {"Key": "foo", "Value": "boo"},
+                    {"Key": "hello", "Value": "world"},
+                ]
+            },
+        )
+        client.put_object_acl.assert_not_called()
+
+    @patch("fzfaws.utils.throttle.time.sleep")
+    @patch.object(S3, "get_client")
+    def test_update_tag_acl_failed(self, mocked_client, mocked_sleep):
+        client = MagicMock()
+        mocked_client.return_value = client
+        client.put_object_tagging.side_effect = [
+            ClientError({"Error": {"Code": "SlowDown"}}, "PutObjectTagging"),
+            {},
+            ClientError({"Error": {"Code": "AccessDenied"}}, "PutObjectTagging"),
+        ]
+        self.assertRaises(
+            S3Error,
+            update_tag_acl,
+            self.s3,
+            [{"Key": "hello.txt"}, {"Key": "world.txt"}],
+            {"Tags": [{"Key": "hello", "Value": "world"}]},
+        )
+        self.assertEqual(client.put_object_tagging.call_count, 3)
+        self.assertRegex(self.capturedOutput.getvalue(), r"failed: s3://kazhala-lol/")
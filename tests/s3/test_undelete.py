@@ -0,0 +1,242 @@
+import io
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.s3 import S3
+from fzfaws.s3.undelete_s3 import (
+    DELETE_BATCH_SIZE,
+    batch_markers,
+    find_undelete_targets,
+    parse_time,
+    remove_delete_markers,
+    undelete_s3,
+)
+from fzfaws.utils.exceptions import S3Error
+
+
+class TestS3Undelete(unittest.TestCase):
+    def setUp(self):
+        self.capturedOutput = io.StringIO()
+        sys.stdout = self.capturedOutput
+        self.now = datetime(2020, 1, 2, tzinfo=timezone.utc)
+        hour = timedelta(hours=1)
+        self.pages = [
+            {
+                "Versions": [
+                    {
+                        "Key": "a.txt",
+                        "VersionId": "a1",
+                        "IsLatest": False,
+                        "Size": 10,
+                        "LastModified": self.now - 5 * hour,
+                    },
+                    {
+                        "Key": "b.txt",
+                        "VersionId": "b1",
+                        "IsLatest": True,
+                        "Size": 20,
+                        "LastModified": self.now - 5 * hour,
+                    },
+                ],
+                "DeleteMarkers": [
+                    {
+                        "Key": "a.txt",
+                        "VersionId": "am2",
+                        "IsLatest": True,
+                        "LastModified": self.now - hour,
+                    },
+                    {
+                        "Key": "a.txt",
+                        "VersionId": "am1",
+                        "IsLatest": False,
+                        "LastModified": self.now - 2 * hour,
+                    },
+                    {
+                        "Key": "c.txt",
+                        "VersionId": "cm1",
+                        "IsLatest": True,
+                        "LastModified": self.now - 3 * hour,
+                    },
+                ],
+            },
+            {
+                "Versions": [
+                    {
+                        "Key": "c.txt",
+                        "VersionId": "c1",
+                        "IsLatest": False,
+                        "Size": 30,
+                        "LastModified": self.now - 4 * hour,
+                    }
+                ],
+                "DeleteMarkers": [
+                    {
+                        "Key": "d.txt",
+                        "VersionId": "dm1",
+                        "IsLatest": True,
+                        "LastModified": self.now - hour,
+                    }
+                ],
+            },
+        ]
+        self.client = MagicMock()
+        self.client.get_paginator.return_value.paginate.return_value = self.pages
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time("2h", self.now), self.now - timedelta(hours=2))
+        self.assertEqual(parse_time("1d", self.now), self.now - timedelta(days=1))
+        self.assertEqual(
+            parse_time("2020-01-01T10:00:00", self.now),
+            datetime(2020, 1, 1, 10, tzinfo=timezone.utc),
+        )
+        self.assertRaises(S3Error, parse_time, "yesterday", self.now)
+
+    def test_find_undelete_targets(self):
+        result = list(find_undelete_targets(self.client, "kazhala-lol"))
+        self.assertEqual(
+            [(target["Key"], target["Markers"], target["Size"]) for target in result],
+            [("a.txt", ["am2", "am1"], 10), ("c.txt", ["cm1"], 30)],
+        )
+        self.client.get_paginator.assert_called_with("list_object_versions")
+
+        result = list(
+            find_undelete_targets(
+                self.client,
+                "kazhala-lol",
+                since=self.now - timedelta(hours=2),
+                until=self.now,
+            )
+        )
+        self.assertEqual([target["Key"] for target in result], ["a.txt"])
+
+        # delete marker created in the same second as the version it hides
+        self.client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Versions": [
+                    {
+                        "Key": "e.txt",
+                        "VersionId": "e1",
+                        "IsLatest": False,
+                        "Size": 50,
+                        "LastModified": self.now,
+                    }
+                ],
+                "DeleteMarkers": [
+                    {
+                        "Key": "e.txt",
+                        "VersionId": "em1",
+                        "IsLatest": True,
+                        "LastModified": self.now,
+                    }
+                ],
+            }
+        ]
+        result = list(find_undelete_targets(self.client, "kazhala-lol"))
+        self.assertEqual(
+            [(target["Key"], target["Markers"]) for target in result],
+            [("e.txt", ["em1"])],
+        )
+
+    def test_batch_markers(self):
+        targets = [
+            {"Key": "a.txt", "Markers": ["1"] * (DELETE_BATCH_SIZE - 1)},
+            {"Key": "b.txt", "Markers": ["1", "2"]},
+            {"Key": "c.txt", "Markers": ["1"]},
+        ]
+        result = list(batch_markers(targets))
+        self.assertEqual(len(result), 2)
+        self.assertEqual(len(result[0]), DELETE_BATCH_SIZE - 1)
+        self.assertEqual(
+            result[1],
+            [
+                {"Key": "b.txt", "VersionId": "1"},
+                {"Key": "b.txt", "VersionId": "2"},
+                {"Key": "c.txt", "VersionId": "1"},
+            ],
+        )
+
+    @patch("fzfaws.s3.undelete_s3.S3TransferWrapper")
+    @patch.object(S3, "get_client")
+    def test_remove_delete_markers(self, mocked_client, mocked_wrapper):
+        mocked_client.return_value = self.client
+        mocked_wrapper().max_workers = 2
+        s3 = S3()
+        s3.bucket_name = "kazhala-lol"
+        targets = [
+            {"Key": "a.txt", "Markers": ["am2", "am1"]},
+            {"Key": "c.txt", "Markers": ["cm1"]},
+        ]
+        self.client.delete_objects.return_value = {}
+        remove_delete_markers(s3, targets, "111 222")
+        self.client.delete_objects.assert_called_once_with(
+            Bucket="kazhala-lol",
+            Delete={
+                "Objects": [
+                    {"Key": "a.txt", "VersionId": "am2"},
+                    {"Key": "a.txt", "VersionId": "am1"},
+                    {"Key": "c.txt", "VersionId": "cm1"},
+                ],
+                "Quiet": True,
+            },
+            MFA="111 222",
+        )
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "undelete: s3://kazhala-lol/a.txt\nundelete: s3://kazhala-lol/c.txt\n",
+        )
+
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        self.client.delete_objects.return_value = {
+            "Errors": [{"Key": "c.txt", "VersionId": "cm1", "Code": "AccessDenied"}]
+        }
+        self.assertRaises(S3Error, remove_delete_markers, s3, targets)
+        self.assertIn(
+            "undelete: s3://kazhala-lol/a.txt\n", self.capturedOutput.getvalue()
+        )
+        self.assertIn(
+            "failed: s3://kazhala-lol/c.txt (AccessDenied)",
+            self.capturedOutput.getvalue(),
+        )
+
+        self.client.delete_objects.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "DeleteObjects"
+        )
+        self.assertRaises(S3Error, remove_delete_markers, s3, targets)
+
+    @patch("fzfaws.s3.undelete_s3.remove_delete_markers")
+    @patch("fzfaws.s3.undelete_s3.get_confirmation")
+    @patch.object(S3, "get_client")
+    @patch.object(S3, "set_s3_path")
+    @patch.object(S3, "set_s3_bucket")
+    def test_undelete_s3(
+        self, mocked_bucket, mocked_path, mocked_client, mocked_confirm, mocked_remove
+    ):
+        mocked_client.return_value = self.client
+        mocked_confirm.return_value = True
+        undelete_s3(bucket="kazhala-lol/", mfa="111 222")
+        mocked_bucket.assert_not_called()
+        mocked_path.assert_called_once()
+        self.assertEqual(
+            self.capturedOutput.getvalue(),
+            "(dryrun) undelete: s3://kazhala-lol/a.txt\n"
+            + "(dryrun) undelete: s3://kazhala-lol/c.txt\n"
+            + "(dryrun) 2 objects to restore, 40 Bytes\n",
+        )
+        self.assertEqual(
+            [target["Key"] for target in mocked_remove.call_args[0][1]],
+            ["a.txt", "c.txt"],
+        )
+        self.assertEqual(mocked_remove.call_args[0][2], "111 222")
+
+        mocked_remove.reset_mock()
+        self.capturedOutput.truncate(0)
+        self.capturedOutput.seek(0)
+        undelete_s3(bucket="kazhala-lol/", until="2020-01-01")
+        self.assertEqual(self.capturedOutput.getvalue(), "No deleted objects found\n")
+        mocked_remove.assert_not_called()
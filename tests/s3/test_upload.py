@@ -2,11 +2,13 @@ import io
 import sys
 import os
 import unittest
-from unittest.mock import patch
+from datetime import datetime, timezone
+from unittest.mock import ANY, MagicMock, patch
 from fzfaws.s3.upload_s3 import upload_s3
 from fzfaws.s3 import S3
 from fzfaws.utils import Pyfzf
 from fzfaws.s3.helper.s3args import S3Args
+from fzfaws.utils.scanner import LocalEntry
 
 
 class TestS3Upload(unittest.TestCase):
@@ -46,14 +48,16 @@ class TestS3Upload(unittest.TestCase):
 
     @patch.object(S3Args, "set_extra_args")
     @patch("fzfaws.s3.upload_s3.get_confirmation")
-    @patch("fzfaws.s3.upload_s3.os.walk")
+    @patch("fzfaws.s3.upload_s3.scan_local")
     @patch.object(Pyfzf, "get_local_file")
     def test_recusive_upload(
-        self, mocked_local_file, mocked_walk, mocked_confirm, mocked_args
+        self, mocked_local_file, mocked_scan, mocked_confirm, mocked_args
     ):
         curr_dirname = os.path.dirname(os.path.abspath(__file__))
         mocked_local_file.return_value = curr_dirname
-        mocked_walk.return_value = [(curr_dirname, "/tmp", [__file__])]
+        mocked_scan.side_effect = lambda *args, **kwargs: iter(
+            [LocalEntry(__file__, "test_upload.py", 10, 0.0, False)]
+        )
         mocked_confirm.return_value = False
 
         self.capturedOutput.truncate(0)
@@ -86,6 +90,100 @@ class TestS3Upload(unittest.TestCase):
         )
         mocked_args.assert_called_once()
 
+        mocked_confirm.return_value = True
+        with patch("fzfaws.s3.upload_s3.upload_file") as mocked_upload:
+            upload_s3(recursive=True, bucket="kazhala-file-lol/hello/")
+            mocked_upload.assert_called_once_with(
+                ANY, __file__, "hello/test_upload.py", {}, "", 10
+            )
+
+    @patch("fzfaws.s3.upload_s3.ETagCache")
+    @patch.object(S3, "get_client")
+    @patch("fzfaws.s3.upload_s3.upload_file")
+    @patch("fzfaws.s3.upload_s3.get_confirmation")
+    @patch("fzfaws.s3.upload_s3.scan_local")
+    def test_skip_unchanged(
+        self, mocked_scan, mocked_confirm, mocked_upload, mocked_client, mocked_cache
+    ):
+        uploaded = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        mocked_scan.return_value = iter(
+            [
+                LocalEntry("/tmp/new.txt", "new.txt", 10, 0.0, False),
+                LocalEntry("/tmp/same.txt", "same.txt", 10, 0.0, False),
+                LocalEntry("/tmp/resized.txt", "resized.txt", 10, 0.0, False),
+                LocalEntry(
+                    "/tmp/touched.txt",
+                    "touched.txt",
+                    20,
+                    uploaded.timestamp() + 10,
+                    False,
+                ),
+                LocalEntry(
+                    "/tmp/changed.txt",
+                    "changed.txt",
+                    10,
+                    uploaded.timestamp() + 10,
+                    False,
+                ),
+            ]
+        )
+        mocked_client().get_paginator().paginate.return_value = [
+            {
+                "Contents": [
+                    {
+                        "Key": "hello/%s" % name,
+                        "Size": size,
+                        "LastModified": uploaded,
+                        "ETag": '"%s"' % etag,
+                    }
+                    for name, size, etag in [
+                        ("same.txt", 10, "same"),
+                        ("resized.txt", 5, "resized"),
+                        ("touched.txt", 20, "touched"),
+                        ("changed.txt", 10, "old"),
+                    ]
+                ]
+            }
+        ]
+        mocked_cache().get_etag.side_effect = lambda path, size, mtime: {
+            "/tmp/touched.txt": "touched",
+            "/tmp/changed.txt": "new",
+        }[path]
+        mocked_confirm.return_value = True
+
+        upload_s3(
+            recursive=True,
+            bucket="kazhala-file-lol/hello/",
+            local_paths="/tmp",
+            skip_unchanged=True,
+        )
+        mocked_client().get_paginator().paginate.assert_called_with(
+            Bucket="kazhala-file-lol", Prefix="hello/"
+        )
+        self.assertEqual(
+            sorted(call[0][2] for call in mocked_upload.call_args_list),
+            ["hello/changed.txt", "hello/new.txt", "hello/resized.txt"],
+        )
+        mocked_cache().save.assert_called_once()
+        self.assertIn(
+            "(dryrun) 2 files unchanged, 30 Bytes skipped",
+            self.capturedOutput.getvalue(),
+        )
+
+        mocked_upload.reset_mock()
+        mocked_confirm.reset_mock()
+        mocked_scan.return_value = iter(
+            [LocalEntry("/tmp/same.txt", "same.txt", 10, 0.0, False)]
+        )
+        upload_s3(
+            recursive=True,
+            bucket="kazhala-file-lol/hello/",
+            local_paths="/tmp",
+            skip_unchanged=True,
+        )
+        mocked_confirm.assert_not_called()
+        mocked_upload.assert_not_called()
+
     @patch("fzfaws.s3.upload_s3.recursive_upload")
     @patch("fzfaws.s3.upload_s3.get_confirmation")
     @patch.object(Pyfzf, "get_local_file")
@@ -5,6 +5,7 @@ import sys
 import unittest
 from unittest.mock import patch
 from botocore.paginate import Paginator
+from fzfaws.s3.helper.exclude_file import FileMatcher
 from fzfaws.s3.helper.walk_s3_folder import walk_s3_folder
 import boto3
 
@@ -17,7 +18,7 @@ class TestS3WalkFolder(unittest.TestCase):
     def tearDown(self):
         sys.stdout = sys.__stdout__
 
-    @patch("fzfaws.s3.helper.walk_s3_folder.exclude_file")
+    @patch.object(FileMatcher, "is_excluded")
     @patch.object(Paginator, "paginate")
     def test_walk(self, mocked_paginator, mocked_exclude):
         data_path2 = os.path.join(
@@ -111,3 +112,26 @@ class TestS3WalkFolder(unittest.TestCase):
         mocked_exclude.return_value = True
         result = walk_s3_folder(client, "kazhala-file-transfer", "", "")
         self.assertEqual(result, [])
+
+    @patch.object(Paginator, "paginate")
+    def test_walk_prune(self, mocked_paginator):
+        mocked_paginator.side_effect = lambda *args, **kwargs: {
+            "": [
+                {
+                    "CommonPrefixes": [{"Prefix": ".git/"}, {"Prefix": "src/"}],
+                    "Contents": [{"Key": "hello.txt"}],
+                }
+            ],
+            "src/": [{"Contents": [{"Key": "src/hello.py"}]}],
+        }[kwargs["Prefix"]]
+        client = boto3.client("s3")
+        result = walk_s3_folder(client, "kazhala-lol", "", "", exclude=[".git/*"])
+        self.assertEqual(
+            result, [("src/hello.py", "/src/hello.py"), ("hello.txt", "/hello.txt")]
+        )
+        self.assertEqual(mocked_paginator.call_count, 2)
+
+        mocked_paginator.reset_mock()
+        result = walk_s3_folder(client, "kazhala-lol", "", "", exclude=["*"])
+        self.assertEqual(result, [])
+        mocked_paginator.assert_not_called()
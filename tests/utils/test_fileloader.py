@@ -4,6 +4,8 @@ import unittest
 import tempfile
 from unittest.mock import patch
 from fzfaws.utils import FileLoader
+from fzfaws.utils import fileloader
+from fzfaws.utils.fileloader import IntrinsicFunction, load_template
 
 
 class TestFileLoader(unittest.TestCase):
@@ -44,6 +46,47 @@ class TestFileLoader(unittest.TestCase):
         if "foo" not in result["dictBody"]:
             self.fail("Json file is not read properly")
 
+    def test_load_template(self):
+        template_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "../data/cloudformation_template.yaml",
+        )
+        self.fileloader.path = template_path
+        result = self.fileloader.process_yaml_file()
+        self.assertEqual(
+            result["dictBody"]["Conditions"]["IsWebServer"],
+            IntrinsicFunction("Equals", [IntrinsicFunction("Ref", "WebServer"), "Yes"]),
+        )
+        self.assertEqual(
+            result["dictBody"]["Conditions"]["IsWebServer"].name, "Fn::Equals"
+        )
+        self.assertEqual(IntrinsicFunction("Ref", "WebServer").name, "Ref")
+        self.assertEqual(
+            load_template("Value: !GetAtt\n  Instance: PublicIp\n")["Value"],
+            IntrinsicFunction("GetAtt", {"Instance": "PublicIp"}),
+        )
+
+        # parsed once, same content return the cached result
+        with patch("fzfaws.utils.fileloader.yaml.load") as mocked_load:
+            self.assertIs(
+                FileLoader(body=result["body"]).process_yaml_body(),
+                result["dictBody"],
+            )
+            mocked_load.assert_not_called()
+        body = json.dumps({"hello": "world"})
+        self.assertIs(load_template(body, "json"), load_template(body, "json"))
+        self.assertIsNot(load_template(body), load_template(body, "json"))
+
+    def test_template_loader(self):
+        if fileloader.yaml.__with_libyaml__:
+            self.assertTrue(
+                issubclass(fileloader.TemplateLoader, fileloader.yaml.CSafeLoader)
+            )
+        # tags are only handled by the template loader
+        self.assertRaises(
+            fileloader.YAMLError, fileloader.yaml.safe_load, "Value: !Ref Hello"
+        )
+
     @patch.object(FileLoader, "_set_cloudformation_env")
     @patch.object(FileLoader, "_set_s3_env")
     @patch.object(FileLoader, "_set_ec2_env")
@@ -93,6 +136,12 @@ class TestFileLoader(unittest.TestCase):
         self.assertEqual(os.environ["FZFAWS_CLOUDFORMATION_UPDATE"], "")
         self.assertEqual(os.environ["FZFAWS_CLOUDFORMATION_WAITER"], "")
 
+        self.fileloader._set_cloudformation_env({"template_bucket": "kazhala-lol/"})
+        self.assertEqual(
+            os.environ["FZFAWS_CLOUDFORMATION_TEMPLATE_BUCKET"], "kazhala-lol/"
+        )
+        os.environ.pop("FZFAWS_CLOUDFORMATION_TEMPLATE_BUCKET")
+
         # custom settings
         self.fileloader._set_cloudformation_env(
             {"profile": "root", "region": "us-east-2", "default_args": {"create": "-l"}}
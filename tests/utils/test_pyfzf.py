@@ -1,10 +1,12 @@
 import unittest
 import subprocess
 import io
+import os
 import sys
 from unittest.mock import ANY, patch
 from fzfaws.utils import Pyfzf, FileLoader
 from fzfaws.utils.exceptions import EmptyList, NoSelectionMade
+from fzfaws.utils.scanner import LocalEntry
 from pathlib import Path
 
 
@@ -105,6 +107,28 @@ class TestPyfzf(unittest.TestCase):
         result = self.fzf.execute_fzf(multi_select=True, print_col=0)
         self.assertEqual(result, ["hello world", "foo boo"])
 
+    @patch.object(subprocess, "Popen")
+    def test_stream_fzf(self, mocked_popen):
+        mocked_popen.return_value.stdout.read.return_value = b"hello world\nfoo boo"
+        mocked_popen.return_value.returncode = 0
+        result = self.fzf.stream_fzf(
+            iter(["hello world", "foo boo"]), multi_select=True, print_col=0
+        )
+        self.assertEqual(result, ["hello world", "foo boo"])
+        mocked_popen.return_value.stdin.write.assert_any_call(b"hello world\n")
+        self.assertIn("--multi", mocked_popen.call_args[0][0])
+
+        mocked_popen.return_value.stdout.read.return_value = b"hello world"
+        result = self.fzf.stream_fzf(iter(["hello world"]), header="foo")
+        self.assertEqual(result, "world")
+        self.assertIn("--header=foo", mocked_popen.call_args[0][0])
+
+        mocked_popen.return_value.stdout.read.return_value = b""
+        mocked_popen.return_value.returncode = 130
+        self.assertRaises(NoSelectionMade, self.fzf.stream_fzf, iter([]))
+        result = self.fzf.stream_fzf(iter([]), empty_allow=True, multi_select=True)
+        self.assertEqual(result, [])
+
     @patch.object(subprocess, "Popen")
     @patch.object(subprocess, "check_output")
     def test_check_ctrl_c(self, mocked_output, mocked_popen):
@@ -117,73 +141,53 @@ class TestPyfzf(unittest.TestCase):
         except:
             self.fail("ctrl-c test failed, unexpected exception raise")
 
-    @patch("fzfaws.utils.Pyfzf._check_fd")
-    @patch.object(subprocess, "Popen")
-    @patch.object(subprocess, "check_output")
-    def test_get_local_file(self, mocked_output, mocked_popen, mocked_check):
-        mocked_check.return_value = False
-        mocked_output.return_value = b""
-        self.assertRaises(NoSelectionMade, self.fzf.get_local_file)
-        mocked_popen.assert_called_with(
-            "find * -type f", shell=True, stderr=ANY, stdout=ANY
+    @patch("fzfaws.utils.pyfzf.scan_local")
+    @patch.object(Pyfzf, "stream_fzf")
+    def test_get_local_file(self, mocked_stream, mocked_scan):
+        mocked_scan.return_value = iter(
+            [LocalEntry("./hello.txt", "hello.txt", 10, 0.0, False)]
         )
-
-        mocked_output.return_value = b"hello"
+        mocked_stream.return_value = "hello.txt"
         result = self.fzf.get_local_file()
-        self.assertEqual("hello", result)
-
-        mocked_output.return_value = b"hello"
-        result = self.fzf.get_local_file(multi_select=True)
-        self.assertEqual(result, ["hello"])
-
-        mocked_output.return_value = b"hello\nworld\n"
-        result = self.fzf.get_local_file(multi_select=True)
-        self.assertEqual(result, ["hello", "world"])
-
-        result = self.fzf.get_local_file(directory=True, search_from_root=True)
-        mocked_popen.assert_called_with(
-            "echo \033[33m./\033[0m; find * -type d", shell=True, stderr=ANY, stdout=ANY
+        self.assertEqual(result, "hello.txt")
+        mocked_scan.assert_called_with(directory=False, hidden=False, suffixes=None)
+        self.assertEqual(list(mocked_stream.call_args[0][0]), ["hello.txt"])
+        mocked_stream.assert_called_with(
+            ANY, empty_allow=False, print_col=0, multi_select=False, header=None
         )
 
-        result = self.fzf.get_local_file(cloudformation=True)
-        mocked_popen.assert_called_with(
-            'find * -type f -name "*.json" -o -name "*.yaml" -o -name "*.yml"',
-            shell=True,
-            stderr=ANY,
-            stdout=ANY,
+        mocked_scan.return_value = iter([LocalEntry("./hello", "hello", 0, 0.0, True)])
+        mocked_stream.return_value = ["hello"]
+        curr_dir = os.getcwd()
+        try:
+            result = self.fzf.get_local_file(
+                search_from_root=True, directory=True, hidden=True, multi_select=True
+            )
+            self.assertEqual(os.getcwd(), os.path.expanduser("~"))
+        finally:
+            os.chdir(curr_dir)
+        self.assertEqual(result, ["hello"])
+        mocked_scan.assert_called_with(directory=True, hidden=True, suffixes=None)
+        self.assertEqual(
+            list(mocked_stream.call_args[0][0]), ["\033[33m./\033[0m", "hello"]
         )
-
-        mocked_output.reset_mock()
-        mocked_check.return_value = True
-        result = self.fzf.get_local_file(cloudformation=True, header="hello")
-        mocked_popen.assert_called_with(
-            "fd --type f --regex '(yaml|yml|json)$'",
-            shell=True,
-            stderr=ANY,
-            stdout=ANY,
+        mocked_stream.assert_called_with(
+            ANY,
+            empty_allow=False,
+            print_col=0,
+            multi_select=True,
+            header="Selecting ./ will use current directory",
         )
-        mocked_output.assert_called_once()
 
-        result = self.fzf.get_local_file(directory=True)
-        mocked_popen.assert_called_with(
-            "echo \033[33m./\033[0m; fd --type d", shell=True, stderr=ANY, stdout=ANY,
+        mocked_scan.return_value = iter([])
+        self.fzf.get_local_file(cloudformation=True, empty_allow=True, header="hello")
+        mocked_scan.assert_called_with(
+            directory=False, hidden=False, suffixes=(".json", ".yaml", ".yml")
         )
-
-        result = self.fzf.get_local_file()
-        mocked_popen.assert_called_with(
-            "fd --type f", shell=True, stderr=ANY, stdout=ANY,
+        mocked_stream.assert_called_with(
+            ANY, empty_allow=True, print_col=0, multi_select=False, header="hello"
         )
 
-    @patch("fzfaws.utils.pyfzf.subprocess")
-    def test_check_fd(self, mocked_subprocess):
-        mocked_subprocess.run.return_value = True
-        result = self.fzf._check_fd()
-        self.assertEqual(result, True)
-
-        mocked_subprocess.run.side_effect = Exception(subprocess.CalledProcessError)
-        result = self.fzf._check_fd()
-        self.assertEqual(result, False)
-
     def test_process_list(self):
         self.fzf.fzf_string = ""
         self.assertRaises(EmptyList, self.fzf.process_list, [], "123")
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from fzfaws.utils.scanner import LocalEntry, scan_local
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        for path in [
+            "hello.txt",
+            "template.yaml",
+            ".hidden.txt",
+            "src/main.py",
+            "src/nested/template.json",
+            ".git/config",
+            "node_modules/lib/index.js",
+        ]:
+            full_path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "w") as file:
+                file.write("hello")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_scan_local(self):
+        entries = sorted(scan_local(self.root), key=lambda entry: entry.relative)
+        self.assertEqual(
+            [entry.relative for entry in entries],
+            [
+                "hello.txt",
+                os.path.join("node_modules", "lib", "index.js"),
+                os.path.join("src", "main.py"),
+                os.path.join("src", "nested", "template.json"),
+                "template.yaml",
+            ],
+        )
+        self.assertEqual(
+            entries[0],
+            LocalEntry(
+                os.path.join(self.root, "hello.txt"),
+                "hello.txt",
+                5,
+                entries[0].mtime,
+                False,
+            ),
+        )
+
+        result = sorted(entry.relative for entry in scan_local(self.root, hidden=True))
+        self.assertIn(".hidden.txt", result)
+        self.assertIn(os.path.join(".git", "config"), result)
+
+        result = sorted(
+            entry.relative
+            for entry in scan_local(self.root, suffixes=(".json", ".yaml", ".yml"))
+        )
+        self.assertEqual(
+            result, [os.path.join("src", "nested", "template.json"), "template.yaml"]
+        )
+
+        result = sorted(
+            entry.relative
+            for entry in scan_local(
+                self.root,
+                skip_dir=lambda path: path.startswith("node_modules"),
+                max_workers=1,
+            )
+        )
+        self.assertNotIn(os.path.join("node_modules", "lib", "index.js"), result)
+        self.assertEqual(len(result), 4)
+
+    def test_scan_directory(self):
+        result = sorted(
+            entry.relative for entry in scan_local(self.root, directory=True)
+        )
+        self.assertEqual(
+            result,
+            [
+                "node_modules",
+                os.path.join("node_modules", "lib"),
+                "src",
+                os.path.join("src", "nested"),
+            ],
+        )
+        self.assertTrue(all(entry.is_dir for entry in scan_local(self.root, True)))
@@ -0,0 +1,90 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from fzfaws.utils.exceptions import S3Error
+from fzfaws.utils.throttle import (
+    RateLimiter,
+    call_with_retry,
+    is_throttled,
+    raise_failures,
+    run_bounded,
+)
+
+
+class TestThrottle(unittest.TestCase):
+    def throttle_error(self, code="SlowDown"):
+        return ClientError({"Error": {"Code": code}}, "PutObjectTagging")
+
+    @patch("fzfaws.utils.throttle.time.sleep")
+    def test_rate_limiter(self, mocked_sleep):
+        limiter = RateLimiter(10)
+        limiter.acquire()
+        mocked_sleep.assert_not_called()
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(mocked_sleep.call_count, 2)
+        self.assertGreater(mocked_sleep.call_args[0][0], 0.1)
+        self.assertLessEqual(mocked_sleep.call_args[0][0], 0.2)
+
+    def test_is_throttled(self):
+        self.assertTrue(is_throttled(self.throttle_error()))
+        self.assertTrue(is_throttled(self.throttle_error("ThrottlingException")))
+        self.assertFalse(is_throttled(self.throttle_error("AccessDenied")))
+
+    @patch("fzfaws.utils.throttle.time.sleep")
+    def test_call_with_retry(self, mocked_sleep):
+        func = MagicMock()
+        func.side_effect = [self.throttle_error(), self.throttle_error(), "hello"]
+        limiter = MagicMock()
+        result = call_with_retry(func, limiter, Bucket="kazhala-lol", Key="hello")
+        self.assertEqual(result, "hello")
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(limiter.acquire.call_count, 3)
+        self.assertEqual(mocked_sleep.call_count, 2)
+        func.assert_called_with(Bucket="kazhala-lol", Key="hello")
+
+        func = MagicMock()
+        func.side_effect = self.throttle_error()
+        self.assertRaises(ClientError, call_with_retry, func, attempts=3)
+        self.assertEqual(func.call_count, 3)
+
+        func = MagicMock()
+        func.side_effect = self.throttle_error("AccessDenied")
+        self.assertRaises(ClientError, call_with_retry, func)
+        self.assertEqual(func.call_count, 1)
+
+    def test_run_bounded(self):
+        def _double(item, offset=0):
+            if item == 3:
+                raise ValueError(item)
+            return item * 2 + offset
+
+        results = {}
+        for item, future in run_bounded(_double, iter(range(10)), 2, offset=1):
+            if future.exception():
+                results[item] = "failed"
+            else:
+                results[item] = future.result()
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[3], "failed")
+        self.assertEqual(results[4], 9)
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_raise_failures(self, mocked_output):
+        raise_failures([], S3Error, "%s objects failed")
+        self.assertEqual(mocked_output.getvalue(), "")
+
+        self.assertRaisesRegex(
+            S3Error,
+            "2 objects failed",
+            raise_failures,
+            [("s3://kazhala-lol/hello", "denied"), ("s3://kazhala-lol/world", "gone")],
+            S3Error,
+            "%s objects failed",
+        )
+        self.assertEqual(
+            mocked_output.getvalue(),
+            "failed: s3://kazhala-lol/hello (denied)\n"
+            "failed: s3://kazhala-lol/world (gone)\n",
+        )
@@ -1,5 +1,6 @@
 import os
 import json
+import tempfile
 import unittest
 from unittest.mock import patch
 from fzfaws.utils import (
@@ -9,6 +10,7 @@ from fzfaws.utils import (
     search_dict_in_list,
     get_name_tag,
     get_default_args,
+    get_cache_path,
     FileLoader,
 )
 from pathlib import Path
@@ -82,3 +84,10 @@ class TestUtil(unittest.TestCase):
 
         result = get_default_args("ec2", ["ls"])
         self.assertEqual(result, ["ls"])
+
+    def test_get_cache_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(os.environ, {"XDG_CACHE_HOME": tmpdir}):
+                result = get_cache_path("hello.json")
+                self.assertEqual(result, "%s/fzfaws/hello.json" % tmpdir)
+                self.assertTrue(os.path.isdir("%s/fzfaws" % tmpdir))